@@ -1,17 +1,43 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, Response, stream_with_context, g, make_response
 from flask_cors import CORS
 import os
+import hmac
+import json
 import time
+import base64
 import tempfile
 import threading
+import functools
 from datetime import datetime
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import logging
+from werkzeug.datastructures import FileStorage
 from werkzeug.exceptions import BadRequest, InternalServerError
-
-from services.azure_speech_service import AzureSpeechService
+from werkzeug.utils import secure_filename
+
+from services.azure_speech_service import AzureSpeechService, TEMP_FILE_BYTES
+from services.transcript_cache import TranscriptCache, is_valid_audio_hash
+from services.transcript_store import (
+    TranscriptStore, TRANSCRIPT_SOURCES, TRANSCRIPT_SOURCE_FILE, TRANSCRIPT_SOURCE_JOB, TRANSCRIPT_SOURCE_SESSION
+)
+from services.session_registry import SessionRegistry, SessionLimitReached
+from services.admission_controller import AdmissionController, AdmissionRejected
+from services.session_store import (
+    create_session_store, is_process_alive, SessionCommandListener,
+    SESSION_STATUS_ACTIVE, SESSION_STATUS_EXPIRED, SESSION_STATUS_ORPHANED
+)
+from services.job_manager import TranscriptionJobManager, JobQueueFull, JOB_STATUS_DONE, JOB_STATUS_FAILED
+from utils.audio_chunker import AudioChunker
+from utils.audio_normalizer import AudioNormalizer, StreamNormalizer, is_decodable_wav, describe_wav_format
+from utils.audio_stream import AudioUploadStream, AudioTooLarge, is_streamable_pcm, hash_seekable_stream
 from utils.audio_validator import AudioValidator
+from utils.voice_activity import VoiceActivityGate, shift_transcriptions
 from utils.response_formatter import ResponseFormatter
+from utils.transcript_export import iter_export, iter_txt, EXPORT_FORMATS
+from utils.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.stage_timer import StageTimer, StageStats
 
 # Load environment variables
 load_dotenv()
@@ -26,11 +52,590 @@ logger = logging.getLogger(__name__)
 
 # Initialize services
 azure_service = AzureSpeechService()
-audio_validator = AudioValidator()
+audio_validator = AudioValidator(max_duration_seconds=float(os.getenv('MAX_AUDIO_DURATION_SECONDS', 0)) or None)
 response_formatter = ResponseFormatter()
 
-# Store active sessions for continuous transcription
-active_sessions = {}
+# Continuous session state shared between gunicorn workers ('local' keeps it per process)
+session_store = create_session_store(
+    os.getenv('SESSION_BACKEND', 'local'),
+    os.getenv('SESSION_DB_PATH', os.path.join(tempfile.gettempdir(), 'speak_easy_sessions.db'))
+)
+
+# Seconds between store reads while waiting on a session owned by another worker
+SESSION_STORE_POLL_SECONDS = float(os.getenv('SESSION_STORE_POLL_SECONDS', 0.25))
+
+# How long to wait for the owning worker to execute a routed command
+SESSION_COMMAND_TIMEOUT_SECONDS = float(os.getenv('SESSION_COMMAND_TIMEOUT_SECONDS', 15))
+
+# Largest audio POST relayed to a session owned by another worker
+STREAM_RELAY_MAX_BYTES = int(os.getenv('STREAM_RELAY_MAX_BYTES', 1024 * 1024))
+
+# Audio POSTs held per streamed session while an earlier seq has not arrived
+STREAM_REORDER_MAX_CHUNKS = int(os.getenv('STREAM_REORDER_MAX_CHUNKS', 32))
+
+
+def _stop_evicted_session(session_id, session, reason):
+    """Stop the recognizer of a session the registry evicted and return its speech config"""
+    result = azure_service.stop_continuous_recognition(session)
+    azure_service.release_session(session)
+    if result['success']:
+        _save_session_transcript({}, session_id, session, result)
+    if session_store is not None:
+        session_store.set_status(session_id, SESSION_STATUS_EXPIRED)
+    logger.info(f"Stopped continuous session {session_id} ({reason} limit)")
+
+
+# Store active sessions for continuous transcription; expired sessions are reaped
+active_sessions = SessionRegistry(
+    stop_fn=_stop_evicted_session,
+    max_sessions=int(os.getenv('MAX_CONTINUOUS_SESSIONS', 50)),
+    max_lifetime_seconds=float(os.getenv('SESSION_MAX_LIFETIME_SECONDS', 4 * 3600)),
+    idle_timeout_seconds=float(os.getenv('SESSION_IDLE_TIMEOUT_SECONDS', 600)),
+    reap_interval_seconds=float(os.getenv('SESSION_REAP_INTERVAL_SECONDS', 15))
+)
+
+# Admission control in front of the transcription routes: a concurrency limit, a bounded
+# wait queue and per-client token buckets; overflow gets 429 with Retry-After.
+# A threaded WSGI worker only ever sees as many requests as it has threads, so by default
+# half of its threads may run transcriptions and a quarter wait, leaving the rest free to
+# answer 429 at once. Event-loop (asgi) workers hold no thread per waiting request.
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 16))
+if os.getenv('SERVER_MODE', 'wsgi') == 'asgi':
+    _default_admission_limits = (32, 64)
+else:
+    _default_admission_limits = (max(1, GUNICORN_THREADS // 2), GUNICORN_THREADS // 4)
+# Per-client limits trust X-Client-Id and X-Forwarded-For only behind a proxy that sets them
+ADMISSION_TRUST_PROXY = os.getenv('ADMISSION_TRUST_PROXY', 'false').lower() == 'true'
+admission_controller = AdmissionController(
+    max_concurrent=int(os.getenv('ADMISSION_MAX_CONCURRENT', _default_admission_limits[0])),
+    max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', _default_admission_limits[1])),
+    max_queue_seconds=float(os.getenv('ADMISSION_MAX_QUEUE_SECONDS', 10)),
+    client_rate=float(os.getenv('ADMISSION_CLIENT_RATE', 0)),
+    client_burst=float(os.getenv('ADMISSION_CLIENT_BURST', 10))
+) if os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true' else None
+
+# Server-side normalization of WAV input to 16 kHz mono 16-bit PCM
+audio_normalizer = AudioNormalizer() if os.getenv('AUDIO_NORMALIZATION_ENABLED', 'true').lower() == 'true' else None
+
+# Voice activity detection: only speech regions (plus padding) reach the recognizer
+VAD_ENABLED = os.getenv('VAD_ENABLED', 'true').lower() == 'true'
+VAD_THRESHOLD_DB = float(os.getenv('VAD_THRESHOLD_DB', 10))
+VAD_PADDING_MS = int(os.getenv('VAD_PADDING_MS', 300))
+VAD_MIN_SPEECH_MS = int(os.getenv('VAD_MIN_SPEECH_MS', 90))
+
+# Content-addressed transcript cache shared by all workers on this machine
+transcript_cache = TranscriptCache(
+    cache_dir=os.getenv('TRANSCRIPT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'speak_easy_cache')),
+    max_entries=int(os.getenv('TRANSCRIPT_CACHE_MAX_ENTRIES', 512)),
+    max_bytes=int(os.getenv('TRANSCRIPT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    max_disk_entries=int(os.getenv('TRANSCRIPT_CACHE_MAX_DISK_ENTRIES', 10000))
+) if os.getenv('TRANSCRIPT_CACHE_ENABLED', 'true').lower() == 'true' else None
+
+# Persistent, searchable store of finished transcripts shared by all workers on this machine
+transcript_store = TranscriptStore(
+    os.getenv('TRANSCRIPT_DB_PATH', os.path.join(tempfile.gettempdir(), 'speak_easy_transcripts.db')),
+    snippet_tokens=int(os.getenv('TRANSCRIPT_SNIPPET_TOKENS', 16))
+) if os.getenv('TRANSCRIPT_STORE_ENABLED', 'true').lower() == 'true' else None
+
+# Shared secret for /api/admin endpoints; without one they are disabled
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+
+def _is_truthy(value) -> bool:
+    """Interpret a form/query flag such as async=true"""
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# WAV files longer than this are split at silence and recognized in parallel
+LONG_FILE_THRESHOLD_SECONDS = float(os.getenv('LONG_FILE_THRESHOLD_SECONDS', 240))
+
+
+# Longest a /api/continuous/results long-poll may wait for new segments
+LONG_POLL_MAX_SECONDS = float(os.getenv('LONG_POLL_MAX_SECONDS', 30))
+
+# Idle SSE streams send a heartbeat event this often so proxies keep them open
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+
+
+def _format_sse(event, data, event_id=None) -> str:
+    """Serialize one Server-Sent Event"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+# Uploads are read and forwarded to the recognizer in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 64 * 1024))
+
+# Batch transcription: most audio parts per request and how many are recognized at once
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', 100))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))
+
+
+def _is_raw_audio_upload() -> bool:
+    """True if the audio is the raw request body rather than a multipart field"""
+    return request.mimetype.startswith('audio/') or request.mimetype == 'application/octet-stream'
+
+
+def _parse_optional_flag(value):
+    """Return True/False for an explicit flag, or None when it was not supplied"""
+    if value is None or str(value).strip() == '':
+        return None
+    return _is_truthy(value)
+
+
+# Recognition deadlines: the probed audio duration times a real-time-factor margin plus
+# a fixed overhead, never below the minimum; audio of unknown length gets the default
+RECOGNITION_RTF_MARGIN = float(os.getenv('RECOGNITION_RTF_MARGIN', 1.5))
+RECOGNITION_DEADLINE_OVERHEAD_SECONDS = float(os.getenv('RECOGNITION_DEADLINE_OVERHEAD_SECONDS', 10))
+RECOGNITION_MIN_DEADLINE_SECONDS = float(os.getenv('RECOGNITION_MIN_DEADLINE_SECONDS', 15))
+RECOGNITION_DEFAULT_DEADLINE_SECONDS = float(os.getenv('RECOGNITION_DEFAULT_DEADLINE_SECONDS', 300))
+
+# Request header with the seconds, counted from the request's arrival, a client will wait for its transcript
+DEADLINE_HEADER = 'X-Deadline-Seconds'
+
+
+def _recognition_timeout(duration_seconds, deadline=None):
+    """
+    Seconds to allow a recognition, from the probed audio duration, cut short by the
+    client's deadline (a time.monotonic() value) when it is sooner
+    """
+    if duration_seconds is None:
+        timeout = RECOGNITION_DEFAULT_DEADLINE_SECONDS
+    else:
+        timeout = max(RECOGNITION_MIN_DEADLINE_SECONDS,
+                      duration_seconds * RECOGNITION_RTF_MARGIN + RECOGNITION_DEADLINE_OVERHEAD_SECONDS)
+    if deadline is not None:
+        timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+    return timeout
+
+
+def _parse_client_deadline(value, elapsed=0.0):
+    """
+    The time.monotonic() by which a client wants its transcript, from the
+    X-Deadline-Seconds header value and the seconds the request has already taken;
+    None when no deadline was given
+    """
+    if value is None or str(value).strip() == '':
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise BadRequest(f'{DEADLINE_HEADER} must be a number of seconds')
+    if not seconds > 0:
+        raise BadRequest(f'{DEADLINE_HEADER} must be positive')
+    return time.monotonic() + seconds - elapsed
+
+
+def _create_vad_gate(stream_format):
+    """Voice activity gate for 16-bit mono PCM in the given format, or None if VAD does not apply"""
+    if not VAD_ENABLED or stream_format['channels'] != 1 or stream_format['bits_per_sample'] != 16 \
+            or stream_format.get('encoding', 'pcm') != 'pcm':
+        return None
+    return VoiceActivityGate(
+        sample_rate=stream_format['sample_rate'],
+        threshold_db=VAD_THRESHOLD_DB,
+        padding_ms=VAD_PADDING_MS,
+        min_speech_ms=VAD_MIN_SPEECH_MS
+    )
+
+
+def _apply_voice_activity(result, vad_gate):
+    """Shift offsets from speech-only audio back to the original timeline and report what was trimmed"""
+    result['transcriptions'] = shift_transcriptions(result['transcriptions'], vad_gate.offset_map)
+    for chunk_error in result.get('chunk_errors', []):
+        chunk_error['start_seconds'] = round(
+            vad_gate.offset_map.to_original_sample(int(chunk_error['start_seconds'] * vad_gate.sample_rate))
+            / float(vad_gate.sample_rate), 3)
+
+    result['voice_activity'] = vad_gate.get_summary()
+    if not vad_gate.offset_map.runs:
+        result['silent'] = True
+    return result
+
+
+def _prepare_audio_file(audio_path, long_file=None, duration_seconds=None, timer=None):
+    """
+    Get an uploaded file ready for recognition: WAV input is normalized to 16 kHz
+    mono 16-bit PCM and trimmed to its speech regions, and long-file mode is chosen
+    when not specified and the speech is longer than LONG_FILE_THRESHOLD_SECONDS.
+
+    Returns:
+        The preparation: 'recognition_path' (None if the audio holds no speech),
+        'recognition_seconds', 'long_file', 'duration_seconds', 'audio_format',
+        'vad_gate' and the 'temp_paths' to remove with _remove_prepared_files
+    """
+    timer = timer or StageTimer()
+    prepared = {
+        'recognition_path': audio_path,
+        'recognition_seconds': None,
+        'long_file': long_file,
+        'duration_seconds': duration_seconds,
+        'audio_format': None,
+        'vad_gate': None,
+        'temp_paths': []
+    }
+
+    try:
+        normalized_path = None
+        if audio_normalizer is not None:
+            normalized_path = f"{audio_path}.normalized.wav"
+            prepared['temp_paths'].append(normalized_path)
+            with timer.stage('normalize'):
+                prepared['audio_format'] = audio_normalizer.normalize_file(audio_path, normalized_path)
+            if prepared['audio_format'] is None:
+                normalized_path = None
+            elif prepared['audio_format']['passthrough']:
+                # Already 16 kHz mono 16-bit PCM: recognize and trim the upload itself
+                normalized_path = audio_path
+            else:
+                TEMP_FILE_BYTES.inc(os.path.getsize(normalized_path), purpose='normalized')
+                prepared['recognition_path'] = normalized_path
+
+        if prepared['duration_seconds'] is None:
+            prepared['duration_seconds'] = AudioChunker.get_wav_duration(prepared['recognition_path'])
+        prepared['recognition_seconds'] = prepared['duration_seconds']
+
+        vad_gate = _create_vad_gate(prepared['audio_format']['normalized']) if normalized_path else None
+        if vad_gate is not None:
+            prepared['vad_gate'] = vad_gate
+            speech_path = f"{audio_path}.speech.wav"
+            prepared['temp_paths'].append(speech_path)
+            with timer.stage('vad'):
+                has_speech = vad_gate.trim_file(normalized_path, speech_path)
+            if has_speech:
+                TEMP_FILE_BYTES.inc(os.path.getsize(speech_path), purpose='speech')
+                prepared['recognition_path'] = speech_path
+                prepared['recognition_seconds'] = vad_gate.speech_seconds
+            elif vad_gate.has_signal:
+                # Too long to have been held back by the gate: recognize the normalized audio untrimmed
+                logger.info(f"No speech regions found in {audio_path}, but it is not silent; recognizing all of it")
+                prepared['vad_gate'] = None
+            else:
+                logger.info(f"No speech detected in {audio_path}, skipping recognition")
+                prepared['recognition_path'] = None
+                prepared['recognition_seconds'] = 0
+    except Exception:
+        _remove_prepared_files(prepared)
+        raise
+
+    if prepared['long_file'] is None:
+        prepared['long_file'] = prepared['recognition_seconds'] is not None \
+            and prepared['recognition_seconds'] > LONG_FILE_THRESHOLD_SECONDS
+    return prepared
+
+
+def _remove_prepared_files(prepared):
+    """Delete the temporary files written by _prepare_audio_file"""
+    for path in prepared['temp_paths']:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _no_speech_result(language):
+    """Recognition result for audio in which voice activity detection found no speech"""
+    return {
+        'success': False,
+        'transcriptions': [],
+        'combined_text': '',
+        'error': 'No speech recognized in audio file',
+        'language': language
+    }
+
+
+def _finish_audio_file(result, prepared):
+    """Map a recognition result of prepared audio back onto the uploaded file"""
+    if prepared['vad_gate'] is not None:
+        _apply_voice_activity(result, prepared['vad_gate'])
+    if prepared['audio_format'] is not None:
+        result['audio_format'] = prepared['audio_format']
+    result['audio_duration_seconds'] = prepared['duration_seconds']
+    return result
+
+
+def _transcribe_audio_file(audio_path, language, long_file=None, duration_seconds=None, timer=None, deadline=None):
+    """
+    Recognize an uploaded file, using chunked long-file mode when requested
+    or, if not specified, when the speech is longer than LONG_FILE_THRESHOLD_SECONDS.
+    WAV input is first normalized to 16 kHz mono 16-bit PCM and trimmed to its
+    speech regions; entirely silent audio never reaches the recognizer.
+    Recognition stops at the client's deadline when that comes first.
+    """
+    timer = timer or StageTimer()
+    prepared = _prepare_audio_file(audio_path, long_file, duration_seconds, timer)
+
+    try:
+        if prepared['recognition_path'] is None:
+            result = _no_speech_result(language)
+        elif prepared['long_file']:
+            # Chunks are recognized in parallel, so only their total is timed
+            with timer.stage('recognize_chunked'):
+                result = azure_service.convert_speech_to_text_from_file_chunked(
+                    audio_file_path=prepared['recognition_path'],
+                    language=language,
+                    timeout=_recognition_timeout(prepared['recognition_seconds'], deadline)
+                )
+        else:
+            result = azure_service.convert_speech_to_text_from_file(
+                audio_file_path=prepared['recognition_path'],
+                language=language,
+                timeout=_recognition_timeout(prepared['recognition_seconds'], deadline),
+                timer=timer
+            )
+    finally:
+        _remove_prepared_files(prepared)
+
+    return _finish_audio_file(result, prepared)
+
+
+def _build_file_transcription_response(result, filename, language):
+    """Build the JSON body and status code for a finished file transcription"""
+    if result['success']:
+        body = {
+            'success': True,
+            'transcription': result['combined_text'],
+            'filename': filename,
+            'language': result['language'],
+            'word_count': len(result['combined_text'].split()) if result['combined_text'] else 0,
+            'segments': len(result['transcriptions']),
+            'message': 'File transcription completed successfully'
+        }
+        if result.get('partial'):
+            # Cut off at the deadline: the segments cover only the start of the audio
+            body['partial'] = True
+            body['message'] = 'Recognition deadline exceeded; returning the segments recognized so far'
+        if 'chunks' in result:
+            body['chunks'] = result['chunks']
+            body['chunk_errors'] = result['chunk_errors']
+        if 'audio_format' in result:
+            body['audio_format'] = result['audio_format']
+        if result.get('audio_duration_seconds') is not None:
+            body['audio_duration_seconds'] = round(result['audio_duration_seconds'], 3)
+        if 'voice_activity' in result:
+            body['voice_activity'] = result['voice_activity']
+        if result.get('attempts', 1) > 1:
+            body['attempts'] = result['attempts']
+        return body, 200
+
+    body = {
+        'success': False,
+        'transcription': '',
+        'filename': filename,
+        'language': language,
+        'error': result['error']
+    }
+    if result.get('silent'):
+        body['silent'] = True
+    if result.get('partial'):
+        # The deadline passed before anything was recognized
+        body['partial'] = True
+        return body, 504
+    if result.get('retry_after'):
+        # The speech service is failing or throttled, not the request: try again later
+        body['retry_after'] = result['retry_after']
+        return body, 503
+    return body, 400
+
+
+def _json_response(body, status_code):
+    """jsonify a body, with a Retry-After header when it tells the client to come back later"""
+    response = jsonify(body)
+    response.status_code = status_code
+    if body.get('retry_after'):
+        response.headers['Retry-After'] = str(body['retry_after'])
+    return response
+
+
+def _cache_hit_response(cached, filename, language, timer, include_timings):
+    """Response for an upload whose transcript was found in the transcript cache"""
+    logger.info(f"Transcript cache hit for {filename} in {language}")
+    body, status_code = _build_file_transcription_response(cached, filename, language)
+    body['cache'] = 'hit'
+    if include_timings:
+        body['timings'] = timer.as_dict()
+    return _json_response(body, status_code)
+
+
+def _cache_transcription_result(audio_hash, language, result):
+    """Store a successful, complete transcription in the transcript cache"""
+    if transcript_cache is None or not audio_hash or not result['success'] or result.get('partial'):
+        return
+    transcript_cache.put(audio_hash, language,
+                        {k: v for k, v in result.items() if k not in ('file_path', 'attempts', 'failed_endpoints')})
+
+
+def _save_transcript(body, source, language, segments, source_id=None, filename=None, duration_seconds=None):
+    """
+    Keep a finished transcript in the transcript store and add its transcript_id to
+    the response body. Empty transcripts are skipped, and a store failure is logged
+    rather than failing a transcription that has already succeeded.
+    """
+    if transcript_store is None or not segments:
+        return
+    try:
+        body['transcript_id'] = transcript_store.save(source, language, segments, source_id=source_id,
+                                                      filename=filename, duration_seconds=duration_seconds)
+    except Exception as e:
+        logger.error(f"Failed to save {source} transcript: {str(e)}")
+
+
+def _save_file_transcript(body, result, filename, language, source=TRANSCRIPT_SOURCE_FILE, source_id=None):
+    """_save_transcript for a successful file transcription result; partial ones are not kept"""
+    if result['success'] and not result.get('partial'):
+        _save_transcript(body, source, language, result['transcriptions'], source_id=source_id,
+                         filename=filename, duration_seconds=result.get('audio_duration_seconds'))
+
+
+def _run_file_transcription_job(audio_path, language, job):
+    """Background job body for asynchronous file transcription"""
+    result = _transcribe_audio_file(audio_path, language, job['options'].get('long_file'),
+                                    job['options'].get('duration_seconds'))
+    _cache_transcription_result(job['options'].get('audio_sha256'), language, result)
+    body, _ = _build_file_transcription_response(result, job['filename'], language)
+    body['transcriptions'] = result['transcriptions']
+    _save_file_transcript(body, result, job['filename'], language, TRANSCRIPT_SOURCE_JOB, job['job_id'])
+    return body
+
+
+# Background executor for asynchronous file transcription jobs
+job_manager = TranscriptionJobManager(
+    transcribe_fn=_run_file_transcription_job,
+    storage_dir=os.getenv('FILE_JOB_STORAGE_DIR', os.path.join(tempfile.gettempdir(), 'speak_easy_jobs')),
+    max_workers=int(os.getenv('FILE_JOB_WORKERS', 2)),
+    max_pending=int(os.getenv('FILE_JOB_MAX_PENDING', 100)),
+    retention_seconds=int(os.getenv('FILE_JOB_RETENTION_SECONDS', 24 * 3600))
+)
+
+
+# Prometheus metrics. Each worker writes its snapshot to METRICS_DIR so a scrape of any
+# worker reports the whole server; an empty METRICS_DIR keeps metrics per worker
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'speakeasy_http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route', 'status'])
+REGISTRY.gauge('speakeasy_active_sessions', 'Continuous sessions with a running recognizer') \
+    .set_function(lambda: len(active_sessions))
+REGISTRY.gauge('speakeasy_file_jobs_in_flight', 'Asynchronous file jobs queued or running') \
+    .set_function(lambda: job_manager.get_stats()['pending'])
+REGISTRY.gauge('speakeasy_recognizer_configs_in_use', 'Pooled speech configs leased by recognizers') \
+    .set_function(lambda: sum(pool['in_use'] for pool in azure_service.get_recognizer_pool_stats()['languages'].values()))
+REGISTRY.gauge('speakeasy_circuit_breaker_state', 'Recognition circuit breaker: 0 closed, 1 half-open, 2 open',
+               multiprocess_mode='max') \
+    .set_function(azure_service.circuit_breaker.state_value)
+
+if admission_controller is not None:
+    REGISTRY.gauge('speakeasy_admission_active', 'Requests holding an admission slot') \
+        .set_function(admission_controller.active)
+    REGISTRY.gauge('speakeasy_admission_queue_depth', 'Requests waiting for an admission slot') \
+        .set_function(admission_controller.queue_depth)
+
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'speak_easy_metrics'))
+if METRICS_DIR:
+    REGISTRY.enable_shared_directory(METRICS_DIR, float(os.getenv('METRICS_EXPORT_SECONDS', 5)))
+
+
+# Per-request stage timings (upload read, temp write, recognizer setup, first segment,
+# drain, ...) sent back as a Server-Timing header and aggregated over the last
+# STAGE_TIMING_WINDOW requests of each route in this worker
+REQUEST_STAGE_DURATION = REGISTRY.histogram(
+    'speakeasy_request_stage_duration_seconds', 'Duration of request processing stages', ['route', 'stage'])
+stage_stats = StageStats(window=int(os.getenv('STAGE_TIMING_WINDOW', 1000)))
+
+
+def _wants_timings(params) -> bool:
+    """Whether the client asked for the stage timings in the response body"""
+    return _is_truthy(params.get('timings', request.args.get('timings', 'false')))
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    g.stage_timer = StageTimer()
+
+
+def _record_request_metrics(method, route, status_code, started, timer):
+    """
+    Observe the latency and stage timings of a finished request
+
+    Returns:
+        The Server-Timing header value, or None if no stage was timed
+    """
+    if started is not None:
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=method, route=route, status=status_code)
+
+    if not timer:
+        return None
+    timings = timer.as_dict()
+    stage_stats.add(route, timings)
+    for stage, duration_ms in timings.items():
+        REQUEST_STAGE_DURATION.observe(duration_ms / 1000.0, route=route, stage=stage)
+    return timer.server_timing()
+
+
+@app.after_request
+def _record_request_duration(response):
+    """Observe request latency per route template, so path parameters do not create new series"""
+    server_timing = _record_request_metrics(
+        request.method,
+        request.url_rule.rule if request.url_rule else 'unmatched',
+        response.status_code,
+        g.get('request_started'),
+        g.get('stage_timer')
+    )
+    if server_timing:
+        # Streamed responses are timed up to the first byte
+        response.headers['Server-Timing'] = server_timing
+    return response
+
+
+def _client_key(headers, remote_addr):
+    """
+    Client key for per-client rate limits: the remote address, or behind a trusted
+    proxy (ADMISSION_TRUST_PROXY) its X-Client-Id or first X-Forwarded-For address
+    """
+    if ADMISSION_TRUST_PROXY:
+        forwarded_for = headers.get('X-Forwarded-For', '').split(',')[0].strip()
+        return headers.get('X-Client-Id') or forwarded_for or remote_addr
+    return remote_addr
+
+
+def _admission_rejected_response(error):
+    """429 response for a request turned away by admission control"""
+    logger.warning(f"Rejected request to {request.path}: {str(error)}")
+    response = jsonify(response_formatter.format_error_response(str(error), 429))
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def admission_controlled(view):
+    """
+    Run a route only once the admission controller grants a slot. The slot is held
+    until the response has been sent, including the body of streamed responses.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if admission_controller is None:
+            return view(*args, **kwargs)
+
+        try:
+            with g.stage_timer.stage('admission_wait'):
+                admission_controller.acquire(_client_key(request.headers, request.remote_addr))
+        except AdmissionRejected as e:
+            return _admission_rejected_response(e)
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            admission_controller.release()
+            raise
+        if response.is_streamed:
+            response.call_on_close(admission_controller.release)
+        else:
+            admission_controller.release()
+        return response
+
+    return wrapper
 
 
 @app.route('/', methods=['GET'])
@@ -47,8 +652,18 @@ def health_check():
             '/api/continuous/start',
             '/api/continuous/stop',
             '/api/continuous/results',
+            '/api/continuous/<session_id>/events',
+            '/api/continuous/<session_id>/audio',
             '/api/file-transcription',
-            '/api/download-transcription'
+            '/api/jobs/<job_id>',
+            '/api/continuous/<session_id>/export',
+            '/api/jobs/<job_id>/result',
+            '/api/jobs/<job_id>/export',
+            '/api/download-transcription',
+            '/api/transcripts',
+            '/api/transcripts/search',
+            '/api/transcripts/<transcript_id>',
+            '/api/transcripts/<transcript_id>/export'
         ]
     })
 
@@ -101,7 +716,58 @@ def test_connection_and_microphone():
         )), 500
 
 
+def _parse_simple_realtime_request(data):
+    """Validated (duration, language) of a simple real-time request body"""
+    duration = data.get('duration', 10)
+    language = data.get('language', 'en-US')
+
+    if duration < 1 or duration > 120:
+        raise BadRequest('Duration must be between 1 and 120 seconds')
+    return duration, language
+
+
+def _parse_multilanguage_request(data):
+    """Validated (duration, language) of a multi-language request body"""
+    duration = data.get('duration', 5)
+    language = data.get('language', 'en-US')
+
+    if duration < 1 or duration > 60:
+        raise BadRequest('Duration must be between 1 and 60 seconds')
+
+    # Validate language code
+    supported_languages = azure_service.get_supported_languages()
+    valid_languages = [lang['code'] for lang in supported_languages]
+
+    if language not in valid_languages:
+        raise BadRequest(
+            f'Unsupported language code: {language}. Supported languages: {", ".join(valid_languages)}')
+    return duration, language
+
+
+def _build_realtime_response(result, message):
+    """Build the JSON body and status code for a finished microphone transcription"""
+    if result['success']:
+        return {
+            'success': True,
+            'transcription': result['combined_text'],
+            'duration': result['duration'],
+            'language': result['language'],
+            'word_count': len(result['combined_text'].split()) if result['combined_text'] else 0,
+            'segments': len(result['transcriptions']),
+            'message': message
+        }, 200
+
+    return {
+        'success': False,
+        'transcription': '',
+        'duration': result['duration'],
+        'language': result['language'],
+        'error': result['error']
+    }, 400
+
+
 @app.route('/api/simple-realtime', methods=['POST'])
+@admission_controlled
 def simple_realtime_transcription():
     """
     API 2: Simple Real-time transcription
@@ -109,12 +775,7 @@ def simple_realtime_transcription():
     Returns transcription once at the end
     """
     try:
-        data = request.get_json() or {}
-        duration = data.get('duration', 10)
-        language = data.get('language', 'en-US')
-
-        if duration < 1 or duration > 120:
-            raise BadRequest('Duration must be between 1 and 120 seconds')
+        duration, language = _parse_simple_realtime_request(request.get_json() or {})
 
         logger.info(f"Starting simple real-time transcription for {duration} seconds in {language}")
 
@@ -125,24 +786,10 @@ def simple_realtime_transcription():
 
         if result['success']:
             logger.info("Simple real-time transcription successful")
-            return jsonify({
-                'success': True,
-                'transcription': result['combined_text'],
-                'duration': result['duration'],
-                'language': result['language'],
-                'word_count': len(result['combined_text'].split()) if result['combined_text'] else 0,
-                'segments': len(result['transcriptions']),
-                'message': 'Real-time transcription completed successfully'
-            })
         else:
             logger.warning(f"Simple real-time transcription failed: {result['error']}")
-            return jsonify({
-                'success': False,
-                'transcription': '',
-                'duration': result['duration'],
-                'language': result['language'],
-                'error': result['error']
-            }), 400
+        body, status_code = _build_realtime_response(result, 'Real-time transcription completed successfully')
+        return jsonify(body), status_code
 
     except BadRequest as e:
         logger.warning(f"Bad request in simple real-time: {str(e)}")
@@ -155,6 +802,7 @@ def simple_realtime_transcription():
 
 
 @app.route('/api/multilanguage-transcription', methods=['POST'])
+@admission_controlled
 def multilanguage_transcription():
     """
     API 3: Multi-language transcription
@@ -162,20 +810,7 @@ def multilanguage_transcription():
     Returns full transcription once at the end
     """
     try:
-        data = request.get_json() or {}
-        duration = data.get('duration', 5)
-        language = data.get('language', 'en-US')
-
-        if duration < 1 or duration > 60:
-            raise BadRequest('Duration must be between 1 and 60 seconds')
-
-        # Validate language code
-        supported_languages = azure_service.get_supported_languages()
-        valid_languages = [lang['code'] for lang in supported_languages]
-
-        if language not in valid_languages:
-            raise BadRequest(
-                f'Unsupported language code: {language}. Supported languages: {", ".join(valid_languages)}')
+        duration, language = _parse_multilanguage_request(request.get_json() or {})
 
         logger.info(f"Starting multi-language transcription for {duration} seconds in {language}")
 
@@ -186,24 +821,11 @@ def multilanguage_transcription():
 
         if result['success']:
             logger.info("Multi-language transcription successful")
-            return jsonify({
-                'success': True,
-                'transcription': result['combined_text'],
-                'duration': result['duration'],
-                'language': result['language'],
-                'word_count': len(result['combined_text'].split()) if result['combined_text'] else 0,
-                'segments': len(result['transcriptions']),
-                'message': f'Multi-language transcription in {language} completed successfully'
-            })
         else:
             logger.warning(f"Multi-language transcription failed: {result['error']}")
-            return jsonify({
-                'success': False,
-                'transcription': '',
-                'duration': result['duration'],
-                'language': result['language'],
-                'error': result['error']
-            }), 400
+        body, status_code = _build_realtime_response(
+            result, f'Multi-language transcription in {language} completed successfully')
+        return jsonify(body), status_code
 
     except BadRequest as e:
         logger.warning(f"Bad request in multi-language: {str(e)}")
@@ -215,7 +837,242 @@ def multilanguage_transcription():
         )), 500
 
 
+def _get_stored_session(session_id):
+    """Session metadata from the shared store, marking sessions whose owner died as orphaned"""
+    if session_store is None:
+        return None
+    meta = session_store.get_session(session_id)
+    if meta and meta['status'] == SESSION_STATUS_ACTIVE and not is_process_alive(meta['owner_pid']):
+        session_store.set_status(session_id, SESSION_STATUS_ORPHANED)
+        meta['status'] = SESSION_STATUS_ORPHANED
+    return meta
+
+
+def _wait_for_stored_results(session_id, cursor=0, timeout=0):
+    """
+    Store-backed counterpart of AzureSpeechService.wait_for_session_results for
+    sessions owned by another worker
+
+    Returns:
+        The same update dictionary plus 'is_active' and 'start_time', or None if unknown
+    """
+    meta = _get_stored_session(session_id)
+    if meta is None:
+        return None
+
+    deadline = time.time() + (timeout or 0)
+    while True:
+        segments = session_store.get_segments(session_id, cursor)
+        if segments or meta['status'] != SESSION_STATUS_ACTIVE or time.time() >= deadline:
+            break
+        time.sleep(SESSION_STORE_POLL_SECONDS)
+        meta = _get_stored_session(session_id) or dict(meta, status=SESSION_STATUS_EXPIRED)
+
+    return _stored_results_update(meta, cursor, segments)
+
+
+def _stored_results_update(meta, cursor, segments):
+    """Update dictionary of _wait_for_stored_results from stored metadata and the segments read"""
+    finished = meta['status'] != SESSION_STATUS_ACTIVE
+    return {
+        'transcriptions': segments,
+        'cursor': cursor + len(segments),
+        'finished': finished,
+        'segments': meta['segments'],
+        'word_count': meta['word_count'],
+        'is_active': not finished,
+        'start_time': meta['start_time']
+    }
+
+
+def _save_session_transcript(body, session_id, session, result):
+    """_save_transcript for a stopped continuous session"""
+    _save_transcript(body, TRANSCRIPT_SOURCE_SESSION, session['session'].get('language'), result['transcriptions'],
+                     source_id=session_id, duration_seconds=result['session_duration'])
+
+
+def _stop_owned_session(session_id):
+    """
+    Stop a session whose recognizer lives in this worker
+
+    Returns:
+        (body, status_code), or None if this worker does not own the session
+    """
+    # Remove session from active sessions before stopping so the reaper cannot also stop it
+    session = active_sessions.remove(session_id)
+    if session is None:
+        return None
+
+    logger.info(f"Stopping continuous transcription session: {session_id}")
+    normalizer = session['session'].get('stream_normalizer')
+    if normalizer is not None:
+        # Push the resampler's tail before the stream is closed
+        with session['session']['audio_lock']:
+            try:
+                azure_service.write_session_audio(session, normalizer.flush())
+            except ValueError:
+                pass
+    result = azure_service.stop_continuous_recognition(session)
+
+    # Return its pooled speech config
+    azure_service.release_session(session)
+    if session_store is not None:
+        session_store.delete_session(session_id)
+
+    if result['success']:
+        logger.info(f"Continuous transcription stopped for session: {session_id}")
+        body = {
+            'success': True,
+            'session_id': session_id,
+            'status': 'stopped',
+            'transcription': result['combined_text'],
+            'session_duration': result['session_duration'],
+            'word_count': result['word_count'],
+            'segments': len(result['transcriptions']),
+            'message': 'Continuous transcription stopped successfully'
+        }
+        _save_session_transcript(body, session_id, session, result)
+        return body, 200
+
+    logger.error(f"Failed to stop session {session_id}: {result['error']}")
+    return {
+        'success': False,
+        'session_id': session_id,
+        'error': result['error']
+    }, 500
+
+
+def _parse_stream_audio_format(audio_format):
+    """Validate the client audio format of a streamed session (defaults to 16 kHz mono 16-bit PCM)"""
+    audio_format = audio_format or {}
+    encoding = audio_format.get('encoding', 'pcm')
+    try:
+        wav_format = AudioNormalizer.raw_pcm_format(
+            sample_rate=int(audio_format.get('sample_rate', 16000)),
+            channels=int(audio_format.get('channels', 1)),
+            encoding=encoding,
+            bits_per_sample=int(audio_format.get('bits_per_sample', 32 if encoding == 'float' else 16))
+        )
+    except (TypeError, ValueError):
+        raise BadRequest('audio_format values must be integers')
+
+    if encoding not in ('pcm', 'float') or not is_decodable_wav(wav_format) \
+            or not 8000 <= wav_format['sample_rate'] <= 192000 or wav_format['channels'] > 8:
+        raise BadRequest('Unsupported audio_format for streamed session')
+    return wav_format
+
+
+def _parse_audio_seq(value):
+    """The required seq of a streamed audio POST: 0 for the first request, then 1, 2, ..."""
+    if value in (None, ''):
+        raise BadRequest('seq is required: number audio requests 0, 1, 2, ... in recording order')
+    try:
+        seq = int(value)
+    except ValueError:
+        raise BadRequest('seq must be an integer')
+    if seq < 0:
+        raise BadRequest('seq must not be negative')
+    return seq
+
+
+def _read_chunks_up_to(chunks, max_bytes):
+    """Join an audio request's chunks, raising BadRequest past max_bytes"""
+    data = bytearray()
+    for chunk in chunks:
+        data += chunk
+        if len(data) > max_bytes:
+            raise BadRequest(f'Audio sent ahead of an earlier seq is limited to {max_bytes} bytes per request')
+    return bytes(data)
+
+
+def _push_session_audio(session_id, chunks, seq):
+    """
+    Normalize client audio and write it into the push stream of a session this worker owns.
+    Requests are written in seq order whatever order they arrive in: one that arrives
+    ahead of an earlier seq is held until the gap is filled.
+
+    Returns:
+        (body, status_code), or None if this worker does not own the session
+    """
+    session = active_sessions.get(session_id)
+    if session is None:
+        return None
+
+    session_control = session['session']
+    normalizer = session_control.get('stream_normalizer')
+    if normalizer is None:
+        return response_formatter.format_error_response(
+            f'Session {session_id} does not accept client audio', 400), 400
+
+    received = 0
+    try:
+        # The normalizer carries state between requests, so they must be written in recording order
+        with session_control['audio_lock']:
+            next_seq = session_control['next_audio_seq']
+            held = session_control['held_audio']
+            if seq < next_seq or seq in held:
+                return response_formatter.format_error_response(
+                    f'Audio seq {seq} was already received', 409), 409
+            if seq > next_seq:
+                if len(held) >= STREAM_REORDER_MAX_CHUNKS:
+                    return response_formatter.format_error_response(
+                        f'Too many audio requests waiting for seq {next_seq}', 409), 409
+                held[seq] = _read_chunks_up_to(chunks, STREAM_RELAY_MAX_BYTES)
+                received = len(held[seq])
+            else:
+                for chunk in chunks:
+                    received += len(chunk)
+                    azure_service.write_session_audio(session, normalizer.process(chunk))
+                next_seq += 1
+                while next_seq in held:
+                    azure_service.write_session_audio(session, normalizer.process(held.pop(next_seq)))
+                    next_seq += 1
+                session_control['next_audio_seq'] = next_seq
+    except ValueError as e:
+        return response_formatter.format_error_response(str(e), 400), 400
+
+    return {
+        'success': True,
+        'session_id': session_id,
+        'seq': seq,
+        'next_seq': next_seq,
+        'held': seq >= next_seq,
+        'bytes_received': received,
+        'pcm_bytes_written': session_control.get('bytes_received', 0),
+        'segments': len(session_control['results'])
+    }, 200
+
+
+def _handle_audio_command(session_id, args):
+    """Write audio relayed through the session store by another worker"""
+    pushed = _push_session_audio(session_id, [base64.b64decode(args['data'])], args['seq'])
+    if pushed is None:
+        return {'body': response_formatter.format_error_response(f'Session {session_id} not found', 400),
+                'status_code': 400}
+    body, status_code = pushed
+    return {'body': body, 'status_code': status_code}
+
+
+def _handle_stop_command(session_id, args):
+    """Execute a stop routed to this worker through the session store"""
+    stopped = _stop_owned_session(session_id)
+    if stopped is None:
+        return {'body': response_formatter.format_error_response(f'Session {session_id} not found', 400),
+                'status_code': 400}
+    body, status_code = stopped
+    return {'body': body, 'status_code': status_code}
+
+
+# Executes commands other workers route to the sessions this worker owns
+session_command_listener = SessionCommandListener(
+    session_store,
+    handlers={'stop': _handle_stop_command, 'audio': _handle_audio_command},
+    retention_seconds=float(os.getenv('SESSION_STORE_RETENTION_SECONDS', 3600))
+) if session_store is not None else None
+
+
 @app.route('/api/continuous/start', methods=['POST'])
+@admission_controlled
 def start_continuous_transcription():
     """
     API 4a: Start continuous real-time transcription (No Diarization)
@@ -226,6 +1083,12 @@ def start_continuous_transcription():
         language = data.get('language', 'en-US')
         session_id = data.get('session_id', f"session_{int(time.time())}")
 
+        # 'microphone' records on the server; 'stream' takes audio the client POSTs
+        source = data.get('source', 'microphone')
+        if source not in ('microphone', 'stream'):
+            raise BadRequest("source must be 'microphone' or 'stream'")
+        stream_format = _parse_stream_audio_format(data.get('audio_format')) if source == 'stream' else None
+
         # Validate language code
         supported_languages = azure_service.get_supported_languages()
         valid_languages = [lang['code'] for lang in supported_languages]
@@ -233,30 +1096,77 @@ def start_continuous_transcription():
         if language not in valid_languages:
             raise BadRequest(f'Unsupported language code: {language}')
 
-        # Check if session already exists
-        if session_id in active_sessions:
+        # Check if session already exists, here or in another worker
+        stored = _get_stored_session(session_id)
+        if session_id in active_sessions or (stored and stored['status'] == SESSION_STATUS_ACTIVE):
             raise BadRequest(f'Session {session_id} already exists')
+        if stored:
+            # A finished session nobody collected; its ID can be reused
+            session_store.delete_session(session_id)
+        active_sessions.check_capacity()
 
         logger.info(f"Starting continuous transcription session: {session_id} in {language}")
 
-        # Create session
-        session = azure_service.start_continuous_transcription_session(language=language)
+        # Create session; segments are mirrored into the shared store when there is one
+        on_segment = None
+        if session_store is not None:
+            def on_segment(index, segment):
+                session_store.append_segment(session_id, index, segment)
+
+        with g.stage_timer.stage('recognizer_create'):
+            if source == 'stream':
+                session = azure_service.start_continuous_stream_session(language=language, on_segment=on_segment)
+                if session['success']:
+                    session['session']['stream_normalizer'] = StreamNormalizer(stream_format)
+                    session['session']['audio_lock'] = threading.Lock()
+                    session['session']['next_audio_seq'] = 0
+                    session['session']['held_audio'] = {}
+            else:
+                session = azure_service.start_continuous_transcription_session(language=language, on_segment=on_segment)
 
         if session['success']:
+            if session_store is not None:
+                # Claim the ID across workers before any segment can arrive
+                try:
+                    session_store.create_session(session_id, os.getpid(), language, session['session']['start_time'])
+                except KeyError:
+                    azure_service.release_session(session)
+                    raise BadRequest(f'Session {session_id} already exists')
+
             # Start recognition
-            if azure_service.start_continuous_recognition(session):
-                active_sessions[session_id] = session
+            with g.stage_timer.stage('recognizer_start'):
+                recognition_started = azure_service.start_continuous_recognition(session)
+            if recognition_started:
+                try:
+                    active_sessions.add(session_id, session)
+                except (KeyError, SessionLimitReached) as e:
+                    # Another request registered the ID or took the last slot meanwhile
+                    azure_service.stop_continuous_recognition(session)
+                    azure_service.release_session(session)
+                    if session_store is not None:
+                        session_store.delete_session(session_id)
+                    if isinstance(e, KeyError):
+                        raise BadRequest(f'Session {session_id} already exists')
+                    raise
                 logger.info(f"Continuous transcription started for session: {session_id}")
 
-                return jsonify({
+                body = {
                     'success': True,
                     'session_id': session_id,
                     'language': language,
                     'status': 'recording',
+                    'source': source,
                     'message': 'Continuous transcription started successfully'
-                })
+                }
+                if source == 'stream':
+                    body['audio_url'] = f"/api/continuous/{session_id}/audio"
+                    body['audio_format'] = dict(describe_wav_format(stream_format), container='raw')
+                return jsonify(body)
             else:
                 logger.error(f"Failed to start recognition for session: {session_id}")
+                azure_service.release_session(session)
+                if session_store is not None:
+                    session_store.delete_session(session_id)
                 return jsonify({
                     'success': False,
                     'session_id': session_id,
@@ -264,15 +1174,22 @@ def start_continuous_transcription():
                 }), 500
         else:
             logger.error(f"Failed to create session: {session['error']}")
-            return jsonify({
+            body = {
                 'success': False,
                 'session_id': session_id,
                 'error': session['error']
-            }), 500
+            }
+            if session.get('retry_after'):
+                body['retry_after'] = session['retry_after']
+                return _json_response(body, 503)
+            return jsonify(body), 500
 
     except BadRequest as e:
         logger.warning(f"Bad request in start continuous: {str(e)}")
         return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except SessionLimitReached as e:
+        logger.warning(f"Rejected continuous session: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 503)), 503
     except Exception as e:
         logger.error(f"Internal error in start continuous: {str(e)}")
         return jsonify(response_formatter.format_error_response(
@@ -293,36 +1210,45 @@ def stop_continuous_transcription():
         if not session_id:
             raise BadRequest('session_id is required')
 
-        if session_id not in active_sessions:
-            raise BadRequest(f'Session {session_id} not found')
-
-        logger.info(f"Stopping continuous transcription session: {session_id}")
-
-        session = active_sessions[session_id]
-        result = azure_service.stop_continuous_recognition(session)
+        stopped = _stop_owned_session(session_id)
+        if stopped is not None:
+            body, status_code = stopped
+            return jsonify(body), status_code
 
-        # Remove session from active sessions
-        del active_sessions[session_id]
+        meta = _get_stored_session(session_id)
+        if meta is None:
+            raise BadRequest(f'Session {session_id} not found')
 
-        if result['success']:
-            logger.info(f"Continuous transcription stopped for session: {session_id}")
-            return jsonify({
-                'success': True,
-                'session_id': session_id,
-                'status': 'stopped',
-                'transcription': result['combined_text'],
-                'session_duration': result['session_duration'],
-                'word_count': result['word_count'],
-                'segments': len(result['transcriptions']),
-                'message': 'Continuous transcription stopped successfully'
-            })
-        else:
-            logger.error(f"Failed to stop session {session_id}: {result['error']}")
-            return jsonify({
-                'success': False,
-                'session_id': session_id,
-                'error': result['error']
-            }), 500
+        if meta['status'] == SESSION_STATUS_ACTIVE:
+            # The recognizer lives in another worker: route the stop to it
+            logger.info(f"Routing stop for session {session_id} to worker {meta['owner_pid']}")
+            command_id = session_store.send_command(session_id, meta['owner_pid'], 'stop')
+            routed = session_store.wait_for_command(command_id, SESSION_COMMAND_TIMEOUT_SECONDS)
+            if routed is None:
+                logger.error(f"Worker {meta['owner_pid']} did not stop session {session_id} in time")
+                return jsonify(response_formatter.format_error_response(
+                    'Session owner did not respond', 504)), 504
+            return jsonify(routed['body']), routed['status_code']
+
+        # Expired, or its worker died: return what was recorded and forget it
+        segments = session_store.get_segments(session_id)
+        session_store.delete_session(session_id)
+        session_duration = (meta['last_segment_time'] or meta['start_time']) - meta['start_time']
+        body = {
+            'success': True,
+            'session_id': session_id,
+            'status': 'stopped',
+            'transcription': ' '.join([segment['text'] for segment in segments]),
+            'session_duration': session_duration,
+            'word_count': meta['word_count'],
+            'segments': len(segments),
+            'message': f"Continuous transcription had already ended ({meta['status']})"
+        }
+        if meta['status'] == SESSION_STATUS_ORPHANED:
+            # Expired sessions were saved by the worker that stopped them
+            _save_transcript(body, TRANSCRIPT_SOURCE_SESSION, meta['language'], segments,
+                             source_id=session_id, duration_seconds=session_duration)
+        return jsonify(body)
 
     except BadRequest as e:
         logger.warning(f"Bad request in stop continuous: {str(e)}")
@@ -334,6 +1260,56 @@ def stop_continuous_transcription():
         )), 500
 
 
+def _parse_continuous_results_request(data):
+    """Validate a results request, returning (session_id, since cursor or None, wait seconds)"""
+    session_id = data.get('session_id')
+    if not session_id:
+        raise BadRequest('session_id is required')
+
+    # Optional cursor: only segments after it are returned, waiting up to 'wait' seconds
+    since = data.get('since')
+    wait = data.get('wait', 0)
+    try:
+        since = int(since) if since is not None else None
+        wait = min(max(0.0, float(wait)), LONG_POLL_MAX_SECONDS)
+    except (TypeError, ValueError):
+        raise BadRequest('since must be an integer and wait a number of seconds')
+    if since is not None and since < 0:
+        raise BadRequest('since must not be negative')
+    return session_id, since, wait
+
+
+def _stored_periodic_results(update):
+    """get_session_results_periodic-style results from a _wait_for_stored_results update"""
+    return dict(
+        update,
+        success=True,
+        combined_text=' '.join([r['text'] for r in update['transcriptions']]),
+        session_duration=time.time() - update['start_time']
+    )
+
+
+def _build_continuous_results_response(session_id, since, result):
+    """Build the JSON body and status code of a continuous results request"""
+    if not result['success']:
+        return {'success': False, 'session_id': session_id, 'error': result['error']}, 500
+
+    body = {
+        'success': True,
+        'session_id': session_id,
+        'status': 'active' if result['is_active'] else 'inactive',
+        'transcription': result['combined_text'],
+        'session_duration': result['session_duration'],
+        'word_count': result['word_count'],
+        'segments': result['segments'],
+        'is_active': result['is_active'],
+        'cursor': result['cursor']
+    }
+    if since is not None:
+        body['transcriptions'] = result['transcriptions']
+    return body, 200
+
+
 @app.route('/api/continuous/results', methods=['POST'])
 def get_continuous_transcription_results():
     """
@@ -341,35 +1317,20 @@ def get_continuous_transcription_results():
     Returns transcription results every 3 seconds or as requested
     """
     try:
-        data = request.get_json() or {}
-        session_id = data.get('session_id')
-
-        if not session_id:
-            raise BadRequest('session_id is required')
-
-        if session_id not in active_sessions:
-            raise BadRequest(f'Session {session_id} not found or stopped')
-
-        session = active_sessions[session_id]
-        result = azure_service.get_session_results_periodic(session)
+        session_id, since, wait = _parse_continuous_results_request(request.get_json() or {})
 
-        if result['success']:
-            return jsonify({
-                'success': True,
-                'session_id': session_id,
-                'status': 'active' if result['is_active'] else 'inactive',
-                'transcription': result['combined_text'],
-                'session_duration': result['session_duration'],
-                'word_count': result['word_count'],
-                'segments': len(result['transcriptions']),
-                'is_active': result['is_active']
-            })
+        session = active_sessions.get(session_id)
+        if session is not None:
+            result = azure_service.get_session_results_periodic(session, since=since, wait=wait)
         else:
-            return jsonify({
-                'success': False,
-                'session_id': session_id,
-                'error': result['error']
-            }), 500
+            # Owned by another worker: read what it has recorded in the shared store
+            update = _wait_for_stored_results(session_id, since or 0, wait if since is not None else 0)
+            if update is None:
+                raise BadRequest(f'Session {session_id} not found or stopped')
+            result = _stored_periodic_results(update)
+
+        body, status_code = _build_continuous_results_response(session_id, since, result)
+        return jsonify(body), status_code
 
     except BadRequest as e:
         logger.warning(f"Bad request in get continuous results: {str(e)}")
@@ -381,105 +1342,747 @@ def get_continuous_transcription_results():
         )), 500
 
 
-@app.route('/api/file-transcription', methods=['POST'])
-def file_transcription():
+def _read_up_to(stream, max_bytes):
+    """Read a request body up to max_bytes, however many reads the server splits it into"""
+    data = bytearray()
+    while len(data) < max_bytes:
+        chunk = stream.read(max_bytes - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+@app.route('/api/continuous/<session_id>/audio', methods=['POST'])
+def push_continuous_transcription_audio(session_id):
     """
-    API 5: File transcription
-    Accepts a WAV file and returns full transcription
+    API 4e: Push client audio into a streamed continuous session (source 'stream')
+    The body is raw PCM in the format given at start. Send successive POSTs while
+    recording, numbered by ?seq=0, 1, 2, ..., or one long chunked POST; it is
+    forwarded to the recognizer as it arrives.
     """
     try:
-        # Check if audio file is present
-        if 'audio' not in request.files:
-            raise BadRequest('No audio file provided')
+        seq = _parse_audio_seq(request.args.get('seq'))
+        chunks = iter(lambda: request.stream.read(UPLOAD_CHUNK_SIZE), b'')
+        pushed = _push_session_audio(session_id, chunks, seq)
+        if pushed is not None:
+            body, status_code = pushed
+            return jsonify(body), status_code
+
+        meta = _get_stored_session(session_id)
+        if meta is None or meta['status'] != SESSION_STATUS_ACTIVE:
+            raise BadRequest(f'Session {session_id} not found or stopped')
 
-        audio_file = request.files['audio']
+        # The recognizer lives in another worker: relay the audio through the session store
+        if request.content_length is not None and request.content_length > STREAM_RELAY_MAX_BYTES:
+            raise BadRequest(f'Relayed audio is limited to {STREAM_RELAY_MAX_BYTES} bytes per request')
+        raw = _read_up_to(request.stream, STREAM_RELAY_MAX_BYTES + 1)
+        if len(raw) > STREAM_RELAY_MAX_BYTES:
+            raise BadRequest(f'Relayed audio is limited to {STREAM_RELAY_MAX_BYTES} bytes per request')
+
+        command_id = session_store.send_command(session_id, meta['owner_pid'], 'audio',
+                                                {'data': base64.b64encode(raw).decode('ascii'), 'seq': seq})
+        routed = session_store.wait_for_command(command_id, SESSION_COMMAND_TIMEOUT_SECONDS)
+        if routed is None:
+            logger.error(f"Worker {meta['owner_pid']} did not accept audio for session {session_id} in time")
+            return jsonify(response_formatter.format_error_response('Session owner did not respond', 504)), 504
+        return jsonify(routed['body']), routed['status_code']
 
-        if audio_file.filename == '':
-            raise BadRequest('No audio file selected')
+    except BadRequest as e:
+        logger.warning(f"Bad request in continuous audio: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in continuous audio: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
 
-        # Get language from form data
-        language = request.form.get('language', 'en-US')
 
-        # Validate language code
-        supported_languages = azure_service.get_supported_languages()
-        valid_languages = [lang['code'] for lang in supported_languages]
+# Ask EventSource to reconnect after 3 seconds if the stream drops
+SSE_RETRY_EVENT = "retry: 3000\n\n"
 
-        if language not in valid_languages:
-            raise BadRequest(f'Unsupported language code: {language}')
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
 
-        # Validate audio file
-        if not audio_validator.is_valid_audio_file(audio_file):
-            raise BadRequest('Invalid audio file format. Supported formats: wav, mp3, m4a, flac')
 
-        # Read audio data
-        audio_data = audio_file.read()
+def _parse_last_event_id(last_event_id):
+    """Segment n is sent with id n, so resuming starts just after the last id seen"""
+    try:
+        return int(last_event_id) + 1 if last_event_id not in (None, '') else 0
+    except ValueError:
+        raise BadRequest('Last-Event-ID must be an integer')
 
-        # Validate audio size (max 50MB for file processing)
-        if not audio_validator.is_valid_audio_size(audio_data):
-            raise BadRequest('Audio file too large. Maximum size: 50MB')
 
-        logger.info(f"Processing audio file: {audio_file.filename} in {language}")
+def _format_sse_update(session_id, update, cursor):
+    """
+    Server-Sent Events for one session results update: its segments, then an end
+    event if the session finished or a heartbeat if nothing arrived
 
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
+    Returns:
+        (events text, next cursor, finished)
+    """
+    events = []
+    for transcription in update['transcriptions']:
+        events.append(_format_sse('segment', dict(transcription, index=cursor), event_id=cursor))
+        cursor += 1
 
-        try:
-            # Convert speech to text
-            result = azure_service.convert_speech_to_text_from_file(
-                audio_file_path=temp_file_path,
-                language=language
-            )
+    if update['finished']:
+        events.append(_format_sse('end', {'session_id': session_id, 'status': 'stopped', 'segments': cursor}))
+    elif not update['transcriptions']:
+        events.append(_format_sse('heartbeat', {'timestamp': time.time()}))
+    return ''.join(events), cursor, update['finished']
 
-            # Clean up temporary file
-            os.unlink(temp_file_path)
 
-            if result['success']:
-                logger.info("File transcription successful")
-                return jsonify({
-                    'success': True,
-                    'transcription': result['combined_text'],
-                    'filename': audio_file.filename,
-                    'language': result['language'],
-                    'word_count': len(result['combined_text'].split()) if result['combined_text'] else 0,
-                    'segments': len(result['transcriptions']),
-                    'message': 'File transcription completed successfully'
-                })
-            else:
-                logger.warning(f"File transcription failed: {result['error']}")
-                return jsonify({
-                    'success': False,
-                    'transcription': '',
-                    'filename': audio_file.filename,
-                    'language': language,
-                    'error': result['error']
-                }), 400
+@app.route('/api/continuous/<session_id>/events', methods=['GET'])
+def stream_continuous_transcription_events(session_id):
+    """
+    API 4d: Server-Sent Events stream for a continuous transcription session
+    Pushes each recognized segment as it arrives, a heartbeat while idle, and an
+    end event once the session stops. Reconnecting clients resume after Last-Event-ID.
+    """
+    try:
+        session = active_sessions.get(session_id)
+        if session is not None:
+            def wait_for_results(cursor):
+                return azure_service.wait_for_session_results(session, cursor, timeout=SSE_HEARTBEAT_SECONDS)
+        elif _get_stored_session(session_id) is not None:
+            # Owned by another worker: follow what it records in the shared store
+            def wait_for_results(cursor):
+                return _wait_for_stored_results(session_id, cursor, timeout=SSE_HEARTBEAT_SECONDS) or \
+                    {'transcriptions': [], 'cursor': cursor, 'finished': True}
+        else:
+            raise BadRequest(f'Session {session_id} not found or stopped')
 
-        except Exception as e:
-            # Clean up temporary file in case of error
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-            raise e
+        cursor = _parse_last_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+
+        def generate(cursor):
+            yield SSE_RETRY_EVENT
+            finished = False
+            while not finished:
+                events, cursor, finished = _format_sse_update(session_id, wait_for_results(cursor), cursor)
+                yield events
+
+        logger.info(f"Streaming events for session {session_id} from segment {cursor}")
+        return Response(
+            stream_with_context(generate(cursor)),
+            mimetype='text/event-stream',
+            headers=SSE_HEADERS
+        )
 
     except BadRequest as e:
-        logger.warning(f"Bad request in file transcription: {str(e)}")
+        logger.warning(f"Bad request in continuous events: {str(e)}")
         return jsonify(response_formatter.format_error_response(str(e), 400)), 400
     except Exception as e:
-        logger.error(f"Internal error in file transcription: {str(e)}")
+        logger.error(f"Internal error in continuous events: {str(e)}")
         return jsonify(response_formatter.format_error_response(
             "Internal server error occurred"
         )), 500
 
 
-@app.route('/api/download-transcription', methods=['POST'])
-def download_transcription():
+@app.route('/api/continuous/<session_id>/export', methods=['GET'])
+def export_continuous_transcription(session_id):
     """
-    API 6: Download transcription as text file
-    Accepts transcription text and returns a downloadable text file
+    API 4f: Export the transcript of a continuous session as TXT, JSON, SRT or VTT (?format=)
+    Covers the segments recognized so far of a running session, including one owned
+    by another worker, and expired or orphaned sessions still in the session store
     """
     try:
-        data = request.get_json()
+        export_format = _parse_export_format()
+        session = active_sessions.get(session_id)
+        if session is not None:
+            segments = azure_service.iter_session_segments(session)
+            metadata = {
+                'language': session['session'].get('language'),
+                'word_count': session['session'].get('word_count'),
+                'start_time': session['session'].get('start_time')
+            }
+        else:
+            meta = _get_stored_session(session_id)
+            if meta is None:
+                return jsonify(response_formatter.format_error_response(
+                    f'Session {session_id} not found', 404)), 404
+            segments = session_store.iter_segments(session_id)
+            metadata = {
+                'language': meta['language'],
+                'word_count': meta['word_count'],
+                'start_time': meta['start_time']
+            }
+
+        logger.info(f"Exporting session {session_id} as {export_format}")
+        return _export_response(export_format, segments, metadata, f'session-{session_id}', 'session')
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in continuous export: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in continuous export: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/file-transcription', methods=['POST'])
+@admission_controlled
+def file_transcription():
+    """
+    API 5: File transcription
+    Accepts a WAV file and returns full transcription.
+    The file can be sent as multipart form data (field "audio") or as the raw
+    request body with an audio/* or application/octet-stream content type.
+    """
+    timer = g.stage_timer
+    try:
+        if _is_raw_audio_upload():
+            # Raw body: options come from the query string and the body is read lazily
+            params = request.args
+            audio_file = FileStorage(
+                stream=request.stream,
+                filename=request.args.get('filename') or request.headers.get('X-Filename', 'upload.wav'),
+                content_type=request.mimetype
+            )
+        else:
+            # Multipart bodies are read in full while the form is parsed
+            with timer.stage('upload_read'):
+                files = request.files
+            # Check if audio file is present
+            if 'audio' not in files:
+                raise BadRequest('No audio file provided')
+
+            params = request.form
+            audio_file = files['audio']
+
+        if audio_file.filename == '':
+            raise BadRequest('No audio file selected')
+
+        # Get language and processing mode from form data
+        language = params.get('language', 'en-US')
+        run_async = _is_truthy(params.get('async', request.args.get('async', 'false')))
+        long_file = _parse_optional_flag(params.get('long_file', request.args.get('long_file')))
+        use_cache = transcript_cache is not None and _is_truthy(params.get('cache', 'true'))
+        include_timings = _wants_timings(params)
+        # Asynchronous jobs are not waited on, so only synchronous requests have a client deadline
+        deadline = None if run_async else _parse_client_deadline(request.headers.get(DEADLINE_HEADER),
+                                                                 timer.elapsed())
+
+        # Validate language code
+        supported_languages = azure_service.get_supported_languages()
+        valid_languages = [lang['code'] for lang in supported_languages]
+
+        if language not in valid_languages:
+            raise BadRequest(f'Unsupported language code: {language}')
+
+        # Validate audio file
+        if not audio_validator.is_valid_audio_file(audio_file):
+            raise BadRequest('Invalid audio file format. Supported formats: wav, mp3, m4a, flac')
+
+        # Probe the container header before any heavy work; spooled uploads are
+        # probed in place, raw bodies from their first bytes
+        extension = os.path.splitext(audio_file.filename.lower())[1]
+        probe = audio_validator.probe_audio_file(audio_file.stream, extension)
+        declared_size = probe['size_bytes'] if probe else request.content_length
+
+        if declared_size is not None and not audio_validator.is_valid_audio_size(declared_size):
+            if declared_size:
+                raise AudioTooLarge(f'Audio exceeds maximum size of {audio_validator.MAX_FILE_SIZE} bytes')
+            raise BadRequest('Empty audio file')
+
+        # Spooled uploads are hashed up front; raw bodies only once they have been read,
+        # since the cache key must be the digest of the bytes actually received
+        cache_checked = False
+        if use_cache and not run_async:
+            with timer.stage('cache_lookup'):
+                audio_hash = hash_seekable_stream(audio_file.stream, UPLOAD_CHUNK_SIZE)
+                cached = transcript_cache.get(audio_hash, language) if is_valid_audio_hash(audio_hash) else None
+            cache_checked = audio_hash is not None
+
+            if cached is not None:
+                return _cache_hit_response(cached, audio_file.filename, language, timer, include_timings)
+
+        # Read the upload in fixed-size chunks, enforcing the size limit as bytes arrive
+        upload = AudioUploadStream(
+            audio_file.stream,
+            chunk_size=UPLOAD_CHUNK_SIZE,
+            max_bytes=audio_validator.MAX_FILE_SIZE
+        )
+        with timer.stage('upload_read'):
+            if probe is None:
+                probe = audio_validator.probe_audio_header(
+                    upload.peek(audio_validator.PROBE_HEAD_BYTES),
+                    total_size=request.content_length,
+                    extension=extension
+                )
+            wav_format = upload.read_header()
+
+        if upload.is_empty:
+            raise BadRequest('Empty audio file')
+
+        if not probe['valid']:
+            raise BadRequest(f"Invalid audio file: {probe['error']}")
+
+        duration_seconds = probe['duration_seconds']
+        if long_file is None and duration_seconds is not None:
+            long_file = duration_seconds > LONG_FILE_THRESHOLD_SECONDS
+
+        logger.info(f"Processing audio file: {audio_file.filename} in {language}")
+
+        if audio_normalizer is not None:
+            can_stream = is_decodable_wav(wav_format)
+        else:
+            can_stream = is_streamable_pcm(wav_format)
+
+        if not run_async and not long_file and can_stream:
+            # WAV is streamed into the recognizer while the body is still arriving,
+            # normalized chunk by chunk on the way through
+            if audio_normalizer is not None:
+                pcm_chunks = audio_normalizer.iter_normalized(wav_format, upload.iter_pcm())
+                stream_format = audio_normalizer.get_normalized_format()
+            else:
+                pcm_chunks = upload.iter_pcm()
+                stream_format = describe_wav_format(wav_format)
+
+            # Only speech regions are forwarded; silence is dropped as it arrives
+            vad_gate = _create_vad_gate(stream_format)
+            if vad_gate is not None:
+                pcm_chunks = vad_gate.iter_speech(pcm_chunks)
+
+            result = azure_service.convert_speech_to_text_from_stream(
+                pcm_chunks,
+                language,
+                sample_rate=stream_format['sample_rate'],
+                bits_per_sample=stream_format['bits_per_sample'],
+                channels=stream_format['channels'],
+                timeout=_recognition_timeout(duration_seconds, deadline),
+                timer=timer
+            )
+            if vad_gate is not None:
+                _apply_voice_activity(result, vad_gate)
+            result['audio_duration_seconds'] = duration_seconds
+            result['audio_format'] = {
+                'original': describe_wav_format(wav_format),
+                'normalized': stream_format
+            }
+            if use_cache:
+                _cache_transcription_result(upload.sha256, language, result)
+
+            body, status_code = _build_file_transcription_response(result, audio_file.filename, language)
+            _save_file_transcript(body, result, audio_file.filename, language)
+            if use_cache:
+                body['cache'] = 'miss'
+            if include_timings:
+                body['timings'] = timer.as_dict()
+            if result['success']:
+                logger.info("File transcription successful")
+            else:
+                logger.warning(f"File transcription failed: {result['error']}")
+            return _json_response(body, status_code)
+
+        # Other containers, async jobs and long files need the audio on disk
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+            temp_file_path = temp_file.name
+            try:
+                with timer.stage('temp_write'):
+                    TEMP_FILE_BYTES.inc(upload.spill_to_file(temp_file), purpose='upload')
+            except Exception:
+                temp_file.close()
+                os.unlink(temp_file_path)
+                raise
+
+        try:
+            if use_cache and not run_async and not cache_checked:
+                # A raw body has now been read and hashed in full
+                with timer.stage('cache_lookup'):
+                    cached = transcript_cache.get(upload.sha256, language)
+                if cached is not None:
+                    os.unlink(temp_file_path)
+                    return _cache_hit_response(cached, audio_file.filename, language, timer, include_timings)
+
+            if run_async:
+                # Hand the upload to the background pool and free this worker immediately
+                job = job_manager.submit(temp_file_path, language, audio_file.filename,
+                                         options={
+                                             'long_file': long_file,
+                                             'duration_seconds': duration_seconds,
+                                             'audio_sha256': upload.sha256 if use_cache else None
+                                         })
+                return jsonify(_queued_job_body(job, audio_file.filename, language)), 202
+
+            # Convert speech to text
+            result = _transcribe_audio_file(temp_file_path, language, long_file, duration_seconds, timer, deadline)
+            if use_cache:
+                _cache_transcription_result(upload.sha256, language, result)
+
+            # Clean up temporary file
+            os.unlink(temp_file_path)
+
+            body, status_code = _build_file_transcription_response(result, audio_file.filename, language)
+            _save_file_transcript(body, result, audio_file.filename, language)
+            if use_cache:
+                body['cache'] = 'miss'
+            if include_timings:
+                body['timings'] = timer.as_dict()
+            if result['success']:
+                logger.info("File transcription successful")
+            else:
+                logger.warning(f"File transcription failed: {result['error']}")
+            return _json_response(body, status_code)
+
+        except JobQueueFull as e:
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+            logger.warning(f"Rejected file transcription job: {str(e)}")
+            return jsonify(response_formatter.format_error_response(str(e), 503)), 503
+        except Exception as e:
+            # Clean up temporary file in case of error
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+            raise e
+
+    except AudioTooLarge:
+        message = f'Audio file too large. Maximum size: {audio_validator.get_max_file_size_mb():g}MB'
+        logger.warning(f"Bad request in file transcription: {message}")
+        return jsonify(response_formatter.format_error_response(message, 400)), 400
+    except BadRequest as e:
+        logger.warning(f"Bad request in file transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in file transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+def _queued_job_body(job, filename, language):
+    """Response body for a file transcription accepted as a background job"""
+    return {
+        'success': True,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'filename': filename,
+        'language': language,
+        'status_url': f"/api/jobs/{job['job_id']}",
+        'result_url': f"/api/jobs/{job['job_id']}/result",
+        'message': 'File transcription job queued'
+    }
+
+
+def _job_status_body(job):
+    """Public view of a job record without its result payload"""
+    return {
+        'success': True,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'filename': job['filename'],
+        'language': job['language'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'error': job['error']
+    }
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_transcription_job_status(job_id):
+    """
+    API 5b: Status of an asynchronous file transcription job
+    Reports queued, running, done or failed
+    """
+    try:
+        job = job_manager.get_job(job_id)
+        if job is None:
+            return jsonify(response_formatter.format_error_response(f'Job {job_id} not found', 404)), 404
+
+        return jsonify(_job_status_body(job))
+
+    except Exception as e:
+        logger.error(f"Internal error in job status: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_transcription_job_result(job_id):
+    """
+    API 5c: Result of an asynchronous file transcription job
+    Returns 202 with the job status while the job is still queued or running
+    """
+    try:
+        job = job_manager.get_job(job_id)
+        if job is None:
+            return jsonify(response_formatter.format_error_response(f'Job {job_id} not found', 404)), 404
+
+        if job['status'] == JOB_STATUS_DONE:
+            return jsonify(dict(job['result'], job_id=job_id, status=job['status']))
+
+        if job['status'] == JOB_STATUS_FAILED:
+            return jsonify({
+                'success': False,
+                'job_id': job_id,
+                'status': job['status'],
+                'transcription': '',
+                'filename': job['filename'],
+                'language': job['language'],
+                'error': job['error']
+            }), 400
+
+        return jsonify(_job_status_body(job)), 202
+
+    except Exception as e:
+        logger.error(f"Internal error in job result: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+def _parse_export_format():
+    """The ?format= of an export request (txt by default)"""
+    export_format = request.args.get('format', 'txt').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise BadRequest(f"Unsupported export format: {export_format}. Use one of: {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+
+def _content_disposition(name, fallback, extension):
+    """
+    Content-Disposition for a download named after a client-supplied name. The quoted
+    filename is reduced to safe ASCII (or the fallback ID when nothing is left), and a
+    non-ASCII name is also sent percent-encoded as filename*.
+    """
+    name = ''.join(c for c in name if c.isprintable() and c not in '/\\')
+    ascii_name = secure_filename(name) or secure_filename(fallback) or 'transcript'
+    value = f'attachment; filename="{ascii_name}.{extension}"'
+    if not name.isascii():
+        value += f"; filename*=UTF-8''{quote(f'{name}.{extension}', safe='')}"
+    return value
+
+
+def _export_response(export_format, segments, metadata, name, fallback):
+    """Stream a transcript document as a download, generated while it is sent"""
+    return Response(
+        stream_with_context(iter_export(export_format, segments, metadata)),
+        content_type=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': _content_disposition(name, fallback, export_format)}
+    )
+
+
+@app.route('/api/jobs/<job_id>/export', methods=['GET'])
+def export_transcription_job(job_id):
+    """
+    API 5e: Export the transcript of a finished job as TXT, JSON, SRT or VTT (?format=)
+    Returns 202 with the job status while the job is still queued or running
+    """
+    try:
+        export_format = _parse_export_format()
+        job = job_manager.get_job(job_id)
+        if job is None:
+            return jsonify(response_formatter.format_error_response(f'Job {job_id} not found', 404)), 404
+
+        if job['status'] == JOB_STATUS_FAILED:
+            raise BadRequest(f"Job {job_id} failed: {job['error']}")
+        if job['status'] != JOB_STATUS_DONE:
+            return jsonify(_job_status_body(job)), 202
+
+        result = job['result']
+        metadata = {
+            'source': job['filename'],
+            'language': job['language'],
+            'word_count': result.get('word_count')
+        }
+        logger.info(f"Exporting job {job_id} as {export_format}")
+        return _export_response(export_format, result.get('transcriptions', []), metadata,
+                                os.path.splitext(job['filename'])[0], job_id)
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in job export: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in job export: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+def _stage_upload_part(audio_file, language, valid_languages, use_cache):
+    """
+    Validate an uploaded multipart file and write it to a temporary file for recognition
+
+    Returns:
+        {'cached': result} on a transcript cache hit, otherwise {'path': temporary file,
+        'duration_seconds': probed duration, 'audio_sha256': hash of the upload}
+    """
+    if audio_file.filename == '':
+        raise BadRequest('No audio file selected')
+
+    if language not in valid_languages:
+        raise BadRequest(f'Unsupported language code: {language}')
+
+    if not audio_validator.is_valid_audio_file(audio_file):
+        raise BadRequest('Invalid audio file format. Supported formats: wav, mp3, m4a, flac')
+
+    # Multipart parts are spooled, so they are probed and hashed in place
+    extension = os.path.splitext(audio_file.filename.lower())[1]
+    probe = audio_validator.probe_audio_file(audio_file.stream, extension)
+    if probe is not None and not audio_validator.is_valid_audio_size(probe['size_bytes']):
+        if probe['size_bytes']:
+            raise AudioTooLarge(f'Audio exceeds maximum size of {audio_validator.MAX_FILE_SIZE} bytes')
+        raise BadRequest('Empty audio file')
+
+    if use_cache:
+        audio_hash = hash_seekable_stream(audio_file.stream, UPLOAD_CHUNK_SIZE)
+        cached = transcript_cache.get(audio_hash, language) if is_valid_audio_hash(audio_hash) else None
+        if cached is not None:
+            return {'cached': cached}
+
+    upload = AudioUploadStream(
+        audio_file.stream,
+        chunk_size=UPLOAD_CHUNK_SIZE,
+        max_bytes=audio_validator.MAX_FILE_SIZE
+    )
+    if probe is None:
+        probe = audio_validator.probe_audio_header(upload.peek(audio_validator.PROBE_HEAD_BYTES),
+                                                   extension=extension)
+    upload.read_header()
+
+    if upload.is_empty:
+        raise BadRequest('Empty audio file')
+
+    if not probe['valid']:
+        raise BadRequest(f"Invalid audio file: {probe['error']}")
+
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+        temp_file_path = temp_file.name
+        try:
+            TEMP_FILE_BYTES.inc(upload.spill_to_file(temp_file), purpose='upload')
+        except Exception:
+            temp_file.close()
+            os.unlink(temp_file_path)
+            raise
+
+    return {'path': temp_file_path, 'duration_seconds': probe['duration_seconds'], 'audio_sha256': upload.sha256}
+
+
+def _transcribe_batch_part(audio_file, language, valid_languages, use_cache, deadline=None):
+    """Validate and transcribe one part of a batch, returning its response body and status code"""
+    staged = _stage_upload_part(audio_file, language, valid_languages, use_cache)
+    if 'cached' in staged:
+        body, status_code = _build_file_transcription_response(staged['cached'], audio_file.filename, language)
+        body['cache'] = 'hit'
+        return body, status_code
+
+    try:
+        result = _transcribe_audio_file(staged['path'], language, duration_seconds=staged['duration_seconds'],
+                                        deadline=deadline)
+    finally:
+        os.unlink(staged['path'])
+
+    if use_cache:
+        _cache_transcription_result(staged['audio_sha256'], language, result)
+
+    body, status_code = _build_file_transcription_response(result, audio_file.filename, language)
+    _save_file_transcript(body, result, audio_file.filename, language)
+    if use_cache:
+        body['cache'] = 'miss'
+    return body, status_code
+
+
+def _run_batch_part(index, audio_file, language, valid_languages, use_cache, deadline=None):
+    """Transcribe one batch part and return its NDJSON record; failures become error records"""
+    try:
+        body, status_code = _transcribe_batch_part(audio_file, language, valid_languages, use_cache, deadline)
+    except AudioTooLarge:
+        message = f'Audio file too large. Maximum size: {audio_validator.get_max_file_size_mb():g}MB'
+        body, status_code = response_formatter.format_error_response(message, 400), 400
+    except BadRequest as e:
+        body, status_code = response_formatter.format_error_response(str(e), 400), 400
+    except Exception as e:
+        logger.error(f"Internal error in batch part {index} ({audio_file.filename}): {str(e)}")
+        body, status_code = response_formatter.format_error_response("Internal server error occurred"), 500
+
+    record = {'index': index, 'status': status_code, 'filename': audio_file.filename, 'language': language}
+    record.update(body)
+    return record
+
+
+@app.route('/api/batch-transcription', methods=['POST'])
+@admission_controlled
+def batch_transcription():
+    """
+    API 5d: Batch file transcription
+    Accepts many audio parts (repeated field "audio") with one language for all of them
+    or one per part (repeated field "language", in the same order), and streams one
+    NDJSON line per part as soon as it finishes. A failed part does not fail the batch.
+    An X-Deadline-Seconds header applies to the batch as a whole.
+    """
+    try:
+        with g.stage_timer.stage('upload_read'):
+            audio_files = request.files.getlist('audio')
+        if not audio_files:
+            raise BadRequest('No audio file provided')
+        if len(audio_files) > BATCH_MAX_FILES:
+            raise BadRequest(f'Too many audio files: at most {BATCH_MAX_FILES} per batch')
+
+        languages = request.form.getlist('language') or ['en-US']
+        if len(languages) == 1:
+            languages = languages * len(audio_files)
+        elif len(languages) != len(audio_files):
+            raise BadRequest('Provide one language for all audio files or one per file')
+
+        use_cache = transcript_cache is not None and _is_truthy(request.form.get('cache', 'true'))
+        valid_languages = {lang['code'] for lang in azure_service.get_supported_languages()}
+        deadline = _parse_client_deadline(request.headers.get(DEADLINE_HEADER), g.stage_timer.elapsed())
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in batch transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in batch transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+    logger.info(f"Processing batch of {len(audio_files)} audio files")
+
+    def generate():
+        executor = ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(audio_files)),
+                                      thread_name_prefix='batch')
+        futures = [
+            executor.submit(_run_batch_part, index, audio_file, language, valid_languages, use_cache, deadline)
+            for index, (audio_file, language) in enumerate(zip(audio_files, languages))
+        ]
+        succeeded = 0
+        try:
+            # Results go out in completion order; each line carries the part's index
+            for future in as_completed(futures):
+                record = future.result()
+                succeeded += record['success']
+                yield json.dumps(record) + '\n'
+
+            logger.info(f"Batch finished: {succeeded} of {len(audio_files)} audio files transcribed")
+            yield json.dumps({
+                'done': True,
+                'total': len(audio_files),
+                'succeeded': succeeded,
+                'failed': len(audio_files) - succeeded
+            }) + '\n'
+        finally:
+            # On a client disconnect, parts not yet started are dropped; running parts
+            # still read the uploaded files, so they finish before the request ends
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/download-transcription', methods=['POST'])
+def download_transcription():
+    """
+    API 6: Download transcription as text file
+    Accepts transcription text and returns a downloadable text file
+    """
+    try:
+        data = request.get_json()
 
         if not data or 'transcription' not in data:
             raise BadRequest('Transcription text is required')
@@ -493,53 +2096,169 @@ def download_transcription():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"speak_easy_transcription_{timestamp}.txt"
 
-        # Create temporary file with transcription
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8')
+        metadata = {
+            'word_count': len(transcription_text.split()),
+            'character_count': len(transcription_text)
+        }
 
-        # Write header with metadata
-        temp_file.write("SpeakEasy Transcription\n")
-        temp_file.write("=" * 50 + "\n")
-        temp_file.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        temp_file.write(f"Word count: {len(transcription_text.split())}\n")
-        temp_file.write(f"Character count: {len(transcription_text)}\n")
-        temp_file.write("=" * 50 + "\n\n")
+        logger.info(f"Generated transcription file: {filename}")
 
-        # Write transcription content
-        temp_file.write(transcription_text)
-        temp_file.write("\n\n")
-        temp_file.write("=" * 50 + "\n")
-        temp_file.write("Generated by SpeakEasy API\n")
+        # Written straight into the response, without a temporary file
+        return Response(
+            stream_with_context(iter_txt([{'text': transcription_text}], metadata)),
+            content_type=EXPORT_FORMATS['txt'],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
 
-        temp_file.close()
+    except BadRequest as e:
+        logger.warning(f"Bad request in download transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in download transcription: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
 
-        logger.info(f"Generated transcription file: {filename}")
 
-        def remove_file(response):
-            """Clean up temporary file after sending"""
-            try:
-                os.unlink(temp_file.name)
-            except:
-                pass
-            return response
-
-        # Return file as download
-        response = send_file(
-            temp_file.name,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/plain'
-        )
+# Largest page of transcripts or search results
+TRANSCRIPT_PAGE_MAX = 100
 
-        # Add callback to remove temporary file after response
-        response.call_on_close(lambda: os.unlink(temp_file.name) if os.path.exists(temp_file.name) else None)
 
-        return response
+def _parse_transcript_query():
+    """limit, language and source of a transcript listing or search"""
+    if transcript_store is None:
+        raise BadRequest('Transcript store is disabled')
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        raise BadRequest('limit must be an integer')
+    if not 1 <= limit <= TRANSCRIPT_PAGE_MAX:
+        raise BadRequest(f'limit must be between 1 and {TRANSCRIPT_PAGE_MAX}')
+    source = request.args.get('source')
+    if source and source not in TRANSCRIPT_SOURCES:
+        raise BadRequest(f"Unsupported source: {source}. Use one of: {', '.join(TRANSCRIPT_SOURCES)}")
+    return limit, request.args.get('language'), source
+
+
+@app.route('/api/transcripts', methods=['GET'])
+def list_transcripts():
+    """
+    API 7a: Saved transcripts, newest first
+    Pages are chained with ?cursor= set to the previous page's next_cursor
+    """
+    try:
+        limit, language, source = _parse_transcript_query()
+        cursor = request.args.get('cursor')
+        try:
+            cursor = int(cursor) if cursor not in (None, '') else None
+        except ValueError:
+            raise BadRequest('cursor must be an integer')
+
+        page = transcript_store.list_transcripts(limit=limit, before=cursor, language=language, source=source)
+        return jsonify(dict(page, success=True))
 
     except BadRequest as e:
-        logger.warning(f"Bad request in download transcription: {str(e)}")
+        logger.warning(f"Bad request in transcript list: {str(e)}")
         return jsonify(response_formatter.format_error_response(str(e), 400)), 400
     except Exception as e:
-        logger.error(f"Internal error in download transcription: {str(e)}")
+        logger.error(f"Internal error in transcript list: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/transcripts/search', methods=['GET'])
+def search_transcripts():
+    """
+    API 7b: Full-text search of saved transcripts
+    Every term of ?q= must appear; results carry a snippet with the matches in <mark> tags
+    """
+    try:
+        limit, language, source = _parse_transcript_query()
+        query = request.args.get('q', '').strip()
+        if not query:
+            raise BadRequest('q is required')
+        try:
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            raise BadRequest('offset must be an integer')
+        if offset < 0:
+            raise BadRequest('offset cannot be negative')
+
+        started = time.perf_counter()
+        try:
+            page = transcript_store.search(query, limit=limit, offset=offset, language=language, source=source,
+                                           order=request.args.get('order', 'relevance'))
+        except ValueError as e:
+            raise BadRequest(str(e))
+        took_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        logger.info(f"Transcript search for {query!r} returned {len(page['results'])} results in {took_ms}ms")
+        return jsonify(dict(page, success=True, query=query, took_ms=took_ms))
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in transcript search: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in transcript search: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/transcripts/<transcript_id>', methods=['GET'])
+def get_transcript(transcript_id):
+    """
+    API 7c: A saved transcript with its full text and segments (?segments=false leaves them out)
+    """
+    try:
+        if transcript_store is None:
+            raise BadRequest('Transcript store is disabled')
+        transcript = transcript_store.get(transcript_id,
+                                          include_segments=_is_truthy(request.args.get('segments', 'true')))
+        if transcript is None:
+            return jsonify(response_formatter.format_error_response(
+                f'Transcript {transcript_id} not found', 404)), 404
+        return jsonify(dict(transcript, success=True))
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in transcript fetch: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in transcript fetch: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/transcripts/<transcript_id>/export', methods=['GET'])
+def export_transcript(transcript_id):
+    """
+    API 7d: Export a saved transcript as TXT, JSON, SRT or VTT (?format=)
+    """
+    try:
+        export_format = _parse_export_format()
+        if transcript_store is None:
+            raise BadRequest('Transcript store is disabled')
+        transcript = transcript_store.get(transcript_id, include_segments=False)
+        if transcript is None:
+            return jsonify(response_formatter.format_error_response(
+                f'Transcript {transcript_id} not found', 404)), 404
+
+        metadata = {
+            'source': transcript['filename'] or f"{transcript['source']} {transcript['source_id']}",
+            'language': transcript['language'],
+            'word_count': transcript['word_count']
+        }
+        name = os.path.splitext(transcript['filename'])[0] if transcript['filename'] else ''
+        return _export_response(export_format, transcript_store.iter_segments(transcript_id), metadata,
+                                name, transcript_id)
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in transcript export: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in transcript export: {str(e)}")
         return jsonify(response_formatter.format_error_response(
             "Internal server error occurred"
         )), 500
@@ -567,20 +2286,45 @@ def get_active_sessions():
     """Get list of active continuous transcription sessions"""
     try:
         sessions_info = []
+        now = time.time()
         for session_id, session in active_sessions.items():
             session_info = {
                 'session_id': session_id,
                 'language': session['session'].get('language', 'unknown'),
                 'is_active': session['session'].get('is_active', False),
                 'start_time': session['session'].get('start_time', 0),
-                'duration': time.time() - session['session'].get('start_time', time.time())
+                'duration': now - session['session'].get('start_time', now),
+                'idle_seconds': now - active_sessions.last_activity(session),
+                'segments': len(session['session'].get('results', [])),
+                'memory_bytes': session['session'].get('result_bytes', 0),
+                'worker_pid': os.getpid()
             }
             sessions_info.append(session_info)
 
+        if session_store is not None:
+            # Sessions owned by the other workers
+            for meta in session_store.list_sessions():
+                if meta['owner_pid'] == os.getpid() and meta['session_id'] in active_sessions:
+                    continue
+                sessions_info.append({
+                    'session_id': meta['session_id'],
+                    'language': meta['language'],
+                    'is_active': meta['status'] == SESSION_STATUS_ACTIVE,
+                    'status': meta['status'],
+                    'start_time': meta['start_time'],
+                    'duration': now - meta['start_time'],
+                    'idle_seconds': now - (meta['last_segment_time'] or meta['start_time']),
+                    'segments': meta['segments'],
+                    'worker_pid': meta['owner_pid']
+                })
+
         return jsonify({
             'success': True,
             'active_sessions': sessions_info,
-            'count': len(sessions_info)
+            'count': len(sessions_info),
+            'memory_bytes': sum(info.get('memory_bytes', 0) for info in sessions_info),
+            'session_backend': 'local' if session_store is None else type(session_store).__name__,
+            'registry': active_sessions.get_stats()
         })
     except Exception as e:
         logger.error(f"Error fetching active sessions: {str(e)}")
@@ -589,6 +2333,186 @@ def get_active_sessions():
         )), 500
 
 
+def _is_admin_request() -> bool:
+    """
+    Admin endpoints require the X-Admin-Token header to match ADMIN_TOKEN, compared in
+    constant time. They fail closed: with no ADMIN_TOKEN configured every request is refused.
+    """
+    if not ADMIN_TOKEN:
+        logger.warning("Refused admin request: ADMIN_TOKEN is not configured")
+        return False
+    supplied = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+@app.route('/api/admin/cache', methods=['GET', 'DELETE'])
+def manage_transcript_cache():
+    """
+    Transcript cache administration
+    GET returns hit/miss statistics; DELETE evicts one audio hash (optionally
+    limited to a language) or, without a body, clears the whole cache
+    """
+    try:
+        if not _is_admin_request():
+            return jsonify(response_formatter.format_error_response('Invalid admin token', 403)), 403
+
+        if transcript_cache is None:
+            raise BadRequest('Transcript cache is disabled')
+
+        if request.method == 'GET':
+            return jsonify({
+                'success': True,
+                'cache': transcript_cache.get_stats()
+            })
+
+        data = request.get_json(silent=True) or {}
+        audio_hash = data.get('audio_sha256')
+
+        if audio_hash is None:
+            removed = transcript_cache.clear()
+        elif is_valid_audio_hash(audio_hash):
+            removed = transcript_cache.evict(audio_hash, data.get('language'))
+        else:
+            raise BadRequest('audio_sha256 must be a lowercase hex SHA-256 digest')
+
+        logger.info(f"Evicted {removed} transcript cache entries")
+        return jsonify({
+            'success': True,
+            'removed': removed,
+            'cache': transcript_cache.get_stats()
+        })
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in cache admin: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in cache admin: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/admin/transcripts', methods=['GET'])
+@app.route('/api/admin/transcripts/<transcript_id>', methods=['DELETE'])
+def manage_transcript_store(transcript_id=None):
+    """
+    Transcript store administration
+    GET returns transcript counts and the database size; DELETE removes one transcript
+    """
+    try:
+        if not _is_admin_request():
+            return jsonify(response_formatter.format_error_response('Invalid admin token', 403)), 403
+
+        if transcript_store is None:
+            raise BadRequest('Transcript store is disabled')
+
+        if request.method == 'GET':
+            return jsonify({
+                'success': True,
+                'store': transcript_store.get_stats()
+            })
+
+        if not transcript_store.delete(transcript_id):
+            return jsonify(response_formatter.format_error_response(
+                f'Transcript {transcript_id} not found', 404)), 404
+
+        logger.info(f"Deleted transcript {transcript_id}")
+        return jsonify({
+            'success': True,
+            'transcript_id': transcript_id,
+            'message': 'Transcript deleted'
+        })
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in transcript admin: {str(e)}")
+        return jsonify(response_formatter.format_error_response(str(e), 400)), 400
+    except Exception as e:
+        logger.error(f"Internal error in transcript admin: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Internal server error occurred"
+        )), 500
+
+
+@app.route('/api/recognizer-pool', methods=['GET'])
+def get_recognizer_pool_stats():
+    """Get hit/miss/wait counters of the per-language speech config pool"""
+    try:
+        return jsonify({
+            'success': True,
+            'pool': azure_service.get_recognizer_pool_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error fetching recognizer pool stats: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Failed to fetch recognizer pool stats"
+        )), 500
+
+
+@app.route('/api/endpoints', methods=['GET'])
+def get_endpoint_stats():
+    """Get load, rolling latency and error rate of every speech endpoint sessions are routed over"""
+    try:
+        return jsonify({
+            'success': True,
+            'endpoints': azure_service.get_endpoint_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error fetching endpoint stats: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Failed to fetch endpoint stats"
+        )), 500
+
+
+@app.route('/api/resilience', methods=['GET'])
+def get_resilience_stats():
+    """Get the recognition retry policy and circuit breaker state of this worker"""
+    try:
+        return jsonify(dict(azure_service.get_resilience_stats(), success=True))
+    except Exception as e:
+        logger.error(f"Error fetching resilience stats: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Failed to fetch resilience stats"
+        )), 500
+
+
+@app.route('/api/stage-timings', methods=['GET'])
+def get_stage_timings():
+    """Get rolling per-route, per-stage latency percentiles of this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'window': stage_stats.window,
+            'routes': stage_stats.get_stats(request.args.get('route'))
+        })
+    except Exception as e:
+        logger.error(f"Error fetching stage timings: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Failed to fetch stage timings"
+        )), 500
+
+
+@app.route('/api/admission', methods=['GET'])
+def get_admission_stats():
+    """Get admission control limits, queue depth and rejection counters of this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'enabled': admission_controller is not None,
+            'admission': admission_controller.get_stats() if admission_controller is not None else None
+        })
+    except Exception as e:
+        logger.error(f"Error fetching admission stats: {str(e)}")
+        return jsonify(response_formatter.format_error_response(
+            "Failed to fetch admission stats"
+        )), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics of all workers in the text exposition format"""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify(response_formatter.format_error_response(
@@ -605,7 +2529,8 @@ def internal_error(error):
 
 if __name__ == '__main__':
     # Validate environment variables on startup
-    required_env_vars = ['AZURE_SPEECH_KEY', 'AZURE_SPEECH_REGION']
+    # AZURE_SPEECH_ENDPOINTS carries its own regions and keys
+    required_env_vars = [] if os.getenv('AZURE_SPEECH_ENDPOINTS') else ['AZURE_SPEECH_KEY', 'AZURE_SPEECH_REGION']
     missing_vars = [var for var in required_env_vars if not os.getenv(var)]
 
     if missing_vars:
@@ -621,9 +2546,28 @@ if __name__ == '__main__':
     logger.info("  4a. POST /api/continuous/start - Start continuous transcription")
     logger.info("  4b. POST /api/continuous/stop - Stop continuous transcription")
     logger.info("  4c. POST /api/continuous/results - Get continuous transcription results")
+    logger.info("  4d. GET  /api/continuous/<session_id>/events - Stream continuous transcription results (SSE)")
+    logger.info("  4e. POST /api/continuous/<session_id>/audio - Push client audio into a streamed session")
+    logger.info("  4f. GET  /api/continuous/<session_id>/export - Export a session transcript (txt/json/srt/vtt)")
     logger.info("  5. POST /api/file-transcription - File transcription")
+    logger.info("  5b. GET /api/jobs/<job_id> - Asynchronous file transcription job status")
+    logger.info("  5c. GET /api/jobs/<job_id>/result - Asynchronous file transcription job result")
+    logger.info("  5d. POST /api/batch-transcription - Batch file transcription (NDJSON results)")
+    logger.info("  5e. GET /api/jobs/<job_id>/export - Export a job transcript (txt/json/srt/vtt)")
     logger.info("  6. POST /api/download-transcription - Download transcription file")
+    logger.info("  7a. GET /api/transcripts - List saved transcripts")
+    logger.info("  7b. GET /api/transcripts/search - Full-text search of saved transcripts")
+    logger.info("  7c. GET /api/transcripts/<transcript_id> - Saved transcript with segments")
+    logger.info("  7d. GET /api/transcripts/<transcript_id>/export - Export a saved transcript (txt/json/srt/vtt)")
     logger.info("  Additional: GET /api/supported-languages - Get supported languages")
     logger.info("  Additional: GET /api/active-sessions - Get active sessions")
+    logger.info("  Additional: GET /api/recognizer-pool - Get speech config pool stats")
+    logger.info("  Additional: GET /api/admission - Admission control queue and rejection stats")
+    logger.info("  Additional: GET /api/endpoints - Per-endpoint load, latency and error rate")
+    logger.info("  Additional: GET /api/resilience - Recognition retry and circuit breaker state")
+    logger.info("  Additional: GET /api/stage-timings - Per-stage request latency percentiles")
+    logger.info("  Additional: GET /metrics - Prometheus metrics")
+    logger.info("  Admin: GET/DELETE /api/admin/cache - Transcript cache stats and eviction")
+    logger.info("  Admin: GET /api/admin/transcripts, DELETE /api/admin/transcripts/<id> - Transcript store")
 
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
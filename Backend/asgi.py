@@ -0,0 +1,713 @@
+"""
+ASGI entry point for serving the API on an event loop:
+
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:application
+
+The routes that wait on a recognizer or a session (simple real-time, multi-language,
+multipart file transcription, continuous results long-polls and SSE event streams)
+are served natively: each wait is an asyncio future completed by the SDK callbacks,
+so thousands of requests can wait with a small, fixed number of threads. Every other
+route runs the Flask app on a bounded thread pool, with the request body streamed
+to it as it arrives, so the synchronous API keeps working unchanged.
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.exceptions import BadRequest, ClientDisconnected as InputDisconnected
+from werkzeug.formparser import parse_form_data
+from werkzeug.routing import Map, Rule
+
+from services.admission_controller import AdmissionRejected
+from services.job_manager import JobQueueFull
+from utils.audio_stream import AudioTooLarge
+from utils.stage_timer import StageTimer
+from app import (
+    app as flask_app, azure_service, audio_validator, response_formatter, job_manager, transcript_cache,
+    admission_controller, active_sessions, session_store,
+    _is_truthy, _parse_optional_flag, _parse_simple_realtime_request, _parse_multilanguage_request,
+    _build_realtime_response, _stage_upload_part, _prepare_audio_file, _remove_prepared_files, _no_speech_result, _finish_audio_file,
+    _recognition_timeout, _parse_client_deadline, DEADLINE_HEADER, _cache_transcription_result,
+    _build_file_transcription_response, _client_key, _queued_job_body, _save_file_transcript, _record_request_metrics,
+    _get_stored_session, _stored_results_update, _parse_continuous_results_request, _stored_periodic_results,
+    _build_continuous_results_response, _parse_last_event_id, _format_sse_update, SSE_RETRY_EVENT, SSE_HEADERS,
+    SSE_HEARTBEAT_SECONDS, SESSION_STORE_POLL_SECONDS, SESSION_STATUS_ACTIVE, SESSION_STATUS_EXPIRED
+)
+
+logger = logging.getLogger(__name__)
+
+# Threads running the Flask app for routes without a native async handler
+ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 16))
+
+# Threads for blocking steps of native routes: multipart parsing, normalization, VAD, long files
+ASGI_BLOCKING_THREADS = int(os.getenv('ASGI_BLOCKING_THREADS', 8))
+
+# Request bodies larger than this are spooled to disk while they arrive
+ASGI_SPOOL_MEMORY_BYTES = int(os.getenv('ASGI_SPOOL_MEMORY_BYTES', 1024 * 1024))
+
+# Room for multipart boundaries and form fields on top of the audio size limit
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Body messages buffered between the event loop and a bridged WSGI request that reads them
+BRIDGE_BODY_QUEUE_MESSAGES = 16
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client goes away before its request body has arrived"""
+
+
+async def _read_body(receive, max_bytes=None):
+    """
+    Spool an ASGI request body to a file object
+
+    Returns:
+        (body file positioned at the start, body length)
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=ASGI_SPOOL_MEMORY_BYTES)
+    length = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            body.close()
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        length += len(chunk)
+        if max_bytes is not None and length > max_bytes:
+            body.close()
+            raise AudioTooLarge(f'Audio exceeds maximum size of {max_bytes} bytes')
+        body.write(chunk)
+        if not message.get('more_body', False):
+            break
+    body.seek(0)
+    return body, length
+
+
+async def _wait_for_disconnect(receive):
+    """Return once the client has gone away (any remaining body is discarded)"""
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+class StreamedBody(io.RawIOBase):
+    """
+    wsgi.input of a bridged request, read while the body is still arriving.
+    pump() runs on the event loop and moves http.request messages into a bounded
+    queue; the WSGI thread takes them off as it reads, so a slow reader holds back
+    the client instead of buffering the body. A read returns what has arrived,
+    like a socket read.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=BRIDGE_BODY_QUEUE_MESSAGES)
+        self._chunk = b''
+        self._position = 0
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._position >= len(self._chunk):
+            if self._finished:
+                return 0
+            item = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+            if item is None:
+                self._finished = True
+                return 0
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            self._chunk, self._position = item, 0
+
+        size = min(len(buffer), len(self._chunk) - self._position)
+        buffer[:size] = self._chunk[self._position:self._position + size]
+        self._position += size
+        return size
+
+    async def pump(self, receive) -> None:
+        """Feed the body to the reader, then return once the client disconnects"""
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                await self._queue.put(InputDisconnected())
+                return
+            if message.get('body'):
+                await self._queue.put(message['body'])
+            if not message.get('more_body', False):
+                break
+        await self._queue.put(None)
+        await _wait_for_disconnect(receive)
+
+
+def _build_environ(scope, body, content_length=None):
+    """
+    WSGI environ for an ASGI HTTP scope. body is spooled (content_length known) or
+    a StreamedBody, read to its end as flagged by wsgi.input_terminated.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client')
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0] if client else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'wsgi.input_terminated': True
+    }
+    if content_length is not None:
+        environ['CONTENT_LENGTH'] = str(content_length)
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').lower()
+        value = value.decode('latin-1')
+        if name == 'content-length':
+            if content_length is None:
+                environ['CONTENT_LENGTH'] = value
+            continue
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+            continue
+        key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class WsgiBridge:
+    """
+    Serves ASGI HTTP requests with a WSGI app on a bounded thread pool.
+    The request body is streamed to the app as it arrives (a long chunked upload
+    reaches the recognizer while it is being sent), and the response is relayed
+    chunk by chunk, so streamed responses (SSE, NDJSON, file downloads) keep
+    streaming; a client disconnect stops the iteration.
+    """
+
+    def __init__(self, wsgi_app, max_threads: int = 16):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_threads), thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        disconnected = threading.Event()
+        body = StreamedBody(loop)
+        environ = _build_environ(scope, body)
+
+        def emit(*item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def run():
+            def start_response(status, headers, exc_info=None):
+                emit('start', status, headers)
+                return lambda data: emit('body', data)
+
+            try:
+                result = self.wsgi_app(environ, start_response)
+                try:
+                    for chunk in result:
+                        if disconnected.is_set():
+                            break
+                        if chunk:
+                            emit('body', chunk)
+                finally:
+                    if hasattr(result, 'close'):
+                        result.close()
+            except Exception as e:
+                logger.error(f"Error in WSGI request {scope['method']} {scope['path']}: {str(e)}")
+                emit('error')
+            finally:
+                body.close()
+                emit('end')
+
+        async def watch_disconnect():
+            await body.pump(receive)
+            disconnected.set()
+            emit('end')
+
+        worker = loop.run_in_executor(self.executor, run)
+        watcher = asyncio.ensure_future(watch_disconnect())
+        started = False
+        try:
+            while True:
+                item = await queue.get()
+                if item[0] == 'start':
+                    status, headers = item[1], item[2]
+                    await send({
+                        'type': 'http.response.start',
+                        'status': int(status.split(' ', 1)[0]),
+                        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                    for name, value in headers]
+                    })
+                    started = True
+                elif item[0] == 'body':
+                    await send({'type': 'http.response.body', 'body': item[1], 'more_body': True})
+                elif item[0] == 'error' and not started:
+                    await _send_json(send, response_formatter.format_error_response("Internal server error", 500), 500)
+                    return
+                elif item[0] == 'end':
+                    break
+            if started and not disconnected.is_set():
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            disconnected.set()
+            watcher.cancel()
+            await asyncio.wait([worker])
+
+
+async def _send_stream(send, receive, response, headers=None):
+    """Send a StreamingResponse chunk by chunk until it ends or the client disconnects"""
+    response_headers = [
+        (b'content-type', response.content_type.encode('latin-1')),
+        (b'access-control-allow-origin', b'*')
+    ]
+    for name, value in dict(response.headers, **(headers or {})).items():
+        response_headers.append((name.lower().encode('latin-1'), value.encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': 200, 'headers': response_headers})
+
+    async def relay():
+        async for chunk in response.chunks:
+            await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    sender = asyncio.ensure_future(relay())
+    watcher = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        await asyncio.wait([sender, watcher], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (sender, watcher):
+            task.cancel()
+        await asyncio.gather(sender, watcher, return_exceptions=True)
+    if sender.done() and not sender.cancelled() and sender.exception() is not None:
+        logger.error(f"Error in streamed response: {str(sender.exception())}")
+
+
+async def _send_json(send, body, status_code=200, headers=None):
+    """Send a complete JSON response serialized like Flask's jsonify"""
+    payload = (flask_app.json.dumps(body) + '\n').encode('utf-8')
+    response_headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(payload)).encode('latin-1')),
+        # Same default as flask_cors on the synchronous routes
+        (b'access-control-allow-origin', b'*')
+    ]
+    for name, value in (headers or {}).items():
+        response_headers.append((name.lower().encode('latin-1'), value.encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': status_code, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': payload, 'more_body': False})
+
+
+class AsgiRequest:
+    """The parts of an ASGI HTTP request the native handlers use"""
+
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self.receive = receive
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = Headers([(name.decode('latin-1'), value.decode('latin-1'))
+                                for name, value in scope.get('headers', [])])
+        self.args = MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        self.mimetype = self.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+
+    async def read_body(self, max_bytes=None):
+        return await _read_body(self.receive, max_bytes)
+
+    async def get_json(self):
+        body, _ = await self.read_body()
+        with body:
+            data = body.read()
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            raise BadRequest('Failed to decode JSON object')
+
+
+async def _transcribe_audio_file_async(audio_path, language, long_file=None, duration_seconds=None, timer=None,
+                                       deadline=None):
+    """Awaitable _transcribe_audio_file: preparation runs on the blocking pool, recognition on the loop"""
+    loop = asyncio.get_running_loop()
+    timer = timer or StageTimer()
+    prepared = await loop.run_in_executor(blocking_executor, _prepare_audio_file,
+                                          audio_path, long_file, duration_seconds, timer)
+
+    try:
+        if prepared['recognition_path'] is None:
+            result = _no_speech_result(language)
+        elif prepared['long_file']:
+            # Chunked recognition keeps its own thread pool
+            with timer.stage('recognize_chunked'):
+                timeout = _recognition_timeout(prepared['recognition_seconds'], deadline)
+                result = await loop.run_in_executor(
+                    blocking_executor, lambda: azure_service.convert_speech_to_text_from_file_chunked(
+                        prepared['recognition_path'], language, timeout=timeout))
+        else:
+            result = await azure_service.convert_speech_to_text_from_file_async(
+                audio_file_path=prepared['recognition_path'],
+                language=language,
+                timeout=_recognition_timeout(prepared['recognition_seconds'], deadline),
+                timer=timer
+            )
+    finally:
+        _remove_prepared_files(prepared)
+
+    return _finish_audio_file(result, prepared)
+
+
+async def simple_realtime_transcription(request, timer):
+    """API 2 served on the event loop"""
+    try:
+        duration, language = _parse_simple_realtime_request(await request.get_json() or {})
+
+        logger.info(f"Starting simple real-time transcription for {duration} seconds in {language}")
+        result = await azure_service.convert_speech_to_text_simple_realtime_async(
+            duration_seconds=duration,
+            language=language
+        )
+
+        if result['success']:
+            logger.info("Simple real-time transcription successful")
+        else:
+            logger.warning(f"Simple real-time transcription failed: {result['error']}")
+        return _build_realtime_response(result, 'Real-time transcription completed successfully')
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in simple real-time: {str(e)}")
+        return response_formatter.format_error_response(str(e), 400), 400
+
+
+async def multilanguage_transcription(request, timer):
+    """API 3 served on the event loop"""
+    try:
+        duration, language = _parse_multilanguage_request(await request.get_json() or {})
+
+        logger.info(f"Starting multi-language transcription for {duration} seconds in {language}")
+        result = await azure_service.convert_speech_to_text_multilanguage_async(
+            duration_seconds=duration,
+            language=language
+        )
+
+        if result['success']:
+            logger.info("Multi-language transcription successful")
+        else:
+            logger.warning(f"Multi-language transcription failed: {result['error']}")
+        return _build_realtime_response(result, f'Multi-language transcription in {language} completed successfully')
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in multi-language: {str(e)}")
+        return response_formatter.format_error_response(str(e), 400), 400
+
+
+def _is_raw_audio_request(request):
+    """Raw audio bodies of API 5, which the Flask route recognizes while they upload"""
+    return request.mimetype.startswith('audio/') or request.mimetype == 'application/octet-stream'
+
+
+async def file_transcription(request, timer):
+    """
+    API 5 served on the event loop for multipart uploads. The body is spooled as
+    it arrives, then validated and recognized like an upload to the synchronous route.
+    """
+    loop = asyncio.get_running_loop()
+    body = None
+    try:
+        with timer.stage('upload_read'):
+            body, length = await request.read_body(audio_validator.MAX_FILE_SIZE + MULTIPART_OVERHEAD_BYTES)
+
+        environ = _build_environ(request.scope, body, length)
+        with timer.stage('upload_read'):
+            _, params, files = await loop.run_in_executor(blocking_executor, parse_form_data, environ)
+        if 'audio' not in files:
+            raise BadRequest('No audio file provided')
+        audio_file = files['audio']
+
+        language = params.get('language', 'en-US')
+        run_async = _is_truthy(params.get('async', request.args.get('async', 'false')))
+        long_file = _parse_optional_flag(params.get('long_file', request.args.get('long_file')))
+        use_cache = transcript_cache is not None and _is_truthy(params.get('cache', 'true'))
+        include_timings = _is_truthy(params.get('timings', request.args.get('timings', 'false')))
+        deadline = None if run_async else _parse_client_deadline(request.headers.get(DEADLINE_HEADER),
+                                                                 timer.elapsed())
+        valid_languages = {lang['code'] for lang in azure_service.get_supported_languages()}
+
+        with timer.stage('temp_write'):
+            staged = await loop.run_in_executor(blocking_executor, _stage_upload_part,
+                                                audio_file, language, valid_languages, use_cache and not run_async)
+
+        if 'cached' in staged:
+            logger.info(f"Transcript cache hit for {audio_file.filename} in {language}")
+            response_body, status_code = _build_file_transcription_response(
+                staged['cached'], audio_file.filename, language)
+            response_body['cache'] = 'hit'
+        elif run_async:
+            job = job_manager.submit(staged['path'], language, audio_file.filename,
+                                     options={
+                                         'long_file': long_file,
+                                         'duration_seconds': staged['duration_seconds'],
+                                         'audio_sha256': staged['audio_sha256'] if use_cache else None
+                                     })
+            return _queued_job_body(job, audio_file.filename, language), 202
+        else:
+            logger.info(f"Processing audio file: {audio_file.filename} in {language}")
+            try:
+                result = await _transcribe_audio_file_async(staged['path'], language, long_file,
+                                                            staged['duration_seconds'], timer, deadline)
+            finally:
+                os.unlink(staged['path'])
+            if use_cache:
+                _cache_transcription_result(staged['audio_sha256'], language, result)
+
+            response_body, status_code = _build_file_transcription_response(result, audio_file.filename, language)
+            _save_file_transcript(response_body, result, audio_file.filename, language)
+            if use_cache:
+                response_body['cache'] = 'miss'
+            if result['success']:
+                logger.info("File transcription successful")
+            else:
+                logger.warning(f"File transcription failed: {result['error']}")
+
+        if include_timings:
+            response_body['timings'] = timer.as_dict()
+        return response_body, status_code
+
+    except AudioTooLarge:
+        message = f'Audio file too large. Maximum size: {audio_validator.get_max_file_size_mb():g}MB'
+        logger.warning(f"Bad request in file transcription: {message}")
+        return response_formatter.format_error_response(message, 400), 400
+    except BadRequest as e:
+        logger.warning(f"Bad request in file transcription: {str(e)}")
+        return response_formatter.format_error_response(str(e), 400), 400
+    except JobQueueFull as e:
+        logger.warning(f"Rejected file transcription job: {str(e)}")
+        return response_formatter.format_error_response(str(e), 503), 503
+    finally:
+        if body is not None:
+            body.close()
+
+
+async def _wait_for_stored_results_async(session_id, cursor=0, timeout=0):
+    """
+    _wait_for_stored_results for the event loop: store reads run on the blocking
+    pool and the poll interval is an asyncio sleep, so no thread waits out the timeout
+    """
+    loop = asyncio.get_running_loop()
+    meta = await loop.run_in_executor(blocking_executor, _get_stored_session, session_id)
+    if meta is None:
+        return None
+
+    deadline = time.time() + (timeout or 0)
+    while True:
+        segments = await loop.run_in_executor(blocking_executor, session_store.get_segments, session_id, cursor)
+        if segments or meta['status'] != SESSION_STATUS_ACTIVE or time.time() >= deadline:
+            break
+        await asyncio.sleep(SESSION_STORE_POLL_SECONDS)
+        meta = await loop.run_in_executor(blocking_executor, _get_stored_session, session_id) or \
+            dict(meta, status=SESSION_STATUS_EXPIRED)
+
+    return _stored_results_update(meta, cursor, segments)
+
+
+async def continuous_transcription_results(request, timer):
+    """API 4c served on the event loop: a long poll waits on a future, not a thread"""
+    try:
+        session_id, since, wait = _parse_continuous_results_request(await request.get_json() or {})
+
+        session = active_sessions.get(session_id)
+        if session is not None:
+            result = await azure_service.get_session_results_periodic_async(session, since=since, wait=wait)
+        else:
+            # Owned by another worker: read what it has recorded in the shared store
+            update = await _wait_for_stored_results_async(session_id, since or 0, wait if since is not None else 0)
+            if update is None:
+                raise BadRequest(f'Session {session_id} not found or stopped')
+            result = _stored_periodic_results(update)
+
+        return _build_continuous_results_response(session_id, since, result)
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in get continuous results: {str(e)}")
+        return response_formatter.format_error_response(str(e), 400), 400
+
+
+async def continuous_transcription_events(request, timer, session_id):
+    """API 4d served on the event loop: each open stream waits on a future, not a thread"""
+    try:
+        session = active_sessions.get(session_id)
+        if session is not None:
+            async def wait_for_results(cursor):
+                return await azure_service.wait_for_session_results_async(session, cursor,
+                                                                         timeout=SSE_HEARTBEAT_SECONDS)
+        elif await asyncio.get_running_loop().run_in_executor(blocking_executor, _get_stored_session,
+                                                              session_id) is not None:
+            # Owned by another worker: follow what it records in the shared store
+            async def wait_for_results(cursor):
+                return await _wait_for_stored_results_async(session_id, cursor, timeout=SSE_HEARTBEAT_SECONDS) or \
+                    {'transcriptions': [], 'cursor': cursor, 'finished': True}
+        else:
+            raise BadRequest(f'Session {session_id} not found or stopped')
+
+        cursor = _parse_last_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+
+        async def generate(cursor):
+            yield SSE_RETRY_EVENT
+            finished = False
+            while not finished:
+                events, cursor, finished = _format_sse_update(session_id, await wait_for_results(cursor), cursor)
+                yield events
+
+        logger.info(f"Streaming events for session {session_id} from segment {cursor}")
+        return StreamingResponse(generate(cursor), 'text/event-stream', SSE_HEADERS)
+
+    except BadRequest as e:
+        logger.warning(f"Bad request in continuous events: {str(e)}")
+        return response_formatter.format_error_response(str(e), 400), 400
+
+
+class StreamingResponse:
+    """A native handler's streamed response: text chunks from an async iterator"""
+
+    def __init__(self, chunks, content_type, headers=None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+class NativeRoute:
+    """
+    A route served on the event loop. admitted routes take an admission slot first;
+    bridge_if(request) sends a request to the Flask app instead, for bodies that
+    route handles better (raw audio it streams into the recognizer as it arrives).
+    """
+
+    def __init__(self, handler, admitted=True, bridge_if=None):
+        self.handler = handler
+        self.admitted = admitted
+        self.bridge_if = bridge_if
+
+
+class SpeechAsgiApp:
+    """Dispatches the native async routes and hands every other request to the Flask app"""
+
+    def __init__(self, routes, wsgi_app):
+        """
+        Args:
+            routes: {(method, rule): NativeRoute}; rules use Flask syntax (/path/<name>)
+            wsgi_app: WsgiBridge serving everything else
+        """
+        self.url_map = Map([Rule(rule, endpoint=route, methods=[method])
+                            for (method, rule), route in routes.items()])
+        self.wsgi = wsgi_app
+
+    def _match(self, scope):
+        """(Rule, path arguments) of the native route for this request, or (None, None)"""
+        try:
+            return self.url_map.bind('localhost').match(scope['path'], scope['method'], return_rule=True)
+        except Exception:
+            # No native route (NotFound, MethodNotAllowed, ...): the Flask app decides
+            return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            # WebSockets are not served; the continuous API uses HTTP and SSE
+            await send({'type': 'websocket.close', 'code': 1003})
+            return
+
+        rule, path_args = self._match(scope)
+        request = AsgiRequest(scope, receive)
+        if rule is None or (rule.endpoint.bridge_if is not None and rule.endpoint.bridge_if(request)):
+            await self.wsgi(scope, receive, send)
+            return
+
+        route = rule.endpoint
+        started = time.perf_counter()
+        timer = StageTimer()
+        headers = {}
+        try:
+            # Admission is decided before the body is read, so rejected uploads cost nothing
+            admitted = False
+            if route.admitted:
+                with timer.stage('admission_wait'):
+                    admitted = await self._admit(request)
+            try:
+                response = await route.handler(request, timer, **path_args)
+            finally:
+                if admitted:
+                    admission_controller.release()
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected request to {scope['path']}: {str(e)}")
+            response = response_formatter.format_error_response(str(e), 429), 429
+            headers['Retry-After'] = str(e.retry_after)
+        except ClientDisconnected:
+            return
+        except Exception as e:
+            logger.error(f"Internal error in {scope['path']}: {str(e)}")
+            response = response_formatter.format_error_response("Internal server error occurred"), 500
+
+        status_code = 200 if isinstance(response, StreamingResponse) else response[1]
+        server_timing = _record_request_metrics(scope['method'], rule.rule, status_code, started, timer)
+        if server_timing:
+            headers['Server-Timing'] = server_timing
+        if isinstance(response, StreamingResponse):
+            await _send_stream(send, receive, response, headers)
+            return
+        body, status_code = response
+        if status_code == 503 and body.get('retry_after'):
+            headers['Retry-After'] = str(body['retry_after'])
+        await _send_json(send, body, status_code, headers)
+
+    @staticmethod
+    async def _admit(request):
+        """Wait for an admission slot; False if admission control is disabled"""
+        if admission_controller is None:
+            return False
+        client = request.scope.get('client')
+        await admission_controller.acquire_async(_client_key(request.headers, client[0] if client else None))
+        return True
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+blocking_executor = ThreadPoolExecutor(max_workers=max(1, ASGI_BLOCKING_THREADS), thread_name_prefix='asgi-blocking')
+
+application = SpeechAsgiApp(
+    routes={
+        ('POST', '/api/simple-realtime'): NativeRoute(simple_realtime_transcription),
+        ('POST', '/api/multilanguage-transcription'): NativeRoute(multilanguage_transcription),
+        ('POST', '/api/continuous/results'): NativeRoute(continuous_transcription_results, admitted=False),
+        ('GET', '/api/continuous/<session_id>/events'): NativeRoute(continuous_transcription_events,
+                                                                   admitted=False),
+        # Raw audio bodies go to the Flask route, which recognizes a WAV while it is uploaded
+        ('POST', '/api/file-transcription'): NativeRoute(file_transcription, bridge_if=_is_raw_audio_request)
+    },
+    wsgi_app=WsgiBridge(flask_app, ASGI_WSGI_THREADS)
+)
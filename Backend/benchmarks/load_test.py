@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Load test for the Speech-to-Text API
+Starts the app under gunicorn with the fake recognition engine (no Azure key or
+network needed) and drives the file transcription, continuous session and download
+endpoints at a fixed concurrency. Results are printed as JSON so runs can be compared.
+
+Usage: python benchmarks/load_test.py --workers 1,4 --concurrency 8 --requests 40 --audio-seconds 5,30
+       python benchmarks/load_test.py --url http://localhost:5000   (benchmark a running server)
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import wave
+import shutil
+import signal
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_RATE = 16000
+
+_local = threading.local()
+
+
+def http():
+    """One requests session per benchmark thread, so connections are reused"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def make_wav(seconds, seed=0):
+    """16 kHz mono WAV of tone bursts separated by pauses, varied by seed so no two uploads are identical"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = np.sin(2 * np.pi * 0.4 * t + rng.uniform(0, np.pi)) > -0.3
+    tone = np.sin(2 * np.pi * rng.uniform(150, 300) * t) * 8000
+    noise = rng.normal(0, 60, len(t))
+    samples = (tone * voiced + noise).astype('<i2')
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Throughput, latency percentiles (ms) and error rate of one scenario"""
+    ordered = sorted(latencies)
+    total = len(latencies) + errors
+    return {
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / float(total), 4) if total else 0.0,
+        'duration_seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': _ms(percentile(ordered, 0.50)),
+            'p95': _ms(percentile(ordered, 0.95)),
+            'p99': _ms(percentile(ordered, 0.99)),
+            'mean': _ms(sum(ordered) / len(ordered)) if ordered else None,
+            'max': _ms(ordered[-1]) if ordered else None
+        }
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def run_scenario(operation, total, concurrency):
+    """
+    Call operation(index) total times from concurrency threads
+
+    operation returns None on success or an error string; it may also return a dict
+    of named step durations, which are summarized alongside the overall latency.
+    """
+    latencies, steps, failures = [], {}, []
+    lock = threading.Lock()
+
+    def call(index):
+        started = time.perf_counter()
+        try:
+            outcome = operation(index)
+        except Exception as e:
+            outcome = f'{type(e).__name__}: {e}'
+        elapsed = time.perf_counter() - started
+        with lock:
+            if isinstance(outcome, str):
+                failures.append(outcome)
+            else:
+                latencies.append(elapsed)
+                for step, seconds in (outcome or {}).items():
+                    steps.setdefault(step, []).append(seconds)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, len(failures), elapsed)
+    if steps:
+        result['steps_ms'] = {
+            step: summarize(values, 0, elapsed)['latency_ms'] for step, values in steps.items()
+        }
+    if failures:
+        result['sample_errors'] = sorted(set(failures))[:5]
+    return result
+
+
+def file_transcription(base_url, audio, timeout):
+    def operation(index):
+        response = http().post(
+            f'{base_url}/api/file-transcription',
+            files={'audio': (f'bench_{index}.wav', audio[index % len(audio)], 'audio/wav')},
+            data={'language': 'en-US', 'cache': 'false'},
+            timeout=timeout
+        )
+        if response.status_code != 200 or not response.json().get('success'):
+            return f'HTTP {response.status_code}'
+        return None
+    return operation
+
+
+def continuous_cycle(base_url, audio_seconds, timeout):
+    """Start a streamed session, push audio in one-second chunks, read results and stop"""
+    pcm = make_wav(audio_seconds)[44:]
+    chunk_bytes = SAMPLE_RATE * 2
+
+    def operation(index):
+        steps = {}
+        session_id = f'bench_{os.getpid()}_{index}_{time.time_ns()}'
+
+        started = time.perf_counter()
+        response = http().post(f'{base_url}/api/continuous/start',
+                               json={'session_id': session_id, 'source': 'stream'}, timeout=timeout)
+        steps['start'] = time.perf_counter() - started
+        if response.status_code != 200:
+            return f'start HTTP {response.status_code}'
+
+        started = time.perf_counter()
+        for seq, offset in enumerate(range(0, len(pcm), chunk_bytes)):
+            response = http().post(f'{base_url}/api/continuous/{session_id}/audio', params={'seq': seq},
+                                   data=pcm[offset:offset + chunk_bytes], timeout=timeout,
+                                   headers={'Content-Type': 'application/octet-stream'})
+            if response.status_code != 200:
+                http().post(f'{base_url}/api/continuous/stop', json={'session_id': session_id}, timeout=timeout)
+                return f'audio HTTP {response.status_code}'
+        steps['audio'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = http().post(f'{base_url}/api/continuous/results',
+                               json={'session_id': session_id, 'since': 0, 'wait': 5}, timeout=timeout)
+        steps['results'] = time.perf_counter() - started
+        if response.status_code != 200:
+            return f'results HTTP {response.status_code}'
+
+        started = time.perf_counter()
+        response = http().post(f'{base_url}/api/continuous/stop', json={'session_id': session_id}, timeout=timeout)
+        steps['stop'] = time.perf_counter() - started
+        if response.status_code != 200:
+            return f'stop HTTP {response.status_code}'
+        return steps
+    return operation
+
+
+def download(base_url, timeout):
+    text = ' '.join(['the quick brown fox jumps over the lazy dog'] * 200)
+
+    def operation(index):
+        response = http().post(f'{base_url}/api/download-transcription',
+                               json={'transcription': text}, timeout=timeout)
+        if response.status_code != 200:
+            return f'HTTP {response.status_code}'
+        return None
+    return operation
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port, workers, threads, args, state_dir):
+    """Start gunicorn with the fake engine and wait until it answers the health check"""
+    env = dict(
+        os.environ,
+        SPEECH_ENGINE='fake',
+        FAKE_ENGINE_SEGMENT_SECONDS=str(args.engine_segment_seconds),
+        FAKE_ENGINE_LATENCY_PER_SECOND=str(args.engine_latency),
+        FAKE_ENGINE_STARTUP_SECONDS=str(args.engine_startup),
+        SESSION_BACKEND='sqlite',
+        SESSION_DB_PATH=os.path.join(state_dir, 'sessions.db'),
+        FILE_JOB_STORAGE_DIR=os.path.join(state_dir, 'jobs'),
+        TRANSCRIPT_CACHE_DIR=os.path.join(state_dir, 'cache'),
+        FLASK_DEBUG='False'
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+         '--threads', str(threads), '--timeout', '600', '--log-level', 'warning', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with code {server.returncode}')
+        try:
+            if requests.get(f'http://127.0.0.1:{port}/', timeout=1).status_code == 200 \
+                    and len(worker_pids(server.pid)) == workers:
+                return server
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError('gunicorn did not become ready within 60 seconds')
+
+
+def stop_server(server):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def worker_pids(master_pid):
+    """PIDs of the gunicorn workers forked by the master (Linux /proc)"""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                # The parent PID follows the parenthesized command name
+                fields = stat.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def rss_mb(pids):
+    """Resident set size in MB of each process"""
+    sizes = {}
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        sizes[str(pid)] = round(int(line.split()[1]) / 1024.0, 1)
+        except OSError:
+            continue
+    return sizes
+
+
+def run_benchmarks(base_url, args, server=None):
+    """Run every selected scenario against one server"""
+    pids = worker_pids(server.pid) if server else []
+    results = {'rss_mb_before': rss_mb(pids), 'scenarios': {}}
+
+    if 'file' in args.scenarios:
+        for seconds in args.audio_seconds:
+            audio = [make_wav(seconds, seed) for seed in range(min(args.requests, 8))]
+            results['scenarios'][f'file_transcription_{seconds:g}s'] = run_scenario(
+                file_transcription(base_url, audio, args.timeout), args.requests, args.concurrency)
+
+    if 'continuous' in args.scenarios:
+        results['scenarios'][f'continuous_cycle_{args.session_seconds:g}s'] = run_scenario(
+            continuous_cycle(base_url, args.session_seconds, args.timeout), args.requests, args.concurrency)
+
+    if 'download' in args.scenarios:
+        results['scenarios']['download_transcription'] = run_scenario(
+            download(base_url, args.timeout), args.requests, args.concurrency)
+
+    results['rss_mb_after'] = rss_mb(pids)
+    return results
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Speech-to-Text API')
+    parser.add_argument('--url', help='Benchmark an already running server instead of starting gunicorn')
+    parser.add_argument('--workers', default='1,2', help='Comma-separated gunicorn worker counts to compare')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client requests')
+    parser.add_argument('--requests', type=int, default=40, help='Requests (or session cycles) per scenario')
+    parser.add_argument('--audio-seconds', default='5,30', help='Comma-separated lengths of uploaded audio')
+    parser.add_argument('--session-seconds', type=float, default=5, help='Audio streamed per continuous session')
+    parser.add_argument('--scenarios', default='file,continuous,download',
+                        help='Comma-separated subset of file, continuous, download')
+    parser.add_argument('--engine-latency', type=float, default=0.0,
+                        help='Fake engine processing seconds per second of audio')
+    parser.add_argument('--engine-startup', type=float, default=0.0, help='Fake engine setup seconds per recognizer')
+    parser.add_argument('--engine-segment-seconds', type=float, default=1.0, help='Audio per fake segment')
+    parser.add_argument('--timeout', type=float, default=120, help='Per-request timeout in seconds')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    args.audio_seconds = parse_list(args.audio_seconds, float)
+    args.scenarios = parse_list(args.scenarios, str.strip)
+
+    report = {
+        'config': {
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'audio_seconds': args.audio_seconds,
+            'session_seconds': args.session_seconds,
+            'scenarios': args.scenarios,
+            'engine_latency_per_second': args.engine_latency,
+            'engine_startup_seconds': args.engine_startup,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'runs': []
+    }
+
+    if args.url:
+        run = {'url': args.url}
+        run.update(run_benchmarks(args.url.rstrip('/'), args))
+        report['runs'].append(run)
+    else:
+        for workers in parse_list(args.workers, int):
+            state_dir = tempfile.mkdtemp(prefix='speak_easy_bench_')
+            port = free_port()
+            print(f'Benchmarking {workers} worker(s) x {args.threads} threads on port {port}...', file=sys.stderr)
+            server = start_server(port, workers, args.threads, args, state_dir)
+            try:
+                run = {'workers': workers, 'threads': args.threads}
+                run.update(run_benchmarks(f'http://127.0.0.1:{port}', args, server))
+                report['runs'].append(run)
+            finally:
+                stop_server(server)
+                shutil.rmtree(state_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
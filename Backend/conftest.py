@@ -0,0 +1,58 @@
+"""
+Settings and audio helpers shared by the offline tests
+Usage: python -m pytest
+
+The app reads its settings at import time, so they are set here before any test
+module imports it. SPEECH_ENGINE=fake needs no Azure key or network: every second
+of audio is recognized as one segment.
+"""
+
+import io
+import os
+import wave
+import tempfile
+
+import numpy as np
+
+TEST_DIR = tempfile.mkdtemp(prefix='speak_easy_test_')
+
+os.environ.update(
+    SPEECH_ENGINE='fake',
+    AZURE_SPEECH_KEY='test',
+    FAKE_ENGINE_SEGMENT_SECONDS='1',
+    SESSION_BACKEND='sqlite',
+    SESSION_DB_PATH=os.path.join(TEST_DIR, 'sessions.db'),
+    TRANSCRIPT_CACHE_ENABLED='true',
+    TRANSCRIPT_CACHE_DIR=os.path.join(TEST_DIR, 'cache'),
+    TRANSCRIPT_DB_PATH=os.path.join(TEST_DIR, 'transcripts.db'),
+    FILE_JOB_STORAGE_DIR=os.path.join(TEST_DIR, 'jobs'),
+    ADMISSION_ENABLED='false'
+)
+
+SAMPLE_RATE = 16000
+
+
+def tone_pcm(seconds, amplitude=8000, frequency=220, sample_rate=SAMPLE_RATE):
+    """16-bit mono PCM of a sine tone"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype('<i2').tobytes()
+
+
+def silence_pcm(seconds, sample_rate=SAMPLE_RATE):
+    return bytes(int(sample_rate * seconds) * 2)
+
+
+def wav_bytes(pcm, sample_rate=SAMPLE_RATE, channels=1, sample_width=2):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def write_wav(path, pcm, **kwargs):
+    with open(path, 'wb') as wav_file:
+        wav_file.write(wav_bytes(pcm, **kwargs))
+    return str(path)
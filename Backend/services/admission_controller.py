@@ -0,0 +1,271 @@
+import math
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+REJECT_RATE_LIMITED = 'rate_limited'
+REJECT_QUEUE_FULL = 'queue_full'
+REJECT_QUEUE_TIMEOUT = 'queue_timeout'
+
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    'speakeasy_admission_rejections_total', 'Requests turned away by admission control', ['reason'])
+ADMISSION_QUEUE_WAIT = REGISTRY.histogram(
+    'speakeasy_admission_queue_wait_seconds', 'Time admitted requests waited for a slot')
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a request is not admitted; retry_after is the suggested wait in whole seconds"""
+
+    def __init__(self, message: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; each admitted request takes one"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Refill, then return 0 if a token is available, or the seconds until one is"""
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Take the token wait_time() found available"""
+        self.tokens -= 1
+
+
+class _Waiter:
+    """A queued request, woken by release() when a slot is handed to it"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.granted = False
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def wake(self) -> bool:
+        """Signal the waiter; False if its event loop is gone"""
+        if self.loop is None:
+            self.event.set()
+            return True
+        try:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+            return True
+        except RuntimeError:
+            return False
+
+
+class AdmissionController:
+    """
+    Admission control in front of the transcription routes.
+
+    At most max_concurrent requests run at once. Up to max_queue more wait in FIFO
+    order for at most max_queue_seconds; a freed slot is handed straight to the
+    oldest waiter. Each client is also limited by a token bucket (client_rate
+    requests per second, bursts of client_burst). Anything over these limits is
+    rejected immediately with a Retry-After estimate derived from the recent
+    completion rate, so bursts cannot pile up uploads and recognizers.
+    Limits apply per worker process.
+    """
+
+    def __init__(
+            self,
+            max_concurrent: int = 32,
+            max_queue: int = 64,
+            max_queue_seconds: float = 10,
+            client_rate: float = 0,
+            client_burst: float = 10,
+            max_clients: int = 10000,
+            throughput_window_seconds: float = 60
+    ):
+        """
+        Args:
+            max_concurrent: Requests admitted at once
+            max_queue: Requests allowed to wait for a slot (0 rejects as soon as all slots are busy)
+            max_queue_seconds: Longest a request waits for a slot before it is rejected
+            client_rate: Requests per second each client may sustain (0 disables per-client limits)
+            client_burst: Requests a client may make at once after being idle
+            max_clients: Token buckets kept; the least recently seen client is forgotten first
+            throughput_window_seconds: Completions in this window estimate Retry-After
+        """
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.max_queue_seconds = max(0.0, float(max_queue_seconds))
+        self.client_rate = max(0.0, float(client_rate))
+        self.client_burst = max(1.0, float(client_burst))
+        self.max_clients = max(1, int(max_clients))
+        self.throughput_window_seconds = max(1.0, float(throughput_window_seconds))
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+        self._buckets = OrderedDict()
+        self._completions = deque()
+        self._stats = {'admitted': 0, 'queued': 0, REJECT_RATE_LIMITED: 0,
+                       REJECT_QUEUE_FULL: 0, REJECT_QUEUE_TIMEOUT: 0}
+
+    def acquire(self, client_id: Optional[str] = None) -> None:
+        """
+        Take a slot, waiting in the queue if all are busy; every successful call
+        must be paired with release()
+
+        Raises:
+            AdmissionRejected: If the client is over its rate, the queue is full,
+                or no slot was freed within max_queue_seconds
+        """
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._admit_or_enqueue(client_id, started)
+        if waiter is None:
+            ADMISSION_QUEUE_WAIT.observe(0)
+            return
+
+        waiter.event.wait(self.max_queue_seconds)
+        self._finish_wait(waiter, started)
+
+    async def acquire_async(self, client_id: Optional[str] = None) -> None:
+        """acquire() for coroutines: a queued request waits on a future instead of a thread"""
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._admit_or_enqueue(client_id, started, asyncio.get_running_loop())
+        if waiter is None:
+            ADMISSION_QUEUE_WAIT.observe(0)
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_queue_seconds)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away while queued; hand on a slot it may just have been given
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            self.release()
+            raise
+        self._finish_wait(waiter, started)
+
+    def release(self) -> None:
+        """Give a slot back, handing it to the oldest queued request if there is one"""
+        with self._lock:
+            self._completions.append(time.monotonic())
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                if waiter.wake():
+                    return
+            self._active -= 1
+
+    def _admit_or_enqueue(self, client_id: Optional[str], now: float,
+                          loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[_Waiter]:
+        """
+        Admit at once (None) or queue a waiter; must be called with the lock held.
+        A client's token is only spent once the request is admitted or queued.
+        """
+        bucket = None
+        if self.client_rate and client_id:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = self._buckets[client_id] = TokenBucket(self.client_rate, self.client_burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+            wait = bucket.wait_time(now)
+            if wait:
+                self._reject(REJECT_RATE_LIMITED, wait,
+                             f'Rate limit of {self.client_rate:g} requests per second exceeded')
+
+        if self._active < self.max_concurrent and not self._waiters:
+            if bucket is not None:
+                bucket.take()
+            self._active += 1
+            self._stats['admitted'] += 1
+            return None
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject(REJECT_QUEUE_FULL, self._estimate_wait(len(self._waiters) + 1, now),
+                         'Server is busy, too many requests queued')
+
+        if bucket is not None:
+            bucket.take()
+        waiter = _Waiter(loop)
+        self._waiters.append(waiter)
+        self._stats['queued'] += 1
+        return waiter
+
+    def _finish_wait(self, waiter: _Waiter, started: float) -> None:
+        """Complete a queued acquire: admitted if release() handed it a slot, rejected otherwise"""
+        with self._lock:
+            if waiter.granted:
+                self._stats['admitted'] += 1
+                ADMISSION_QUEUE_WAIT.observe(time.monotonic() - started)
+                return
+            self._waiters.remove(waiter)
+            self._reject(REJECT_QUEUE_TIMEOUT, self._estimate_wait(len(self._waiters) + 1, time.monotonic()),
+                         f'Server is busy, no capacity within {self.max_queue_seconds:g}s')
+
+    def _reject(self, reason: str, wait_seconds: float, message: str) -> None:
+        """Count and raise a rejection; must be called with the lock held"""
+        self._stats[reason] += 1
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        raise AdmissionRejected(message, reason, max(1, int(math.ceil(wait_seconds))))
+
+    def _estimate_wait(self, position: int, now: float) -> float:
+        """Seconds until a request at this queue position would get a slot, at the recent completion rate"""
+        throughput = self._throughput(now)
+        if not throughput:
+            return self.max_queue_seconds or 1.0
+        return position / throughput
+
+    def _throughput(self, now: float) -> float:
+        """Completions per second over the throughput window; must be called with the lock held"""
+        horizon = now - self.throughput_window_seconds
+        while self._completions and self._completions[0] < horizon:
+            self._completions.popleft()
+        if not self._completions:
+            return 0.0
+        return len(self._completions) / min(self.throughput_window_seconds,
+                                            max(1.0, now - self._completions[0]))
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def active(self) -> int:
+        with self._lock:
+            return self._active
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limits, occupancy and admission counters"""
+        with self._lock:
+            return dict(
+                self._stats,
+                active=self._active,
+                queue_depth=len(self._waiters),
+                throughput_per_second=round(self._throughput(time.monotonic()), 3),
+                max_concurrent=self.max_concurrent,
+                max_queue=self.max_queue,
+                max_queue_seconds=self.max_queue_seconds,
+                client_rate=self.client_rate,
+                client_burst=self.client_burst,
+                clients=len(self._buckets)
+            )
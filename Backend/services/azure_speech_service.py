@@ -1,39 +1,158 @@
+import io
 import os
+import math
+import asyncio
+import sys
 import logging
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Awaitable
 import threading
 import time
+import shutil
 import tempfile
 import platform
-
-try:
-    import azure.cognitiveservices.speech as speechsdk
-except ImportError:
-    raise ImportError("Azure Speech SDK not found. Install it with: pip install azure-cognitiveservices-speech")
+from concurrent.futures import ThreadPoolExecutor
+
+from services.recognition_engine import RecognitionEngine, CANCELLATION_ERROR, create_recognition_engine
+from services.endpoint_pool import EndpointPool, parse_endpoints
+from services.recognizer_factory import RecognizerFactory
+from services.recognition_resilience import (
+    CircuitBreaker, CircuitOpen, RetryPolicy, RECOGNITION_RETRIES, is_transient, is_service_failure
+)
+from utils.audio_chunker import AudioChunker
+from utils.audio_stream import AudioUploadStream, is_streamable_pcm
+from utils.metrics import REGISTRY
+from utils.stage_timer import StageTimer
 
 logger = logging.getLogger(__name__)
 
+# The Speech SDK reports offsets and durations in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+# Recognition metrics, labelled by mode: file, stream, continuous or microphone
+SESSION_DURATION = REGISTRY.histogram(
+    'speakeasy_recognition_session_duration_seconds', 'Wall time of recognizer sessions', ['mode'],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 14400))
+TIME_TO_FIRST_SEGMENT = REGISTRY.histogram(
+    'speakeasy_time_to_first_segment_seconds', 'Time from starting recognition to the first recognized segment',
+    ['mode'], buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120))
+RECOGNIZED_SEGMENTS = REGISTRY.counter(
+    'speakeasy_recognized_segments_total', 'Recognized speech segments', ['mode'])
+AUDIO_SECONDS = REGISTRY.counter(
+    'speakeasy_audio_seconds_total', 'Seconds of audio sent to the recognizer', ['mode'])
+AUDIO_BYTES = REGISTRY.counter(
+    'speakeasy_audio_bytes_total', 'Bytes of audio sent to the recognizer', ['mode'])
+CANCELLATIONS = REGISTRY.counter(
+    'speakeasy_recognition_cancellations_total',
+    'Canceled recognitions by CancellationReason and CancellationErrorCode', ['mode', 'reason', 'code'])
+TEMP_FILE_BYTES = REGISTRY.counter(
+    'speakeasy_temp_file_bytes_written_total', 'Bytes written to temporary files', ['purpose'])
+DEADLINES_EXCEEDED = REGISTRY.counter(
+    'speakeasy_recognition_deadline_exceeded_total',
+    'Recognitions stopped at their deadline and returned with partial results', ['mode'])
+
+# Error of a recognition whose deadline passed before any speech was recognized
+DEADLINE_EXCEEDED_ERROR = 'Recognition deadline exceeded before any speech was recognized'
+
+SUPPORTED_LANGUAGES = [
+    {'code': 'en-US', 'name': 'English (United States)'},
+    {'code': 'en-GB', 'name': 'English (United Kingdom)'},
+    {'code': 'en-IN', 'name': 'English (India)'},
+    {'code': 'hi-IN', 'name': 'Hindi (India)'},
+    {'code': 'es-ES', 'name': 'Spanish (Spain)'},
+    {'code': 'fr-FR', 'name': 'French (France)'},
+    {'code': 'de-DE', 'name': 'German (Germany)'},
+    {'code': 'ja-JP', 'name': 'Japanese (Japan)'},
+    {'code': 'ko-KR', 'name': 'Korean (Korea)'},
+    {'code': 'zh-CN', 'name': 'Chinese (Mandarin, China)'},
+    {'code': 'pt-BR', 'name': 'Portuguese (Brazil)'},
+    {'code': 'ru-RU', 'name': 'Russian (Russia)'},
+    {'code': 'ar-SA', 'name': 'Arabic (Saudi Arabia)'},
+    {'code': 'it-IT', 'name': 'Italian (Italy)'},
+    {'code': 'nl-NL', 'name': 'Dutch (Netherlands)'}
+]
+
+
+def _resolve_future(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _resolve_threadsafe(loop, future) -> None:
+    """Complete an asyncio future from an SDK callback thread"""
+    try:
+        loop.call_soon_threadsafe(_resolve_future, future)
+    except RuntimeError:
+        # The event loop has already been closed
+        pass
+
 
 class AzureSpeechService:
     """Service class for Azure Cognitive Services Speech-to-Text with Linux compatibility"""
 
-    def __init__(self):
+    def __init__(self, engine: Optional[RecognitionEngine] = None):
+        # The engine that actually recognizes audio: the Azure SDK, or the offline fake (SPEECH_ENGINE=fake)
+        self.engine = engine or create_recognition_engine(os.getenv('SPEECH_ENGINE', 'azure'))
+
         self.subscription_key = os.getenv('AZURE_SPEECH_KEY')
         self.region = os.getenv('AZURE_SPEECH_REGION', 'centralindia')
         self.endpoint = f"https://{self.region}.api.cognitive.microsoft.com"
 
-        if not self.subscription_key:
+        # Speech resources sessions are routed over: AZURE_SPEECH_ENDPOINTS lists
+        # region:key[:max_concurrent] entries, otherwise the single resource above is used
+        endpoints = parse_endpoints(
+            os.getenv('AZURE_SPEECH_ENDPOINTS'),
+            self.region,
+            self.subscription_key,
+            int(os.getenv('AZURE_SPEECH_MAX_CONCURRENT', 100))
+        )
+        if self.engine.requires_credentials and not all(endpoint.subscription_key for endpoint in endpoints):
             raise ValueError("Azure Speech subscription key not found in environment variables")
+        # The first endpoint is the one reported as this service's region
+        self.region = endpoints[0].region
+        self.endpoint = endpoints[0].endpoint
+
+        self.endpoint_pool = EndpointPool(
+            endpoints,
+            latency_alpha=float(os.getenv('ENDPOINT_EWMA_ALPHA', 0.2)),
+            failure_threshold=int(os.getenv('ENDPOINT_FAILURE_THRESHOLD', 3)),
+            eject_seconds=float(os.getenv('ENDPOINT_EJECT_SECONDS', 30))
+        )
 
-        # Initialize speech config
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=self.subscription_key,
-            endpoint=self.endpoint
+        # Pool of immutable per-language speech configs shared by all requests
+        self.recognizer_factory = RecognizerFactory(
+            engine=self.engine,
+            endpoint_pool=self.endpoint_pool,
+            languages=[lang['code'] for lang in SUPPORTED_LANGUAGES],
+            max_configs_per_language=int(os.getenv('SPEECH_CONFIG_POOL_SIZE', 16)),
+            acquire_timeout=float(os.getenv('SPEECH_CONFIG_ACQUIRE_TIMEOUT', 30))
+        )
+
+        # Long-file mode: split at silence and recognize chunks in parallel
+        self.long_file_chunk_seconds = float(os.getenv('LONG_FILE_CHUNK_SECONDS', 60))
+        self.long_file_max_workers = int(os.getenv('LONG_FILE_MAX_WORKERS', 4))
+
+        # Streamed sessions: how long stop waits for the recognizer to finish buffered audio
+        self.stream_drain_seconds = float(os.getenv('STREAM_DRAIN_SECONDS', 5))
+
+        # Streamed uploads up to this size are kept so a failed session can be replayed
+        self.stream_retry_buffer_bytes = int(os.getenv('STREAM_RETRY_BUFFER_BYTES', 2 * 1024 * 1024))
+
+        # Resilience: transient cancellations are retried with jittered backoff, and
+        # repeated service failures open a circuit breaker that fails fast for a cooldown
+        self.retry_policy = RetryPolicy(
+            max_retries=int(os.getenv('RECOGNITION_MAX_RETRIES', 2)),
+            base_delay=float(os.getenv('RECOGNITION_RETRY_BASE_SECONDS', 0.5)),
+            max_delay=float(os.getenv('RECOGNITION_RETRY_MAX_SECONDS', 8)),
+            budget_seconds=float(os.getenv('RECOGNITION_RETRY_BUDGET_SECONDS', 30))
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5)),
+            cooldown_seconds=float(os.getenv('CIRCUIT_BREAKER_COOLDOWN_SECONDS', 30))
         )
 
         # Detect if running on Linux and set appropriate audio configuration
         self.is_linux = platform.system().lower() == 'linux'
-        logger.info(f"Running on {platform.system()}, Linux mode: {self.is_linux}")
+        logger.info(f"Running on {platform.system()}, Linux mode: {self.is_linux}, engine: {self.engine.name}")
 
     def _get_audio_config(self):
         """Get appropriate audio configuration based on platform"""
@@ -45,7 +164,7 @@ class AzureSpeechService:
                 return None
             else:
                 # For Windows/local development
-                return speechsdk.audio.AudioConfig(use_default_microphone=True)
+                return self.engine.microphone_audio_config()
         except Exception as e:
             logger.error(f"Error creating audio config: {str(e)}")
             return None
@@ -114,6 +233,7 @@ class AzureSpeechService:
         """
         Simple real-time speech-to-text - modified for Linux compatibility
         """
+        speech_config = None
         try:
             # Check if we're on Linux
             if self.is_linux:
@@ -127,9 +247,6 @@ class AzureSpeechService:
                     'platform': platform.system()
                 }
 
-            # Configure speech recognition
-            self.speech_config.speech_recognition_language = language
-
             # Create audio configuration
             audio_config = self._get_audio_config()
             if not audio_config:
@@ -142,11 +259,9 @@ class AzureSpeechService:
                     'language': language
                 }
 
-            # Create speech recognizer
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+            # Create speech recognizer from a pooled per-language config
+            speech_config = self.recognizer_factory.acquire_config(language)
+            speech_recognizer = self.recognizer_factory.create_recognizer(speech_config, audio_config)
 
             # Results storage
             results = {
@@ -160,32 +275,7 @@ class AzureSpeechService:
 
             # Event to track completion
             done = threading.Event()
-
-            def recognized_cb(evt):
-                """Callback for recognized speech"""
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    transcription = {
-                        'text': evt.result.text,
-                        'confidence': getattr(evt.result, 'confidence', 0.0),
-                        'timestamp': time.time()
-                    }
-                    results['transcriptions'].append(transcription)
-                    logger.info(f"Recognized: {evt.result.text}")
-
-            def canceled_cb(evt):
-                """Callback for canceled recognition"""
-                if evt.reason == speechsdk.CancellationReason.Error:
-                    results['error'] = f"Recognition error: {evt.error_details}"
-                done.set()
-
-            def session_stopped_cb(evt):
-                """Callback for session stopped"""
-                done.set()
-
-            # Connect callbacks
-            speech_recognizer.recognized.connect(recognized_cb)
-            speech_recognizer.canceled.connect(canceled_cb)
-            speech_recognizer.session_stopped.connect(session_stopped_cb)
+            run = self._connect_recognition_callbacks(speech_recognizer, results, 'microphone', StageTimer(), done.set)
 
             # Start recognition
             logger.info(f"Listening for {duration_seconds} seconds...")
@@ -196,15 +286,10 @@ class AzureSpeechService:
 
             # Stop recognition
             speech_recognizer.stop_continuous_recognition()
+            SESSION_DURATION.observe(time.time() - run['started'], mode='microphone')
+            self._report_endpoint(speech_config, results, run)
 
-            # Process results
-            if results['transcriptions']:
-                results['success'] = True
-                results['combined_text'] = ' '.join([t['text'] for t in results['transcriptions']])
-            elif not results['error']:
-                results['error'] = 'No speech detected during the recording period'
-
-            return results
+            return self._finish_recognition(results, 'No speech detected during the recording period')
 
         except Exception as e:
             logger.error(f"Error in simple real-time transcription: {str(e)}")
@@ -216,6 +301,8 @@ class AzureSpeechService:
                 'duration': duration_seconds,
                 'language': language
             }
+        finally:
+            self.recognizer_factory.release_config(language, speech_config)
 
     def convert_speech_to_text_multilanguage(
             self,
@@ -237,9 +324,66 @@ class AzureSpeechService:
             }
         return self.convert_speech_to_text_simple_realtime(duration_seconds, language)
 
-    def start_continuous_transcription_session(self, language: str = 'en-US') -> Dict[str, Any]:
+    async def convert_speech_to_text_simple_realtime_async(
+            self,
+            duration_seconds: int = 10,
+            language: str = 'en-US'
+    ) -> Dict[str, Any]:
+        """
+        Awaitable convert_speech_to_text_simple_realtime: the recording period is awaited
+        on the event loop instead of blocking a thread
+        """
+        results = {
+            'success': False,
+            'transcriptions': [],
+            'combined_text': '',
+            'error': None,
+            'duration': duration_seconds,
+            'language': language
+        }
+        if self.is_linux:
+            results['error'] = 'Real-time microphone transcription is not supported on Linux server environments. Please use file upload instead.'
+            results['platform'] = platform.system()
+            return results
+
+        try:
+            audio_config = self._get_audio_config()
+            if not audio_config:
+                results['error'] = 'Unable to initialize audio configuration'
+                return results
+
+            logger.info(f"Listening for {duration_seconds} seconds...")
+            await self._run_recognition_async(audio_config, language, results,
+                                              deadline=time.monotonic() + duration_seconds, mode='microphone')
+            return self._finish_recognition(results, 'No speech detected during the recording period')
+
+        except Exception as e:
+            logger.error(f"Error in simple real-time transcription: {str(e)}")
+            results.update({
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': f'Recognition error: {str(e)}'
+            })
+            return results
+
+    async def convert_speech_to_text_multilanguage_async(
+            self,
+            duration_seconds: int = 5,
+            language: str = 'en-US'
+    ) -> Dict[str, Any]:
+        """Awaitable convert_speech_to_text_multilanguage"""
+        return await self.convert_speech_to_text_simple_realtime_async(duration_seconds, language)
+
+    def start_continuous_transcription_session(
+            self,
+            language: str = 'en-US',
+            on_segment: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Start a continuous transcription session - modified for Linux
+        on_segment(index, segment) is called for every recognized segment, e.g. to
+        mirror it into a shared session store.
         """
         try:
             if self.is_linux:
@@ -249,9 +393,6 @@ class AzureSpeechService:
                     'platform': platform.system()
                 }
 
-            # Configure speech recognition
-            self.speech_config.speech_recognition_language = language
-
             # Create audio configuration
             audio_config = self._get_audio_config()
             if not audio_config:
@@ -260,68 +401,173 @@ class AzureSpeechService:
                     'error': 'Unable to initialize audio configuration'
                 }
 
-            # Create speech recognizer
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+            return self._create_continuous_session(language, audio_config, on_segment)
 
-            # Session control
-            session_control = {
-                'recognizer': speech_recognizer,
-                'is_active': False,
-                'stop_event': threading.Event(),
-                'session_id': None,
-                'results': [],
-                'language': language,
-                'start_time': time.time()
+        except CircuitOpen as e:
+            logger.warning(f"Refused continuous transcription session: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'retry_after': e.retry_after
+            }
+        except Exception as e:
+            logger.error(f"Error creating continuous transcription session: {str(e)}")
+            return {
+                'success': False,
+                'error': f'Session creation error: {str(e)}'
             }
 
-            def transcribed_cb(evt):
-                """Callback for final transcription results"""
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    transcription_data = {
-                        'text': evt.result.text,
-                        'confidence': getattr(evt.result, 'confidence', 0.0),
-                        'timestamp': time.time()
-                    }
-                    session_control['results'].append(transcription_data)
-                    logger.info(f"TRANSCRIBED: Text={evt.result.text}")
-
-            def session_started_cb(evt):
-                """Callback for session start"""
-                session_control['session_id'] = evt.session_id
-                logger.info(f'Continuous session started: {evt.session_id}')
-
-            def session_stopped_cb(evt):
-                """Callback for session stop"""
-                logger.info('Continuous session stopped')
-                session_control['stop_event'].set()
-
-            def canceled_cb(evt):
-                """Callback for cancellation"""
-                logger.error(f'Continuous session canceled: {evt}')
-                session_control['stop_event'].set()
+    def _create_continuous_session(
+            self,
+            language: str,
+            audio_config,
+            on_segment: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+            push_stream=None
+    ) -> Dict[str, Any]:
+        """Build a continuous recognizer session around an audio config (microphone or push stream)"""
+        # Fail fast while the circuit breaker is open rather than start a doomed session
+        self.circuit_breaker.allow()
 
-            # Connect callbacks to events
-            speech_recognizer.recognized.connect(transcribed_cb)
-            speech_recognizer.session_started.connect(session_started_cb)
-            speech_recognizer.session_stopped.connect(session_stopped_cb)
-            speech_recognizer.canceled.connect(canceled_cb)
+        # Create speech recognizer; the config stays leased until the session is stopped
+        speech_config = self.recognizer_factory.acquire_config(language)
+        try:
+            speech_recognizer = self.recognizer_factory.create_recognizer(speech_config, audio_config)
+        except Exception:
+            self.recognizer_factory.release_config(language, speech_config)
+            raise
+        endpoint = self.recognizer_factory.endpoint_of(speech_config)
+
+        # Session control
+        session_control = {
+            'recognizer': speech_recognizer,
+            'speech_config': speech_config,
+            'is_active': False,
+            'stop_event': threading.Event(),
+            # Notified whenever a segment arrives or the session ends
+            'condition': threading.Condition(),
+            # (loop, future) of coroutines waiting for the same, completed on notify
+            'async_waiters': [],
+            'session_id': None,
+            'results': [],
+            # Running totals kept as segments arrive, so reads never rescan the results
+            'word_count': 0,
+            'result_bytes': 0,
+            'last_segment_time': None,
+            'language': language,
+            'start_time': time.time(),
+            # Set for sessions fed by the client rather than a server microphone
+            'push_stream': push_stream
+        }
+
+        def transcribed_cb(evt):
+            """Callback for final transcription results"""
+            if self.engine.is_recognized(evt):
+                transcription_data = {
+                    'text': evt.result.text,
+                    'confidence': getattr(evt.result, 'confidence', 0.0),
+                    'timestamp': time.time(),
+                    # Position in the session's audio, for subtitle exports
+                    'offset': getattr(evt.result, 'offset', None),
+                    'duration': getattr(evt.result, 'duration', None)
+                }
+                with session_control['condition']:
+                    session_control['results'].append(transcription_data)
+                    session_control['word_count'] += len(evt.result.text.split())
+                    session_control['result_bytes'] += \
+                        sys.getsizeof(transcription_data) + sys.getsizeof(evt.result.text)
+                    session_control['last_segment_time'] = transcription_data['timestamp']
+                    index = len(session_control['results']) - 1
+                    self._notify_session(session_control)
+                if index == 0:
+                    # Not an endpoint latency sample: a live session's first segment waits on
+                    # the speaker, so only file and one-shot runs feed the endpoint averages
+                    TIME_TO_FIRST_SEGMENT.observe(transcription_data['timestamp'] - session_control['start_time'],
+                                                  mode='continuous')
+                RECOGNIZED_SEGMENTS.inc(mode='continuous')
+                logger.info(f"TRANSCRIBED: Text={evt.result.text}")
+
+                if on_segment is not None:
+                    try:
+                        on_segment(index, transcription_data)
+                    except Exception as e:
+                        logger.error(f"Error publishing segment: {str(e)}")
+
+        def session_started_cb(evt):
+            """Callback for session start"""
+            session_control['session_id'] = evt.session_id
+            logger.info(f'Continuous session started: {evt.session_id}')
+
+        def session_stopped_cb(evt):
+            """Callback for session stop"""
+            logger.info('Continuous session stopped')
+            self._end_session(session_control)
+
+        def canceled_cb(evt):
+            """Callback for cancellation"""
+            logger.error(f'Continuous session canceled: {evt}')
+            details = self._record_cancellation(evt, 'continuous')
+            if details['reason'] == CANCELLATION_ERROR:
+                self.circuit_breaker.record(details['code'])
+                if endpoint is not None:
+                    self.endpoint_pool.record_outcome(endpoint, details['code'])
+            self._end_session(session_control)
+
+        # Connect callbacks to events
+        speech_recognizer.recognized.connect(transcribed_cb)
+        speech_recognizer.session_started.connect(session_started_cb)
+        speech_recognizer.session_stopped.connect(session_stopped_cb)
+        speech_recognizer.canceled.connect(canceled_cb)
+
+        return {
+            'success': True,
+            'session': session_control,
+            'message': 'Continuous transcription session created successfully'
+        }
+
+    def start_continuous_stream_session(
+            self,
+            language: str = 'en-US',
+            on_segment: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+            sample_rate: int = 16000
+    ) -> Dict[str, Any]:
+        """
+        Start a continuous transcription session fed by the client instead of a
+        server microphone. Audio written with write_session_audio goes into a push
+        stream attached to the recognizer, so this also works on Linux servers.
+        """
+        try:
+            push_stream, audio_config = self.engine.stream_audio_config(sample_rate, 16, 1)
+            session = self._create_continuous_session(language, audio_config, on_segment, push_stream=push_stream)
+            session['session']['audio_bytes_per_second'] = sample_rate * 2
+            return session
 
+        except CircuitOpen as e:
+            logger.warning(f"Refused streamed continuous session: {str(e)}")
             return {
-                'success': True,
-                'session': session_control,
-                'message': 'Continuous transcription session created successfully'
+                'success': False,
+                'error': str(e),
+                'retry_after': e.retry_after
             }
-
         except Exception as e:
-            logger.error(f"Error creating continuous transcription session: {str(e)}")
+            logger.error(f"Error creating streamed continuous session: {str(e)}")
             return {
                 'success': False,
                 'error': f'Session creation error: {str(e)}'
             }
 
+    def write_session_audio(self, session: Dict[str, Any], pcm: bytes) -> None:
+        """Push 16-bit mono PCM into a streamed session's recognizer"""
+        push_stream = session['session'].get('push_stream')
+        if push_stream is None:
+            raise ValueError('Session does not accept client audio')
+        if not session['session']['is_active']:
+            raise ValueError('Session is not active')
+        if pcm:
+            push_stream.write(pcm)
+            session['session']['bytes_received'] = session['session'].get('bytes_received', 0) + len(pcm)
+            AUDIO_BYTES.inc(len(pcm), mode='continuous')
+            AUDIO_SECONDS.inc(len(pcm) / float(session['session']['audio_bytes_per_second']), mode='continuous')
+
     def start_continuous_recognition(self, session: Dict[str, Any]) -> bool:
         """Start continuous recognition for the session"""
         try:
@@ -341,12 +587,21 @@ class AzureSpeechService:
         try:
             if session.get('success') and session['session']['is_active']:
                 recognizer = session['session']['recognizer']
+                push_stream = session['session'].get('push_stream')
+                if push_stream is not None:
+                    # Ending the audio lets the recognizer finish the last utterance first
+                    push_stream.close()
+                    session['session']['stop_event'].wait(self.stream_drain_seconds)
                 recognizer.stop_continuous_recognition_async()
                 session['session']['is_active'] = False
-                session['session']['stop_event'].set()
+                self._end_session(session['session'])
+                self.release_session(session)
+                SESSION_DURATION.observe(time.time() - session['session']['start_time'], mode='continuous')
 
                 # Get results
-                results = session['session']['results'].copy()
+                with session['session']['condition']:
+                    results = session['session']['results'].copy()
+                    word_count = session['session']['word_count']
                 combined_text = ' '.join([r['text'] for r in results])
 
                 logger.info("Continuous recognition stopped")
@@ -356,50 +611,479 @@ class AzureSpeechService:
                     'transcriptions': results,
                     'combined_text': combined_text,
                     'session_duration': time.time() - session['session']['start_time'],
-                    'word_count': len(combined_text.split()) if combined_text else 0
+                    'word_count': word_count
                 }
             return {'success': False, 'error': 'Session not active'}
         except Exception as e:
             logger.error(f"Error stopping continuous recognition: {str(e)}")
             return {'success': False, 'error': f'Stop error: {str(e)}'}
 
-    def get_session_results_periodic(self, session: Dict[str, Any]) -> Dict[str, Any]:
-        """Get current session results without stopping"""
+    def _record_cancellation(self, evt, mode: str) -> Dict[str, str]:
+        """Count a canceled event by reason and error code and return its details"""
+        details = self.engine.cancellation_details(evt)
+        CANCELLATIONS.inc(mode=mode, reason=details['reason'], code=details['code'])
+        return details
+
+    @staticmethod
+    def _record_audio(mode: str, byte_count: int, bytes_per_second: Optional[float]) -> None:
+        AUDIO_BYTES.inc(byte_count, mode=mode)
+        if bytes_per_second:
+            AUDIO_SECONDS.inc(byte_count / float(bytes_per_second), mode=mode)
+
+    @staticmethod
+    def _end_session(session_control: Dict[str, Any]) -> None:
+        """Mark a continuous session as finished and wake anyone waiting for results"""
+        with session_control['condition']:
+            session_control['stop_event'].set()
+            AzureSpeechService._notify_session(session_control)
+
+    @staticmethod
+    def _notify_session(session_control: Dict[str, Any]) -> None:
+        """Wake threads and coroutines waiting for session results; must be called with the condition held"""
+        session_control['condition'].notify_all()
+        for loop, future in session_control['async_waiters']:
+            try:
+                loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+            except RuntimeError:
+                # The waiter's event loop has closed
+                pass
+        session_control['async_waiters'] = []
+
+    def wait_for_session_results(
+            self,
+            session: Dict[str, Any],
+            cursor: int = 0,
+            timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Block until the session has segments past the cursor, it ends, or the timeout passes
+
+        Args:
+            session: Session returned by start_continuous_transcription_session
+            cursor: Number of segments the caller has already seen
+            timeout: Seconds to wait; None waits indefinitely, 0 returns immediately
+
+        Returns:
+            Dictionary with the new 'transcriptions', the next 'cursor', 'finished',
+            and the running 'segments' and 'word_count' totals
+        """
+        session_control = session['session']
+        cursor = max(0, cursor)
+        with session_control['condition']:
+            session_control['condition'].wait_for(
+                lambda: len(session_control['results']) > cursor or session_control['stop_event'].is_set(),
+                timeout
+            )
+            new_results = session_control['results'][cursor:]
+            return {
+                'transcriptions': new_results,
+                'cursor': cursor + len(new_results),
+                'finished': session_control['stop_event'].is_set(),
+                'segments': len(session_control['results']),
+                'word_count': session_control['word_count']
+            }
+
+    async def wait_for_session_results_async(
+            self,
+            session: Dict[str, Any],
+            cursor: int = 0,
+            timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Awaitable wait_for_session_results: the wait is a future completed when a
+        segment arrives or the session ends, so a waiting request holds no thread
+        """
+        session_control = session['session']
+        cursor = max(0, cursor)
+        with session_control['condition']:
+            ready = len(session_control['results']) > cursor or session_control['stop_event'].is_set()
+            if not ready and timeout != 0:
+                loop = asyncio.get_running_loop()
+                waiter = (loop, loop.create_future())
+                session_control['async_waiters'].append(waiter)
+        if not ready and timeout != 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter[1]), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with session_control['condition']:
+                    if waiter in session_control['async_waiters']:
+                        session_control['async_waiters'].remove(waiter)
+        return self.wait_for_session_results(session, cursor, timeout=0)
+
+    @staticmethod
+    def iter_session_segments(session: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Segments the session has recognized so far, in order, without copying its result list"""
+        session_control = session['session']
+        with session_control['condition']:
+            count = len(session_control['results'])
+        # Results are only ever appended, so the first count entries are stable
+        for index in range(count):
+            yield session_control['results'][index]
+
+    def release_session(self, session: Dict[str, Any]) -> None:
+        """Return the session's leased speech config to the pool (idempotent)"""
+        session_control = session.get('session') or {}
+        speech_config = session_control.pop('speech_config', None)
+        if speech_config is not None:
+            self.recognizer_factory.release_config(session_control.get('language'), speech_config)
+
+    def get_session_results_periodic(
+            self,
+            session: Dict[str, Any],
+            since: Optional[int] = None,
+            wait: float = 0
+    ) -> Dict[str, Any]:
+        """
+        Get current session results without stopping.
+        With a 'since' cursor only the segments after it are returned (optionally
+        waiting up to 'wait' seconds for one to arrive) along with the next cursor.
+        """
         try:
             if session.get('success'):
-                results = session['session']['results'].copy()
-                combined_text = ' '.join([r['text'] for r in results])
+                update = self.wait_for_session_results(session, since or 0, timeout=wait if since is not None else 0)
+                return self._periodic_results(session, update)
+            return {'success': False, 'error': 'Invalid session'}
+        except Exception as e:
+            logger.error(f"Error getting session results: {str(e)}")
+            return {'success': False, 'error': f'Results error: {str(e)}'}
 
-                return {
-                    'success': True,
-                    'transcriptions': results,
-                    'combined_text': combined_text,
-                    'is_active': session['session']['is_active'],
-                    'session_duration': time.time() - session['session']['start_time'],
-                    'word_count': len(combined_text.split()) if combined_text else 0
-                }
+    async def get_session_results_periodic_async(
+            self,
+            session: Dict[str, Any],
+            since: Optional[int] = None,
+            wait: float = 0
+    ) -> Dict[str, Any]:
+        """Awaitable get_session_results_periodic for event-loop servers"""
+        try:
+            if session.get('success'):
+                update = await self.wait_for_session_results_async(
+                    session, since or 0, timeout=wait if since is not None else 0)
+                return self._periodic_results(session, update)
             return {'success': False, 'error': 'Invalid session'}
         except Exception as e:
             logger.error(f"Error getting session results: {str(e)}")
             return {'success': False, 'error': f'Results error: {str(e)}'}
 
-    def convert_speech_to_text_from_file(self, audio_file_path: str, language: str = 'en-US') -> Dict[str, Any]:
+    @staticmethod
+    def _periodic_results(session: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        """Results of get_session_results_periodic from a wait_for_session_results update"""
+        return {
+            'success': True,
+            'transcriptions': update['transcriptions'],
+            'combined_text': ' '.join([r['text'] for r in update['transcriptions']]),
+            'cursor': update['cursor'],
+            'segments': update['segments'],
+            'is_active': session['session']['is_active'],
+            'session_duration': time.time() - session['session']['start_time'],
+            'word_count': update['word_count']
+        }
+
+    def _run_recognition(
+            self,
+            audio_config,
+            language: str,
+            results: Dict[str, Any],
+            feed: Optional[Callable[[], None]] = None,
+            deadline: Optional[float] = None,
+            mode: str = 'file',
+            timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
         """
-        Convert audio file to text - This works on both Windows and Linux
+        Recognize a finite audio source until the session stops and fill in results.
+        If feed is given it runs on the calling thread while recognition is in progress,
+        writing audio into the push stream behind audio_config. If the session has not
+        stopped by deadline (a time.monotonic() value, 300 seconds from now by default)
+        it is stopped there and results are marked partial. Stage durations
+        (config_wait, recognizer_create, first_segment, drain, ...) go to timer.
         """
-        try:
-            # Configure speech recognition
-            self.speech_config.speech_recognition_language = language
+        deadline = deadline if deadline is not None else time.monotonic() + 300
+        timer = timer or StageTimer()
+        lease_started = time.time()
+        with self.recognizer_factory.lease(language, avoid=results.get('failed_endpoints', ())) as speech_config:
+            timer.record('config_wait', time.time() - lease_started)
+            with timer.stage('recognizer_create'):
+                speech_recognizer = self.recognizer_factory.create_recognizer(speech_config, audio_config)
 
-            # Create audio configuration from file
-            audio_config = speechsdk.audio.AudioConfig(filename=audio_file_path)
+            # Event to track completion
+            done = threading.Event()
+            run = self._connect_recognition_callbacks(speech_recognizer, results, mode, timer, done.set)
 
-            # Create speech recognizer
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+            # Start recognition
+            speech_recognizer.start_continuous_recognition()
 
+            try:
+                if feed is not None:
+                    with timer.stage('upload_stream'):
+                        feed()
+
+                # Wait for completion, but no longer than the deadline
+                if not done.wait(timeout=max(0.0, deadline - time.monotonic())):
+                    self._mark_partial(results, mode)
+                self._record_drain(timer, run)
+            finally:
+                # Stop recognition
+                with timer.stage('recognizer_stop'):
+                    speech_recognizer.stop_continuous_recognition()
+                SESSION_DURATION.observe(time.time() - run['started'], mode=mode)
+                self._report_endpoint(speech_config, results, run)
+
+        return self._finish_recognition(results)
+
+    async def _run_recognition_async(
+            self,
+            audio_config,
+            language: str,
+            results: Dict[str, Any],
+            deadline: Optional[float] = None,
+            mode: str = 'file',
+            timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Awaitable _run_recognition for event-loop servers. The SDK callbacks complete an
+        asyncio future when the session stops, so a recognition in progress holds no
+        thread; only the short start and stop calls run on executor threads.
+        """
+        deadline = deadline if deadline is not None else time.monotonic() + 300
+        loop = asyncio.get_running_loop()
+        timer = timer or StageTimer()
+        lease_started = time.time()
+        speech_config = await self.recognizer_factory.acquire_config_async(
+            language, avoid=results.get('failed_endpoints', ()))
+        try:
+            timer.record('config_wait', time.time() - lease_started)
+            with timer.stage('recognizer_create'):
+                speech_recognizer = self.recognizer_factory.create_recognizer(speech_config, audio_config)
+
+            stopped = loop.create_future()
+            run = self._connect_recognition_callbacks(speech_recognizer, results, mode, timer,
+                                                      lambda: _resolve_threadsafe(loop, stopped))
+            await loop.run_in_executor(None, speech_recognizer.start_continuous_recognition)
+
+            try:
+                try:
+                    await asyncio.wait_for(stopped, max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    self._mark_partial(results, mode)
+                self._record_drain(timer, run)
+            finally:
+                with timer.stage('recognizer_stop'):
+                    await loop.run_in_executor(None, speech_recognizer.stop_continuous_recognition)
+                SESSION_DURATION.observe(time.time() - run['started'], mode=mode)
+                self._report_endpoint(speech_config, results, run)
+        finally:
+            self.recognizer_factory.release_config(language, speech_config)
+
+        return results
+
+    def _connect_recognition_callbacks(
+            self,
+            speech_recognizer,
+            results: Dict[str, Any],
+            mode: str,
+            timer: StageTimer,
+            on_stopped: Callable[[], None]
+    ) -> Dict[str, Any]:
+        """
+        Collect recognized segments of a finite recognition into results and call
+        on_stopped (from an SDK thread) once the session stops or is canceled
+
+        Returns:
+            The run's 'started' time and, once it arrives, its 'first_segment' time
+        """
+        run = {'started': time.time(), 'first_segment': None}
+
+        def recognized_cb(evt):
+            """Callback for recognized speech"""
+            if self.engine.is_recognized(evt):
+                transcription = {
+                    'text': evt.result.text,
+                    'confidence': getattr(evt.result, 'confidence', 0.0)
+                }
+                if mode == 'microphone':
+                    transcription['timestamp'] = time.time()
+                else:
+                    transcription['offset'] = evt.result.offset
+                    transcription['duration'] = evt.result.duration
+                if not results['transcriptions']:
+                    run['first_segment'] = time.time()
+                    TIME_TO_FIRST_SEGMENT.observe(run['first_segment'] - run['started'], mode=mode)
+                    timer.record('first_segment', run['first_segment'] - run['started'])
+                RECOGNIZED_SEGMENTS.inc(mode=mode)
+                results['transcriptions'].append(transcription)
+                logger.info(f"Recognized ({mode}): {evt.result.text}")
+
+        def canceled_cb(evt):
+            """Callback for canceled recognition"""
+            details = self._record_cancellation(evt, mode)
+            if details['reason'] == CANCELLATION_ERROR:
+                results['error'] = f"Recognition error: {details['error_details']}"
+                results['error_code'] = details['code']
+            on_stopped()
+
+        def session_stopped_cb(evt):
+            """Callback for session stopped"""
+            on_stopped()
+
+        # Connect callbacks
+        speech_recognizer.recognized.connect(recognized_cb)
+        speech_recognizer.canceled.connect(canceled_cb)
+        speech_recognizer.session_stopped.connect(session_stopped_cb)
+        return run
+
+    def _report_endpoint(self, speech_config, results: Dict[str, Any], run: Dict[str, Any]) -> None:
+        """
+        Feed a finished recognition's time to first segment and outcome into the moving
+        averages of the endpoint it ran on. An endpoint that failed is remembered in
+        results so that a retry goes elsewhere.
+        """
+        endpoint = self.recognizer_factory.endpoint_of(speech_config)
+        if endpoint is None:
+            return
+        if run['first_segment'] is not None:
+            self.endpoint_pool.record_latency(endpoint, run['first_segment'] - run['started'])
+        code = results.get('error_code')
+        self.endpoint_pool.record_outcome(endpoint, code)
+        if is_service_failure(code):
+            results.setdefault('failed_endpoints', []).append(endpoint.name)
+
+    @staticmethod
+    def _mark_partial(results: Dict[str, Any], mode: str) -> None:
+        """
+        Note that a recognition was cut off at its deadline, so its segments cover only
+        part of the audio. A microphone recording ends at its deadline by design.
+        """
+        if mode == 'microphone' or results.get('partial'):
+            return
+        results['partial'] = True
+        DEADLINES_EXCEEDED.inc(mode=mode)
+        logger.warning(f"Recognition ({mode}) stopped at its deadline with {len(results['transcriptions'])} segments")
+
+    @staticmethod
+    def _record_drain(timer: StageTimer, run: Dict[str, Any]) -> None:
+        """Time from the first segment (or the start, if none came) to session_stopped"""
+        timer.record('drain', time.time() - (run['first_segment'] or run['started']))
+
+    @staticmethod
+    def _finish_recognition(
+            results: Dict[str, Any],
+            no_speech_error: str = 'No speech recognized in audio file'
+    ) -> Dict[str, Any]:
+        """
+        Mark results successful and join their text, or explain why nothing was
+        recognized. Results cut off at their deadline keep 'partial' set either way.
+        """
+        if results['transcriptions']:
+            results['success'] = True
+            results['combined_text'] = ' '.join([t['text'] for t in results['transcriptions']])
+        elif not results['error']:
+            results['error'] = DEADLINE_EXCEEDED_ERROR if results.get('partial') else no_speech_error
+        return results
+
+    def _recognize_with_retry(
+            self,
+            recognize: Callable[[], Any],
+            results: Dict[str, Any],
+            mode: str,
+            timer: Optional[StageTimer] = None,
+            replayable: Optional[Callable[[], bool]] = None,
+            deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run recognize(), which fills in results, behind the circuit breaker and retry
+        it while it is canceled by a transient error and the retry policy allows.
+        replayable() tells whether the audio can still be recognized again; by default it can.
+        No retry is begun that could not start before deadline (a time.monotonic() value).
+        """
+        timer = timer or StageTimer()
+        started = time.monotonic()
+        retries = 0
+        while self._begin_attempt(results):
+            recognize()
+            delay = self._end_attempt(results, retries, started, mode, replayable is None or replayable(), deadline)
+            if delay is None:
+                break
+            with timer.stage('retry_backoff'):
+                time.sleep(delay)
+            retries += 1
+        return results
+
+    async def _recognize_with_retry_async(
+            self,
+            recognize: Callable[[], Awaitable[Any]],
+            results: Dict[str, Any],
+            mode: str,
+            timer: Optional[StageTimer] = None,
+            deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """_recognize_with_retry for coroutines: the backoff is awaited instead of slept"""
+        timer = timer or StageTimer()
+        started = time.monotonic()
+        retries = 0
+        while self._begin_attempt(results):
+            await recognize()
+            delay = self._end_attempt(results, retries, started, mode, deadline=deadline)
+            if delay is None:
+                break
+            with timer.stage('retry_backoff'):
+                await asyncio.sleep(delay)
+            retries += 1
+        return results
+
+    def _begin_attempt(self, results: Dict[str, Any]) -> bool:
+        """Clear results for a new attempt; False, with the error set, if the circuit breaker refuses it"""
+        try:
+            self.circuit_breaker.allow()
+        except CircuitOpen as e:
+            logger.warning(f"Recognition refused: {str(e)}")
+            results['error'] = str(e)
+            results['retry_after'] = e.retry_after
+            return False
+        results.update(success=False, transcriptions=[], combined_text='', error=None)
+        results.pop('error_code', None)
+        results.pop('partial', None)
+        results['attempts'] = results.get('attempts', 0) + 1
+        return True
+
+    def _end_attempt(
+            self,
+            results: Dict[str, Any],
+            retries: int,
+            started: float,
+            mode: str,
+            retry: bool = True,
+            deadline: Optional[float] = None
+    ) -> Optional[float]:
+        """Record an attempt's outcome with the circuit breaker; the backoff before a retry, or None"""
+        code = results.get('error_code')
+        self.circuit_breaker.record(code)
+        delay = self.retry_policy.next_delay(code, retries, started) if retry else None
+        if delay is not None and deadline is not None and time.monotonic() + delay >= deadline:
+            # The retry could not begin before the deadline
+            delay = None
+        if delay is not None:
+            RECOGNITION_RETRIES.inc(mode=mode, code=code)
+            logger.warning(f"Recognition ({mode}) canceled with {code}, retrying in {delay:.2f}s")
+        elif is_transient(code):
+            # Out of retries: tell the client when trying again is worthwhile
+            results['retry_after'] = max(1, int(math.ceil(self.retry_policy.max_delay)))
+        return delay
+
+    def convert_speech_to_text_from_file(
+            self,
+            audio_file_path: str,
+            language: str = 'en-US',
+            timeout: float = 300,
+            timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert audio file to text - This works on both Windows and Linux
+        Recognition, retries included, is stopped timeout seconds from now and the
+        segments recognized by then are returned with 'partial' set.
+        """
+        deadline = time.monotonic() + timeout
+        try:
             # Results storage
             results = {
                 'success': False,
@@ -410,57 +1094,252 @@ class AzureSpeechService:
                 'language': language
             }
 
-            # Event to track completion
-            done = threading.Event()
+            logger.info(f"Processing file: {audio_file_path}")
+            file_seconds = AudioChunker.get_wav_duration(audio_file_path)
+            file_bytes = os.path.getsize(audio_file_path)
+            self._record_audio('file', file_bytes, file_bytes / file_seconds if file_seconds else None)
+            # A file can be replayed, so every attempt gets a fresh audio config
+            self._recognize_with_retry(
+                lambda: self._run_recognition(self.engine.file_audio_config(audio_file_path), language, results,
+                                              deadline=deadline, mode='file', timer=timer),
+                results, 'file', timer, deadline=deadline)
+            return self._finish_recognition(results)
 
-            def recognized_cb(evt):
-                """Callback for recognized speech"""
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    transcription = {
-                        'text': evt.result.text,
-                        'confidence': getattr(evt.result, 'confidence', 0.0),
-                        'offset': evt.result.offset,
-                        'duration': evt.result.duration
-                    }
-                    results['transcriptions'].append(transcription)
-                    logger.info(f"File transcribed: {evt.result.text}")
-
-            def canceled_cb(evt):
-                """Callback for canceled recognition"""
-                if evt.reason == speechsdk.CancellationReason.Error:
-                    results['error'] = f"Recognition error: {evt.error_details}"
-                done.set()
-
-            def session_stopped_cb(evt):
-                """Callback for session stopped"""
-                done.set()
-
-            # Connect callbacks
-            speech_recognizer.recognized.connect(recognized_cb)
-            speech_recognizer.canceled.connect(canceled_cb)
-            speech_recognizer.session_stopped.connect(session_stopped_cb)
+        except Exception as e:
+            logger.error(f"Error in file transcription: {str(e)}")
+            return {
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': f'File transcription error: {str(e)}',
+                'file_path': audio_file_path,
+                'language': language
+            }
 
-            # Start recognition
+    async def convert_speech_to_text_from_file_async(
+            self,
+            audio_file_path: str,
+            language: str = 'en-US',
+            timeout: float = 300,
+            timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Awaitable convert_speech_to_text_from_file: the wait for the recognizer to finish
+        the file is a future completed by its callbacks
+        """
+        deadline = time.monotonic() + timeout
+        results = {
+            'success': False,
+            'transcriptions': [],
+            'combined_text': '',
+            'error': None,
+            'file_path': audio_file_path,
+            'language': language
+        }
+        try:
             logger.info(f"Processing file: {audio_file_path}")
-            speech_recognizer.start_continuous_recognition()
+            file_seconds = AudioChunker.get_wav_duration(audio_file_path)
+            file_bytes = os.path.getsize(audio_file_path)
+            self._record_audio('file', file_bytes, file_bytes / file_seconds if file_seconds else None)
+            await self._recognize_with_retry_async(
+                lambda: self._run_recognition_async(self.engine.file_audio_config(audio_file_path), language,
+                                                    results, deadline=deadline, mode='file', timer=timer),
+                results, 'file', timer, deadline=deadline)
+            return self._finish_recognition(results)
 
-            # Wait for completion (increased timeout for file processing)
-            done.wait(timeout=300)  # 5 minutes max
+        except Exception as e:
+            logger.error(f"Error in file transcription: {str(e)}")
+            results.update({
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': f'File transcription error: {str(e)}'
+            })
+            return results
 
-            # Stop recognition
-            speech_recognizer.stop_continuous_recognition()
+    def convert_speech_to_text_from_stream(
+            self,
+            pcm_chunks: Iterable[bytes],
+            language: str = 'en-US',
+            sample_rate: int = 16000,
+            bits_per_sample: int = 16,
+            channels: int = 1,
+            timeout: float = 300,
+            timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert a stream of raw PCM chunks to text through a push stream.
+        Chunks are written as they arrive, so recognition overlaps with the upload
+        and memory use does not grow with the audio length. The first
+        stream_retry_buffer_bytes of audio are also kept, so that a session canceled
+        by a transient error can be replayed into a new one; longer streams are not retried.
+        timeout seconds from now the upload stops being forwarded and the session is
+        stopped; the segments recognized by then are returned with 'partial' set.
+        """
+        deadline = time.monotonic() + timeout
+        results = {
+            'success': False,
+            'transcriptions': [],
+            'combined_text': '',
+            'error': None,
+            'language': language,
+            'bytes_streamed': 0
+        }
+
+        # Pull the first chunk before opening a session: an empty stream (e.g. audio
+        # the voice activity gate found to be all silence) needs no recognizer at all
+        pcm_chunks = iter(pcm_chunks)
+        first_chunk = next(pcm_chunks, None)
+        if first_chunk is None:
+            results['error'] = 'No speech recognized in audio file'
+            return results
+
+        results['bytes_streamed'] = len(first_chunk)
+        replay = {'chunks': [first_chunk], 'bytes': len(first_chunk)}
+
+        def audio():
+            """Audio of one attempt: whatever earlier attempts consumed, then the rest of the upload"""
+            yield from list(replay['chunks'])
+            for chunk in pcm_chunks:
+                results['bytes_streamed'] += len(chunk)
+                replay['bytes'] += len(chunk)
+                if replay['bytes'] <= self.stream_retry_buffer_bytes:
+                    replay['chunks'].append(chunk)
+                else:
+                    # Too long to keep: this stream can no longer be replayed
+                    replay['chunks'].clear()
+                yield chunk
+
+        def recognize():
+            push_stream, audio_config = self.engine.stream_audio_config(sample_rate, bits_per_sample, channels)
+
+            def feed():
+                try:
+                    for chunk in audio():
+                        if results.get('error_code'):
+                            # The session was canceled; stop pushing audio nobody will recognize
+                            break
+                        if time.monotonic() >= deadline:
+                            # Out of time: end the audio here and keep what is recognized of it
+                            self._mark_partial(results, 'stream')
+                            break
+                        push_stream.write(chunk)
+                finally:
+                    # Closing signals end of audio so the session can drain and stop
+                    push_stream.close()
+
+            self._run_recognition(audio_config, language, results, feed=feed, deadline=deadline,
+                                  mode='stream', timer=timer)
+
+        try:
+            logger.info(f"Processing streamed audio: {sample_rate} Hz, {bits_per_sample}-bit, {channels} channel(s)")
+            self._recognize_with_retry(recognize, results, 'stream', timer,
+                                       replayable=lambda: replay['bytes'] <= self.stream_retry_buffer_bytes,
+                                       deadline=deadline)
+            return self._finish_recognition(results)
+
+        except Exception as e:
+            logger.error(f"Error in streamed transcription: {str(e)}")
+            results.update({
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': f'File transcription error: {str(e)}'
+            })
+            return results
+        finally:
+            self._record_audio('stream', results['bytes_streamed'], sample_rate * bits_per_sample // 8 * channels)
+
+    def convert_speech_to_text_from_file_chunked(
+            self,
+            audio_file_path: str,
+            language: str = 'en-US',
+            chunk_seconds: Optional[float] = None,
+            max_workers: Optional[int] = None,
+            timeout: float = 300
+    ) -> Dict[str, Any]:
+        """
+        Convert a long PCM WAV file to text by recognizing silence-aligned chunks in parallel.
+        Segment offsets are shifted back onto the original file's timeline. All chunks
+        share one deadline timeout seconds from now; chunks cut off by it, or not started
+        before it, leave the result marked 'partial'.
+        """
+        deadline = time.monotonic() + timeout
+        chunk_seconds = chunk_seconds or self.long_file_chunk_seconds
+        max_workers = max_workers or self.long_file_max_workers
+        chunk_dir = tempfile.mkdtemp(prefix='speak_easy_chunks_')
+
+        try:
+            try:
+                chunks = AudioChunker(chunk_seconds=chunk_seconds).split_wav(audio_file_path, chunk_dir)
+            except Exception as e:
+                # Not a PCM WAV we can split - fall back to a single recognizer session
+                logger.warning(f"Chunking unavailable for {audio_file_path}: {str(e)}")
+                return self.convert_speech_to_text_from_file(audio_file_path, language, timeout=timeout)
+
+            TEMP_FILE_BYTES.inc(sum(os.path.getsize(chunk['path']) for chunk in chunks), purpose='chunks')
+            if len(chunks) <= 1:
+                return self.convert_speech_to_text_from_file(audio_file_path, language,
+                                                             timeout=max(0.0, deadline - time.monotonic()))
+
+            logger.info(f"Transcribing {len(chunks)} chunks of {audio_file_path} with {max_workers} workers")
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                    thread_name_prefix='file-chunk') as executor:
+                chunk_results = list(executor.map(
+                    lambda chunk: self._recognize_chunk(chunk['path'], language, deadline),
+                    chunks
+                ))
+
+            results = {
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': None,
+                'file_path': audio_file_path,
+                'language': language,
+                'chunks': len(chunks),
+                'chunk_errors': []
+            }
+            if any(chunk_result.get('partial') for chunk_result in chunk_results):
+                results['partial'] = True
+
+            for index, (chunk, chunk_result) in enumerate(zip(chunks, chunk_results)):
+                shift = int(round(chunk['start_seconds'] * TICKS_PER_SECOND))
+                for transcription in chunk_result['transcriptions']:
+                    results['transcriptions'].append(dict(
+                        transcription,
+                        offset=transcription.get('offset', 0) + shift
+                    ))
+
+                # A chunk with no speech is not an error, nor one cut off by the deadline
+                # (the result is marked partial instead); anything else is reported
+                if chunk_result.get('error') and not chunk_result['transcriptions'] \
+                        and chunk_result['error'] not in ('No speech recognized in audio file',
+                                                          DEADLINE_EXCEEDED_ERROR):
+                    results['chunk_errors'].append({
+                        'chunk': index,
+                        'start_seconds': chunk['start_seconds'],
+                        'error': chunk_result['error']
+                    })
 
-            # Process results
             if results['transcriptions']:
                 results['success'] = True
                 results['combined_text'] = ' '.join([t['text'] for t in results['transcriptions']])
-            elif not results['error']:
+            elif results['chunk_errors']:
+                results['error'] = results['chunk_errors'][0]['error']
+                retry_after = max(chunk_result.get('retry_after', 0) for chunk_result in chunk_results)
+                if retry_after:
+                    results['retry_after'] = retry_after
+            elif results.get('partial'):
+                results['error'] = DEADLINE_EXCEEDED_ERROR
+            else:
                 results['error'] = 'No speech recognized in audio file'
 
             return results
 
         except Exception as e:
-            logger.error(f"Error in file transcription: {str(e)}")
+            logger.error(f"Error in chunked file transcription: {str(e)}")
             return {
                 'success': False,
                 'transcriptions': [],
@@ -469,21 +1348,53 @@ class AzureSpeechService:
                 'file_path': audio_file_path,
                 'language': language
             }
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    def _recognize_chunk(self, chunk_path: str, language: str, deadline: float) -> Dict[str, Any]:
+        """Recognize one chunk of a long file in the time left before deadline"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # Not started in time: skipped, and the file's result is partial
+            return {
+                'success': False,
+                'transcriptions': [],
+                'combined_text': '',
+                'error': DEADLINE_EXCEEDED_ERROR,
+                'file_path': chunk_path,
+                'language': language,
+                'partial': True
+            }
+        return self.convert_speech_to_text_from_file(chunk_path, language, timeout=remaining)
 
     def convert_speech_to_text(self, audio_data: bytes, language: str = 'en-US') -> Dict[str, Any]:
         """
         Legacy method for basic speech-to-text from audio data
         """
         try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
+            upload = AudioUploadStream(io.BytesIO(audio_data))
+            wav_format = upload.read_header()
+
+            if is_streamable_pcm(wav_format):
+                # PCM WAV goes straight into a push stream without touching disk
+                result = self.convert_speech_to_text_from_stream(
+                    upload.iter_pcm(),
+                    language,
+                    sample_rate=wav_format['sample_rate'],
+                    bits_per_sample=wav_format['bits_per_sample'],
+                    channels=wav_format['channels']
+                )
+            else:
+                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+                    temp_file.write(audio_data)
+                    temp_file_path = temp_file.name
+                TEMP_FILE_BYTES.inc(len(audio_data), purpose='upload')
 
-            # Use the file transcription method
-            result = self.convert_speech_to_text_from_file(temp_file_path, language)
+                # Use the file transcription method
+                result = self.convert_speech_to_text_from_file(temp_file_path, language)
 
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+                # Clean up temporary file
+                os.unlink(temp_file_path)
 
             # Convert to legacy format
             if result['success']:
@@ -511,37 +1422,36 @@ class AzureSpeechService:
 
     def get_supported_languages(self) -> List[Dict[str, str]]:
         """Get list of supported languages for speech recognition"""
-        return [
-            {'code': 'en-US', 'name': 'English (United States)'},
-            {'code': 'en-GB', 'name': 'English (United Kingdom)'},
-            {'code': 'en-IN', 'name': 'English (India)'},
-            {'code': 'hi-IN', 'name': 'Hindi (India)'},
-            {'code': 'es-ES', 'name': 'Spanish (Spain)'},
-            {'code': 'fr-FR', 'name': 'French (France)'},
-            {'code': 'de-DE', 'name': 'German (Germany)'},
-            {'code': 'ja-JP', 'name': 'Japanese (Japan)'},
-            {'code': 'ko-KR', 'name': 'Korean (Korea)'},
-            {'code': 'zh-CN', 'name': 'Chinese (Mandarin, China)'},
-            {'code': 'pt-BR', 'name': 'Portuguese (Brazil)'},
-            {'code': 'ru-RU', 'name': 'Russian (Russia)'},
-            {'code': 'ar-SA', 'name': 'Arabic (Saudi Arabia)'},
-            {'code': 'it-IT', 'name': 'Italian (Italy)'},
-            {'code': 'nl-NL', 'name': 'Dutch (Netherlands)'}
-        ]
+        return [dict(lang) for lang in SUPPORTED_LANGUAGES]
+
+    def get_recognizer_pool_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/wait counters of the speech config pool"""
+        return self.recognizer_factory.get_stats()
+
+    def get_endpoint_stats(self) -> Dict[str, Any]:
+        """Get load, rolling latency and error rate, and ejection state of every speech endpoint"""
+        return self.endpoint_pool.get_stats()
+
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Get the retry policy and the circuit breaker's state and counters"""
+        return {
+            'retry': self.retry_policy.get_stats(),
+            'circuit_breaker': self.circuit_breaker.get_stats()
+        }
 
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to Azure Speech Service"""
         try:
-            # Create a simple speech config to test authentication
-            test_config = speechsdk.SpeechConfig(
-                subscription=self.subscription_key,
-                endpoint=self.endpoint
-            )
+            # Create a simple speech config for every endpoint to test authentication
+            for endpoint in self.endpoint_pool.endpoints.values():
+                self.engine.build_speech_config(endpoint.subscription_key, endpoint.endpoint)
 
             return {
                 'success': True,
                 'endpoint': self.endpoint,
                 'region': self.region,
+                'endpoints': list(self.endpoint_pool.endpoints),
+                'engine': self.engine.name,
                 'platform': platform.system(),
                 'message': 'Connection configuration successful'
             }
@@ -0,0 +1,204 @@
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Iterable, Optional
+
+from services.recognition_resilience import is_service_failure
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_SESSIONS = REGISTRY.counter(
+    'speakeasy_endpoint_sessions_total', 'Recognizer sessions routed to each speech endpoint', ['endpoint'])
+ENDPOINT_FAILURES = REGISTRY.counter(
+    'speakeasy_endpoint_failures_total', 'Service failures of recognizer sessions by speech endpoint',
+    ['endpoint', 'code'])
+ENDPOINT_IN_FLIGHT = REGISTRY.gauge(
+    'speakeasy_endpoint_in_flight', 'Speech configs leased from each speech endpoint', ['endpoint'])
+ENDPOINT_LATENCY = REGISTRY.gauge(
+    'speakeasy_endpoint_latency_seconds', 'Rolling average time to first segment of each speech endpoint',
+    ['endpoint'], multiprocess_mode='all')
+
+
+def endpoint_url(region: str) -> str:
+    return f"https://{region}.api.cognitive.microsoft.com"
+
+
+class SpeechEndpoint:
+    """
+    One Speech resource: a region and subscription key, with at most max_concurrent
+    recognizers at once, plus the rolling health figures routing is based on
+    """
+
+    def __init__(self, name: str, region: str, subscription_key: Optional[str], max_concurrent: int = 100):
+        self.name = name
+        self.region = region
+        self.subscription_key = subscription_key
+        self.endpoint = endpoint_url(region)
+        self.max_concurrent = max(1, int(max_concurrent))
+
+        # Guarded by the EndpointPool's lock
+        self.in_flight = 0
+        self.latency = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.sessions = 0
+        self.failures = 0
+
+
+def parse_endpoints(
+        spec: Optional[str],
+        default_region: str,
+        default_key: Optional[str],
+        default_max_concurrent: int = 100
+) -> List[SpeechEndpoint]:
+    """
+    Endpoints from an AZURE_SPEECH_ENDPOINTS value: comma-separated region:key entries,
+    each optionally followed by :max_concurrent. Without a spec there is a single
+    endpoint for the default region and key.
+
+    Raises:
+        ValueError: If an entry has no region or key
+    """
+    if not spec or not spec.strip():
+        return [SpeechEndpoint(default_region, default_region, default_key, default_max_concurrent)]
+
+    endpoints = []
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [part.strip() for part in entry.split(':')]
+        if len(parts) not in (2, 3) or not parts[0] or not parts[1]:
+            raise ValueError(f"Speech endpoint entries must be region:key[:max_concurrent], got {parts[0]!r}")
+        # A second key in the same region gets its own name, e.g. eastus#2
+        same_region = sum(1 for endpoint in endpoints if endpoint.region == parts[0])
+        name = parts[0] if not same_region else f'{parts[0]}#{same_region + 1}'
+        endpoints.append(SpeechEndpoint(name, parts[0], parts[1],
+                                        int(parts[2]) if len(parts) == 3 else default_max_concurrent))
+    if not endpoints:
+        raise ValueError('AZURE_SPEECH_ENDPOINTS lists no endpoints')
+    return endpoints
+
+
+class EndpointPool:
+    """
+    Latency-aware routing of recognizer sessions over several speech endpoints.
+
+    Every endpoint keeps an exponentially weighted moving average of its time to
+    first segment and of its service failure rate. New sessions go to the endpoint
+    with the lowest score: that latency, inflated by its failure rate and by how
+    close it is to its concurrency cap. Endpoints with no latency sample yet score
+    zero, so each one is tried. After failure_threshold service failures in a row an
+    endpoint is ejected for eject_seconds and only used when every endpoint is ejected.
+    """
+
+    def __init__(
+            self,
+            endpoints: List[SpeechEndpoint],
+            latency_alpha: float = 0.2,
+            failure_threshold: int = 3,
+            eject_seconds: float = 30
+    ):
+        """
+        Args:
+            endpoints: The endpoints to route over
+            latency_alpha: Weight of the newest sample in the moving averages (0 to 1)
+            failure_threshold: Consecutive service failures that eject an endpoint (0 never ejects)
+            eject_seconds: How long an ejected endpoint is avoided
+        """
+        if not endpoints:
+            raise ValueError('At least one speech endpoint is required')
+        self.endpoints = {endpoint.name: endpoint for endpoint in endpoints}
+        self.latency_alpha = min(1.0, max(0.01, float(latency_alpha)))
+        self.failure_threshold = max(0, int(failure_threshold))
+        self.eject_seconds = max(0.0, float(eject_seconds))
+        self._lock = threading.Lock()
+
+    def ranked(self, avoid: Iterable[str] = ()) -> List[SpeechEndpoint]:
+        """
+        Endpoints with free capacity, best first. Ejected endpoints, and those named
+        in avoid (e.g. ones that already failed this request), come after all others.
+        """
+        avoid = set(avoid)
+        now = time.monotonic()
+        with self._lock:
+            available = [endpoint for endpoint in self.endpoints.values()
+                         if endpoint.in_flight < endpoint.max_concurrent]
+            return sorted(available, key=lambda endpoint: (
+                endpoint.name in avoid or endpoint.ejected_until > now,
+                self._score(endpoint)
+            ))
+
+    @staticmethod
+    def _score(endpoint: SpeechEndpoint) -> float:
+        """Expected latency of a new session; must be called with the lock held"""
+        load = endpoint.in_flight / float(endpoint.max_concurrent)
+        return (endpoint.latency or 0.0) * (1 + load) / max(0.05, 1 - endpoint.error_rate)
+
+    def acquire(self, endpoint: SpeechEndpoint) -> bool:
+        """Take a concurrency slot of the endpoint; False if it is at its cap"""
+        with self._lock:
+            if endpoint.in_flight >= endpoint.max_concurrent:
+                return False
+            endpoint.in_flight += 1
+            endpoint.sessions += 1
+            in_flight = endpoint.in_flight
+        ENDPOINT_SESSIONS.inc(endpoint=endpoint.name)
+        ENDPOINT_IN_FLIGHT.set(in_flight, endpoint=endpoint.name)
+        return True
+
+    def release(self, endpoint: SpeechEndpoint) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+            in_flight = endpoint.in_flight
+        ENDPOINT_IN_FLIGHT.set(in_flight, endpoint=endpoint.name)
+
+    def record_latency(self, endpoint: SpeechEndpoint, seconds: float) -> None:
+        """Fold a time to first segment into the endpoint's moving average"""
+        with self._lock:
+            if endpoint.latency is None:
+                endpoint.latency = seconds
+            else:
+                endpoint.latency += self.latency_alpha * (seconds - endpoint.latency)
+            latency = endpoint.latency
+        ENDPOINT_LATENCY.set(latency, endpoint=endpoint.name)
+
+    def record_outcome(self, endpoint: SpeechEndpoint, code: Optional[str]) -> None:
+        """Record how a session ended, by CancellationErrorCode (None if it was not canceled by an error)"""
+        failed = is_service_failure(code)
+        with self._lock:
+            endpoint.error_rate += self.latency_alpha * ((1.0 if failed else 0.0) - endpoint.error_rate)
+            if not failed:
+                endpoint.consecutive_failures = 0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            ejected = self.failure_threshold and endpoint.consecutive_failures >= self.failure_threshold
+            if ejected:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                endpoint.consecutive_failures = 0
+        ENDPOINT_FAILURES.inc(endpoint=endpoint.name, code=code)
+        if ejected:
+            logger.warning(f"Speech endpoint {endpoint.name} ejected for {self.eject_seconds:g}s after repeated {code}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint load, moving averages, counters and ejection state (keys are never included)"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint.name: {
+                    'region': endpoint.region,
+                    'endpoint': endpoint.endpoint,
+                    'in_flight': endpoint.in_flight,
+                    'max_concurrent': endpoint.max_concurrent,
+                    'latency_ms': round(endpoint.latency * 1000, 2) if endpoint.latency is not None else None,
+                    'error_rate': round(endpoint.error_rate, 4),
+                    'score': round(self._score(endpoint), 4),
+                    'sessions': endpoint.sessions,
+                    'failures': endpoint.failures,
+                    'ejected_seconds': round(max(0.0, endpoint.ejected_until - now), 1)
+                }
+                for endpoint in self.endpoints.values()
+            }
@@ -0,0 +1,336 @@
+import os
+import json
+import uuid
+import time
+import shutil
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: there are no gunicorn workers, so no other process competes for claims
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_DONE = 'done'
+JOB_STATUS_FAILED = 'failed'
+
+FINISHED_STATUSES = {JOB_STATUS_DONE, JOB_STATUS_FAILED}
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the number of unfinished jobs reached the configured limit"""
+
+
+class TranscriptionJobManager:
+    """
+    Runs file transcriptions in the background on a fixed-size thread pool.
+
+    Every job lives in its own directory under storage_dir holding the uploaded
+    audio, a job.json record and a claim file with the pid of the worker that
+    owns it. Because the records are on disk, any gunicorn worker can report a
+    job's status, and unfinished jobs whose owner died are picked up again by
+    the next worker that starts.
+    """
+
+    AUDIO_FILENAME = 'audio'
+    RECORD_FILENAME = 'job.json'
+    CLAIM_FILENAME = 'claim'
+    CLAIM_LOCK_FILENAME = 'claim.lock'
+
+    def __init__(
+            self,
+            transcribe_fn: Callable[[str, str, Dict[str, Any]], Dict[str, Any]],
+            storage_dir: str,
+            max_workers: int = 2,
+            max_pending: int = 100,
+            retention_seconds: int = 24 * 3600
+    ):
+        """
+        Args:
+            transcribe_fn: Called as transcribe_fn(audio_path, language, job) and
+                must return the JSON-serializable job result
+            storage_dir: Directory holding one sub-directory per job
+            max_workers: Number of jobs transcribed concurrently
+            max_pending: Maximum number of queued or running jobs owned by this worker
+            retention_seconds: Finished jobs older than this are purged
+        """
+        self.transcribe_fn = transcribe_fn
+        self.storage_dir = storage_dir
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.retention_seconds = retention_seconds
+
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='file-job')
+        self._lock = threading.Lock()
+        self._pending = set()
+
+        self.recover_jobs()
+
+    # ------------------------------------------------------------------
+    # Paths and record persistence
+    # ------------------------------------------------------------------
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.storage_dir, job_id)
+
+    def _record_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), self.RECORD_FILENAME)
+
+    def _audio_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), self.AUDIO_FILENAME)
+
+    def _claim_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), self.CLAIM_FILENAME)
+
+    def _write_record(self, job: Dict[str, Any]) -> None:
+        """Atomically replace the job record on disk"""
+        record_path = self._record_path(job['job_id'])
+        temp_path = f"{record_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        os.replace(temp_path, record_path)
+
+    def _read_record(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._record_path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_valid_job_id(job_id: str) -> bool:
+        try:
+            return uuid.UUID(job_id).hex == job_id
+        except (ValueError, TypeError, AttributeError):
+            return False
+
+    # ------------------------------------------------------------------
+    # Ownership
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @contextmanager
+    def _claim_lock(self, job_id: str):
+        """Exclusive lock serializing the claim checks and takeovers of one job across workers"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self._job_dir(job_id), self.CLAIM_LOCK_FILENAME), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _claim(self, job_id: str) -> bool:
+        """
+        Take ownership of a job, replacing a claim left by a dead worker. The owner check
+        and the takeover happen under the job's claim lock, so two workers recovering the
+        same job cannot both win; the new claim is renamed into place and read back.
+        """
+        claim_path = self._claim_path(job_id)
+        try:
+            with self._claim_lock(job_id):
+                try:
+                    with open(claim_path, 'r') as f:
+                        owner_pid = int(f.read().strip() or 0)
+                except FileNotFoundError:
+                    owner_pid = 0
+                if owner_pid == os.getpid():
+                    return True
+                if owner_pid and self._pid_alive(owner_pid):
+                    return False
+
+                temp_path = f"{claim_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w') as f:
+                    f.write(str(os.getpid()))
+                os.replace(temp_path, claim_path)
+                with open(claim_path, 'r') as f:
+                    return f.read().strip() == str(os.getpid())
+        except (OSError, ValueError):
+            return False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, audio_path: str, language: str, filename: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Queue an uploaded audio file for background transcription
+
+        Args:
+            audio_path: Path of the uploaded audio; the file is moved into the job store
+            language: Recognition language code
+            filename: Original filename reported back to the client
+            options: Extra JSON-serializable settings passed through to transcribe_fn
+
+        Returns:
+            The initial job record
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                raise JobQueueFull(f'Too many pending transcription jobs (limit {self.max_pending})')
+
+            job_id = uuid.uuid4().hex
+            self._pending.add(job_id)
+
+        try:
+            os.makedirs(self._job_dir(job_id))
+            shutil.move(audio_path, self._audio_path(job_id))
+            self._claim(job_id)
+
+            job = {
+                'job_id': job_id,
+                'status': JOB_STATUS_QUEUED,
+                'filename': filename,
+                'language': language,
+                'options': options or {},
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'attempts': 0,
+                'result': None,
+                'error': None
+            }
+            self._write_record(job)
+            self._executor.submit(self._run, job_id)
+        except Exception:
+            with self._lock:
+                self._pending.discard(job_id)
+            shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+            raise
+
+        logger.info(f"Queued transcription job {job_id} for {filename} in {language}")
+        self.purge_expired()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record by ID, regardless of which worker owns it"""
+        if not self._is_valid_job_id(job_id):
+            return None
+        return self._read_record(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor occupancy for this worker"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': pending
+        }
+
+    def recover_jobs(self) -> int:
+        """Re-queue unfinished jobs whose owning worker is no longer alive"""
+        recovered = 0
+        for job_id in os.listdir(self.storage_dir):
+            if not self._is_valid_job_id(job_id):
+                continue
+
+            job = self._read_record(job_id)
+            if not job or job['status'] in FINISHED_STATUSES:
+                continue
+
+            if not self._claim(job_id):
+                continue
+
+            if not os.path.exists(self._audio_path(job_id)):
+                job.update({
+                    'status': JOB_STATUS_FAILED,
+                    'finished_at': time.time(),
+                    'error': 'Job audio was lost before processing completed'
+                })
+                self._write_record(job)
+                continue
+
+            with self._lock:
+                if job_id in self._pending:
+                    continue
+                self._pending.add(job_id)
+
+            job['status'] = JOB_STATUS_QUEUED
+            self._write_record(job)
+            self._executor.submit(self._run, job_id)
+            recovered += 1
+
+        if recovered:
+            logger.info(f"Recovered {recovered} unfinished transcription jobs")
+        return recovered
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs older than the retention period"""
+        purged = 0
+        cutoff = time.time() - self.retention_seconds
+        for job_id in os.listdir(self.storage_dir):
+            if not self._is_valid_job_id(job_id):
+                continue
+            job = self._read_record(job_id)
+            if job and job['status'] in FINISHED_STATUSES and (job.get('finished_at') or 0) < cutoff:
+                shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+                purged += 1
+        return purged
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self, job_id: str) -> None:
+        job = self._read_record(job_id)
+        if job is None:
+            with self._lock:
+                self._pending.discard(job_id)
+            return
+
+        job.update({
+            'status': JOB_STATUS_RUNNING,
+            'started_at': time.time(),
+            'attempts': job.get('attempts', 0) + 1
+        })
+        self._write_record(job)
+
+        try:
+            result = self.transcribe_fn(self._audio_path(job_id), job['language'], job)
+            job.update({
+                'status': JOB_STATUS_DONE if result.get('success') else JOB_STATUS_FAILED,
+                'result': result,
+                'error': None if result.get('success') else result.get('error')
+            })
+        except Exception as e:
+            logger.error(f"Transcription job {job_id} failed: {str(e)}")
+            job.update({
+                'status': JOB_STATUS_FAILED,
+                'error': f'Job error: {str(e)}'
+            })
+        finally:
+            job['finished_at'] = time.time()
+            self._write_record(job)
+            try:
+                os.unlink(self._audio_path(job_id))
+            except OSError:
+                pass
+            with self._lock:
+                self._pending.discard(job_id)
+
+        logger.info(f"Transcription job {job_id} finished with status {job['status']}")
@@ -0,0 +1,398 @@
+import os
+import queue
+import wave
+import random
+import logging
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The Speech SDK reports offsets and durations in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+ENGINE_AZURE = 'azure'
+ENGINE_FAKE = 'fake'
+
+# CancellationReason name of a recognition that failed
+CANCELLATION_ERROR = 'Error'
+
+
+class RecognitionEngine(ABC):
+    """
+    Interface between AzureSpeechService and the speech backend that recognizes audio.
+
+    Recognizers returned by an engine follow the Speech SDK's event model: they expose
+    recognized, session_started, session_stopped and canceled signals with connect(),
+    plus start/stop_continuous_recognition and their _async variants, so the service
+    code is the same for every engine. Events are inspected only through
+    is_recognized and is_error.
+    """
+
+    name = None
+
+    # Engines talking to a real service need a subscription key
+    requires_credentials = True
+
+    @abstractmethod
+    def build_speech_config(self, subscription_key: str, endpoint: str, language: Optional[str] = None) -> Any:
+        """Build a recognizer configuration, bound to one recognition language when given"""
+
+    @abstractmethod
+    def create_recognizer(self, speech_config: Any, audio_config: Any) -> Any:
+        """Recognizer for one speech config and audio input"""
+
+    @abstractmethod
+    def file_audio_config(self, path: str) -> Any:
+        """Audio input reading an audio file"""
+
+    @abstractmethod
+    def stream_audio_config(self, sample_rate: int = 16000, bits_per_sample: int = 16,
+                            channels: int = 1) -> Tuple[Any, Any]:
+        """
+        Audio input fed by the caller
+
+        Returns:
+            (push_stream, audio_config); write PCM with push_stream.write and close it at end of audio
+        """
+
+    @abstractmethod
+    def microphone_audio_config(self) -> Any:
+        """Audio input from the default microphone"""
+
+    @abstractmethod
+    def is_recognized(self, evt) -> bool:
+        """True if a recognized event carries final recognized speech"""
+
+    @abstractmethod
+    def cancellation_details(self, evt) -> Dict[str, str]:
+        """
+        Why a canceled event fired
+
+        Returns:
+            Dictionary with the CancellationReason name as 'reason', the
+            CancellationErrorCode name as 'code' and the 'error_details' text
+        """
+
+    def is_error(self, evt) -> bool:
+        """True if a canceled event was caused by an error"""
+        return self.cancellation_details(evt)['reason'] == CANCELLATION_ERROR
+
+
+class AzureRecognitionEngine(RecognitionEngine):
+    """RecognitionEngine backed by the Azure Speech SDK"""
+
+    name = ENGINE_AZURE
+
+    def __init__(self):
+        # Imported here so that other engines work without the SDK installed
+        try:
+            import azure.cognitiveservices.speech as speechsdk
+        except ImportError:
+            raise ImportError("Azure Speech SDK not found. Install it with: pip install azure-cognitiveservices-speech")
+        self.speechsdk = speechsdk
+
+    def build_speech_config(self, subscription_key: str, endpoint: str, language: Optional[str] = None):
+        speech_config = self.speechsdk.SpeechConfig(
+            subscription=subscription_key,
+            endpoint=endpoint
+        )
+        if language:
+            speech_config.speech_recognition_language = language
+        return speech_config
+
+    def create_recognizer(self, speech_config, audio_config):
+        return self.speechsdk.SpeechRecognizer(
+            speech_config=speech_config,
+            audio_config=audio_config
+        )
+
+    def file_audio_config(self, path: str):
+        return self.speechsdk.audio.AudioConfig(filename=path)
+
+    def stream_audio_config(self, sample_rate: int = 16000, bits_per_sample: int = 16, channels: int = 1):
+        stream_format = self.speechsdk.audio.AudioStreamFormat(
+            samples_per_second=sample_rate,
+            bits_per_sample=bits_per_sample,
+            channels=channels
+        )
+        push_stream = self.speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+        return push_stream, self.speechsdk.audio.AudioConfig(stream=push_stream)
+
+    def microphone_audio_config(self):
+        return self.speechsdk.audio.AudioConfig(use_default_microphone=True)
+
+    def is_recognized(self, evt) -> bool:
+        return evt.result.reason == self.speechsdk.ResultReason.RecognizedSpeech
+
+    def cancellation_details(self, evt) -> Dict[str, str]:
+        details = evt.cancellation_details
+        return {
+            'reason': details.reason.name,
+            'code': details.code.name,
+            'error_details': details.error_details or ''
+        }
+
+
+class FakeSignal:
+    """Minimal stand-in for an SDK EventSignal"""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def connect(self, callback) -> None:
+        self._callbacks.append(callback)
+
+    def fire(self, evt) -> None:
+        for callback in list(self._callbacks):
+            callback(evt)
+
+
+class FakeFuture:
+    """Already-completed result of a fake _async call"""
+
+    def get(self) -> None:
+        return None
+
+
+class FakePushAudioStream:
+    """Push stream of the fake engine; the recognizer thread reads what is written"""
+
+    def __init__(self, sample_rate: int, bits_per_sample: int, channels: int):
+        self.bytes_per_second = sample_rate * channels * bits_per_sample // 8
+        self._queue = queue.Queue()
+
+    def write(self, data: bytes) -> None:
+        self._queue.put(bytes(data))
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+    def read(self, timeout: float) -> Optional[bytes]:
+        """Next written chunk; b'' if none arrived within the timeout, None once closed"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return b''
+
+
+class FakeRecognizer:
+    """
+    Recognizer of the fake engine. A background thread consumes the audio and emits
+    one recognized event per segment_seconds of audio, each after a delay of
+    latency_per_second times the segment's length, then session_stopped at end of audio.
+    """
+
+    def __init__(self, engine: 'FakeRecognitionEngine', speech_config, audio_config):
+        self.engine = engine
+        self.language = speech_config.speech_recognition_language
+        self.audio_config = audio_config
+        self.session_id = f'fake-{next(engine.session_ids)}'
+
+        self.recognized = FakeSignal()
+        self.session_started = FakeSignal()
+        self.session_stopped = FakeSignal()
+        self.canceled = FakeSignal()
+
+        self._stop_event = threading.Event()
+        self._stopped_lock = threading.Lock()
+        self._stopped = False
+        self._thread = None
+        self._position_ticks = 0
+
+    def start_continuous_recognition(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=self.session_id, daemon=True)
+        self._thread.start()
+
+    def start_continuous_recognition_async(self) -> FakeFuture:
+        self.start_continuous_recognition()
+        return FakeFuture()
+
+    def stop_continuous_recognition(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._fire_stopped()
+
+    def stop_continuous_recognition_async(self) -> FakeFuture:
+        self.stop_continuous_recognition()
+        return FakeFuture()
+
+    def _fire_stopped(self) -> None:
+        with self._stopped_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self.session_stopped.fire(SimpleNamespace(session_id=self.session_id))
+
+    def _run(self) -> None:
+        self.session_started.fire(SimpleNamespace(session_id=self.session_id))
+        try:
+            if self._stop_event.wait(self.engine.startup_seconds):
+                return
+            failure_code = self.engine.next_failure()
+            if failure_code:
+                self.canceled.fire(SimpleNamespace(reason=CANCELLATION_ERROR, code=failure_code,
+                                                   error_details=f'Injected {failure_code} failure',
+                                                   session_id=self.session_id))
+                return
+            kind = self.audio_config.kind
+            if kind == 'file':
+                self._recognize_audio(*self._read_file(self.audio_config.path))
+            elif kind == 'stream':
+                stream = self.audio_config.stream
+                self._recognize_audio(self._iter_stream(stream), stream.bytes_per_second)
+            else:
+                # Microphone: one segment per segment_seconds of wall time until stopped
+                while not self._stop_event.wait(self.engine.segment_seconds):
+                    self._emit(self.engine.segment_seconds)
+        except Exception as e:
+            logger.error(f"Fake recognizer {self.session_id} failed: {str(e)}")
+            self.canceled.fire(SimpleNamespace(reason=CANCELLATION_ERROR, code='RuntimeError',
+                                               error_details=str(e), session_id=self.session_id))
+        finally:
+            self._fire_stopped()
+
+    @staticmethod
+    def _read_file(path: str) -> Tuple[Iterable[bytes], int]:
+        """Audio bytes of a file and their byte rate; non-WAV files are assumed to be 16 kHz 16-bit mono"""
+        try:
+            with wave.open(path, 'rb') as wav:
+                bytes_per_second = wav.getframerate() * wav.getnchannels() * wav.getsampwidth()
+                return [wav.readframes(wav.getnframes())], bytes_per_second
+        except (wave.Error, EOFError):
+            return [b'\0' * os.path.getsize(path)], 32000
+
+    def _iter_stream(self, stream: FakePushAudioStream) -> Iterator[bytes]:
+        while not self._stop_event.is_set():
+            chunk = stream.read(timeout=0.1)
+            if chunk is None:
+                return
+            if chunk:
+                yield chunk
+
+    def _recognize_audio(self, chunks: Iterable[bytes], bytes_per_second: int) -> None:
+        segment_bytes = max(1, int(self.engine.segment_seconds * bytes_per_second))
+        pending = 0
+        for chunk in chunks:
+            pending += len(chunk)
+            while pending >= segment_bytes:
+                if not self._emit(segment_bytes / float(bytes_per_second)):
+                    return
+                pending -= segment_bytes
+        if pending and not self._stop_event.is_set():
+            self._emit(pending / float(bytes_per_second))
+
+    def _emit(self, audio_seconds: float) -> bool:
+        """Wait out the simulated processing time, then emit one segment; False if stopped meanwhile"""
+        if self._stop_event.wait(self.engine.latency_per_second * audio_seconds):
+            return False
+        duration = int(round(audio_seconds * TICKS_PER_SECOND))
+        result = SimpleNamespace(
+            reason=FakeRecognitionEngine.RESULT_RECOGNIZED,
+            text=self.engine.text,
+            offset=self._position_ticks,
+            duration=duration
+        )
+        self._position_ticks += duration
+        self.recognized.fire(SimpleNamespace(result=result, session_id=self.session_id))
+        return True
+
+
+class FakeRecognitionEngine(RecognitionEngine):
+    """
+    Deterministic offline engine for load tests and CI without network or Azure key.
+    Every segment_seconds of audio produce one segment with the configured text,
+    delivered after latency_per_second seconds per second of audio (a real-time factor).
+    A failure_rate share of sessions is canceled right after startup with one of
+    failure_codes, to exercise retries and the circuit breaker.
+    """
+
+    name = ENGINE_FAKE
+    requires_credentials = False
+
+    RESULT_RECOGNIZED = 'recognized'
+
+    def __init__(
+            self,
+            text: str = 'the quick brown fox jumps over the lazy dog',
+            latency_per_second: float = 0.0,
+            segment_seconds: float = 5.0,
+            startup_seconds: float = 0.0,
+            failure_rate: float = 0.0,
+            failure_codes: Iterable[str] = ('ServiceTimeout',),
+            seed: Optional[int] = None
+    ):
+        """
+        Args:
+            text: Text of every recognized segment
+            latency_per_second: Seconds of simulated processing per second of audio
+            segment_seconds: Audio length covered by each segment
+            startup_seconds: Simulated connection setup time before recognition starts
+            failure_rate: Share of sessions (0 to 1) canceled with an injected error
+            failure_codes: CancellationErrorCode names the injected errors are drawn from
+            seed: Seed of this engine's failure draws, so a run can be repeated; None seeds from the OS
+        """
+        self.text = text
+        self.latency_per_second = max(0.0, latency_per_second)
+        self.segment_seconds = max(0.01, segment_seconds)
+        self.startup_seconds = max(0.0, startup_seconds)
+        self.failure_rate = min(1.0, max(0.0, failure_rate))
+        self.failure_codes = list(failure_codes) or ['ServiceTimeout']
+        self.session_ids = itertools.count(1)
+        self._random = random.Random(seed)
+
+    def next_failure(self) -> Optional[str]:
+        """CancellationErrorCode to cancel a starting session with, or None to let it recognize"""
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return self._random.choice(self.failure_codes)
+        return None
+
+    def build_speech_config(self, subscription_key: str, endpoint: str, language: Optional[str] = None):
+        return SimpleNamespace(endpoint=endpoint, speech_recognition_language=language)
+
+    def create_recognizer(self, speech_config, audio_config) -> FakeRecognizer:
+        return FakeRecognizer(self, speech_config, audio_config)
+
+    def file_audio_config(self, path: str):
+        return SimpleNamespace(kind='file', path=path)
+
+    def stream_audio_config(self, sample_rate: int = 16000, bits_per_sample: int = 16, channels: int = 1):
+        push_stream = FakePushAudioStream(sample_rate, bits_per_sample, channels)
+        return push_stream, SimpleNamespace(kind='stream', stream=push_stream)
+
+    def microphone_audio_config(self):
+        return SimpleNamespace(kind='microphone')
+
+    def is_recognized(self, evt) -> bool:
+        return evt.result.reason == self.RESULT_RECOGNIZED
+
+    def cancellation_details(self, evt) -> Dict[str, str]:
+        return {'reason': evt.reason, 'code': evt.code, 'error_details': evt.error_details}
+
+
+def create_recognition_engine(name: Optional[str] = None) -> RecognitionEngine:
+    """
+    Build the configured recognition engine
+
+    Args:
+        name: 'azure' (default) or 'fake'; the fake engine reads its FAKE_ENGINE_* settings from the environment
+    """
+    name = (name or ENGINE_AZURE).lower()
+    if name == ENGINE_AZURE:
+        return AzureRecognitionEngine()
+    if name == ENGINE_FAKE:
+        return FakeRecognitionEngine(
+            text=os.getenv('FAKE_ENGINE_TEXT', 'the quick brown fox jumps over the lazy dog'),
+            latency_per_second=float(os.getenv('FAKE_ENGINE_LATENCY_PER_SECOND', 0)),
+            segment_seconds=float(os.getenv('FAKE_ENGINE_SEGMENT_SECONDS', 5)),
+            startup_seconds=float(os.getenv('FAKE_ENGINE_STARTUP_SECONDS', 0)),
+            failure_rate=float(os.getenv('FAKE_ENGINE_FAILURE_RATE', 0)),
+            failure_codes=[code.strip() for code in os.getenv('FAKE_ENGINE_FAILURE_CODES', 'ServiceTimeout').split(',')
+                           if code.strip()],
+            seed=int(os.environ['FAKE_ENGINE_SEED']) if os.getenv('FAKE_ENGINE_SEED') else None
+        )
+    raise ValueError(f'Unknown speech engine: {name}')
@@ -0,0 +1,222 @@
+import math
+import time
+import random
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# CancellationErrorCode names of failures that may succeed when tried again
+TRANSIENT_ERROR_CODES = frozenset({
+    'ConnectionFailure',
+    'ServiceTimeout',
+    'ServiceError',
+    'ServiceUnavailable',
+    'TooManyRequests',
+    'ServiceRedirectTemporary'
+})
+
+# Failures that say the speech service is unusable rather than the request being bad:
+# the transient ones, plus credentials the service no longer accepts
+SERVICE_FAILURE_CODES = TRANSIENT_ERROR_CODES | {'AuthenticationFailure', 'Forbidden'}
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+# Values of the circuit state gauge
+CIRCUIT_STATE_VALUES = {CIRCUIT_CLOSED: 0, CIRCUIT_HALF_OPEN: 1, CIRCUIT_OPEN: 2}
+
+RECOGNITION_RETRIES = REGISTRY.counter(
+    'speakeasy_recognition_retries_total', 'Recognitions retried after a transient cancellation', ['mode', 'code'])
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    'speakeasy_circuit_breaker_rejections_total', 'Recognitions refused while the circuit breaker was open')
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    'speakeasy_circuit_breaker_transitions_total', 'Circuit breaker state changes', ['state'])
+
+
+def is_transient(code: Optional[str]) -> bool:
+    """True if a recognition canceled with this CancellationErrorCode is worth retrying"""
+    return code in TRANSIENT_ERROR_CODES
+
+
+def is_service_failure(code: Optional[str]) -> bool:
+    """True if this CancellationErrorCode counts against the circuit breaker"""
+    return code in SERVICE_FAILURE_CODES
+
+
+class CircuitOpen(RuntimeError):
+    """Raised when the circuit breaker refuses a call; retry_after is the remaining cooldown in whole seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around recognizer sessions.
+
+    After failure_threshold service failures in a row the circuit opens and every
+    call fails fast for cooldown_seconds. Then a single probe is let through
+    (half-open): its success closes the circuit, its failure opens it for another
+    cooldown. A probe that never reports back is replaced after a cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30):
+        """
+        Args:
+            failure_threshold: Consecutive service failures that open the circuit (0 disables the breaker)
+            cooldown_seconds: How long the circuit stays open before a probe is allowed
+        """
+        self.failure_threshold = max(0, int(failure_threshold))
+        self.cooldown_seconds = max(0.0, float(cooldown_seconds))
+
+        self._lock = threading.Lock()
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._stats = {'failures': 0, 'successes': 0, 'rejected': 0, 'opened': 0}
+
+    def allow(self) -> None:
+        """
+        Admit a call, or fail fast
+
+        Raises:
+            CircuitOpen: If the circuit is open, or half-open with its probe in flight
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return
+            now = time.monotonic()
+            if self._state == CIRCUIT_OPEN and now - self._opened_at >= self.cooldown_seconds:
+                self._transition(CIRCUIT_HALF_OPEN)
+            if self._state == CIRCUIT_HALF_OPEN and (
+                    self._probe_started is None or now - self._probe_started >= self.cooldown_seconds):
+                self._probe_started = now
+                return
+
+            self._stats['rejected'] += 1
+            CIRCUIT_REJECTIONS.inc()
+            remaining = self.cooldown_seconds - (now - (self._probe_started or self._opened_at))
+            raise CircuitOpen('Speech service is unavailable, recognition suspended after repeated failures',
+                              max(1, int(math.ceil(remaining))))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats['successes'] += 1
+            self._consecutive_failures = 0
+            if self._state != CIRCUIT_CLOSED:
+                self._transition(CIRCUIT_CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats['failures'] += 1
+            self._consecutive_failures += 1
+            if not self.failure_threshold:
+                return
+            if self._state == CIRCUIT_HALF_OPEN or (
+                    self._state == CIRCUIT_CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._stats['opened'] += 1
+                self._transition(CIRCUIT_OPEN)
+
+    def record(self, code: Optional[str]) -> None:
+        """Record the outcome of a recognition by its CancellationErrorCode (None if not canceled by an error)"""
+        if is_service_failure(code):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _transition(self, state: str) -> None:
+        """Move to a new state; must be called with the lock held"""
+        if state != CIRCUIT_HALF_OPEN:
+            self._probe_started = None
+        logger.warning(f"Recognition circuit breaker {self._state} -> {state}")
+        self._state = state
+        CIRCUIT_TRANSITIONS.inc(state=state)
+
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def state_value(self) -> int:
+        """State as a number for the metrics gauge: 0 closed, 1 half-open, 2 open"""
+        return CIRCUIT_STATE_VALUES[self.state()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the state, settings and outcome counters"""
+        with self._lock:
+            return dict(
+                self._stats,
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                failure_threshold=self.failure_threshold,
+                cooldown_seconds=self.cooldown_seconds
+            )
+
+
+class RetryPolicy:
+    """
+    Retries of recognitions canceled by a transient error, with exponential backoff
+    and full jitter. Each request may retry at most max_retries times, and only while
+    the retries would finish within budget_seconds of its first attempt, so a slow
+    or throttled service cannot hold a request (and its recognizer slot) for long.
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 2,
+            base_delay: float = 0.5,
+            max_delay: float = 8,
+            budget_seconds: float = 30
+    ):
+        """
+        Args:
+            max_retries: Retries per request after the first attempt (0 disables retries)
+            base_delay: Backoff ceiling of the first retry; it doubles with every further retry
+            max_delay: Largest backoff ceiling
+            budget_seconds: Wall time after the first attempt started beyond which no retry is begun
+        """
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.budget_seconds = max(0.0, float(budget_seconds))
+
+    def backoff(self, retry: int) -> float:
+        """Seconds to wait before the given retry (0 for the first): uniform up to the exponential ceiling"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    def next_delay(self, code: Optional[str], retry: int, started: float) -> Optional[float]:
+        """
+        Backoff before retrying a recognition that ended with this CancellationErrorCode
+
+        Args:
+            code: CancellationErrorCode of the attempt, None if it was not canceled by an error
+            retry: Retries made so far
+            started: time.monotonic() when the first attempt started
+
+        Returns:
+            Seconds to wait before the next attempt, or None if it should not be retried
+        """
+        if not is_transient(code) or retry >= self.max_retries:
+            return None
+        delay = self.backoff(retry)
+        if time.monotonic() + delay - started > self.budget_seconds:
+            return None
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_retries': self.max_retries,
+            'base_delay': self.base_delay,
+            'max_delay': self.max_delay,
+            'budget_seconds': self.budget_seconds,
+            'transient_codes': sorted(TRANSIENT_ERROR_CODES)
+        }
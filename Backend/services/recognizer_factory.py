@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterable, Optional
+
+from services.endpoint_pool import EndpointPool, SpeechEndpoint
+from services.recognition_engine import RecognitionEngine
+
+logger = logging.getLogger(__name__)
+
+
+# Marks a pool slot reserved for a config that still has to be built
+_BUILD = object()
+
+# Longest an async waiter sleeps between pool checks, in case its wakeup was taken by a thread
+ASYNC_WAIT_RECHECK_SECONDS = 1.0
+
+
+class RecognizerPoolExhausted(RuntimeError):
+    """Raised when no SpeechConfig becomes free before the acquire timeout"""
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RecognizerFactory:
+    """
+    Builds speech recognizers from bounded pools of per-language SpeechConfig objects
+    created by the recognition engine, one set of pools per speech endpoint.
+
+    Each pooled config has its recognition language set once when it is built and is
+    never mutated afterwards, so concurrent requests never share mutable state.
+    A config is leased for the lifetime of the recognizer built from it, from the
+    best endpoint the EndpointPool ranks that still has capacity. Event-loop
+    callers use acquire_config_async, which waits for a free config on the loop
+    instead of blocking a thread.
+    """
+
+    def __init__(
+            self,
+            engine: RecognitionEngine,
+            endpoint_pool: EndpointPool,
+            languages: List[str],
+            max_configs_per_language: int = 16,
+            acquire_timeout: float = 30.0,
+            prewarm: bool = True
+    ):
+        """
+        Args:
+            engine: Recognition engine that builds configs and recognizers
+            endpoint_pool: Speech endpoints to route leases over
+            languages: Languages with pooled configs; others are built on demand and not reused
+            max_configs_per_language: Pooled configs per language and endpoint
+            acquire_timeout: Default seconds to wait for a free config
+            prewarm: Build one config per language and endpoint up front
+        """
+        self.engine = engine
+        self.endpoint_pool = endpoint_pool
+        self.max_configs_per_language = max(1, int(max_configs_per_language))
+        self.acquire_timeout = acquire_timeout
+
+        self._condition = threading.Condition()
+        self._languages = set(languages)
+        self._pools = {
+            name: {language: {'idle': deque(), 'created': 0, 'in_use': 0} for language in languages}
+            for name in endpoint_pool.endpoints
+        }
+        # Endpoint and pooled flag of every leased config, by id(config)
+        self._leases = {}
+        self._stats = {'hits': 0, 'misses': 0, 'waits': 0, 'timeouts': 0, 'unpooled': 0}
+        self._async_waiters = deque()
+
+        if prewarm:
+            for endpoint in endpoint_pool.endpoints.values():
+                for language in languages:
+                    self._pools[endpoint.name][language]['idle'].append(self._build_config(endpoint, language))
+                    self._pools[endpoint.name][language]['created'] += 1
+
+    def _build_config(self, endpoint: SpeechEndpoint, language: str):
+        """Build a SpeechConfig for an endpoint, bound to a single recognition language"""
+        return self.engine.build_speech_config(endpoint.subscription_key, endpoint.endpoint, language)
+
+    def acquire_config(self, language: str, timeout: Optional[float] = None, avoid: Iterable[str] = ()):
+        """
+        Lease a SpeechConfig for the given language
+
+        Args:
+            language: Recognition language code
+            timeout: Seconds to wait for a free config (defaults to acquire_timeout)
+            avoid: Names of endpoints to use only if no other has capacity
+
+        Returns:
+            A SpeechConfig that must be handed back with release_config
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+
+        with self._condition:
+            while True:
+                leased = self._try_lease(language, avoid)
+                if leased is not None:
+                    break
+
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise RecognizerPoolExhausted(
+                        f"No speech config available for {language} after {timeout:.1f}s")
+                self._condition.wait(remaining)
+
+        return self._build_leased(language, *leased)
+
+    async def acquire_config_async(self, language: str, timeout: Optional[float] = None, avoid: Iterable[str] = ()):
+        """
+        Lease a SpeechConfig for the given language from a coroutine. While the pools are
+        exhausted the coroutine waits on a future that release_config completes, so a
+        queued request holds no thread.
+        """
+        loop = asyncio.get_running_loop()
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                leased = self._try_lease(language, avoid)
+                if leased is not None:
+                    break
+
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise RecognizerPoolExhausted(
+                        f"No speech config available for {language} after {timeout:.1f}s")
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+
+            try:
+                await asyncio.wait_for(waiter[1], min(remaining, ASYNC_WAIT_RECHECK_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+        return self._build_leased(language, *leased)
+
+    def _try_lease(self, language: str, avoid: Iterable[str]):
+        """
+        Lease an idle config of the best endpoint with capacity, or reserve a slot for a
+        new one (_BUILD). Returns (endpoint, config or _BUILD), or None if every endpoint
+        is at its cap or out of configs. Must be called with the condition held.
+
+        Languages outside the supported list are never pooled, but their configs still
+        take a slot of the endpoint's max_concurrent like any other session.
+        """
+        for endpoint in self.endpoint_pool.ranked(avoid):
+            pool = self._pools[endpoint.name].get(language)
+            if pool is not None and not pool['idle'] and pool['created'] >= self.max_configs_per_language:
+                continue
+            if not self.endpoint_pool.acquire(endpoint):
+                continue
+
+            if pool is None:
+                self._stats['unpooled'] += 1
+                return endpoint, _BUILD
+
+            pool['in_use'] += 1
+            if pool['idle']:
+                self._stats['hits'] += 1
+                speech_config = pool['idle'].popleft()
+                self._leases[id(speech_config)] = (endpoint, True)
+                return endpoint, speech_config
+
+            pool['created'] += 1
+            self._stats['misses'] += 1
+            return endpoint, _BUILD
+        return None
+
+    def _build_leased(self, language: str, endpoint: SpeechEndpoint, leased):
+        """Build the config for a reserved slot, giving the slot back if that fails"""
+        if leased is not _BUILD:
+            return leased
+
+        pooled = language in self._languages
+        # Build outside the lock so a slow SDK call does not block other languages
+        try:
+            speech_config = self._build_config(endpoint, language)
+        except Exception:
+            with self._condition:
+                if pooled:
+                    pool = self._pools[endpoint.name][language]
+                    pool['created'] -= 1
+                    pool['in_use'] -= 1
+                self.endpoint_pool.release(endpoint)
+                self._notify_one()
+            raise
+        with self._condition:
+            self._leases[id(speech_config)] = (endpoint, pooled)
+        return speech_config
+
+    def _notify_one(self) -> None:
+        """Wake one thread and one coroutine waiting for a config; call with the condition held"""
+        self._condition.notify()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+                break
+            except RuntimeError:
+                # That waiter's event loop has been closed
+                continue
+
+    def release_config(self, language: str, speech_config) -> None:
+        """Return a leased SpeechConfig to its endpoint's language pool, and its endpoint slot"""
+        if speech_config is None:
+            return
+
+        with self._condition:
+            lease = self._leases.pop(id(speech_config), None)
+            if lease is None:
+                return
+            endpoint, pooled = lease
+            if pooled:
+                pool = self._pools[endpoint.name][language]
+                pool['in_use'] -= 1
+                pool['idle'].append(speech_config)
+            self.endpoint_pool.release(endpoint)
+            self._notify_one()
+
+    @contextmanager
+    def lease(self, language: str, timeout: Optional[float] = None, avoid: Iterable[str] = ()):
+        """Context manager that leases a SpeechConfig and always returns it"""
+        speech_config = self.acquire_config(language, timeout, avoid)
+        try:
+            yield speech_config
+        finally:
+            self.release_config(language, speech_config)
+
+    def create_recognizer(self, speech_config, audio_config):
+        """Create a SpeechRecognizer from a leased config"""
+        return self.engine.create_recognizer(speech_config, audio_config)
+
+    def endpoint_of(self, speech_config) -> Optional[SpeechEndpoint]:
+        """The endpoint a leased config was built for"""
+        lease = self._leases.get(id(speech_config))
+        return lease[0] if lease is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool counters and per-language occupancy summed over the endpoints"""
+        with self._condition:
+            languages = {}
+            for pools in self._pools.values():
+                for language, pool in pools.items():
+                    totals = languages.setdefault(language, {'created': 0, 'idle': 0, 'in_use': 0})
+                    totals['created'] += pool['created']
+                    totals['idle'] += len(pool['idle'])
+                    totals['in_use'] += pool['in_use']
+            return {
+                'max_configs_per_language': self.max_configs_per_language,
+                'endpoints': len(self._pools),
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+                'unpooled': self._stats['unpooled'],
+                'languages': languages
+            }
@@ -0,0 +1,164 @@
+import time
+import logging
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVICTION_LIFETIME = 'lifetime'
+EVICTION_IDLE = 'idle'
+
+
+class SessionLimitReached(RuntimeError):
+    """Raised when the registry already holds the maximum number of sessions"""
+
+
+class SessionRegistry:
+    """
+    Bounded registry of live continuous transcription sessions.
+
+    A background reaper stops sessions that outlived max_lifetime_seconds or that
+    have not produced a segment for idle_timeout_seconds, so clients that never call
+    stop cannot leak recognizers. Expired sessions are handed to stop_fn outside
+    the registry lock.
+    """
+
+    def __init__(
+            self,
+            stop_fn: Callable[[str, Dict[str, Any], str], None],
+            max_sessions: int = 50,
+            max_lifetime_seconds: float = 4 * 3600,
+            idle_timeout_seconds: float = 600,
+            reap_interval_seconds: float = 15
+    ):
+        """
+        Args:
+            stop_fn: Called as stop_fn(session_id, session, reason) for every evicted session
+            max_sessions: Maximum concurrently registered sessions
+            max_lifetime_seconds: Sessions are stopped this long after they started (0 disables)
+            idle_timeout_seconds: Sessions are stopped this long after their last segment (0 disables)
+            reap_interval_seconds: How often the reaper checks for expired sessions
+        """
+        self.stop_fn = stop_fn
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.reap_interval_seconds = max(0.1, float(reap_interval_seconds))
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._stats = {'registered': 0, 'stopped': 0, 'rejected': 0,
+                       'evicted_lifetime': 0, 'evicted_idle': 0}
+
+        self._shutdown_event = threading.Event()
+        self._reaper = threading.Thread(target=self._reap_loop, name='session-reaper', daemon=True)
+        self._reaper.start()
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def check_capacity(self) -> None:
+        """
+        Fail fast before creating a recognizer if no slot is free
+
+        Raises:
+            SessionLimitReached: If max_sessions sessions are registered
+        """
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                self._stats['rejected'] += 1
+                raise SessionLimitReached(f'Maximum of {self.max_sessions} active sessions reached')
+
+    def add(self, session_id: str, session: Dict[str, Any]) -> None:
+        """
+        Register a started session
+
+        Raises:
+            KeyError: If the session ID is already registered
+            SessionLimitReached: If max_sessions sessions are registered
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                raise KeyError(session_id)
+            if len(self._sessions) >= self.max_sessions:
+                self._stats['rejected'] += 1
+                raise SessionLimitReached(f'Maximum of {self.max_sessions} active sessions reached')
+            self._sessions[session_id] = session
+            self._stats['registered'] += 1
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def remove(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Unregister a session the client stopped"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._stats['stopped'] += 1
+            return session
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Snapshot of registered sessions"""
+        with self._lock:
+            return list(self._sessions.items())
+
+    def _expiry_reason(self, session: Dict[str, Any], now: float) -> Optional[str]:
+        session_control = session['session']
+        if self.max_lifetime_seconds and now - session_control['start_time'] > self.max_lifetime_seconds:
+            return EVICTION_LIFETIME
+        if self.idle_timeout_seconds and now - self.last_activity(session) > self.idle_timeout_seconds:
+            return EVICTION_IDLE
+        return None
+
+    @staticmethod
+    def last_activity(session: Dict[str, Any]) -> float:
+        """Time the last segment arrived, or the start time if none has yet"""
+        session_control = session['session']
+        return session_control.get('last_segment_time') or session_control['start_time']
+
+    def reap(self) -> int:
+        """Stop and unregister every expired session"""
+        now = time.time()
+        expired = []
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                reason = self._expiry_reason(session, now)
+                if reason:
+                    del self._sessions[session_id]
+                    self._stats[f'evicted_{reason}'] += 1
+                    expired.append((session_id, session, reason))
+
+        for session_id, session, reason in expired:
+            logger.warning(f"Evicting continuous session {session_id}: {reason} limit exceeded")
+            try:
+                self.stop_fn(session_id, session, reason)
+            except Exception as e:
+                logger.error(f"Error stopping evicted session {session_id}: {str(e)}")
+        return len(expired)
+
+    def _reap_loop(self) -> None:
+        while not self._shutdown_event.wait(self.reap_interval_seconds):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Session reaper error: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limits and eviction counters"""
+        with self._lock:
+            return dict(
+                self._stats,
+                active=len(self._sessions),
+                max_sessions=self.max_sessions,
+                max_lifetime_seconds=self.max_lifetime_seconds,
+                idle_timeout_seconds=self.idle_timeout_seconds
+            )
+
+    def shutdown(self) -> None:
+        self._shutdown_event.set()
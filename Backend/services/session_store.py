@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_STATUS_ACTIVE = 'active'
+SESSION_STATUS_EXPIRED = 'expired'
+SESSION_STATUS_ORPHANED = 'orphaned'
+
+COMMAND_STATUS_PENDING = 'pending'
+COMMAND_STATUS_DONE = 'done'
+
+
+def is_process_alive(pid: int) -> bool:
+    """True if a process with this pid exists on this machine"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SessionStore(ABC):
+    """
+    Interface for continuous-session state shared between gunicorn workers.
+
+    The worker that owns a session's recognizer records the session and every
+    recognized segment here, so any worker can serve results. Requests that need
+    the recognizer itself (such as stop) are queued as commands addressed to the
+    owner, which picks them up with a SessionCommandListener and posts the result
+    back. Backends implement the abstract methods; SQLiteSessionStore covers
+    workers on one machine, and a networked store (e.g. Redis) can be dropped in
+    for several machines.
+    """
+
+    @abstractmethod
+    def create_session(self, session_id: str, owner_pid: int, language: str, start_time: float) -> None:
+        """Record a new session; raises KeyError if the ID is already taken"""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session metadata (owner_pid, language, status, start_time, word_count, segments), or None"""
+
+    @abstractmethod
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Metadata of every stored session"""
+
+    @abstractmethod
+    def append_segment(self, session_id: str, index: int, segment: Dict[str, Any]) -> None:
+        """Store segment number index and update the session's running totals"""
+
+    @abstractmethod
+    def get_segments(self, session_id: str, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Segments with an index of at least since, in order, at most limit of them"""
+
+    def iter_segments(self, session_id: str, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """All segments in order, read page_size at a time so long sessions never sit in memory at once"""
+        since = 0
+        while True:
+            page = self.get_segments(session_id, since, limit=page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            since += len(page)
+
+    @abstractmethod
+    def set_status(self, session_id: str, status: str) -> None:
+        """Change a session's status and record when it changed"""
+
+    @abstractmethod
+    def delete_session(self, session_id: str) -> None:
+        """Remove a session and its segments"""
+
+    @abstractmethod
+    def purge_finished(self, older_than_seconds: float) -> int:
+        """Delete sessions that stopped being active longer ago than the given age"""
+
+    @abstractmethod
+    def send_command(self, session_id: str, owner_pid: int, command: str, args: Optional[Dict[str, Any]] = None) -> int:
+        """Queue a command for the owning worker and return its ID"""
+
+    @abstractmethod
+    def fetch_commands(self, owner_pid: int) -> List[Dict[str, Any]]:
+        """Pending commands addressed to a worker"""
+
+    @abstractmethod
+    def complete_command(self, command_id: int, result: Dict[str, Any]) -> None:
+        """Post a command's result and mark it done"""
+
+    @abstractmethod
+    def get_command_result(self, command_id: int) -> Optional[Dict[str, Any]]:
+        """The posted result of a command, or None while it is pending"""
+
+    def wait_for_command(self, command_id: int, timeout: float, poll_interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """Poll for a command result until it is posted or the timeout passes"""
+        deadline = time.time() + timeout
+        while True:
+            result = self.get_command_result(command_id)
+            if result is not None or time.time() >= deadline:
+                return result
+            time.sleep(poll_interval)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SessionStore backed by a SQLite database in WAL mode, shared by the workers on one machine"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            owner_pid INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            status TEXT NOT NULL,
+            start_time REAL NOT NULL,
+            status_time REAL NOT NULL,
+            last_segment_time REAL,
+            word_count INTEGER NOT NULL DEFAULT 0,
+            segments INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS segments (
+            session_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (session_id, idx)
+        );
+        CREATE TABLE IF NOT EXISTS commands (
+            command_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            owner_pid INTEGER NOT NULL,
+            command TEXT NOT NULL,
+            args TEXT,
+            status TEXT NOT NULL,
+            result TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS commands_owner ON commands (owner_pid, status);
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SDK callbacks and request threads all write"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def create_session(self, session_id: str, owner_pid: int, language: str, start_time: float) -> None:
+        try:
+            self._connect().execute(
+                'INSERT INTO sessions (session_id, owner_pid, language, status, start_time, status_time) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (session_id, owner_pid, language, SESSION_STATUS_ACTIVE, start_time, time.time())
+            )
+        except sqlite3.IntegrityError:
+            raise KeyError(session_id)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute('SELECT * FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._connect().execute('SELECT * FROM sessions ORDER BY start_time')]
+
+    def append_segment(self, session_id: str, index: int, segment: Dict[str, Any]) -> None:
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('INSERT OR REPLACE INTO segments (session_id, idx, data) VALUES (?, ?, ?)',
+                               (session_id, index, json.dumps(segment)))
+            connection.execute(
+                'UPDATE sessions SET segments = ?, word_count = word_count + ?, last_segment_time = ? '
+                'WHERE session_id = ?',
+                (index + 1, len(segment.get('text', '').split()), segment.get('timestamp', time.time()), session_id)
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def get_segments(self, session_id: str, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            'SELECT data FROM segments WHERE session_id = ? AND idx >= ? ORDER BY idx LIMIT ?',
+            (session_id, since, -1 if limit is None else limit))
+        return [json.loads(row['data']) for row in rows]
+
+    def set_status(self, session_id: str, status: str) -> None:
+        self._connect().execute('UPDATE sessions SET status = ?, status_time = ? WHERE session_id = ?',
+                                (status, time.time(), session_id))
+
+    def delete_session(self, session_id: str) -> None:
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('DELETE FROM segments WHERE session_id = ?', (session_id,))
+            connection.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        cutoff = time.time() - older_than_seconds
+        rows = self._connect().execute(
+            'SELECT session_id FROM sessions WHERE status != ? AND status_time < ?',
+            (SESSION_STATUS_ACTIVE, cutoff)
+        ).fetchall()
+        for row in rows:
+            self.delete_session(row['session_id'])
+        # Results nobody collected and commands whose owner never answered
+        self._connect().execute('DELETE FROM commands WHERE created_at < ?', (cutoff,))
+        return len(rows)
+
+    def send_command(self, session_id: str, owner_pid: int, command: str, args: Optional[Dict[str, Any]] = None) -> int:
+        cursor = self._connect().execute(
+            'INSERT INTO commands (session_id, owner_pid, command, args, status, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (session_id, owner_pid, command, json.dumps(args or {}), COMMAND_STATUS_PENDING, time.time())
+        )
+        return cursor.lastrowid
+
+    def fetch_commands(self, owner_pid: int) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            'SELECT command_id, session_id, command, args FROM commands '
+            'WHERE owner_pid = ? AND status = ? ORDER BY command_id',
+            (owner_pid, COMMAND_STATUS_PENDING)
+        ).fetchall()
+        return [dict(row, args=json.loads(row['args'] or '{}')) for row in rows]
+
+    def complete_command(self, command_id: int, result: Dict[str, Any]) -> None:
+        self._connect().execute('UPDATE commands SET status = ?, result = ? WHERE command_id = ?',
+                                (COMMAND_STATUS_DONE, json.dumps(result), command_id))
+
+    def get_command_result(self, command_id: int) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            'SELECT status, result FROM commands WHERE command_id = ?', (command_id,)).fetchone()
+        if row is None or row['status'] != COMMAND_STATUS_DONE:
+            return None
+        self._connect().execute('DELETE FROM commands WHERE command_id = ?', (command_id,))
+        return json.loads(row['result'])
+
+
+def create_session_store(backend: str, db_path: Optional[str] = None) -> Optional[SessionStore]:
+    """
+    Build the configured session store
+
+    Args:
+        backend: 'local' keeps sessions in the owning process only; 'sqlite' shares them
+        db_path: Database path for the sqlite backend
+
+    Returns:
+        The store, or None for the local backend
+    """
+    backend = (backend or 'local').lower()
+    if backend == 'local':
+        return None
+    if backend == 'sqlite':
+        return SQLiteSessionStore(db_path)
+    raise ValueError(f'Unknown session backend: {backend}')
+
+
+class SessionCommandListener:
+    """
+    Background thread that executes commands addressed to this worker's sessions
+    and periodically purges finished sessions from the store.
+    """
+
+    def __init__(
+            self,
+            store: SessionStore,
+            handlers: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]],
+            poll_interval: float = 0.1,
+            retention_seconds: float = 3600
+    ):
+        """
+        Args:
+            store: Shared session store
+            handlers: Command name -> handler(session_id, args) returning a JSON-serializable result
+            poll_interval: Seconds between checks for new commands
+            retention_seconds: Expired or orphaned sessions are purged after this long
+        """
+        self.store = store
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.owner_pid = os.getpid()
+
+        self._shutdown_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='session-commands', daemon=True)
+        self._thread.start()
+
+    def process_pending(self) -> int:
+        """Execute every pending command for this worker"""
+        commands = self.store.fetch_commands(self.owner_pid)
+        for command in commands:
+            handler = self.handlers.get(command['command'])
+            try:
+                if handler is None:
+                    result = {'success': False, 'error': f"Unknown command: {command['command']}"}
+                else:
+                    result = handler(command['session_id'], command['args'])
+            except Exception as e:
+                logger.error(f"Session command {command['command']} failed: {str(e)}")
+                result = {'success': False, 'error': f'Command error: {str(e)}'}
+            self.store.complete_command(command['command_id'], result)
+        return len(commands)
+
+    def _run(self) -> None:
+        last_purge = 0.0
+        while not self._shutdown_event.wait(self.poll_interval):
+            try:
+                self.process_pending()
+                if time.time() - last_purge > 60:
+                    last_purge = time.time()
+                    self.store.purge_finished(self.retention_seconds)
+            except Exception as e:
+                logger.error(f"Session command listener error: {str(e)}")
+
+    def shutdown(self) -> None:
+        self._shutdown_event.set()
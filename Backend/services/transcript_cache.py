@@ -0,0 +1,229 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_valid_audio_hash(audio_hash: Optional[str]) -> bool:
+    """True if the value looks like a lowercase hex SHA-256 digest"""
+    return bool(audio_hash) and bool(SHA256_PATTERN.match(audio_hash))
+
+
+class TranscriptCache:
+    """
+    Content-addressed cache of transcription results keyed by audio SHA-256 and language.
+
+    Lookups go through a bounded in-memory LRU first and then a directory of JSON
+    files shared by every gunicorn worker on the machine. Disk hits are promoted
+    into the memory tier.
+    """
+
+    def __init__(
+            self,
+            cache_dir: str,
+            max_entries: int = 512,
+            max_bytes: int = 64 * 1024 * 1024,
+            max_disk_entries: int = 10000
+    ):
+        """
+        Args:
+            cache_dir: Directory for the on-disk tier
+            max_entries: Maximum entries held in memory
+            max_bytes: Maximum serialized size of the entries held in memory
+            max_disk_entries: The oldest disk entries are pruned beyond this count
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_disk_entries = max(1, int(max_disk_entries))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._puts_since_prune = 0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def _key(audio_hash: str, language: str) -> str:
+        return f"{audio_hash}:{language}"
+
+    def _disk_path(self, audio_hash: str, language: str) -> str:
+        # Language codes are validated against the supported list before reaching the cache
+        safe_language = re.sub(r'[^A-Za-z0-9-]', '_', language)
+        return os.path.join(self.cache_dir, audio_hash[:2], f"{audio_hash}_{safe_language}.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any], size: int) -> None:
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+
+        self._memory[key] = (entry, size)
+        self._memory_bytes += size
+
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+    def get(self, audio_hash: str, language: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached transcription result
+
+        Returns:
+            The stored result, or None on a miss
+        """
+        if not is_valid_audio_hash(audio_hash):
+            return None
+
+        key = self._key(audio_hash, language)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return self._memory[key][0]['result']
+
+        try:
+            with open(self._disk_path(audio_hash, language), 'r', encoding='utf-8') as f:
+                serialized = f.read()
+            entry = json.loads(serialized)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self._remember(key, entry, len(serialized))
+            self._stats['disk_hits'] += 1
+        return entry['result']
+
+    def put(self, audio_hash: str, language: str, result: Dict[str, Any]) -> None:
+        """Store a transcription result in both tiers"""
+        if not is_valid_audio_hash(audio_hash):
+            return
+
+        entry = {'audio_hash': audio_hash, 'language': language, 'stored_at': time.time(), 'result': result}
+        serialized = json.dumps(entry)
+
+        disk_path = self._disk_path(audio_hash, language)
+        try:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            temp_path = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+            os.replace(temp_path, disk_path)
+        except OSError as e:
+            logger.warning(f"Failed to write transcript cache entry: {str(e)}")
+
+        with self._lock:
+            self._remember(self._key(audio_hash, language), entry, len(serialized))
+            self._stats['stores'] += 1
+            self._puts_since_prune += 1
+            prune = self._puts_since_prune >= 100
+            if prune:
+                self._puts_since_prune = 0
+
+        if prune:
+            self.prune_disk()
+
+    def _disk_entries(self):
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if name.endswith('.json'):
+                    yield os.path.join(prefix_dir, name)
+
+    def prune_disk(self) -> int:
+        """Delete the oldest disk entries beyond max_disk_entries"""
+        entries = []
+        for path in self._disk_entries():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+
+        excess = len(entries) - self.max_disk_entries
+        if excess <= 0:
+            return 0
+
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return excess
+
+    def evict(self, audio_hash: str, language: Optional[str] = None) -> int:
+        """
+        Remove one entry, or every language stored for an audio hash
+
+        Returns:
+            Number of entries removed from either tier
+        """
+        if not is_valid_audio_hash(audio_hash):
+            return 0
+
+        removed = 0
+        with self._lock:
+            for key in [k for k in self._memory if k.split(':', 1)[0] == audio_hash
+                        and (language is None or k.split(':', 1)[1] == language)]:
+                self._memory_bytes -= self._memory.pop(key)[1]
+                removed += 1
+
+        prefix_dir = os.path.join(self.cache_dir, audio_hash[:2])
+        if os.path.isdir(prefix_dir):
+            for name in os.listdir(prefix_dir):
+                if not name.startswith(audio_hash + '_'):
+                    continue
+                if language is not None and name != os.path.basename(self._disk_path(audio_hash, language)):
+                    continue
+                try:
+                    os.unlink(os.path.join(prefix_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry from both tiers"""
+        with self._lock:
+            removed = len(self._memory)
+            self._memory.clear()
+            self._memory_bytes = 0
+
+        for path in list(self._disk_entries()):
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes"""
+        disk_entries = sum(1 for _ in self._disk_entries())
+        with self._lock:
+            lookups = self._stats['memory_hits'] + self._stats['disk_hits'] + self._stats['misses']
+            hits = self._stats['memory_hits'] + self._stats['disk_hits']
+            return dict(
+                self._stats,
+                hit_ratio=round(hits / lookups, 4) if lookups else 0.0,
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                disk_entries=disk_entries,
+                max_disk_entries=self.max_disk_entries
+            )
@@ -0,0 +1,340 @@
+import os
+import re
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_SOURCE_FILE = 'file'
+TRANSCRIPT_SOURCE_JOB = 'job'
+TRANSCRIPT_SOURCE_SESSION = 'session'
+TRANSCRIPT_SOURCES = (TRANSCRIPT_SOURCE_FILE, TRANSCRIPT_SOURCE_JOB, TRANSCRIPT_SOURCE_SESSION)
+
+SEARCH_ORDERS = ('relevance', 'recent')
+
+# Characters of a transcript's text included in listings
+PREVIEW_CHARS = 200
+
+# Quoted phrases and bare terms of a search query
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Shortest prefix accepted in a search; shorter ones match most of the index
+MIN_PREFIX_CHARS = 2
+
+TRANSCRIPTS_SAVED = REGISTRY.counter(
+    'speakeasy_transcripts_saved_total', 'Transcripts written to the transcript store', ['source'])
+TRANSCRIPT_SEARCH_SECONDS = REGISTRY.histogram(
+    'speakeasy_transcript_search_seconds', 'Full-text search time in the transcript store', [],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+
+def build_match_expression(query: str) -> str:
+    """
+    FTS5 MATCH expression for a user query: every term must appear, "quoted text"
+    is matched as a phrase and a trailing * makes a term a prefix. Terms are quoted,
+    so FTS5 operators and punctuation in the query are searched for literally.
+
+    Raises:
+        ValueError: If the query has no terms, or a prefix that is too short
+    """
+    terms = []
+    for phrase, word in QUERY_TOKEN.findall(query or ''):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith('*')
+        term = term.rstrip('*').strip() if prefix else term.strip()
+        if not term:
+            continue
+        if prefix and len(term) < MIN_PREFIX_CHARS:
+            raise ValueError(f'Prefix searches need at least {MIN_PREFIX_CHARS} characters before the *')
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted + '*' if prefix else quoted)
+    if not terms:
+        raise ValueError('Search query must contain at least one term')
+    return ' '.join(terms)
+
+
+class TranscriptStore:
+    """
+    Persistent store of finished transcripts in a SQLite database in WAL mode.
+
+    Each transcript keeps its metadata, full text and recognized segments. An FTS5
+    index over the text (an external-content table kept in step by triggers, so the
+    text is stored once) answers searches with bm25 ranking and highlighted
+    snippets; prefix indexes for 2 to 4 characters keep term* searches off a scan of
+    the term list. Listings page by transcript rowid rather than OFFSET, so every
+    page costs the same however deep it is. WAL lets every worker read while one writes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transcripts (
+            id INTEGER PRIMARY KEY,
+            transcript_id TEXT NOT NULL UNIQUE,
+            source TEXT NOT NULL,
+            source_id TEXT,
+            filename TEXT,
+            language TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            duration_seconds REAL,
+            word_count INTEGER NOT NULL,
+            segment_count INTEGER NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS transcripts_language ON transcripts (language, id);
+        CREATE INDEX IF NOT EXISTS transcripts_source ON transcripts (source, id);
+        CREATE INDEX IF NOT EXISTS transcripts_source_id ON transcripts (source_id);
+        CREATE TABLE IF NOT EXISTS transcript_segments (
+            transcript_rowid INTEGER NOT NULL,
+            idx INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (transcript_rowid, idx)
+        ) WITHOUT ROWID;
+        CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+            text, content='transcripts', content_rowid='id', tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3 4'
+        );
+        CREATE TRIGGER IF NOT EXISTS transcripts_fts_insert AFTER INSERT ON transcripts BEGIN
+            INSERT INTO transcripts_fts (rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS transcripts_fts_delete AFTER DELETE ON transcripts BEGIN
+            INSERT INTO transcripts_fts (transcripts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+    """
+
+    # Columns returned for a transcript, without its text
+    COLUMNS = ('transcript_id, source, source_id, filename, language, created_at, duration_seconds, '
+               'word_count, segment_count')
+
+    def __init__(self, db_path: str, snippet_tokens: int = 16):
+        """
+        Args:
+            db_path: Path of the SQLite database
+            snippet_tokens: Words of context in each search snippet
+        """
+        self.db_path = db_path
+        self.snippet_tokens = max(1, min(64, int(snippet_tokens)))
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; request threads and job workers all write"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def save(
+            self,
+            source: str,
+            language: str,
+            segments: List[Dict[str, Any]],
+            source_id: Optional[str] = None,
+            filename: Optional[str] = None,
+            duration_seconds: Optional[float] = None
+    ) -> str:
+        """
+        Store a finished transcript with its segments
+
+        Args:
+            source: One of TRANSCRIPT_SOURCES
+            language: Recognition language
+            segments: Recognized segments in order, each with at least 'text'
+            source_id: Job or session ID the transcript came from
+            filename: Uploaded file name
+            duration_seconds: Length of the audio or session
+
+        Returns:
+            The new transcript ID
+        """
+        text = ' '.join(segment['text'].strip() for segment in segments if (segment.get('text') or '').strip())
+        transcript_id = uuid.uuid4().hex
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = connection.execute(
+                'INSERT INTO transcripts (transcript_id, source, source_id, filename, language, created_at, '
+                'duration_seconds, word_count, segment_count, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (transcript_id, source, source_id, filename, language, time.time(), duration_seconds,
+                 len(text.split()), len(segments), text)
+            )
+            connection.executemany(
+                'INSERT INTO transcript_segments (transcript_rowid, idx, data) VALUES (?, ?, ?)',
+                ((cursor.lastrowid, index, json.dumps(segment)) for index, segment in enumerate(segments))
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        TRANSCRIPTS_SAVED.inc(source=source)
+        return transcript_id
+
+    def get(self, transcript_id: str, include_segments: bool = True) -> Optional[Dict[str, Any]]:
+        """A transcript with its text (and segments), or None if unknown"""
+        row = self._connect().execute(
+            f'SELECT id, {self.COLUMNS}, text FROM transcripts WHERE transcript_id = ?', (transcript_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        transcript = dict(row)
+        rowid = transcript.pop('id')
+        if include_segments:
+            transcript['segments'] = [json.loads(segment['data']) for segment in self._connect().execute(
+                'SELECT data FROM transcript_segments WHERE transcript_rowid = ? ORDER BY idx', (rowid,))]
+        return transcript
+
+    def iter_segments(self, transcript_id: str, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Segments of a transcript in order, read a page at a time"""
+        row = self._connect().execute(
+            'SELECT id FROM transcripts WHERE transcript_id = ?', (transcript_id,)).fetchone()
+        if row is None:
+            return
+        index = 0
+        while True:
+            page = self._connect().execute(
+                'SELECT idx, data FROM transcript_segments WHERE transcript_rowid = ? AND idx >= ? '
+                'ORDER BY idx LIMIT ?', (row['id'], index, page_size)).fetchall()
+            for segment in page:
+                yield json.loads(segment['data'])
+            if len(page) < page_size:
+                return
+            index = page[-1]['idx'] + 1
+
+    @staticmethod
+    def _filters(language: Optional[str], source: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if language:
+            clauses.append('t.language = ?')
+            params.append(language)
+        if source:
+            clauses.append('t.source = ?')
+            params.append(source)
+        return ''.join(f' AND {clause}' for clause in clauses), params
+
+    def list_transcripts(
+            self,
+            limit: int = 20,
+            before: Optional[int] = None,
+            language: Optional[str] = None,
+            source: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Newest transcripts first, with a preview of their text
+
+        Args:
+            limit: Transcripts per page
+            before: Cursor from the previous page's 'next_cursor'
+            language: Only transcripts in this language
+            source: Only transcripts from this source
+
+        Returns:
+            {'transcripts': [...], 'next_cursor': cursor of the next page or None}
+        """
+        filters, params = self._filters(language, source)
+        rows = self._connect().execute(
+            f'SELECT t.id, {self.COLUMNS}, substr(t.text, 1, {PREVIEW_CHARS}) AS preview FROM transcripts t '
+            f'WHERE t.id < ?{filters} ORDER BY t.id DESC LIMIT ?',
+            [before if before is not None else 2 ** 63 - 1] + params + [limit + 1]
+        ).fetchall()
+        transcripts = [dict(row) for row in rows[:limit]]
+        next_cursor = transcripts[-1]['id'] if len(rows) > limit else None
+        for transcript in transcripts:
+            del transcript['id']
+        return {'transcripts': transcripts, 'next_cursor': next_cursor}
+
+    def search(
+            self,
+            query: str,
+            limit: int = 20,
+            offset: int = 0,
+            language: Optional[str] = None,
+            source: Optional[str] = None,
+            order: str = 'relevance',
+            highlight: Iterable[str] = ('<mark>', '</mark>')
+    ) -> Dict[str, Any]:
+        """
+        Full-text search over transcript text
+
+        Args:
+            query: Terms that must all appear; "quoted text" is a phrase, term* a prefix
+            limit: Results per page
+            offset: Results to skip (the previous page's 'next_offset')
+            language: Only transcripts in this language
+            source: Only transcripts from this source
+            order: 'relevance' (bm25) or 'recent' (newest first)
+            highlight: Markers placed before and after each matched term in the snippet
+
+        Returns:
+            {'results': [... with 'snippet' and 'score'], 'next_offset': offset of the next page or None}
+
+        Raises:
+            ValueError: If the query has no terms or the order is unknown
+        """
+        if order not in SEARCH_ORDERS:
+            raise ValueError(f"Unsupported search order: {order}. Use one of: {', '.join(SEARCH_ORDERS)}")
+        match = build_match_expression(query)
+        open_mark, close_mark = highlight
+        filters, params = self._filters(language, source)
+        started = time.perf_counter()
+        rows = self._connect().execute(
+            f'SELECT {self.COLUMNS}, bm25(transcripts_fts) AS score, '
+            f'snippet(transcripts_fts, 0, ?, ?, \'…\', {self.snippet_tokens}) AS snippet '
+            f'FROM transcripts_fts JOIN transcripts t ON t.id = transcripts_fts.rowid '
+            f'WHERE transcripts_fts MATCH ?{filters} '
+            f"ORDER BY {'transcripts_fts.rank' if order == 'relevance' else 'transcripts_fts.rowid DESC'} "
+            f'LIMIT ? OFFSET ?',
+            [open_mark, close_mark, match] + params + [limit + 1, offset]
+        ).fetchall()
+        TRANSCRIPT_SEARCH_SECONDS.observe(time.perf_counter() - started)
+        # bm25 is lower for better matches; flip it so higher scores rank first
+        results = [dict(row, score=round(-row['score'], 6)) for row in rows[:limit]]
+        return {'results': results, 'next_offset': offset + limit if len(rows) > limit else None}
+
+    def delete(self, transcript_id: str) -> bool:
+        """Remove a transcript and its segments; False if it was unknown"""
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT id FROM transcripts WHERE transcript_id = ?', (transcript_id,)).fetchone()
+            if row is not None:
+                connection.execute('DELETE FROM transcript_segments WHERE transcript_rowid = ?', (row['id'],))
+                connection.execute('DELETE FROM transcripts WHERE id = ?', (row['id'],))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return row is not None
+
+    def optimize(self) -> None:
+        """Merge the full-text index into a single b-tree, which speeds up searches after bulk loads"""
+        self._connect().execute("INSERT INTO transcripts_fts (transcripts_fts) VALUES ('optimize')")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Transcript counts by source and the database size"""
+        rows = self._connect().execute('SELECT source, count(*) AS count FROM transcripts GROUP BY source')
+        by_source = {row['source']: row['count'] for row in rows}
+        size = 0
+        for suffix in ('', '-wal'):
+            if os.path.exists(self.db_path + suffix):
+                size += os.path.getsize(self.db_path + suffix)
+        return {
+            'transcripts': sum(by_source.values()),
+            'by_source': by_source,
+            'db_path': self.db_path,
+            'db_bytes': size
+        }
@@ -24,6 +24,18 @@ echo "System dependencies installed successfully"
 export PULSE_RUNTIME_PATH=/tmp/pulse-socket
 export ALSA_DEBUG=0
 
-# Start the Flask application
-echo "Starting Flask application..."
-gunicorn --bind=0.0.0.0 --timeout 600 app:app
\ No newline at end of file
+# Continuous sessions are shared through SQLite so any worker can serve them
+export SESSION_BACKEND=${SESSION_BACKEND:-sqlite}
+
+# Admission control derives its default per-worker limits from the server mode and thread count
+export SERVER_MODE=${SERVER_MODE:-wsgi}
+export GUNICORN_THREADS=${GUNICORN_THREADS:-16}
+
+# Start the Flask application; SERVER_MODE=asgi serves asgi.py on event-loop workers
+if [ "$SERVER_MODE" = "asgi" ]; then
+    echo "Starting ASGI application..."
+    gunicorn --bind=0.0.0.0 --timeout 600 --workers ${GUNICORN_WORKERS:-$(nproc)} -k uvicorn.workers.UvicornWorker asgi:application
+else
+    echo "Starting Flask application..."
+    gunicorn --bind=0.0.0.0 --timeout 600 --workers ${GUNICORN_WORKERS:-$(nproc)} --threads $GUNICORN_THREADS app:app
+fi
\ No newline at end of file
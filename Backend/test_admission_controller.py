@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control: the concurrency limit, wait queue, per-client token buckets and Retry-After
+Usage: python -m pytest test_admission_controller.py
+"""
+
+import time
+import asyncio
+import threading
+
+import app as speech_app
+from conftest import tone_pcm, wav_bytes
+from services.admission_controller import (
+    AdmissionController, AdmissionRejected, TokenBucket,
+    REJECT_RATE_LIMITED, REJECT_QUEUE_FULL, REJECT_QUEUE_TIMEOUT
+)
+
+
+def rejection(acquire, *args):
+    try:
+        acquire(*args)
+    except AdmissionRejected as e:
+        return e
+    raise AssertionError('the request should have been rejected')
+
+
+def test_token_bucket_bursts_then_refills():
+    bucket = TokenBucket(rate=2, burst=3, now=0)
+    for _ in range(3):
+        assert bucket.wait_time(0) == 0
+        bucket.take()
+    assert bucket.wait_time(0) == 0.5
+    assert bucket.wait_time(0.25) == 0.25
+    assert bucket.wait_time(0.5) == 0
+    # Idle time never fills the bucket past its burst
+    bucket.wait_time(100)
+    assert bucket.tokens == 3
+
+
+def test_freed_slots_go_to_queued_requests_in_order():
+    controller = AdmissionController(max_concurrent=1, max_queue=2, max_queue_seconds=5)
+    controller.acquire()
+    admitted = []
+
+    def queued(name):
+        controller.acquire()
+        admitted.append(name)
+
+    threads = [threading.Thread(target=queued, args=(name,)) for name in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    assert controller.queue_depth() == 2 and not admitted
+
+    controller.release()
+    threads[0].join(2)
+    assert admitted == ['first']
+    controller.release()
+    threads[1].join(2)
+    assert admitted == ['first', 'second']
+
+    controller.release()
+    stats = controller.get_stats()
+    assert stats['active'] == 0 and stats['admitted'] == 3 and stats['queued'] == 2
+
+
+def test_full_queue_is_rejected_with_retry_after_from_throughput():
+    controller = AdmissionController(max_concurrent=1, max_queue=0, max_queue_seconds=7)
+    controller.acquire()
+    # With no completions yet the estimate falls back to the queue timeout
+    assert rejection(controller.acquire).retry_after == 7
+
+    for _ in range(4):
+        controller.release()
+        controller.acquire()
+    error = rejection(controller.acquire)
+    assert error.reason == REJECT_QUEUE_FULL
+    # Four completions within the last second: the next slot is about a quarter second away
+    assert error.retry_after == 1
+    assert controller.get_stats()[REJECT_QUEUE_FULL] == 2
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_queue_seconds=0.1)
+    controller.acquire()
+    started = time.monotonic()
+    error = rejection(controller.acquire)
+    assert error.reason == REJECT_QUEUE_TIMEOUT and error.retry_after >= 1
+    assert time.monotonic() - started >= 0.1
+    assert controller.queue_depth() == 0
+
+
+def test_clients_are_rate_limited_independently():
+    controller = AdmissionController(max_concurrent=10, client_rate=0.5, client_burst=2)
+    for _ in range(2):
+        controller.acquire('10.0.0.1')
+        controller.release()
+
+    error = rejection(controller.acquire, '10.0.0.1')
+    assert error.reason == REJECT_RATE_LIMITED
+    assert error.retry_after == 2
+    controller.acquire('10.0.0.2')
+    controller.release()
+    assert controller.get_stats()['clients'] == 2
+
+
+def test_cancelled_async_waiter_passes_its_slot_on():
+    controller = AdmissionController(max_concurrent=1, max_queue=2, max_queue_seconds=5)
+
+    async def scenario():
+        await controller.acquire_async()
+        leaving = asyncio.ensure_future(controller.acquire_async())
+        staying = asyncio.ensure_future(controller.acquire_async())
+        await asyncio.sleep(0.05)
+        leaving.cancel()
+        await asyncio.sleep(0.05)
+        controller.release()
+        await asyncio.wait_for(staying, 2)
+        return leaving.cancelled()
+
+    assert asyncio.run(scenario())
+    assert controller.active() == 1 and controller.queue_depth() == 0
+
+
+def test_rejected_route_answers_429_with_retry_after(monkeypatch):
+    controller = AdmissionController(max_concurrent=4, client_rate=0.1, client_burst=1)
+    monkeypatch.setattr(speech_app, 'admission_controller', controller)
+    client = speech_app.app.test_client()
+
+    def upload():
+        return client.post('/api/file-transcription', data=wav_bytes(tone_pcm(1)), content_type='audio/wav',
+                           query_string={'cache': 'false'})
+
+    assert upload().status_code == 200
+    rejected = upload()
+    assert rejected.status_code == 429
+    assert rejected.headers['Retry-After'] == '10'
+    assert controller.active() == 0
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for silence-aligned splitting of long files and the stitching of chunk results
+Usage: python -m pytest test_audio_chunker.py
+"""
+
+import wave
+
+from conftest import tone_pcm, silence_pcm, write_wav, SAMPLE_RATE
+from services.azure_speech_service import AzureSpeechService
+from services.recognition_engine import FakeRecognitionEngine, TICKS_PER_SECOND
+from utils.audio_chunker import AudioChunker, BLOCK_SECONDS
+
+
+def read_frames(path):
+    with wave.open(path, 'rb') as wav_file:
+        return wav_file.readframes(wav_file.getnframes())
+
+
+def test_cuts_land_in_the_pause_before_each_boundary(tmp_path):
+    # Speech with a pause at 3.5-3.7 s and 7.3-7.5 s; chunks aim for 4 s
+    pcm = tone_pcm(3.5) + silence_pcm(0.2) + tone_pcm(3.6) + silence_pcm(0.2) + tone_pcm(2)
+    source = write_wav(tmp_path / 'speech.wav', pcm)
+
+    chunks = AudioChunker(chunk_seconds=4, search_window_seconds=1).split_wav(source, str(tmp_path))
+    starts = [chunk['start_seconds'] for chunk in chunks]
+    assert len(chunks) == 3
+    assert 3.5 <= starts[1] < 3.7
+    assert 7.3 <= starts[2] < 7.5
+
+
+def test_chunks_tile_the_file_across_read_blocks(tmp_path):
+    seconds = 3 * BLOCK_SECONDS + 1.3
+    pcm = tone_pcm(seconds, frequency=310)
+    source = write_wav(tmp_path / 'long.wav', pcm)
+
+    chunks = AudioChunker(chunk_seconds=4).split_wav(source, str(tmp_path))
+    assert len(chunks) > 3
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert abs(previous['start_seconds'] + previous['duration_seconds'] - chunk['start_seconds']) < 1e-9
+    assert abs(sum(chunk['duration_seconds'] for chunk in chunks) - seconds) < 1.0 / SAMPLE_RATE
+    # Copying the chunks block by block loses and repeats nothing
+    assert b''.join(read_frames(chunk['path']) for chunk in chunks) == pcm
+
+
+def test_short_files_are_not_split(tmp_path):
+    source = write_wav(tmp_path / 'short.wav', tone_pcm(2))
+    chunks = AudioChunker(chunk_seconds=4).split_wav(source, str(tmp_path))
+    assert [(chunk['start_seconds'], chunk['duration_seconds']) for chunk in chunks] == [(0.0, 2.0)]
+
+
+def test_chunk_offsets_are_stitched_onto_the_file_timeline(tmp_path):
+    """The fake engine tiles each chunk with segments, so stitched segments must tile the file"""
+    seconds = 9.5
+    source = write_wav(tmp_path / 'long.wav', tone_pcm(4) + silence_pcm(0.3) + tone_pcm(seconds - 4.3))
+    service = AzureSpeechService(engine=FakeRecognitionEngine(segment_seconds=1))
+
+    result = service.convert_speech_to_text_from_file_chunked(source, chunk_seconds=3, max_workers=3)
+    assert result['success'] and result['chunks'] >= 3
+    segments = result['transcriptions']
+    assert segments[0]['offset'] == 0
+    for previous, segment in zip(segments, segments[1:]):
+        assert abs(previous['offset'] + previous['duration'] - segment['offset']) <= 1
+    end = segments[-1]['offset'] + segments[-1]['duration']
+    assert abs(end - seconds * TICKS_PER_SECOND) <= len(segments)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for WAV normalization to 16 kHz mono 16-bit PCM
+Usage: python -m pytest test_audio_normalizer.py
+"""
+
+import os
+import wave
+
+import numpy as np
+
+import app as speech_app
+from conftest import tone_pcm, write_wav
+from utils.audio_normalizer import AudioNormalizer, StreamingResampler, StreamNormalizer
+
+
+def stereo_pcm(seconds, sample_rate):
+    mono = np.frombuffer(tone_pcm(seconds, sample_rate=sample_rate), dtype='<i2')
+    return np.repeat(mono, 2).tobytes()
+
+
+def test_chunked_resampling_matches_one_pass():
+    signal = np.frombuffer(tone_pcm(1, sample_rate=48000), dtype='<i2').astype(np.float32) / 32768.0
+
+    whole = StreamingResampler(48000)
+    expected = np.concatenate([whole.process(signal), whole.flush()])
+
+    chunked = StreamingResampler(48000)
+    pieces = [chunked.process(signal[start:start + 997]) for start in range(0, len(signal), 997)]
+    actual = np.concatenate(pieces + [chunked.flush()])
+
+    assert abs(len(expected) - 16000) <= 1
+    assert len(actual) == len(expected)
+    assert np.allclose(actual, expected, atol=1e-5)
+
+
+def test_stream_normalizer_carries_partial_frames():
+    wav_format = AudioNormalizer.raw_pcm_format(48000, channels=2)
+    raw = stereo_pcm(0.5, 48000)
+
+    whole = StreamNormalizer(wav_format)
+    expected = whole.process(raw) + whole.flush()
+
+    # Odd-sized pieces split sample frames; the remainder waits for the next piece
+    split = StreamNormalizer(wav_format)
+    output = b''.join(split.process(raw[start:start + 1001]) for start in range(0, len(raw), 1001))
+    output += split.flush()
+
+    assert output == expected
+    assert abs(len(output) // 2 - 8000) <= 1
+
+
+def test_stream_normalizer_passes_target_format_through():
+    normalizer = StreamNormalizer(AudioNormalizer.raw_pcm_format(16000))
+    pcm = tone_pcm(0.1)
+    assert normalizer.passthrough
+    assert normalizer.process(pcm[:101]) + normalizer.process(pcm[101:]) + normalizer.flush() == pcm
+
+
+def test_normalize_file_converts_to_target_format(tmp_path):
+    source = write_wav(tmp_path / 'stereo.wav', stereo_pcm(1, 44100), sample_rate=44100, channels=2)
+    target = str(tmp_path / 'normalized.wav')
+
+    audio_format = AudioNormalizer().normalize_file(source, target)
+    assert not audio_format['passthrough']
+    assert audio_format['original']['sample_rate'] == 44100 and audio_format['original']['channels'] == 2
+    with wave.open(target, 'rb') as wav_file:
+        assert (wav_file.getframerate(), wav_file.getnchannels(), wav_file.getsampwidth()) == (16000, 1, 2)
+        assert abs(wav_file.getnframes() - 16000) <= 1
+
+
+def test_normalize_file_does_not_rewrite_target_format(tmp_path):
+    source = write_wav(tmp_path / 'mono.wav', tone_pcm(1))
+    target = str(tmp_path / 'normalized.wav')
+
+    audio_format = AudioNormalizer().normalize_file(source, target)
+    assert audio_format['passthrough']
+    assert audio_format['original'] == audio_format['normalized']
+    assert not os.path.exists(target)
+
+
+def test_prepared_upload_in_target_format_is_recognized_in_place(tmp_path):
+    source = write_wav(tmp_path / 'mono.wav', tone_pcm(2))
+    prepared = speech_app._prepare_audio_file(source)
+    try:
+        assert prepared['audio_format']['passthrough']
+        assert not os.path.exists(f'{source}.normalized.wav')
+        # Speech is still trimmed out of the upload itself
+        assert prepared['recognition_path'] in (source, f'{source}.speech.wav')
+        assert prepared['duration_seconds'] == 2
+    finally:
+        speech_app._remove_prepared_files(prepared)
+    assert os.path.exists(source)
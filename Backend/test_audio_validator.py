@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the container header probes of uploaded audio
+Usage: python -m pytest test_audio_validator.py
+"""
+
+import io
+import struct
+
+from conftest import tone_pcm, wav_bytes
+from utils.audio_validator import AudioValidator
+
+
+def flac_header(sample_rate=44100, channels=2, bits_per_sample=16, total_samples=441000):
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((bits_per_sample - 1) << 36) | total_samples
+    streaminfo = struct.pack('>HH', 4096, 4096) + bytes(6) + packed.to_bytes(8, 'big') + bytes(16)
+    return b'fLaC' + bytes([0x80]) + len(streaminfo).to_bytes(3, 'big') + streaminfo
+
+
+def ogg_page(packet, granule=0, serial=1, sequence=0):
+    return (b'OggS' + bytes(2) + struct.pack('<qII', granule, serial, sequence) + bytes(4)
+            + bytes([1, len(packet)]) + packet)
+
+
+def vorbis_id(channels=2, sample_rate=44100):
+    return b'\x01vorbis' + bytes(4) + bytes([channels]) + struct.pack('<I', sample_rate) + bytes(14)
+
+
+def opus_head(channels=1, pre_skip=312, sample_rate=16000):
+    return b'OpusHead' + bytes([1, channels]) + struct.pack('<HI', pre_skip, sample_rate) + bytes(3)
+
+
+# MPEG-1 layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+MP3_FRAME_HEADER = b'\xff\xfb\x90\x00'
+MP3_FRAME_LENGTH = 417
+
+
+def mp3_frames(count, xing_frames=None):
+    first = bytearray(MP3_FRAME_HEADER + bytes(MP3_FRAME_LENGTH - 4))
+    if xing_frames is not None:
+        # The Xing header follows the 32 bytes of stereo side information
+        first[36:48] = b'Xing' + struct.pack('>II', 1, xing_frames)
+    return bytes(first) + (MP3_FRAME_HEADER + bytes(MP3_FRAME_LENGTH - 4)) * (count - 1)
+
+
+def probe(data, extension=None, **kwargs):
+    return AudioValidator(**kwargs).probe_audio_file(io.BytesIO(data), extension)
+
+
+def test_wav_probe():
+    result = probe(wav_bytes(tone_pcm(1.5)), '.wav')
+    assert result['valid'] and (result['container'], result['codec']) == ('wav', 'pcm')
+    assert (result['sample_rate'], result['channels'], result['bits_per_sample']) == (16000, 1, 16)
+    assert result['duration_seconds'] == 1.5 and result['duration_exact']
+
+    truncated = probe(wav_bytes(tone_pcm(1.5))[:16000], '.wav')
+    assert truncated['valid'] and not truncated['duration_exact']
+    assert truncated['duration_seconds'] < 1.5
+
+
+def test_flac_streaminfo():
+    result = probe(flac_header(total_samples=441000) + bytes(100), '.flac')
+    assert result['valid'] and result['codec'] == 'flac'
+    assert (result['sample_rate'], result['channels'], result['bits_per_sample']) == (44100, 2, 16)
+    assert result['duration_seconds'] == 10.0 and result['duration_exact']
+
+    # An encoder that did not know the length writes zero samples
+    assert probe(flac_header(total_samples=0))['duration_seconds'] is None
+    assert not probe(flac_header(sample_rate=0))['valid']
+    assert not probe(flac_header()[:20])['valid']
+
+
+def test_ogg_vorbis_duration_from_the_last_page():
+    data = ogg_page(vorbis_id()) + bytes(1000) + ogg_page(b'x', granule=88200, sequence=5)
+    result = probe(data, '.ogg')
+    assert result['valid'] and result['codec'] == 'vorbis'
+    assert (result['sample_rate'], result['channels']) == (44100, 2)
+    assert result['duration_seconds'] == 2.0 and result['duration_exact']
+
+
+def test_ogg_opus_counts_48khz_granules_after_pre_skip():
+    last_page = ogg_page(b'x', granule=312 + 3 * 48000, sequence=9)
+    # A page of another logical stream after it is skipped
+    other_stream = ogg_page(b'x', granule=999999, serial=2)
+    result = probe(ogg_page(opus_head()) + last_page + other_stream, '.ogg')
+    assert result['valid'] and result['codec'] == 'opus'
+    assert (result['sample_rate'], result['channels']) == (16000, 1)
+    assert result['duration_seconds'] == 3.0
+
+    assert not probe(ogg_page(b'\x01unknown' + bytes(20)))['valid']
+
+
+def test_mp3_duration_from_xing_frame_count_or_bitrate():
+    exact = probe(mp3_frames(10, xing_frames=1000), '.mp3')
+    assert exact['valid'] and exact['codec'] == 'mp3'
+    assert (exact['sample_rate'], exact['channels']) == (44100, 2)
+    assert abs(exact['duration_seconds'] - 1000 * 1152 / 44100.0) < 1e-9 and exact['duration_exact']
+
+    estimated = probe(mp3_frames(40), '.mp3')
+    assert not estimated['duration_exact']
+    assert abs(estimated['duration_seconds'] - 40 * MP3_FRAME_LENGTH * 8 / 128000.0) < 1e-9
+
+
+def test_mp3_after_an_id3_tag():
+    tag_body = bytes(2000)
+    id3 = b'ID3\x03\x00\x00' + bytes([0, 0, len(tag_body) >> 7, len(tag_body) & 0x7F]) + tag_body
+    result = probe(id3 + mp3_frames(40), '.mp3')
+    assert result['valid'] and result['container'] == 'mp3'
+    # The tag is not counted as audio
+    assert abs(result['duration_seconds'] - 40 * MP3_FRAME_LENGTH * 8 / 128000.0) < 1e-9
+
+    assert not probe(b'\xff' + bytes(500), '.mp3')['valid']
+
+
+def test_content_must_match_the_extension():
+    assert probe(flac_header(), '.mp3')['error'] == 'File extension .mp3 does not match its FLAC content'
+    assert not probe(b'not audio at all', '.wav')['valid']
+    # Containers the probe does not parse are left to the recognizer
+    assert probe(b'\x00\x00\x00\x20ftypM4A ', '.m4a')['valid']
+
+
+def test_duration_limit_and_file_position():
+    result = probe(flac_header(total_samples=441000), '.flac', max_duration_seconds=5)
+    assert not result['valid'] and 'Maximum duration: 5s' in result['error']
+
+    upload = io.BytesIO(b'junk' + wav_bytes(tone_pcm(1)))
+    upload.seek(4)
+    assert AudioValidator().probe_audio_file(upload, '.wav')['duration_seconds'] == 1.0
+    assert upload.tell() == 4
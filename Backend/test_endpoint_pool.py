@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for latency-aware routing over several speech endpoints
+Usage: python -m pytest test_endpoint_pool.py
+"""
+
+import time
+
+from conftest import tone_pcm, write_wav
+from services.azure_speech_service import AzureSpeechService
+from services.endpoint_pool import EndpointPool, SpeechEndpoint, parse_endpoints
+from services.recognition_engine import FakeRecognitionEngine
+from services.recognizer_factory import RecognizerFactory, RecognizerPoolExhausted
+
+
+def make_pool(*names, max_concurrent=4, failure_threshold=2, eject_seconds=30):
+    endpoints = [SpeechEndpoint(name, name, 'key', max_concurrent) for name in names]
+    return EndpointPool(endpoints, latency_alpha=0.5, failure_threshold=failure_threshold,
+                        eject_seconds=eject_seconds)
+
+
+def ranked_names(pool, avoid=()):
+    return [endpoint.name for endpoint in pool.ranked(avoid)]
+
+
+def test_parse_endpoints():
+    endpoints = parse_endpoints('eastus:k1:10, westeurope:k2, eastus:k3', 'centralindia', None, 50)
+    assert [e.name for e in endpoints] == ['eastus', 'westeurope', 'eastus#2']
+    assert [e.max_concurrent for e in endpoints] == [10, 50, 50]
+
+    default, = parse_endpoints('', 'centralindia', 'key', 50)
+    assert default.name == 'centralindia' and default.subscription_key == 'key'
+
+    try:
+        parse_endpoints('eastus', 'centralindia', None)
+        assert False, 'an entry without a key must be rejected'
+    except ValueError:
+        pass
+
+
+def test_ranking_prefers_unsampled_then_fast_then_idle_endpoints():
+    pool = make_pool('slow', 'fast', 'new')
+    slow, fast, new = (pool.endpoints[name] for name in ('slow', 'fast', 'new'))
+    pool.record_latency(slow, 2.0)
+    pool.record_latency(fast, 0.5)
+    assert ranked_names(pool) == ['new', 'fast', 'slow']
+
+    # Load inflates the expected latency of a busy endpoint
+    pool.record_latency(new, 0.8)
+    assert ranked_names(pool) == ['fast', 'new', 'slow']
+    for _ in range(3):
+        assert pool.acquire(fast)
+    assert ranked_names(pool) == ['new', 'fast', 'slow']
+    assert pool.acquire(fast)
+    # At its cap an endpoint is not offered at all, and acquiring it fails
+    assert 'fast' not in ranked_names(pool)
+    assert not pool.acquire(fast)
+    pool.release(fast)
+    assert 'fast' in ranked_names(pool)
+
+    # Endpoints to avoid come last whatever their score
+    assert ranked_names(pool, avoid=['new'])[-1] == 'new'
+
+
+def test_repeated_service_failures_eject_an_endpoint():
+    pool = make_pool('east', 'west', eject_seconds=0.2)
+    east = pool.endpoints['east']
+    pool.record_latency(east, 0.1)
+    pool.record_latency(pool.endpoints['west'], 1.0)
+
+    # A success in between resets the run of failures
+    pool.record_outcome(east, 'ServiceTimeout')
+    pool.record_outcome(east, None)
+    pool.record_outcome(east, 'ServiceTimeout')
+    assert ranked_names(pool)[0] == 'east'
+
+    # A bad request is the client's fault: it is no service failure
+    pool.record_outcome(east, 'BadRequestParameters')
+    assert pool.get_stats()['east']['failures'] == 2
+
+    pool.record_outcome(east, 'ServiceTimeout')
+    assert ranked_names(pool)[0] == 'east'
+    pool.record_outcome(east, 'ServiceTimeout')
+    assert ranked_names(pool) == ['west', 'east']
+    assert pool.get_stats()['east']['ejected_seconds'] > 0
+
+    time.sleep(0.25)
+    assert pool.get_stats()['east']['ejected_seconds'] == 0
+    assert pool.get_stats()['east']['failures'] == 4
+
+
+def test_unpooled_languages_hold_an_endpoint_slot():
+    pool = make_pool('only', max_concurrent=1)
+    factory = RecognizerFactory(FakeRecognitionEngine(), pool, ['en-US'], acquire_timeout=0.05)
+    endpoint = pool.endpoints['only']
+
+    config = factory.acquire_config('xx-XX')
+    assert config.speech_recognition_language == 'xx-XX'
+    assert endpoint.in_flight == 1
+    try:
+        factory.acquire_config('en-US')
+        assert False, 'the endpoint is at its cap'
+    except RecognizerPoolExhausted:
+        pass
+
+    factory.release_config('xx-XX', config)
+    assert endpoint.in_flight == 0
+    with factory.lease('en-US'):
+        assert endpoint.in_flight == 1
+    assert endpoint.in_flight == 0
+    assert factory.get_stats()['unpooled'] == 1
+
+
+def test_only_file_runs_feed_endpoint_latency(tmp_path):
+    service = AzureSpeechService(engine=FakeRecognitionEngine(segment_seconds=1))
+    endpoint, = service.endpoint_pool.endpoints.values()
+
+    # A live session's first segment waits on the speaker, so it is no latency sample
+    session = service.start_continuous_stream_session('en-US')
+    assert service.start_continuous_recognition(session)
+    service.write_session_audio(session, tone_pcm(2))
+    stopped = service.stop_continuous_recognition(session)
+    assert stopped['success'] and stopped['transcriptions']
+    assert endpoint.latency is None
+
+    result = service.convert_speech_to_text_from_file(write_wav(tmp_path / 'tone.wav', tone_pcm(1)))
+    assert result['success']
+    assert endpoint.latency is not None
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for background file transcription jobs and their recovery across workers
+Usage: python -m pytest test_job_manager.py
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import subprocess
+import multiprocessing
+
+from services.job_manager import TranscriptionJobManager, JobQueueFull, JOB_STATUS_DONE, JOB_STATUS_FAILED
+
+
+def transcribe(audio_path, language, job):
+    with open(audio_path, 'rb') as f:
+        return {'success': True, 'bytes': len(f.read()), 'language': language}
+
+
+def wait_for_status(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get_job(job_id)
+        if job['status'] in (JOB_STATUS_DONE, JOB_STATUS_FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def dead_pid():
+    """The pid of a process that has already exited"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def stale_job(storage_dir, owner_pid, status='running'):
+    """An unfinished job left on disk by another worker"""
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(storage_dir, job_id)
+    os.makedirs(job_dir)
+    with open(os.path.join(job_dir, 'audio'), 'wb') as f:
+        f.write(b'audio')
+    with open(os.path.join(job_dir, 'claim'), 'w') as f:
+        f.write(str(owner_pid))
+    with open(os.path.join(job_dir, 'job.json'), 'w') as f:
+        json.dump({'job_id': job_id, 'status': status, 'language': 'en-US', 'filename': 'a.wav',
+                   'options': {}, 'attempts': 1}, f)
+    return job_id
+
+
+def test_submitted_job_runs_and_cleans_up(tmp_path):
+    manager = TranscriptionJobManager(transcribe, str(tmp_path / 'jobs'))
+    upload = tmp_path / 'upload'
+    upload.write_bytes(b'12345')
+    try:
+        job = manager.submit(str(upload), 'fr-FR', 'meeting.wav')
+        assert not upload.exists()
+        finished = wait_for_status(manager, job['job_id'])
+        assert finished['status'] == JOB_STATUS_DONE
+        assert finished['result'] == {'success': True, 'bytes': 5, 'language': 'fr-FR'}
+        assert finished['attempts'] == 1
+        assert manager.get_job('../etc') is None
+    finally:
+        manager.shutdown(wait=True)
+    # The audio goes once the finished record is written
+    assert not os.path.exists(os.path.join(str(tmp_path / 'jobs'), job['job_id'], 'audio'))
+
+
+def test_pending_jobs_are_capped(tmp_path):
+    def slow(audio_path, language, job):
+        time.sleep(0.3)
+        return {'success': True}
+
+    manager = TranscriptionJobManager(slow, str(tmp_path / 'jobs'), max_workers=1, max_pending=1)
+    try:
+        first = tmp_path / 'first'
+        first.write_bytes(b'1')
+        manager.submit(str(first), 'en-US', 'first.wav')
+        second = tmp_path / 'second'
+        second.write_bytes(b'2')
+        try:
+            manager.submit(str(second), 'en-US', 'second.wav')
+            assert False, 'a second pending job must be refused'
+        except JobQueueFull:
+            pass
+        assert second.exists()
+    finally:
+        manager.shutdown(wait=True)
+
+
+def test_jobs_of_dead_workers_are_recovered(tmp_path):
+    storage_dir = str(tmp_path / 'jobs')
+    os.makedirs(storage_dir)
+    orphaned = stale_job(storage_dir, dead_pid())
+    # The parent process stands in for another live worker
+    owned = stale_job(storage_dir, os.getppid())
+    finished = stale_job(storage_dir, dead_pid(), status=JOB_STATUS_DONE)
+
+    manager = TranscriptionJobManager(transcribe, storage_dir)
+    try:
+        job = wait_for_status(manager, orphaned)
+        assert job['status'] == JOB_STATUS_DONE and job['attempts'] == 2
+        with open(os.path.join(storage_dir, orphaned, 'claim')) as f:
+            assert f.read() == str(os.getpid())
+
+        assert manager.get_job(owned)['status'] == 'running'
+        assert manager.get_job(finished)['status'] == JOB_STATUS_DONE
+        assert manager.recover_jobs() == 0
+    finally:
+        manager.shutdown(wait=True)
+
+
+def _slow_pid_alive(pid):
+    # Widens the window between checking the old owner and taking over its claim
+    time.sleep(0.05)
+    return TranscriptionJobManager._pid_alive(pid)
+
+
+def _race_for_claim(storage_dir, job_id, start_at):
+    manager = TranscriptionJobManager.__new__(TranscriptionJobManager)
+    manager.storage_dir = storage_dir
+    manager._pid_alive = _slow_pid_alive
+    time.sleep(max(0.0, start_at - time.time()))
+    return manager._claim(job_id)
+
+
+def test_only_one_worker_takes_over_a_stale_claim(tmp_path):
+    storage_dir = str(tmp_path / 'jobs')
+    os.makedirs(storage_dir)
+    for _ in range(5):
+        job_id = stale_job(storage_dir, dead_pid())
+        start_at = time.time() + 0.3
+        with multiprocessing.get_context('fork').Pool(6) as pool:
+            won = pool.starmap(_race_for_claim, [(storage_dir, job_id, start_at)] * 6)
+        assert won.count(True) == 1
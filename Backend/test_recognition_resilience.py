@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for recognition retries and the circuit breaker, on the fake speech engine
+Usage: python -m pytest test_recognition_resilience.py
+
+The fake engine's failure injection (failure_rate, failure_codes and seed)
+stands in for a failing speech service.
+"""
+
+import time
+import random
+
+from conftest import tone_pcm, write_wav
+from services.azure_speech_service import AzureSpeechService
+from services.recognition_engine import RecognitionEngine, FakeRecognitionEngine
+from services.recognition_resilience import (
+    CircuitBreaker, CircuitOpen, RetryPolicy, is_transient, is_service_failure,
+    CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN
+)
+
+
+def fake_service(failure_rate=0.0, failure_codes=('ServiceTimeout',), failure_threshold=3, cooldown_seconds=0.3):
+    """A speech service on a fake engine, with fast retries and a short breaker cooldown"""
+    engine = FakeRecognitionEngine(segment_seconds=1, failure_rate=failure_rate, failure_codes=failure_codes)
+    service = AzureSpeechService(engine=engine)
+    service.retry_policy = RetryPolicy(max_retries=2, base_delay=0.01, max_delay=0.02)
+    service.circuit_breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown_seconds=cooldown_seconds)
+    return service
+
+
+def test_engines_must_implement_the_whole_interface():
+    class PartialEngine(RecognitionEngine):
+        def create_recognizer(self, speech_config, audio_config):
+            pass
+
+    try:
+        PartialEngine()
+        assert False, 'an engine missing abstract methods must not be instantiable'
+    except TypeError:
+        pass
+
+
+def test_seeded_engines_inject_the_same_failures():
+    def draws(engine):
+        return [engine.next_failure() for _ in range(50)]
+
+    codes = ('ServiceTimeout', 'ConnectionFailure', 'TooManyRequests')
+    first = FakeRecognitionEngine(failure_rate=0.5, failure_codes=codes, seed=7)
+    random.seed(1)
+    expected = draws(first)
+
+    # The sequence depends only on the seed, not on the global random state
+    second = FakeRecognitionEngine(failure_rate=0.5, failure_codes=codes, seed=7)
+    random.seed(2)
+    assert draws(second) == expected
+    assert None in expected and set(expected) - {None} <= set(codes)
+
+
+# Retries and circuit breaker
+
+def test_error_classification():
+    """Transient codes are retried; credential failures only count against the breaker"""
+    for code in ('ServiceTimeout', 'ConnectionFailure', 'TooManyRequests'):
+        assert is_transient(code) and is_service_failure(code)
+    assert not is_transient('AuthenticationFailure') and is_service_failure('AuthenticationFailure')
+    assert not is_transient('BadRequestParameters') and not is_service_failure('BadRequestParameters')
+    assert not is_transient(None) and not is_service_failure(None)
+
+
+def test_retry_policy_limits():
+    policy = RetryPolicy(max_retries=2, base_delay=0.5, max_delay=8, budget_seconds=30)
+    started = time.monotonic()
+    assert 0 <= policy.next_delay('ServiceTimeout', 0, started) <= 0.5
+    assert policy.next_delay('ServiceTimeout', 2, started) is None
+    assert policy.next_delay('AuthenticationFailure', 0, started) is None
+    # Past the budget no retry is begun
+    assert policy.next_delay('ServiceTimeout', 0, started - 31) is None
+
+
+def test_circuit_breaker_trips_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=0.2)
+    breaker.record('ServiceUnavailable')
+    assert breaker.state() == CIRCUIT_CLOSED
+    breaker.record('ServiceUnavailable')
+    assert breaker.state() == CIRCUIT_OPEN
+
+    try:
+        breaker.allow()
+        assert False, 'an open breaker must refuse calls'
+    except CircuitOpen as e:
+        assert e.retry_after >= 1
+
+    # After the cooldown one probe goes through; others wait for its outcome
+    time.sleep(0.25)
+    breaker.allow()
+    assert breaker.state() == CIRCUIT_HALF_OPEN
+    try:
+        breaker.allow()
+        assert False, 'only one probe may run while half-open'
+    except CircuitOpen:
+        pass
+    breaker.record(None)
+    assert breaker.state() == CIRCUIT_CLOSED
+
+
+def test_injected_transient_failures_are_retried_then_trip_the_breaker(tmp_path):
+    service = fake_service(failure_rate=1.0, failure_codes=('ServiceTimeout',))
+    audio_path = write_wav(str(tmp_path / 'tone.wav'), tone_pcm(2))
+
+    result = service.convert_speech_to_text_from_file(audio_path)
+    assert not result['success']
+    assert result['error_code'] == 'ServiceTimeout'
+    assert result['attempts'] == 3
+    assert result['retry_after'] >= 1
+    assert service.circuit_breaker.state() == CIRCUIT_OPEN
+
+    # While open, recognition is refused without reaching the engine
+    refused = service.convert_speech_to_text_from_file(audio_path)
+    assert not refused['success'] and 'attempts' not in refused
+    assert refused['retry_after'] >= 1
+
+    # The service recovers: the probe after the cooldown succeeds and closes the circuit
+    service.engine.failure_rate = 0
+    time.sleep(0.35)
+    recovered = service.convert_speech_to_text_from_file(audio_path)
+    assert recovered['success'] and len(recovered['transcriptions']) == 2
+    assert service.circuit_breaker.state() == CIRCUIT_CLOSED
+
+
+def test_non_transient_failures_are_not_retried(tmp_path):
+    service = fake_service(failure_rate=1.0, failure_codes=('BadRequestParameters',))
+    audio_path = write_wav(str(tmp_path / 'tone.wav'), tone_pcm(1))
+
+    result = service.convert_speech_to_text_from_file(audio_path)
+    assert not result['success']
+    assert result['attempts'] == 1
+    # A bad request says nothing about the service's health
+    assert service.circuit_breaker.get_stats()['consecutive_failures'] == 0
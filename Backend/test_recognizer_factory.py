@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled per-language speech configs and their leases
+Usage: python -m pytest test_recognizer_factory.py
+"""
+
+import time
+import asyncio
+import threading
+
+from services.endpoint_pool import EndpointPool, SpeechEndpoint
+from services.recognition_engine import FakeRecognitionEngine
+from services.recognizer_factory import RecognizerFactory, RecognizerPoolExhausted
+
+
+def make_factory(max_configs=2, endpoints=('eastus',), acquire_timeout=0.1, prewarm=True):
+    pool = EndpointPool([SpeechEndpoint(name, name, 'key') for name in endpoints])
+    return RecognizerFactory(FakeRecognitionEngine(), pool, ['en-US', 'fr-FR'],
+                             max_configs_per_language=max_configs, acquire_timeout=acquire_timeout,
+                             prewarm=prewarm)
+
+
+def test_prewarmed_configs_are_reused_and_bound_to_one_language():
+    factory = make_factory()
+    assert factory.get_stats()['languages']['en-US'] == {'created': 1, 'idle': 1, 'in_use': 0}
+
+    with factory.lease('en-US') as first:
+        assert first.speech_recognition_language == 'en-US'
+        assert factory.get_stats()['languages']['en-US']['in_use'] == 1
+    with factory.lease('en-US') as again:
+        assert again is first
+    with factory.lease('fr-FR') as french:
+        assert french.speech_recognition_language == 'fr-FR'
+
+    stats = factory.get_stats()
+    assert stats['hits'] == 3 and stats['misses'] == 0
+    assert stats['languages']['en-US'] == {'created': 1, 'idle': 1, 'in_use': 0}
+
+
+def test_pool_grows_to_its_cap_then_times_out():
+    factory = make_factory(max_configs=2)
+    first = factory.acquire_config('en-US')
+    second = factory.acquire_config('en-US')
+    assert first is not second
+    assert factory.get_stats()['misses'] == 1
+
+    try:
+        factory.acquire_config('en-US', timeout=0.05)
+        assert False, 'the pool is exhausted'
+    except RecognizerPoolExhausted:
+        pass
+    # Other languages have their own pools
+    factory.release_config('fr-FR', factory.acquire_config('fr-FR'))
+
+    factory.release_config('en-US', first)
+    factory.release_config('en-US', second)
+    stats = factory.get_stats()
+    assert stats['timeouts'] == 1 and stats['waits'] == 1
+    assert stats['languages']['en-US'] == {'created': 2, 'idle': 2, 'in_use': 0}
+
+
+def test_waiting_thread_gets_the_released_config():
+    factory = make_factory(max_configs=1, acquire_timeout=2)
+    held = factory.acquire_config('en-US')
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(factory.acquire_config('en-US')))
+    waiter.start()
+    time.sleep(0.1)
+    assert not received
+
+    factory.release_config('en-US', held)
+    waiter.join(2)
+    assert received == [held]
+    factory.release_config('en-US', held)
+
+
+def test_async_waiter_gets_the_released_config():
+    factory = make_factory(max_configs=1, acquire_timeout=2)
+    held = factory.acquire_config('en-US')
+
+    async def acquire_while_held():
+        task = asyncio.ensure_future(factory.acquire_config_async('en-US'))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        # Released from another thread, as a finishing recognition would
+        threading.Thread(target=factory.release_config, args=('en-US', held)).start()
+        return await asyncio.wait_for(task, 2)
+
+    assert asyncio.run(acquire_while_held()) is held
+
+
+def test_leases_spread_over_endpoints_and_remember_them():
+    factory = make_factory(max_configs=1, endpoints=('eastus', 'westeurope'), prewarm=False)
+    first = factory.acquire_config('en-US')
+    second = factory.acquire_config('en-US')
+    endpoints = {factory.endpoint_of(first).name, factory.endpoint_of(second).name}
+    assert endpoints == {'eastus', 'westeurope'}
+    assert factory.get_stats()['misses'] == 2
+
+    factory.release_config('en-US', first)
+    factory.release_config('en-US', second)
+    assert all(endpoint.in_flight == 0 for endpoint in factory.endpoint_pool.endpoints.values())
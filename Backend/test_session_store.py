@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared session store and cross-worker command routing
+Usage: python -m pytest test_session_store.py
+"""
+
+import os
+import time
+import base64
+
+import app as speech_app
+from conftest import tone_pcm
+from services.session_store import SessionStore, SQLiteSessionStore, SessionCommandListener
+
+
+def test_backends_must_implement_the_whole_interface():
+    class PartialStore(SessionStore):
+        def create_session(self, session_id, owner_pid, language, start_time):
+            pass
+
+    try:
+        PartialStore()
+        assert False, 'a backend missing abstract methods must not be instantiable'
+    except TypeError:
+        pass
+
+
+def test_segments_are_paged_in_order(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    store.create_session('paged', os.getpid(), 'en-US', time.time())
+    for index in range(5):
+        store.append_segment('paged', index, {'text': f'segment {index}'})
+
+    assert [s['text'] for s in store.get_segments('paged', since=3)] == ['segment 3', 'segment 4']
+    assert [s['text'] for s in store.iter_segments('paged', page_size=2)] == [f'segment {i}' for i in range(5)]
+    assert store.get_session('paged')['segments'] == 5
+
+    store.delete_session('paged')
+    assert store.get_session('paged') is None
+
+
+def test_commands_reach_only_the_owning_worker(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    owner_pid = os.getpid()
+    store.create_session('mine', owner_pid, 'en-US', time.time())
+    store.create_session('theirs', owner_pid + 1, 'en-US', time.time())
+
+    listener = SessionCommandListener(
+        store,
+        handlers={'echo': lambda session_id, args: {'session_id': session_id, 'args': args}},
+        poll_interval=0.02
+    )
+    try:
+        command_id = store.send_command('mine', owner_pid, 'echo', {'value': 1})
+        assert store.wait_for_command(command_id, timeout=2) == {'session_id': 'mine', 'args': {'value': 1}}
+
+        unknown = store.send_command('mine', owner_pid, 'rewind')
+        assert store.wait_for_command(unknown, timeout=2)['success'] is False
+
+        # Addressed to another worker: this listener leaves it alone
+        other = store.send_command('theirs', owner_pid + 1, 'echo')
+        assert store.wait_for_command(other, timeout=0.3) is None
+    finally:
+        listener.shutdown()
+
+
+def test_relayed_audio_and_stop_are_routed_to_the_session_owner():
+    """Audio and stop commands another worker relays are applied to this worker's session, in seq order"""
+    client = speech_app.app.test_client()
+    started = client.post('/api/continuous/start', json={'session_id': 'relay_test', 'source': 'stream'})
+    assert started.status_code == 200
+
+    store = speech_app.session_store
+    pcm = tone_pcm(2)
+    half = len(pcm) // 2
+    # Sent as another worker would: the second half first
+    for seq, data in ((1, pcm[half:]), (0, pcm[:half])):
+        command_id = store.send_command('relay_test', os.getpid(), 'audio',
+                                        {'data': base64.b64encode(data).decode('ascii'), 'seq': seq})
+        routed = store.wait_for_command(command_id, timeout=5)
+        assert routed['status_code'] == 200
+    assert routed['body']['next_seq'] == 2
+    assert routed['body']['pcm_bytes_written'] == len(pcm)
+
+    command_id = store.send_command('relay_test', os.getpid(), 'stop')
+    stopped = store.wait_for_command(command_id, timeout=10)
+    assert stopped['status_code'] == 200
+    assert stopped['body']['success']
+    assert 'relay_test' not in speech_app.active_sessions
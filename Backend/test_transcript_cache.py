@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed transcript cache and its admin endpoint
+Usage: python -m pytest test_transcript_cache.py
+"""
+
+import io
+import hashlib
+
+import app as speech_app
+from conftest import tone_pcm, wav_bytes
+from services.transcript_cache import TranscriptCache
+
+RESULT = {'success': True, 'transcriptions': [{'text': 'hello', 'offset': 0, 'duration': 10000000}]}
+
+
+def test_cache_tiers_and_eviction(tmp_path):
+    digest = hashlib.sha256(b'audio').hexdigest()
+    cache = TranscriptCache(str(tmp_path), max_entries=1)
+
+    assert cache.get(digest, 'en-US') is None
+    cache.put(digest, 'en-US', RESULT)
+    assert cache.get(digest, 'en-US') == RESULT
+    assert cache.get(digest, 'fr-FR') is None
+
+    # A second worker sees the entry through the shared directory
+    other_worker = TranscriptCache(str(tmp_path))
+    assert other_worker.get(digest, 'en-US') == RESULT
+    assert other_worker.get_stats()['disk_hits'] == 1
+
+    assert cache.evict(digest) >= 1
+    assert TranscriptCache(str(tmp_path)).get(digest, 'en-US') is None
+
+
+def test_cache_rejects_malformed_digests(tmp_path):
+    cache = TranscriptCache(str(tmp_path))
+    cache.put('../../etc/passwd', 'en-US', RESULT)
+    assert cache.get('../../etc/passwd', 'en-US') is None
+    assert cache.get_stats()['stores'] == 0
+
+
+def test_file_transcription_cache_miss_then_hit():
+    client = speech_app.app.test_client()
+    audio = wav_bytes(tone_pcm(2, frequency=330))
+
+    def upload(language='en-US'):
+        return client.post('/api/file-transcription',
+                           data={'audio': (io.BytesIO(audio), 'clip.wav'), 'language': language},
+                           content_type='multipart/form-data')
+
+    first = upload()
+    assert first.status_code == 200
+    assert first.get_json()['cache'] == 'miss'
+
+    second = upload()
+    assert second.status_code == 200
+    assert second.get_json()['cache'] == 'hit'
+    assert second.get_json()['transcription'] == first.get_json()['transcription']
+
+    # The cache is keyed by language as well as content
+    assert upload('fr-FR').get_json()['cache'] == 'miss'
+
+
+def test_cache_ignores_client_declared_digest():
+    """A raw body cannot claim another upload's cached transcript by declaring its digest"""
+    client = speech_app.app.test_client()
+    cached_audio = wav_bytes(tone_pcm(2, frequency=440))
+    client.post('/api/file-transcription', data={'audio': (io.BytesIO(cached_audio), 'a.wav')},
+                content_type='multipart/form-data')
+
+    forged = client.post('/api/file-transcription', data=wav_bytes(tone_pcm(1, frequency=550)),
+                         content_type='audio/wav',
+                         headers={'X-Audio-SHA256': hashlib.sha256(cached_audio).hexdigest()})
+    assert forged.status_code == 200
+    assert forged.get_json()['cache'] == 'miss'
+
+
+def test_admin_endpoints_fail_closed_without_a_token(monkeypatch):
+    client = speech_app.app.test_client()
+    monkeypatch.setattr(speech_app, 'ADMIN_TOKEN', None)
+    assert client.delete('/api/admin/cache').status_code == 403
+    assert client.get('/api/admin/cache', headers={'X-Admin-Token': ''}).status_code == 403
+    assert client.get('/api/admin/transcripts').status_code == 403
+
+
+def test_admin_endpoints_require_the_configured_token(monkeypatch):
+    client = speech_app.app.test_client()
+    monkeypatch.setattr(speech_app, 'ADMIN_TOKEN', 's3cret')
+    assert client.get('/api/admin/cache').status_code == 403
+    assert client.get('/api/admin/cache', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    response = client.get('/api/admin/cache', headers={'X-Admin-Token': 's3cret'})
+    assert response.status_code == 200
+    assert 'cache' in response.get_json()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for transcript export documents and their download headers
+Usage: python -m pytest test_transcript_export.py
+"""
+
+import json
+
+import app as speech_app
+from conftest import tone_pcm, wav_bytes
+from utils.transcript_export import format_cue_time, iter_export, TICKS_PER_SECOND
+
+SEGMENTS = [
+    {'text': 'first line', 'offset': 0, 'duration': int(1.5 * TICKS_PER_SECOND)},
+    {'text': '', 'offset': 2 * TICKS_PER_SECOND, 'duration': TICKS_PER_SECOND},
+    {'text': 'second line', 'offset': int(3661.25 * TICKS_PER_SECOND), 'duration': TICKS_PER_SECOND}
+]
+
+
+def export(export_format, segments=SEGMENTS, metadata=None):
+    return ''.join(iter_export(export_format, segments, metadata or {}))
+
+
+def test_cue_times():
+    assert format_cue_time(0) == '00:00:00,000'
+    assert format_cue_time(3661.2504) == '01:01:01,250'
+    assert format_cue_time(59.9996, '.') == '00:01:00.000'
+    assert format_cue_time(-1) == '00:00:00,000'
+
+
+def test_srt_numbers_cues_and_skips_empty_segments():
+    assert export('srt') == (
+        '1\n00:00:00,000 --> 00:00:01,500\nfirst line\n\n'
+        '2\n01:01:01,250 --> 01:01:02,250\nsecond line\n\n'
+    )
+
+
+def test_vtt_header_and_cues():
+    document = export('vtt')
+    assert document.startswith('WEBVTT\n\n')
+    assert '00:00:00.000 --> 00:00:01.500\nfirst line\n\n' in document
+    assert '01:01:01.250 --> 01:01:02.250\nsecond line\n\n' in document
+
+
+def test_segments_without_offsets_follow_each_other():
+    """Session segments carry wall-clock timestamps; untimed ones are laid end to end"""
+    segments = [{'text': 'one two', 'timestamp': 105.0}, {'text': 'three four five'}]
+    cues = json.loads(export('json', segments, {'start_time': 100.0}))['segments']
+    assert cues[0] == {'start': 5.0, 'end': 6.0, 'text': 'one two'}
+    assert cues[1]['start'] == cues[0]['end']
+    assert cues[1]['end'] > cues[1]['start']
+
+
+def test_unknown_format_is_rejected():
+    try:
+        export('docx')
+        assert False, 'an unsupported format must raise'
+    except ValueError:
+        pass
+
+
+def _transcribe(client, filename):
+    """Transcribe a raw WAV body uploaded under the given client-supplied name"""
+    response = client.post('/api/file-transcription', data=wav_bytes(tone_pcm(1)), content_type='audio/wav',
+                           query_string={'filename': filename, 'cache': 'false'})
+    assert response.status_code == 200
+    return response.get_json()['transcript_id']
+
+
+def test_download_name_cannot_inject_header_parameters():
+    client = speech_app.app.test_client()
+    transcript_id = _transcribe(client, 'evil"; filename=owned; x=y.wav')
+    disposition = client.get(f'/api/transcripts/{transcript_id}/export?format=srt').headers['Content-Disposition']
+    assert disposition.startswith('attachment; filename="')
+    quoted = disposition.split('filename="', 1)[1].split('"', 1)[0]
+    assert quoted.endswith('.srt')
+    assert '"' not in quoted and ';' not in quoted
+    assert disposition.count('filename=') == 1
+
+
+def test_non_ascii_download_name_uses_rfc5987_encoding():
+    client = speech_app.app.test_client()
+    transcript_id = _transcribe(client, 'Встреча.wav')
+    disposition = client.get(f'/api/transcripts/{transcript_id}/export?format=vtt').headers['Content-Disposition']
+    # Nothing of the name survives ASCII sanitizing, so the quoted name falls back to the ID
+    assert f'filename="{transcript_id}.vtt"' in disposition
+    assert "filename*=UTF-8''%D0%92%D1%81%D1%82%D1%80%D0%B5%D1%87%D0%B0.vtt" in disposition
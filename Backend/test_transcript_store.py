@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the transcript store and its full-text search
+Usage: python -m pytest test_transcript_store.py
+"""
+
+import pytest
+
+import app as speech_app
+from conftest import tone_pcm, wav_bytes
+from services.transcript_store import TranscriptStore, build_match_expression
+
+
+def save(store, text, source='file', language='en-US'):
+    return store.save(source, language, [{'text': sentence} for sentence in text.split('. ')])
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(str(tmp_path / 'transcripts.db'))
+    save(store, 'The quarterly budget review. Marketing asked for more budget')
+    save(store, 'Budget approved for the new office', source='job')
+    save(store, 'Réunion sur le budget', language='fr-FR')
+    save(store, 'Weather forecast for the weekend')
+    return store
+
+
+def test_match_expression_quotes_every_term():
+    assert build_match_expression('budget review') == '"budget" "review"'
+    assert build_match_expression('"new office" bud*') == '"new office" "bud"*'
+    # FTS5 syntax in a query is searched for literally
+    assert build_match_expression('NEAR(a b) OR c-d') == '"NEAR(a" "b)" "OR" "c-d"'
+    for query in ('', '   ', 'b*'):
+        with pytest.raises(ValueError):
+            build_match_expression(query)
+
+
+def test_every_term_must_match(store):
+    results = store.search('budget review')['results']
+    assert len(results) == 1
+    assert '<mark>budget</mark> <mark>review</mark>' in results[0]['snippet']
+    assert results[0]['segment_count'] == 2
+
+    assert len(store.search('budget')['results']) == 3
+    assert store.search('"budget approved"')['results'][0]['source'] == 'job'
+    assert not store.search('"approved budget"')['results']
+    assert len(store.search('week*')['results']) == 1
+
+
+def test_results_rank_by_relevance_or_recency(store):
+    relevant = store.search('budget', language='en-US')['results']
+    # The transcript mentioning the term twice ranks first
+    assert 'quarterly' in relevant[0]['snippet']
+    assert relevant[0]['score'] >= relevant[1]['score']
+
+    recent = store.search('budget', order='recent')['results']
+    assert 'Réunion' in recent[0]['snippet']
+    with pytest.raises(ValueError):
+        store.search('budget', order='alphabetical')
+
+
+def test_filters_and_paging(store):
+    assert len(store.search('budget', language='fr-FR')['results']) == 1
+    assert [r['source'] for r in store.search('budget', source='job')['results']] == ['job']
+
+    first = store.search('budget', limit=2)
+    assert len(first['results']) == 2 and first['next_offset'] == 2
+    rest = store.search('budget', limit=2, offset=first['next_offset'])
+    assert len(rest['results']) == 1 and rest['next_offset'] is None
+
+
+def test_deleted_transcripts_leave_the_index(store):
+    transcript_id = store.search('weather')['results'][0]['transcript_id']
+    assert store.delete(transcript_id)
+    assert not store.search('weather')['results']
+    assert store.get(transcript_id) is None
+    assert not store.delete(transcript_id)
+
+
+def test_search_route():
+    client = speech_app.app.test_client()
+    uploaded = client.post('/api/file-transcription', data=wav_bytes(tone_pcm(1)), content_type='audio/wav',
+                           query_string={'cache': 'false'})
+    transcript_id = uploaded.get_json()['transcript_id']
+
+    response = client.get('/api/transcripts/search', query_string={'q': 'quick brown', 'order': 'recent'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['results'][0]['transcript_id'] == transcript_id
+    assert '<mark>quick</mark>' in body['results'][0]['snippet']
+
+    assert client.get('/api/transcripts/search').status_code == 400
+    assert client.get('/api/transcripts/search', query_string={'q': 'a*'}).status_code == 400
+    assert client.get('/api/transcripts/search', query_string={'q': 'fox', 'offset': -1}).status_code == 400
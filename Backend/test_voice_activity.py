@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for voice activity trimming and mapping segments back to the original timeline
+Usage: python -m pytest test_voice_activity.py
+"""
+
+from conftest import SAMPLE_RATE, tone_pcm, silence_pcm
+from utils.voice_activity import VoiceActivityGate, OffsetMap, shift_transcriptions, TICKS_PER_SECOND
+
+
+def test_vad_keeps_tone_between_silences():
+    gate = VoiceActivityGate(sample_rate=SAMPLE_RATE)
+    pcm = silence_pcm(1) + tone_pcm(1) + silence_pcm(2) + tone_pcm(1) + silence_pcm(1)
+    kept = b''.join(gate.iter_speech([pcm[i:i + 4096] for i in range(0, len(pcm), 4096)]))
+
+    summary = gate.get_summary()
+    assert summary['regions'] == 2
+    assert not summary['passed_through']
+    # Both tones survive with their padding; most of the silence is trimmed
+    assert 2.0 <= len(kept) / 2 / SAMPLE_RATE < 4.0
+    first_region = gate.offset_map.get_regions()[0]
+    assert 0.5 <= first_region['start_seconds'] <= 1.0
+
+
+def test_vad_drops_silence():
+    gate = VoiceActivityGate(sample_rate=SAMPLE_RATE)
+    kept = b''.join(gate.iter_speech([silence_pcm(3)]))
+    assert kept == b''
+    assert not gate.has_signal
+    assert gate.get_summary()['regions'] == 0
+
+
+def test_vad_keeps_audio_without_a_quiet_lead_in():
+    """Continuous sound from the first frame is recognized, not taken for the noise floor"""
+    gate = VoiceActivityGate(sample_rate=SAMPLE_RATE)
+    pcm = tone_pcm(5, amplitude=3000)
+    kept = b''.join(gate.iter_speech([pcm]))
+    assert len(kept) >= len(pcm) * 0.9
+
+
+def test_segment_spanning_a_trimmed_gap_keeps_its_original_end():
+    """A segment over kept speech on both sides of a trimmed second ends where it ends in the original"""
+    offset_map = OffsetMap(SAMPLE_RATE)
+    # Kept: 0-1 s and 2-3 s of the original; 1-2 s was trimmed
+    offset_map.add(0, 0, SAMPLE_RATE)
+    offset_map.add(SAMPLE_RATE, 2 * SAMPLE_RATE, SAMPLE_RATE)
+
+    spanning = {'text': 'across the gap', 'offset': TICKS_PER_SECOND // 2, 'duration': TICKS_PER_SECOND}
+    shifted, = shift_transcriptions([spanning], offset_map)
+    assert shifted['offset'] == TICKS_PER_SECOND // 2
+    # Ends at 2.5 s in the original, not 1.5 s
+    assert shifted['offset'] + shifted['duration'] == 5 * TICKS_PER_SECOND // 2
+
+
+def test_segment_ending_at_a_run_boundary_does_not_absorb_the_gap():
+    offset_map = OffsetMap(SAMPLE_RATE)
+    offset_map.add(0, 0, SAMPLE_RATE)
+    offset_map.add(SAMPLE_RATE, 3 * SAMPLE_RATE, SAMPLE_RATE)
+
+    first, second = shift_transcriptions([
+        {'offset': 0, 'duration': TICKS_PER_SECOND},
+        {'offset': TICKS_PER_SECOND, 'duration': TICKS_PER_SECOND}
+    ], offset_map)
+    assert (first['offset'], first['duration']) == (0, TICKS_PER_SECOND)
+    assert (second['offset'], second['duration']) == (3 * TICKS_PER_SECOND, TICKS_PER_SECOND)
+    # Cues built from them must not overlap
+    assert first['offset'] + first['duration'] <= second['offset']
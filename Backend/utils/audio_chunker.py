@@ -0,0 +1,164 @@
+import os
+import wave
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Audio read or copied per step while splitting, so memory stays flat however long the file
+BLOCK_SECONDS = 5
+
+
+class AudioChunker:
+    """Utility class for splitting long PCM WAV files at silence boundaries"""
+
+    def __init__(
+            self,
+            chunk_seconds: float = 60.0,
+            search_window_seconds: float = 10.0,
+            frame_ms: int = 20
+    ):
+        """
+        Args:
+            chunk_seconds: Target length of each chunk
+            search_window_seconds: How far before the target cut point to look for silence
+            frame_ms: Analysis frame length used to measure energy
+        """
+        self.chunk_seconds = max(1.0, float(chunk_seconds))
+        self.search_window_seconds = min(max(0.0, float(search_window_seconds)), self.chunk_seconds / 2)
+        self.frame_ms = frame_ms
+
+    @staticmethod
+    def get_wav_duration(audio_file_path: str) -> Optional[float]:
+        """
+        Get the duration of a PCM WAV file from its header
+
+        Returns:
+            Duration in seconds, or None if the file is not a readable PCM WAV
+        """
+        try:
+            with wave.open(audio_file_path, 'rb') as wav_file:
+                return wav_file.getnframes() / float(wav_file.getframerate())
+        except (wave.Error, EOFError, OSError):
+            return None
+
+    @staticmethod
+    def _to_mono_float(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+        """Decode interleaved PCM bytes into a mono float array for energy analysis"""
+        if sample_width == 1:
+            samples = np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0
+        elif sample_width == 2:
+            samples = np.frombuffer(raw, dtype='<i2').astype(np.float32)
+        elif sample_width == 3:
+            packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+            samples = (packed[:, 0].astype(np.int32)
+                       | (packed[:, 1].astype(np.int32) << 8)
+                       | (packed[:, 2].astype(np.int8).astype(np.int32) << 16)).astype(np.float32)
+        else:
+            samples = np.frombuffer(raw, dtype='<i4').astype(np.float32)
+
+        return samples.reshape(-1, channels).mean(axis=1)
+
+    def _frame_length(self, sample_rate: int) -> int:
+        return max(1, int(sample_rate * self.frame_ms / 1000))
+
+    @staticmethod
+    def _frame_energy(samples: np.ndarray, frame_length: int) -> np.ndarray:
+        """RMS energy of each whole analysis frame of mono samples"""
+        frame_count = len(samples) // frame_length
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        return np.sqrt(np.mean(frames * frames, axis=1))
+
+    def find_cut_points(self, samples: np.ndarray, sample_rate: int) -> List[int]:
+        """
+        Choose sample indices to cut at, each at the quietest frame shortly before a chunk boundary
+
+        Args:
+            samples: Mono samples
+            sample_rate: Sample rate in Hz
+
+        Returns:
+            Sorted cut positions in samples (excluding 0 and the end)
+        """
+        frame_length = self._frame_length(sample_rate)
+        return self._choose_cuts(self._frame_energy(samples, frame_length), frame_length)
+
+    def _choose_cuts(self, energy: np.ndarray, frame_length: int) -> List[int]:
+        """find_cut_points from the energy of each analysis frame"""
+        frame_count = len(energy)
+        if frame_count == 0:
+            return []
+
+        frames_per_chunk = max(1, int(self.chunk_seconds * 1000 / self.frame_ms))
+        window_frames = int(self.search_window_seconds * 1000 / self.frame_ms)
+
+        cut_frames = []
+        start = 0
+        while frame_count - start > frames_per_chunk:
+            target = start + frames_per_chunk
+            window_start = max(start + 1, target - window_frames)
+            quietest = window_start + int(np.argmin(energy[window_start:target + 1]))
+            cut_frames.append(quietest)
+            start = quietest
+
+        return [frame * frame_length for frame in cut_frames]
+
+    def split_wav(self, audio_file_path: str, output_dir: str) -> List[Dict[str, Any]]:
+        """
+        Split a PCM WAV file into chunk files at silence boundaries
+
+        Args:
+            audio_file_path: Source WAV file
+            output_dir: Directory for the chunk files
+
+        Returns:
+            Ordered list of chunks with path, start_seconds and duration_seconds
+        """
+        with wave.open(audio_file_path, 'rb') as wav_file:
+            params = wav_file.getparams()
+            frame_length = self._frame_length(params.framerate)
+            # Whole analysis frames per block, so no frame straddles two reads
+            block_frames = max(1, params.framerate * BLOCK_SECONDS // frame_length) * frame_length
+
+            # First pass: frame energies, one block at a time
+            energies = []
+            total_frames = 0
+            while True:
+                raw = wav_file.readframes(block_frames)
+                frames_read = len(raw) // (params.sampwidth * params.nchannels)
+                if frames_read == 0:
+                    break
+                total_frames += frames_read
+                samples = self._to_mono_float(raw[:frames_read * params.sampwidth * params.nchannels],
+                                              params.sampwidth, params.nchannels)
+                energies.append(self._frame_energy(samples, frame_length))
+                if frames_read < block_frames:
+                    break
+
+            energy = np.concatenate(energies) if energies else np.zeros(0)
+            boundaries = [0] + self._choose_cuts(energy, frame_length) + [total_frames]
+
+            # Second pass: seek to each cut and copy the chunk across block by block
+            chunks = []
+            for index, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+                chunk_path = os.path.join(output_dir, f"chunk_{index:04d}.wav")
+                wav_file.setpos(start)
+                with wave.open(chunk_path, 'wb') as chunk_file:
+                    chunk_file.setnchannels(params.nchannels)
+                    chunk_file.setsampwidth(params.sampwidth)
+                    chunk_file.setframerate(params.framerate)
+                    position = start
+                    while position < end:
+                        chunk_file.writeframes(wav_file.readframes(min(block_frames, end - position)))
+                        position += block_frames
+
+                chunks.append({
+                    'path': chunk_path,
+                    'start_seconds': start / float(params.framerate),
+                    'duration_seconds': (end - start) / float(params.framerate)
+                })
+
+        logger.info(f"Split {audio_file_path} into {len(chunks)} chunks")
+        return chunks
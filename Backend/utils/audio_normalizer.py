@@ -0,0 +1,291 @@
+import struct
+import logging
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from utils.audio_stream import AudioUploadStream, WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT
+
+logger = logging.getLogger(__name__)
+
+# Format the recognizer is fed after normalization
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+TARGET_BITS_PER_SAMPLE = 16
+
+SUPPORTED_PCM_BITS = {8, 16, 24, 32}
+SUPPORTED_FLOAT_BITS = {32, 64}
+
+
+def is_decodable_wav(wav_format: Optional[Dict[str, Any]]) -> bool:
+    """True if a parsed WAV format can be decoded and normalized by AudioNormalizer"""
+    if not wav_format or wav_format['channels'] < 1 or wav_format['sample_rate'] < 1:
+        return False
+    if wav_format['format_tag'] == WAVE_FORMAT_PCM:
+        return wav_format['bits_per_sample'] in SUPPORTED_PCM_BITS
+    if wav_format['format_tag'] == WAVE_FORMAT_IEEE_FLOAT:
+        return wav_format['bits_per_sample'] in SUPPORTED_FLOAT_BITS
+    return False
+
+
+def describe_wav_format(wav_format: Dict[str, Any]) -> Dict[str, Any]:
+    """Public description of a parsed WAV format"""
+    return {
+        'container': 'wav',
+        'encoding': 'float' if wav_format['format_tag'] == WAVE_FORMAT_IEEE_FLOAT else 'pcm',
+        'sample_rate': wav_format['sample_rate'],
+        'channels': wav_format['channels'],
+        'bits_per_sample': wav_format['bits_per_sample']
+    }
+
+
+def decode_pcm(raw: bytes, wav_format: Dict[str, Any]) -> np.ndarray:
+    """
+    Decode interleaved WAV sample bytes into a float32 array of shape (frames, channels)
+    scaled to [-1.0, 1.0]
+    """
+    bits = wav_format['bits_per_sample']
+    channels = wav_format['channels']
+
+    if wav_format['format_tag'] == WAVE_FORMAT_IEEE_FLOAT:
+        samples = np.frombuffer(raw, dtype='<f4' if bits == 32 else '<f8').astype(np.float32)
+    elif bits == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif bits == 16:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif bits == 24:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608.0
+    else:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+
+    return samples.reshape(-1, channels)
+
+
+class StreamingResampler:
+    """
+    Chunk-by-chunk sample rate converter for mono float signals.
+    Downsampling applies a windowed-sinc anti-aliasing filter before linear
+    interpolation; filter history and the fractional read position are carried
+    across chunks so the output is identical to converting the whole signal at once.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE, taps: int = 101):
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.step = source_rate / float(target_rate)
+
+        self._filter = None
+        if source_rate > target_rate:
+            cutoff = 0.45 * target_rate / source_rate
+            n = np.arange(taps) - (taps - 1) / 2.0
+            kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+            self._filter = (kernel / kernel.sum()).astype(np.float32)
+            self._history = np.zeros(taps - 1, dtype=np.float32)
+            # Drop the filter's group delay so timestamps stay aligned with the source
+            self._delay_remaining = (taps - 1) // 2
+
+        self._previous = None
+        self._position = 0.0
+
+    def _filter_chunk(self, samples: np.ndarray) -> np.ndarray:
+        if self._filter is None:
+            return samples
+
+        padded = np.concatenate([self._history, samples])
+        self._history = padded[-(len(self._filter) - 1):]
+        filtered = np.convolve(padded, self._filter, mode='valid').astype(np.float32)
+
+        if self._delay_remaining:
+            dropped = min(self._delay_remaining, len(filtered))
+            filtered = filtered[dropped:]
+            self._delay_remaining -= dropped
+        return filtered
+
+    def _interpolate(self, samples: np.ndarray) -> np.ndarray:
+        if self._previous is not None:
+            samples = np.concatenate([[self._previous], samples])
+        if len(samples) == 0:
+            return samples
+
+        last_index = len(samples) - 1
+        count = int(np.floor((last_index - self._position) / self.step)) + 1 if self._position <= last_index else 0
+        positions = self._position + self.step * np.arange(count)
+        output = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+        next_position = self._position + self.step * count
+        # Re-base onto the next buffer, whose first element is this buffer's last sample
+        self._position = next_position - last_index
+        self._previous = samples[-1]
+        return output
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample one chunk of mono samples"""
+        if self.source_rate == self.target_rate:
+            return samples
+        return self._interpolate(self._filter_chunk(samples))
+
+    def flush(self) -> np.ndarray:
+        """Emit the samples still held back by the anti-aliasing filter delay"""
+        if self.source_rate == self.target_rate or self._filter is None:
+            return np.zeros(0, dtype=np.float32)
+        tail = np.zeros((len(self._filter) - 1) // 2, dtype=np.float32)
+        return self._interpolate(self._filter_chunk(tail))
+
+
+class StreamNormalizer:
+    """
+    Push-style normalizer for audio that arrives in arbitrary pieces (e.g. successive
+    HTTP bodies from a browser). Partial sample frames are carried to the next call,
+    and resampler state persists for the whole stream.
+    """
+
+    def __init__(self, wav_format: Dict[str, Any], target_sample_rate: int = TARGET_SAMPLE_RATE):
+        self.wav_format = wav_format
+        self.block_align = max(1, wav_format['block_align'])
+        self.passthrough = not AudioNormalizer(target_sample_rate).needs_normalization(wav_format)
+        self._resampler = StreamingResampler(wav_format['sample_rate'], target_sample_rate)
+        self._carry = b''
+
+    def process(self, raw: bytes) -> bytes:
+        """Normalize the whole frames in raw (plus any carried bytes) to 16-bit mono PCM"""
+        raw = self._carry + raw
+        usable = len(raw) - (len(raw) % self.block_align)
+        self._carry = raw[usable:]
+        if not usable:
+            return b''
+        if self.passthrough:
+            return raw[:usable]
+
+        frames = decode_pcm(raw[:usable], self.wav_format)
+        mono = frames.mean(axis=1) if frames.shape[1] > 1 else frames[:, 0]
+        return AudioNormalizer._to_int16(self._resampler.process(mono))
+
+    def flush(self) -> bytes:
+        """Emit the samples still held back by the resampler at end of stream"""
+        if self.passthrough:
+            return b''
+        return AudioNormalizer._to_int16(self._resampler.flush())
+
+
+class AudioNormalizer:
+    """Utility class converting WAV audio to 16 kHz mono 16-bit PCM with vectorized NumPy"""
+
+    @staticmethod
+    def raw_pcm_format(sample_rate: int, channels: int = 1, encoding: str = 'pcm',
+                       bits_per_sample: int = 16) -> Dict[str, Any]:
+        """Format description, shaped like parse_wav_header output, for headerless PCM"""
+        return {
+            'format_tag': WAVE_FORMAT_IEEE_FLOAT if encoding == 'float' else WAVE_FORMAT_PCM,
+            'channels': channels,
+            'sample_rate': sample_rate,
+            'bits_per_sample': bits_per_sample,
+            'block_align': channels * bits_per_sample // 8,
+            'byte_rate': sample_rate * channels * bits_per_sample // 8,
+            'data_offset': 0,
+            'data_size': None
+        }
+
+    def __init__(self, target_sample_rate: int = TARGET_SAMPLE_RATE):
+        self.target_sample_rate = target_sample_rate
+
+    def get_normalized_format(self) -> Dict[str, Any]:
+        """Description of the format produced by the normalizer"""
+        return {
+            'container': 'wav',
+            'encoding': 'pcm',
+            'sample_rate': self.target_sample_rate,
+            'channels': TARGET_CHANNELS,
+            'bits_per_sample': TARGET_BITS_PER_SAMPLE
+        }
+
+    def needs_normalization(self, wav_format: Dict[str, Any]) -> bool:
+        """True unless the audio already is 16-bit mono PCM at the target rate"""
+        return not (wav_format['format_tag'] == WAVE_FORMAT_PCM
+                    and wav_format['bits_per_sample'] == TARGET_BITS_PER_SAMPLE
+                    and wav_format['channels'] == TARGET_CHANNELS
+                    and wav_format['sample_rate'] == self.target_sample_rate)
+
+    def iter_normalized(self, wav_format: Dict[str, Any], pcm_chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Normalize a stream of WAV sample bytes chunk by chunk
+
+        Args:
+            wav_format: Parsed WAV format of the source
+            pcm_chunks: Sample bytes in whole frames (e.g. AudioUploadStream.iter_pcm)
+
+        Yields:
+            16-bit little-endian mono PCM bytes at the target sample rate
+        """
+        if not self.needs_normalization(wav_format):
+            yield from pcm_chunks
+            return
+
+        normalizer = StreamNormalizer(wav_format, self.target_sample_rate)
+
+        for chunk in pcm_chunks:
+            output = normalizer.process(chunk)
+            if output:
+                yield output
+
+        tail = normalizer.flush()
+        if tail:
+            yield tail
+
+    @staticmethod
+    def _to_int16(samples: np.ndarray) -> bytes:
+        return (np.clip(samples, -1.0, 32767.0 / 32768.0) * 32768.0).astype('<i2').tobytes()
+
+    @staticmethod
+    def _wav_header(data_size: int, sample_rate: int) -> bytes:
+        block_align = TARGET_CHANNELS * TARGET_BITS_PER_SAMPLE // 8
+        return b'RIFF' + struct.pack('<I', 36 + data_size) + b'WAVE' + b'fmt ' + struct.pack(
+            '<IHHIIHH', 16, WAVE_FORMAT_PCM, TARGET_CHANNELS, sample_rate,
+            sample_rate * block_align, block_align, TARGET_BITS_PER_SAMPLE
+        ) + b'data' + struct.pack('<I', data_size)
+
+    def normalize_file(self, source_path: str, target_path: str, chunk_size: int = 64 * 1024) -> Optional[Dict[str, Any]]:
+        """
+        Write a normalized copy of a WAV file
+
+        Args:
+            source_path: Source WAV file
+            target_path: Destination for the 16 kHz mono 16-bit PCM WAV
+            chunk_size: Bytes decoded at a time
+
+        Returns:
+            Dictionary with 'original' and 'normalized' format descriptions and 'passthrough',
+            or None if the source is not a WAV the normalizer can decode. Nothing is written
+            when None is returned, nor on passthrough: a source already in the target format
+            is recognized as it is.
+        """
+        with open(source_path, 'rb') as source:
+            upload = AudioUploadStream(source, chunk_size=chunk_size)
+            wav_format = upload.read_header()
+            if not is_decodable_wav(wav_format):
+                return None
+            if not self.needs_normalization(wav_format):
+                return {
+                    'original': describe_wav_format(wav_format),
+                    'normalized': self.get_normalized_format(),
+                    'passthrough': True
+                }
+
+            data_size = 0
+            with open(target_path, 'wb') as target:
+                target.write(self._wav_header(0, self.target_sample_rate))
+                for chunk in self.iter_normalized(wav_format, upload.iter_pcm()):
+                    target.write(chunk)
+                    data_size += len(chunk)
+
+                # Patch the RIFF and data sizes now that the length is known
+                target.seek(0)
+                target.write(self._wav_header(data_size, self.target_sample_rate))
+
+        return {
+            'original': describe_wav_format(wav_format),
+            'normalized': self.get_normalized_format(),
+            'passthrough': False
+        }
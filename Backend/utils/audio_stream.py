@@ -0,0 +1,224 @@
+import struct
+import hashlib
+import logging
+from typing import Optional, Iterator, Dict, Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# WAVE format tags
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Streaming WAV writers (e.g. browsers) often leave the data size as 0 or 0xFFFFFFFF
+UNKNOWN_DATA_SIZES = {0, 0xFFFFFFFF}
+
+
+class AudioTooLarge(ValueError):
+    """Raised when an upload exceeds the configured size limit while streaming"""
+
+
+def parse_wav_header(header: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse the RIFF/WAVE header from the first bytes of a file
+
+    Args:
+        header: Leading bytes of the file
+
+    Returns:
+        Dictionary with format_tag, channels, sample_rate, bits_per_sample, block_align,
+        byte_rate, data_offset and data_size (None if unknown), or None if the header
+        is incomplete or not a WAV file
+    """
+    if len(header) < 12 or header[0:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return None
+
+    fmt = None
+    position = 12
+    while position + 8 <= len(header):
+        chunk_id = header[position:position + 4]
+        chunk_size = struct.unpack('<I', header[position + 4:position + 8])[0]
+        body_start = position + 8
+
+        if chunk_id == b'fmt ':
+            if body_start + 16 > len(header):
+                return None
+            format_tag, channels, sample_rate, byte_rate, block_align, bits_per_sample = struct.unpack(
+                '<HHIIHH', header[body_start:body_start + 16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40 and body_start + 26 <= len(header):
+                # The real format tag is the first two bytes of the sub-format GUID
+                format_tag = struct.unpack('<H', header[body_start + 24:body_start + 26])[0]
+            fmt = {
+                'format_tag': format_tag,
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'byte_rate': byte_rate,
+                'block_align': block_align,
+                'bits_per_sample': bits_per_sample
+            }
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            fmt['data_offset'] = body_start
+            fmt['data_size'] = None if chunk_size in UNKNOWN_DATA_SIZES else chunk_size
+            return fmt
+
+        # Chunks are word aligned
+        position = body_start + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def is_streamable_pcm(wav_format: Optional[Dict[str, Any]]) -> bool:
+    """True if a parsed WAV format can be written to a recognizer push stream as-is"""
+    return bool(wav_format) and wav_format['format_tag'] == WAVE_FORMAT_PCM \
+        and wav_format['bits_per_sample'] == 16 and wav_format['channels'] in (1, 2)
+
+
+def hash_seekable_stream(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Optional[str]:
+    """
+    SHA-256 of a seekable stream, read chunk by chunk and rewound afterwards
+
+    Returns:
+        Hex digest, or None if the stream cannot seek
+    """
+    try:
+        if not stream.seekable():
+            return None
+        start = stream.tell()
+    except (AttributeError, OSError):
+        return None
+
+    hasher = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        hasher.update(chunk)
+    stream.seek(start)
+    return hasher.hexdigest()
+
+
+class AudioUploadStream:
+    """
+    Reads an uploaded audio stream in fixed-size chunks without buffering the whole body.
+    Enforces the size limit as bytes arrive and can parse a WAV header up front so the
+    PCM payload can be streamed straight into a recognizer. A SHA-256 of everything
+    read is computed on the way through.
+    """
+
+    # Give up looking for the WAV data chunk after this many bytes
+    MAX_HEADER_BYTES = 64 * 1024
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = 64 * 1024, max_bytes: Optional[int] = None):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.wav_format = None
+        self._buffer = b''
+        self._exhausted = False
+        self._hasher = hashlib.sha256()
+
+    def _read_chunk(self) -> bytes:
+        if self._exhausted:
+            return b''
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self._exhausted = True
+            return b''
+
+        self.bytes_read += len(chunk)
+        self._hasher.update(chunk)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise AudioTooLarge(f'Audio exceeds maximum size of {self.max_bytes} bytes')
+        return chunk
+
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        """
+        Buffer just enough of the stream to parse a WAV header
+
+        Returns:
+            The parsed WAV format (see parse_wav_header), or None for other containers
+        """
+        if self.wav_format is None and self._buffer:
+            self.wav_format = parse_wav_header(self._buffer)
+        while self.wav_format is None and len(self._buffer) < self.MAX_HEADER_BYTES:
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+            self.wav_format = parse_wav_header(self._buffer)
+        return self.wav_format
+
+    def peek(self, size: int) -> bytes:
+        """Buffer and return up to size leading bytes without consuming them"""
+        while len(self._buffer) < size:
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        return self._buffer[:size]
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """Hex SHA-256 of the whole stream, available once it has been read to the end"""
+        return self._hasher.hexdigest() if self._exhausted else None
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the stream ended before any byte was read"""
+        return self._exhausted and self.bytes_read == 0
+
+    def get_duration_seconds(self) -> Optional[float]:
+        """Duration declared by the WAV header, if known"""
+        if not self.wav_format or not self.wav_format['data_size'] or not self.wav_format['byte_rate']:
+            return None
+        return self.wav_format['data_size'] / float(self.wav_format['byte_rate'])
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield the raw stream, starting with any buffered header bytes"""
+        if self._buffer:
+            buffered, self._buffer = self._buffer, b''
+            yield buffered
+        while True:
+            chunk = self._read_chunk()
+            if not chunk:
+                return
+            yield chunk
+
+    def iter_pcm(self) -> Iterator[bytes]:
+        """
+        Yield only the WAV data chunk payload, in whole sample frames.
+        Any trailing chunks after the data are still read so the hash covers the whole stream.
+        """
+        if self.wav_format is None:
+            raise ValueError('WAV header has not been parsed')
+
+        remaining = self.wav_format['data_size']
+        block_align = max(1, self.wav_format['block_align'])
+        skip = self.wav_format['data_offset']
+        carry = b''
+
+        for chunk in self:
+            if remaining == 0:
+                continue
+            if skip:
+                dropped = min(skip, len(chunk))
+                chunk = chunk[dropped:]
+                skip -= dropped
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+
+            chunk = carry + chunk
+            usable = len(chunk) - (len(chunk) % block_align)
+            carry = chunk[usable:]
+            if usable:
+                yield chunk[:usable]
+
+    def spill_to_file(self, file_obj: BinaryIO) -> int:
+        """Copy the stream to a file chunk by chunk and return the bytes written"""
+        written = 0
+        for chunk in self:
+            file_obj.write(chunk)
+            written += len(chunk)
+        return written
@@ -1,9 +1,249 @@
 import os
+import struct
 import logging
+from typing import Dict, Any, Optional, Union, BinaryIO
 from werkzeug.datastructures import FileStorage
 
+from utils.audio_stream import parse_wav_header, WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT
+
 logger = logging.getLogger(__name__)
 
+# WAVE format tags reported by the probe
+WAV_CODECS = {
+    WAVE_FORMAT_PCM: 'pcm',
+    WAVE_FORMAT_IEEE_FLOAT: 'float',
+    0x0006: 'alaw',
+    0x0007: 'mulaw',
+    0x0011: 'ima_adpcm',
+    0x0055: 'mp3'
+}
+
+# MPEG audio layer III tables, indexed by version ('1', '2', '2.5')
+MP3_BITRATES_KBPS = {
+    '1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0],
+    '2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+}
+MP3_SAMPLE_RATES = {
+    '1': [44100, 48000, 32000],
+    '2': [22050, 24000, 16000],
+    '2.5': [11025, 12000, 8000]
+}
+
+# Containers the probe understands, by file extension
+PROBED_EXTENSIONS = {'.wav': 'wav', '.flac': 'flac', '.ogg': 'ogg', '.mp3': 'mp3'}
+
+
+def _probe_result(container: Optional[str], **fields) -> Dict[str, Any]:
+    result = {
+        'valid': True,
+        'container': container,
+        'codec': None,
+        'sample_rate': None,
+        'channels': None,
+        'bits_per_sample': None,
+        'duration_seconds': None,
+        'duration_exact': False,
+        'error': None
+    }
+    result.update(fields)
+    return result
+
+
+def _invalid_probe(container: Optional[str], error: str) -> Dict[str, Any]:
+    return _probe_result(container, valid=False, error=error)
+
+
+def _id3v2_size(head: bytes) -> int:
+    """Size of a leading ID3v2 tag (including its header), or 0"""
+    if len(head) < 10 or head[:3] != b'ID3':
+        return 0
+    size = ((head[6] & 0x7F) << 21) | ((head[7] & 0x7F) << 14) | ((head[8] & 0x7F) << 7) | (head[9] & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _probe_wav(head: bytes, total_size: Optional[int]) -> Dict[str, Any]:
+    wav_format = parse_wav_header(head)
+    if wav_format is None:
+        return _invalid_probe('wav', 'Corrupt or truncated WAV header')
+
+    if wav_format['channels'] < 1 or wav_format['sample_rate'] < 1 or wav_format['byte_rate'] < 1:
+        return _invalid_probe('wav', 'WAV header declares an empty audio format')
+
+    duration = None
+    exact = False
+    if wav_format['data_size'] is not None:
+        data_size = wav_format['data_size']
+        if total_size is not None:
+            data_size = min(data_size, max(0, total_size - wav_format['data_offset']))
+        duration = data_size / float(wav_format['byte_rate'])
+        exact = total_size is None or data_size == wav_format['data_size']
+    elif total_size is not None:
+        duration = max(0, total_size - wav_format['data_offset']) / float(wav_format['byte_rate'])
+
+    return _probe_result(
+        'wav',
+        codec=WAV_CODECS.get(wav_format['format_tag'], f"0x{wav_format['format_tag']:04x}"),
+        sample_rate=wav_format['sample_rate'],
+        channels=wav_format['channels'],
+        bits_per_sample=wav_format['bits_per_sample'],
+        duration_seconds=duration,
+        duration_exact=exact
+    )
+
+
+def _probe_flac(head: bytes) -> Dict[str, Any]:
+    # The mandatory STREAMINFO block directly follows the marker
+    if len(head) < 8 + 34 or head[4] & 0x7F != 0:
+        return _invalid_probe('flac', 'Corrupt or truncated FLAC header')
+
+    info = head[8:8 + 34]
+    packed = int.from_bytes(info[10:18], 'big')
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits_per_sample = ((packed >> 36) & 0x1F) + 1
+    total_samples = packed & 0xFFFFFFFFF
+
+    if sample_rate == 0:
+        return _invalid_probe('flac', 'FLAC STREAMINFO declares a zero sample rate')
+
+    return _probe_result(
+        'flac',
+        codec='flac',
+        sample_rate=sample_rate,
+        channels=channels,
+        bits_per_sample=bits_per_sample,
+        duration_seconds=total_samples / float(sample_rate) if total_samples else None,
+        duration_exact=bool(total_samples)
+    )
+
+
+def _probe_ogg(head: bytes, tail: Optional[bytes]) -> Dict[str, Any]:
+    if len(head) < 27 or head[4] != 0:
+        return _invalid_probe('ogg', 'Corrupt or truncated OGG page')
+
+    serial = head[14:18]
+    segment_count = head[26]
+    packet = head[27 + segment_count:]
+
+    if packet[:7] == b'\x01vorbis' and len(packet) >= 16:
+        codec = 'vorbis'
+        channels = packet[11]
+        sample_rate = struct.unpack('<I', packet[12:16])[0]
+        granule_rate, pre_skip = sample_rate, 0
+    elif packet[:8] == b'OpusHead' and len(packet) >= 16:
+        codec = 'opus'
+        channels = packet[9]
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+        sample_rate = struct.unpack('<I', packet[12:16])[0] or 48000
+        # Opus granule positions always count 48 kHz samples
+        granule_rate = 48000
+    else:
+        return _invalid_probe('ogg', 'Unsupported or corrupt OGG codec header')
+
+    if not channels or not sample_rate:
+        return _invalid_probe('ogg', 'OGG codec header declares an empty audio format')
+
+    duration = None
+    if tail:
+        # The last page of the logical stream carries the total granule position
+        position = tail.rfind(b'OggS')
+        while position != -1:
+            if position + 18 <= len(tail) and tail[position + 14:position + 18] == serial:
+                granule = struct.unpack('<q', tail[position + 6:position + 14])[0]
+                if granule > 0:
+                    duration = max(0, granule - pre_skip) / float(granule_rate)
+                break
+            position = tail.rfind(b'OggS', 0, position)
+
+    return _probe_result(
+        'ogg',
+        codec=codec,
+        sample_rate=sample_rate,
+        channels=channels,
+        duration_seconds=duration,
+        duration_exact=duration is not None
+    )
+
+
+def _parse_mp3_frame_header(header: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a 4-byte MPEG audio layer III frame header"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version = {0: '2.5', 2: '2', 3: '1'}.get((header[1] >> 3) & 0x3)
+    layer = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x3
+    if version is None or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = MP3_BITRATES_KBPS['1' if version == '1' else '2'][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+    samples_per_frame = 1152 if version == '1' else 576
+    padding = (header[2] >> 1) & 0x1
+    channels = 1 if (header[3] >> 6) == 3 else 2
+
+    return {
+        'version': version,
+        'bitrate': bitrate,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'samples_per_frame': samples_per_frame,
+        'frame_length': samples_per_frame // 8 * bitrate // sample_rate + padding
+    }
+
+
+def _probe_mp3(head: bytes, total_size: Optional[int], audio_offset: int) -> Dict[str, Any]:
+    # Find the first frame whose successor also starts with a valid header
+    frame = None
+    position = 0
+    while position + 4 <= len(head):
+        position = head.find(b'\xff', position)
+        if position == -1:
+            break
+        candidate = _parse_mp3_frame_header(head[position:position + 4])
+        if candidate:
+            following = position + candidate['frame_length']
+            if following + 4 > len(head) or _parse_mp3_frame_header(head[following:following + 4]):
+                frame = candidate
+                break
+        position += 1
+
+    if frame is None:
+        return _invalid_probe('mp3', 'No valid MPEG layer III frame found')
+
+    # Xing/Info (LAME) or VBRI headers give the exact frame count
+    side_info = (32 if frame['channels'] == 2 else 17) if frame['version'] == '1' \
+        else (17 if frame['channels'] == 2 else 9)
+    frame_data = head[position + 4:position + frame['frame_length']]
+    frame_count = None
+
+    xing = frame_data[side_info:side_info + 12]
+    if xing[:4] in (b'Xing', b'Info') and len(xing) >= 12 and struct.unpack('>I', xing[4:8])[0] & 0x1:
+        frame_count = struct.unpack('>I', xing[8:12])[0]
+    elif frame_data[32:36] == b'VBRI' and len(frame_data) >= 50:
+        frame_count = struct.unpack('>I', frame_data[46:50])[0]
+
+    if frame_count:
+        duration = frame_count * frame['samples_per_frame'] / float(frame['sample_rate'])
+        exact = True
+    elif total_size is not None:
+        # Constant bitrate estimate from the audio payload size
+        duration = max(0, total_size - audio_offset - position) * 8 / float(frame['bitrate'])
+        exact = False
+    else:
+        duration, exact = None, False
+
+    return _probe_result(
+        'mp3',
+        codec='mp3',
+        sample_rate=frame['sample_rate'],
+        channels=frame['channels'],
+        duration_seconds=duration,
+        duration_exact=exact
+    )
+
 
 class AudioValidator:
     """Utility class for validating audio files"""
@@ -14,8 +254,18 @@ class AudioValidator:
     # Maximum file size (10MB)
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
 
-    def __init__(self):
-        pass
+    # Leading bytes read to probe the container header
+    PROBE_HEAD_BYTES = 16 * 1024
+
+    # Trailing bytes read to find the last OGG page
+    PROBE_TAIL_BYTES = 64 * 1024
+
+    def __init__(self, max_duration_seconds: Optional[float] = None):
+        """
+        Args:
+            max_duration_seconds: Reject audio whose probed duration exceeds this (None disables)
+        """
+        self.max_duration_seconds = max_duration_seconds
 
     def is_valid_audio_file(self, file: FileStorage) -> bool:
         """
@@ -40,17 +290,17 @@ class AudioValidator:
 
         return True
 
-    def is_valid_audio_size(self, audio_data: bytes) -> bool:
+    def is_valid_audio_size(self, audio_data: Union[bytes, int]) -> bool:
         """
         Validate if the audio file size is within limits
 
         Args:
-            audio_data: Audio file data in bytes
+            audio_data: Audio file data in bytes, or just its size so the body need not be read
 
         Returns:
             True if size is valid, False otherwise
         """
-        file_size = len(audio_data)
+        file_size = audio_data if isinstance(audio_data, int) else len(audio_data)
 
         if file_size == 0:
             logger.warning("Empty audio file")
@@ -63,6 +313,107 @@ class AudioValidator:
         logger.info(f"Audio file size: {file_size} bytes")
         return True
 
+    def probe_audio_header(
+            self,
+            head: bytes,
+            total_size: Optional[int] = None,
+            tail: Optional[bytes] = None,
+            extension: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Identify the container and codec from the leading bytes of a file
+
+        Args:
+            head: First bytes of the file (PROBE_HEAD_BYTES is enough for WAV, FLAC, OGG and MP3)
+            total_size: Total file size, used for size-based duration estimates
+            tail: Last bytes of the file, used to read the OGG end position
+            extension: File extension; content must match a probed container's extension
+
+        Returns:
+            Dictionary with valid, container, codec, sample_rate, channels, bits_per_sample,
+            duration_seconds, duration_exact and error
+        """
+        id3_size = _id3v2_size(head)
+        return self._probe_body(head[id3_size:], id3_size, total_size, tail, extension)
+
+    def _probe_body(
+            self,
+            body: bytes,
+            id3_size: int,
+            total_size: Optional[int],
+            tail: Optional[bytes],
+            extension: Optional[str]
+    ) -> Dict[str, Any]:
+        """Probe the bytes following any ID3v2 tag"""
+        if body[:4] == b'RIFF' and body[8:12] == b'WAVE':
+            probe = _probe_wav(body, total_size)
+        elif body[:4] == b'fLaC':
+            probe = _probe_flac(body)
+        elif body[:4] == b'OggS':
+            probe = _probe_ogg(body, tail)
+        elif id3_size or body[:1] == b'\xff':
+            probe = _probe_mp3(body, total_size, id3_size)
+        elif extension in PROBED_EXTENSIONS:
+            probe = _invalid_probe(None, f'File content is not a valid {extension[1:].upper()} file')
+        else:
+            # Containers we do not parse (e.g. M4A, WebM) are left to the recognizer
+            return _probe_result(None)
+
+        expected = PROBED_EXTENSIONS.get(extension)
+        if probe['valid'] and expected and probe['container'] != expected:
+            return _invalid_probe(probe['container'],
+                                  f"File extension {extension} does not match its {probe['container'].upper()} content")
+
+        if probe['valid'] and self.max_duration_seconds and probe['duration_seconds'] \
+                and probe['duration_seconds'] > self.max_duration_seconds:
+            probe.update({
+                'valid': False,
+                'error': f"Audio is {probe['duration_seconds']:.0f}s long. "
+                         f"Maximum duration: {self.max_duration_seconds:.0f}s"
+            })
+
+        return probe
+
+    def probe_audio_file(self, file_obj: BinaryIO, extension: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Probe a seekable file object from its header (and tail for OGG) without reading the body.
+        The position is restored afterwards.
+
+        Returns:
+            Probe result (see probe_audio_header), or None if the file cannot seek
+        """
+        try:
+            if not file_obj.seekable():
+                return None
+            start = file_obj.tell()
+            file_obj.seek(0, os.SEEK_END)
+            total_size = file_obj.tell() - start
+        except (AttributeError, OSError):
+            return None
+
+        try:
+            file_obj.seek(start)
+            head = file_obj.read(self.PROBE_HEAD_BYTES)
+
+            # Skip ID3 tags, which can be large when they embed artwork
+            id3_size = min(_id3v2_size(head), total_size)
+            if id3_size:
+                file_obj.seek(start + id3_size)
+                body = file_obj.read(self.PROBE_HEAD_BYTES)
+            else:
+                body = head
+
+            tail = None
+            if body[:4] == b'OggS':
+                file_obj.seek(start + max(0, total_size - self.PROBE_TAIL_BYTES))
+                tail = file_obj.read(self.PROBE_TAIL_BYTES)
+        finally:
+            file_obj.seek(start)
+
+        probe = self._probe_body(body, id3_size, total_size, tail, extension)
+        probe['size_bytes'] = total_size
+        return probe
+
     def get_file_info(self, file: FileStorage, audio_data: bytes = None) -> dict:
         """
         Get information about the uploaded audio file
@@ -0,0 +1,298 @@
+import os
+import json
+import bisect
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from services.session_store import is_process_alive
+
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# How a gauge's values from several workers are combined, as in prometheus_client's
+# multiprocess mode: summed, the largest or smallest, or kept apart under a pid label
+GAUGE_MULTIPROCESS_MODES = ('sum', 'max', 'min', 'all')
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """A metric family: one value per combination of label values, updated under a lock"""
+
+    type_name = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: Dict[str, Any]) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, mergeable with the same metric from other workers"""
+        with self._lock:
+            samples = [[list(key), value] for key, value in self._values.items()]
+        return {'type': self.type_name, 'help': self.documentation,
+                'labelnames': list(self.labelnames), 'samples': samples}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, or is read from a callback when metrics are collected.
+    multiprocess_mode (one of GAUGE_MULTIPROCESS_MODES) says how workers' values are merged.
+    """
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 multiprocess_mode: str = 'sum'):
+        if multiprocess_mode not in GAUGE_MULTIPROCESS_MODES:
+            raise ValueError(f'Unsupported multiprocess_mode: {multiprocess_mode}')
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._function = None
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the (unlabelled) value from function at collection time"""
+        self._function = function
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._function is not None:
+            try:
+                self.set(float(self._function()))
+            except Exception as e:
+                logger.error(f"Error collecting gauge {self.name}: {str(e)}")
+        snapshot = super().snapshot()
+        snapshot['mode'] = self.multiprocess_mode
+        if self.multiprocess_mode == 'all':
+            # Each worker's values stay separate series
+            pid = str(os.getpid())
+            snapshot['labelnames'].append('pid')
+            for sample in snapshot['samples']:
+                sample[0].append(pid)
+        return snapshot
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the last one for values above every bucket
+                state = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            state['counts'][index] += 1
+            state['sum'] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = [[list(key), {'counts': list(state['counts']), 'sum': state['sum']}]
+                       for key, state in self._values.items()]
+        return {'type': self.type_name, 'help': self.documentation, 'labelnames': list(self.labelnames),
+                'buckets': list(self.buckets), 'samples': samples}
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text format.
+
+    Updates are a dictionary write under a per-metric lock, so they are cheap enough
+    for SDK callbacks. Each gunicorn worker has its own registry; with a shared
+    directory every worker periodically writes a snapshot there, and render() merges
+    the snapshots of all live workers so a scrape of any worker covers the whole server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._directory = None
+        self._exporter = None
+        self._shutdown_event = threading.Event()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric already registered: {metric.name}')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              multiprocess_mode: str = 'sum') -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def enable_shared_directory(self, directory: str, interval_seconds: float = 5) -> None:
+        """Write this worker's snapshot to directory every interval_seconds and merge all workers on render"""
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._exporter = threading.Thread(target=self._export_loop, args=(max(0.5, interval_seconds),),
+                                          name='metrics-exporter', daemon=True)
+        self._exporter.start()
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self._directory, f'{pid}.json')
+
+    def export(self) -> None:
+        """Write this worker's snapshot atomically"""
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, self._snapshot_path(os.getpid()))
+
+    def _export_loop(self, interval_seconds: float) -> None:
+        while not self._shutdown_event.wait(interval_seconds):
+            try:
+                self.export()
+            except Exception as e:
+                logger.error(f"Metrics export error: {str(e)}")
+
+    def _worker_snapshots(self) -> List[Dict[str, Any]]:
+        """This worker's live snapshot plus the latest snapshot of every other live worker"""
+        snapshots = [self.snapshot()]
+        if self._directory is None:
+            return snapshots
+
+        for entry in os.listdir(self._directory):
+            pid_text, extension = os.path.splitext(entry)
+            if extension != '.json' or not pid_text.isdigit() or int(pid_text) == os.getpid():
+                continue
+            path = os.path.join(self._directory, entry)
+            if not is_process_alive(int(pid_text)):
+                # Exited workers are dropped; Prometheus treats the drop like a counter reset
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    @staticmethod
+    def merge(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sum counters and histogram buckets with equal labels across snapshots; gauges
+        are summed or take the largest or smallest value, as their mode says
+        """
+        merged = {}
+        for snapshot in snapshots:
+            for name, family in snapshot.items():
+                target = merged.setdefault(name, dict(family, samples={}))
+                if family.get('buckets') != target.get('buckets'):
+                    continue
+                for labelvalues, value in family['samples']:
+                    key = tuple(labelvalues)
+                    current = target['samples'].get(key)
+                    if family['type'] == 'histogram':
+                        if current is None:
+                            current = target['samples'][key] = {'counts': [0] * len(value['counts']), 'sum': 0.0}
+                        current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                        current['sum'] += value['sum']
+                    elif current is None:
+                        target['samples'][key] = value
+                    elif family.get('mode') == 'max':
+                        target['samples'][key] = max(current, value)
+                    elif family.get('mode') == 'min':
+                        target['samples'][key] = min(current, value)
+                    else:
+                        target['samples'][key] = current + value
+        return merged
+
+    def render(self) -> str:
+        """All metrics of every live worker in the Prometheus text exposition format"""
+        lines = []
+        for name, family in sorted(self.merge(self._worker_snapshots()).items()):
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = family['labelnames']
+            for labelvalues, value in sorted(family['samples'].items()):
+                if family['type'] != 'histogram':
+                    lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(family['buckets']) + [float('inf')], value['counts']):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labelvalues, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def shutdown(self) -> None:
+        self._shutdown_event.set()
+
+
+# Registry shared by the app and its services
+REGISTRY = MetricsRegistry()
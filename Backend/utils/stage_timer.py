@@ -0,0 +1,103 @@
+import re
+import math
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StageTimer:
+    """
+    Wall-clock durations of the named stages of one request.
+
+    Stages may be timed with the stage() context manager or recorded from
+    elsewhere (e.g. recognizer callbacks) with record(); repeated stages add up.
+    Stages can overlap, as upload and recognition do when audio is streamed.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def __bool__(self) -> bool:
+        return bool(self._stages)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, plus the total so far"""
+        with self._lock:
+            timings = {name: round(seconds * 1000, 2) for name, seconds in self._stages.items()}
+        timings['total'] = round(self.elapsed() * 1000, 2)
+        return timings
+
+    def server_timing(self) -> str:
+        """Value of a Server-Timing header"""
+        return ', '.join(f'{re.sub(r"[^A-Za-z0-9_-]", "_", name)};dur={duration}'
+                         for name, duration in self.as_dict().items())
+
+
+class StageStats:
+    """Rolling per-route, per-stage aggregate of the last window timings"""
+
+    def __init__(self, window: int = 1000):
+        self.window = max(1, int(window))
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def add(self, route: str, timings: Dict[str, float]) -> None:
+        """Record the millisecond timings of one request"""
+        with self._lock:
+            stages = self._samples.setdefault(route, {})
+            for name, duration in timings.items():
+                samples = stages.get(name)
+                if samples is None:
+                    samples = stages[name] = deque(maxlen=self.window)
+                samples.append(duration)
+
+    def get_stats(self, route: Optional[str] = None) -> Dict[str, Any]:
+        """count, mean, p50, p95, p99 and max in milliseconds for every stage of every (or one) route"""
+        with self._lock:
+            snapshot = {
+                name: {stage: sorted(samples) for stage, samples in stages.items()}
+                for name, stages in self._samples.items()
+                if route is None or name == route
+            }
+        return {
+            name: {
+                stage: {
+                    'count': len(values),
+                    'mean_ms': round(sum(values) / len(values), 2),
+                    'p50_ms': _percentile(values, 0.50),
+                    'p95_ms': _percentile(values, 0.95),
+                    'p99_ms': _percentile(values, 0.99),
+                    'max_ms': values[-1]
+                }
+                for stage, values in stages.items()
+            }
+            for name, stages in snapshot.items()
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
@@ -0,0 +1,133 @@
+import json
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+# The Speech SDK reports offsets and durations in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+# Cue length assumed for segments recorded without a duration
+SECONDS_PER_WORD = 0.4
+
+EXPORT_FORMATS = {
+    'txt': 'text/plain; charset=utf-8',
+    'json': 'application/json',
+    'srt': 'application/x-subrip; charset=utf-8',
+    'vtt': 'text/vtt; charset=utf-8'
+}
+
+
+def format_cue_time(seconds: float, decimal_separator: str = ',') -> str:
+    """HH:MM:SS,mmm as used by SRT (decimal_separator='.' gives the WebVTT form)"""
+    milliseconds = int(round(max(0.0, seconds) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600 * 1000)
+    minutes, milliseconds = divmod(milliseconds, 60 * 1000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_separator}{milliseconds:03d}'
+
+
+def _timed_segments(segments: Iterable[Dict[str, Any]], start_time: Optional[float]) -> Iterator[Dict[str, Any]]:
+    """
+    Segments with start and end in seconds from the start of the audio. offset and
+    duration are used when recorded; otherwise the start comes from the wall-clock
+    timestamp relative to start_time (or follows the previous segment) and the
+    length is estimated from the word count.
+    """
+    cursor = 0.0
+    for segment in segments:
+        text = (segment.get('text') or '').strip()
+        if segment.get('offset') is not None:
+            start = segment['offset'] / float(TICKS_PER_SECOND)
+        elif segment.get('timestamp') is not None and start_time is not None:
+            start = max(cursor, segment['timestamp'] - start_time)
+        else:
+            start = cursor
+        if segment.get('duration'):
+            end = start + segment['duration'] / float(TICKS_PER_SECOND)
+        else:
+            end = start + max(1.0, len(text.split()) * SECONDS_PER_WORD)
+        cursor = end
+        yield {'text': text, 'start': start, 'end': end}
+
+
+def iter_txt(segments: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> Iterator[str]:
+    """Plain text document: a metadata header, then one paragraph of text"""
+    yield 'SpeakEasy Transcription\n'
+    yield '=' * 50 + '\n'
+    yield f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    for label, key in (('Source', 'source'), ('Language', 'language'), ('Word count', 'word_count'),
+                       ('Character count', 'character_count')):
+        if metadata.get(key) is not None:
+            yield f'{label}: {metadata[key]}\n'
+    yield '=' * 50 + '\n\n'
+
+    separator = ''
+    for segment in segments:
+        text = (segment.get('text') or '').strip()
+        if text:
+            yield separator + text
+            separator = ' '
+
+    yield '\n\n'
+    yield '=' * 50 + '\n'
+    yield 'Generated by SpeakEasy API\n'
+
+
+def iter_json(segments: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> Iterator[str]:
+    """JSON document with the metadata fields and a segments array, written one segment at a time"""
+    yield '{'
+    for key, value in metadata.items():
+        yield f'{json.dumps(key)}: {json.dumps(value)}, '
+    yield '"segments": ['
+    separator = ''
+    for segment in _timed_segments(segments, metadata.get('start_time')):
+        yield separator + json.dumps({
+            'start': round(segment['start'], 3),
+            'end': round(segment['end'], 3),
+            'text': segment['text']
+        })
+        separator = ', '
+    yield ']}\n'
+
+
+def iter_srt(segments: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> Iterator[str]:
+    """SubRip subtitles, one numbered cue per segment"""
+    index = 0
+    for segment in _timed_segments(segments, metadata.get('start_time')):
+        if not segment['text']:
+            continue
+        index += 1
+        yield (f"{index}\n{format_cue_time(segment['start'])} --> {format_cue_time(segment['end'])}\n"
+               f"{segment['text']}\n\n")
+
+
+def iter_vtt(segments: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> Iterator[str]:
+    """WebVTT subtitles, one cue per segment"""
+    yield 'WEBVTT\n\n'
+    for segment in _timed_segments(segments, metadata.get('start_time')):
+        if not segment['text']:
+            continue
+        yield (f"{format_cue_time(segment['start'], '.')} --> {format_cue_time(segment['end'], '.')}\n"
+               f"{segment['text']}\n\n")
+
+
+_EXPORTERS = {'txt': iter_txt, 'json': iter_json, 'srt': iter_srt, 'vtt': iter_vtt}
+
+
+def iter_export(export_format: str, segments: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> Iterator[str]:
+    """
+    Generate a transcript document piece by piece, so memory use does not depend on its length
+
+    Args:
+        export_format: One of EXPORT_FORMATS
+        segments: Recognized segments with 'text' and, where recorded, 'offset'/'duration'
+            in ticks or a wall-clock 'timestamp'
+        metadata: Fields describing the transcript (source, language, word_count, ...);
+            'start_time' anchors segment timestamps
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    exporter = _EXPORTERS.get(export_format)
+    if exporter is None:
+        raise ValueError(f"Unsupported export format: {export_format}. Use one of: {', '.join(EXPORT_FORMATS)}")
+    return exporter(segments, metadata)
@@ -0,0 +1,329 @@
+import wave
+import bisect
+import logging
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from utils.audio_stream import AudioUploadStream, is_streamable_pcm
+
+logger = logging.getLogger(__name__)
+
+# The Speech SDK reports offsets in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+
+class OffsetMap:
+    """
+    Maps positions in speech-only (trimmed) audio back to the original timeline.
+    Built from runs of kept samples: (trimmed_start, original_start, length).
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.runs: List[Tuple[int, int, int]] = []
+        self._trimmed_starts: List[int] = []
+
+    def add(self, trimmed_start: int, original_start: int, length: int) -> None:
+        """Record kept samples, extending the previous run when contiguous"""
+        if self.runs:
+            last_trimmed, last_original, last_length = self.runs[-1]
+            if last_trimmed + last_length == trimmed_start and last_original + last_length == original_start:
+                self.runs[-1] = (last_trimmed, last_original, last_length + length)
+                return
+        self.runs.append((trimmed_start, original_start, length))
+        self._trimmed_starts.append(trimmed_start)
+
+    @property
+    def kept_samples(self) -> int:
+        return sum(length for _, _, length in self.runs)
+
+    def to_original_sample(self, trimmed_sample: int, end: bool = False) -> int:
+        """
+        Map a sample position in the trimmed audio to the original audio. An end
+        position that falls on the boundary of two runs maps to the end of the
+        earlier run rather than the start of the later one.
+        """
+        if not self.runs:
+            return trimmed_sample
+        bisect_position = bisect.bisect_left if end else bisect.bisect_right
+        index = max(0, bisect_position(self._trimmed_starts, trimmed_sample) - 1)
+        trimmed_start, original_start, _ = self.runs[index]
+        return original_start + (trimmed_sample - trimmed_start)
+
+    def to_original_ticks(self, trimmed_ticks: int, end: bool = False) -> int:
+        """Map an SDK offset (or, with end, the end of a segment) in the trimmed audio to the original audio"""
+        trimmed_sample = int(round(trimmed_ticks * self.sample_rate / TICKS_PER_SECOND))
+        original_sample = self.to_original_sample(trimmed_sample, end)
+        return trimmed_ticks + int(round((original_sample - trimmed_sample) * TICKS_PER_SECOND / self.sample_rate))
+
+    def get_regions(self) -> List[Dict[str, float]]:
+        """Kept speech regions in original time"""
+        return [
+            {
+                'start_seconds': round(original_start / float(self.sample_rate), 3),
+                'end_seconds': round((original_start + length) / float(self.sample_rate), 3)
+            }
+            for _, original_start, length in self.runs
+        ]
+
+
+def frame_features(samples: np.ndarray, frame_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame energy (dBFS) and zero-crossing rate of int16 mono samples
+
+    Returns:
+        (energy_db, zero_crossing_rate) arrays with one value per whole frame
+    """
+    frame_count = len(samples) // frame_length
+    frames = samples[:frame_count * frame_length].astype(np.float32).reshape(frame_count, frame_length) / 32768.0
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+    signs = np.signbit(frames)
+    zero_crossing_rate = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_length - 1)
+
+    return energy_db, zero_crossing_rate
+
+
+class VoiceActivityGate:
+    """
+    Energy/zero-crossing voice activity detector that passes through only speech
+    (plus padding) from a stream of 16-bit mono PCM.
+
+    Frame features and speech decisions are vectorized per chunk. The noise floor
+    starts from a fixed quiet-room level, drops at once to the quietest frames of
+    each chunk and rises only slowly, never above MAX_NOISE_FLOOR_DB, so audio
+    without a quiet lead-in (continuous speech, music) is not taken for noise.
+    Voiced frames must exceed the floor by threshold_db. Quieter frames with a high
+    zero-crossing rate (fricatives) count when they exceed the floor by half of that.
+
+    Audio with signal above ABSOLUTE_FLOOR_DB in which no speech was found is passed
+    through untrimmed rather than dropped, when it is at most FALLBACK_SECONDS long.
+    """
+
+    # Never treat frames quieter than this as speech
+    ABSOLUTE_FLOOR_DB = -55.0
+
+    # Noise floor assumed before any audio is seen, and the highest it may rise to
+    NOISE_SEED_DB = -60.0
+    MAX_NOISE_FLOOR_DB = -45.0
+
+    # Longest audio held back so that it can be passed through if no speech is found
+    FALLBACK_SECONDS = 30
+
+    # Zero-crossing rate typical of unvoiced consonants
+    FRICATIVE_ZCR = 0.25
+
+    # dB per second the noise floor may rise
+    NOISE_RISE_DB_PER_SECOND = 1.0
+
+    def __init__(
+            self,
+            sample_rate: int = 16000,
+            frame_ms: int = 30,
+            threshold_db: float = 10.0,
+            padding_ms: int = 300,
+            min_speech_ms: int = 90
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.padding_frames = max(1, int(round(padding_ms / frame_ms)))
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+
+        self.offset_map = OffsetMap(sample_rate)
+        self.total_samples = 0
+
+        self.peak_db = float('-inf')
+        self.passed_through = False
+
+        self._carry = np.zeros(0, dtype=np.int16)
+        self._noise_db = self.NOISE_SEED_DB
+        self._withheld: List[np.ndarray] = []
+        self._withheld_samples = 0
+        self._withholding = True
+        self._preroll = deque(maxlen=self.padding_frames)
+        self._onset_run = 0
+        self._hangover = 0
+        self._frame_index = 0
+        self._trimmed_samples = 0
+
+    def _classify(self, energy_db: np.ndarray, zero_crossing_rate: np.ndarray) -> np.ndarray:
+        """Vectorized speech decision for one chunk of frames, updating the noise floor"""
+        chunk_floor = float(np.percentile(energy_db, 10))
+        chunk_seconds = len(energy_db) * self.frame_ms / 1000.0
+        self._noise_db = min(chunk_floor, self._noise_db + self.NOISE_RISE_DB_PER_SECOND * chunk_seconds,
+                             self.MAX_NOISE_FLOOR_DB)
+        self.peak_db = max(self.peak_db, float(energy_db.max()))
+
+        voiced = energy_db > max(self.ABSOLUTE_FLOOR_DB, self._noise_db + self.threshold_db)
+        unvoiced = (zero_crossing_rate > self.FRICATIVE_ZCR) & \
+            (energy_db > max(self.ABSOLUTE_FLOOR_DB, self._noise_db + self.threshold_db / 2))
+        return voiced | unvoiced
+
+    def _emit(self, frame_index: int, frame: np.ndarray) -> bytes:
+        self.offset_map.add(self._trimmed_samples, frame_index * self.frame_length, len(frame))
+        self._trimmed_samples += len(frame)
+        return frame.tobytes()
+
+    def _process_samples(self, samples: np.ndarray) -> bytes:
+        frame_count = len(samples) // self.frame_length
+        if frame_count == 0:
+            return b''
+
+        energy_db, zero_crossing_rate = frame_features(samples, self.frame_length)
+        is_speech = self._classify(energy_db, zero_crossing_rate)
+        frames = samples[:frame_count * self.frame_length].reshape(frame_count, self.frame_length)
+
+        output = []
+        for frame, speech in zip(frames, is_speech):
+            index = self._frame_index
+            self._frame_index += 1
+
+            if self._hangover > 0 and speech:
+                # Still inside a speech region
+                self._hangover = self.padding_frames
+                output.append(self._emit(index, frame))
+            elif speech:
+                # Possible onset: buffer until it has lasted min_speech_frames
+                self._preroll.append((index, frame))
+                self._onset_run += 1
+                if self._onset_run >= self.min_speech_frames:
+                    output.extend(self._emit(i, f) for i, f in self._preroll)
+                    self._preroll.clear()
+                    self._hangover = self.padding_frames
+            elif self._hangover > 0:
+                # Trailing padding after speech
+                self._hangover -= 1
+                output.append(self._emit(index, frame))
+            else:
+                self._onset_run = 0
+                self._preroll.append((index, frame))
+
+        return b''.join(output)
+
+    def iter_speech(self, pcm_chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Filter 16-bit mono PCM chunks down to speech regions
+
+        Yields:
+            PCM bytes of the kept frames; offset_map records where they came from
+        """
+        for chunk in pcm_chunks:
+            samples = np.frombuffer(chunk, dtype='<i2')
+            self.total_samples += len(samples)
+            if len(self._carry):
+                samples = np.concatenate([self._carry, samples])
+
+            usable = len(samples) - (len(samples) % self.frame_length)
+            self._carry = samples[usable:].copy()
+            self._withhold(samples[:usable])
+            kept = self._process_samples(samples[:usable])
+            if kept:
+                yield kept
+
+        if self._withholding and not self.offset_map.runs and self.has_signal:
+            # No speech found in audio that is not silent: better to recognize all of it
+            logger.info(f"No speech regions found in {self.total_seconds:.1f}s of audio above "
+                         f"{self.ABSOLUTE_FLOOR_DB} dBFS; passing it through untrimmed")
+            self._withheld.append(self._carry)
+            samples = np.concatenate(self._withheld)
+            self._withheld = []
+            self.passed_through = True
+            self.offset_map.add(0, 0, len(samples))
+            self._trimmed_samples = len(samples)
+            yield samples.tobytes()
+            return
+
+        # A trailing partial frame is kept only if it continues a speech region
+        if len(self._carry) and self._hangover > 0:
+            yield self._emit(self._frame_index, self._carry)
+
+    def _withhold(self, samples: np.ndarray) -> None:
+        """Keep audio seen before the first speech region, up to FALLBACK_SECONDS"""
+        if not self._withholding:
+            return
+        if self.offset_map.runs or self._withheld_samples + len(samples) > self.FALLBACK_SECONDS * self.sample_rate:
+            self._withholding = False
+            self._withheld = []
+            return
+        self._withheld.append(samples)
+        self._withheld_samples += len(samples)
+
+    @property
+    def has_signal(self) -> bool:
+        """True if any frame was louder than ABSOLUTE_FLOOR_DB, i.e. the audio is not silence"""
+        return self.peak_db > self.ABSOLUTE_FLOOR_DB
+
+    @property
+    def speech_seconds(self) -> float:
+        return self.offset_map.kept_samples / float(self.sample_rate)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_samples / float(self.sample_rate)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Statistics describing what was trimmed"""
+        return {
+            'total_seconds': round(self.total_seconds, 3),
+            'speech_seconds': round(self.speech_seconds, 3),
+            'trimmed_seconds': round(self.total_seconds - self.speech_seconds, 3),
+            'regions': len(self.offset_map.runs),
+            'passed_through': self.passed_through
+        }
+
+    def trim_file(self, source_path: str, target_path: str) -> bool:
+        """
+        Write the speech regions of a 16-bit mono PCM WAV file to a new WAV file
+
+        Args:
+            source_path: Source WAV at the gate's sample rate (e.g. normalizer output)
+            target_path: Destination WAV
+
+        Returns:
+            True if any speech was found, or the audio was passed through untrimmed
+            (nothing is written otherwise)
+        """
+        with open(source_path, 'rb') as source:
+            upload = AudioUploadStream(source)
+            wav_format = upload.read_header()
+            if not is_streamable_pcm(wav_format) or wav_format['channels'] != 1 \
+                    or wav_format['sample_rate'] != self.sample_rate:
+                raise ValueError(f'Voice activity detection needs 16-bit mono PCM at {self.sample_rate} Hz')
+
+            speech = self.iter_speech(upload.iter_pcm())
+            first = next(speech, None)
+            if first is None:
+                return False
+
+            with wave.open(target_path, 'wb') as target:
+                target.setnchannels(1)
+                target.setsampwidth(2)
+                target.setframerate(self.sample_rate)
+                target.writeframes(first)
+                for chunk in speech:
+                    target.writeframes(chunk)
+
+        return True
+
+
+def shift_transcriptions(transcriptions: List[Dict[str, Any]], offset_map: OffsetMap) -> List[Dict[str, Any]]:
+    """
+    Map segments from trimmed audio back onto the original timeline. Both ends are
+    mapped, so a segment spanning trimmed silence is stretched over it.
+    """
+    shifted = []
+    for transcription in transcriptions:
+        offset = transcription.get('offset', 0)
+        original_offset = offset_map.to_original_ticks(offset)
+        update = {'offset': original_offset}
+        if 'duration' in transcription:
+            original_end = offset_map.to_original_ticks(offset + transcription['duration'], end=True)
+            update['duration'] = max(0, original_end - original_offset)
+        shifted.append(dict(transcription, **update))
+    return shifted
@@ -1,27 +1,18 @@
-import React, { useState } from "react";
-import { recordAudio } from "../utils/audioRecorder";
+import React, { useEffect, useRef, useState } from "react";
+import { streamAudio } from "../utils/audioRecorder";
+import { speechAPI } from "../services/api";
 import WaveformVisualizer from "./WaveformVisualizer";
 import "./OptionComponent.css";
 import DownloadButton from "./DownloadButton";
 
-async function transcribeWithFileApi(audioBlob, language) {
-  const formData = new FormData();
-  formData.append("file", audioBlob, "audio.wav");
-  formData.append("language", language);
-  const response = await fetch("https://voice-transcribe-demo-2.azurewebsites.net/api/file-transcription", {
-    method: "POST",
-    body: formData,
-  });
-  if (!response.ok) throw new Error("Transcription failed");
-  const data = await response.json();
-  return data;
-}
-
 function ContinuousRealtime() {
   const [recording, setRecording] = useState(false);
+  const [stopping, setStopping] = useState(false);
   const [transcription, setTranscription] = useState("");
   const [error, setError] = useState(null);
   const [duration, setDuration] = useState(60);
+  // Recorder, session, audio sender, event stream and auto-stop timer of the running session
+  const live = useRef(null);
 
   const durations = [
     { label: "15 seconds", value: 15 },
@@ -31,28 +22,89 @@ function ContinuousRealtime() {
     { label: "3 minutes", value: 180 },
   ];
 
+  const handleStop = async () => {
+    const current = live.current;
+    if (!current) return;
+    live.current = null;
+    clearTimeout(current.timer);
+    setStopping(true);
+    try {
+      // stop() hands over the last partial chunk; wait for every chunk to be posted
+      current.recorder.stop();
+      if (current.send) {
+        await current.send.flush();
+        const res = await speechAPI.stopContinuousTranscription(current.sessionId);
+        if (res.success) {
+          setTranscription(res.transcription);
+        } else {
+          setError(res.error || "Transcription failed.");
+        }
+      }
+    } catch (e) {
+      setError("API call failed.");
+    }
+    if (current.events) current.events.close();
+    setStopping(false);
+    setRecording(false);
+  };
+
   const handleRecord = async () => {
     setRecording(true);
     setTranscription("");
     setError(null);
+    // Audio captured before the session has started is sent once it has
+    const pending = [];
+    const current = { pending };
+    live.current = current;
     try {
-      const audioBlob = await recordAudio(duration);
-      const res = await transcribeWithFileApi(audioBlob, "en-US");
-      if (res.success) {
-        setTranscription(res.transcription);
-      } else {
-        setError(res.error || "Transcription failed.");
+      current.recorder = await streamAudio((chunk) => {
+        if (current.send) current.send(chunk);
+        else pending.push(chunk);
+      });
+      const session = await speechAPI.startStreamingTranscription("en-US", current.recorder.audioFormat);
+      if (live.current !== current) {
+        // Stopped while the session was starting
+        if (session.success) await speechAPI.stopContinuousTranscription(session.session_id);
+        return;
       }
+      if (!session.success) {
+        current.recorder.stop();
+        live.current = null;
+        setError(session.error || "Could not start transcription.");
+        setRecording(false);
+        return;
+      }
+      current.sessionId = session.session_id;
+      current.send = speechAPI.createSessionAudioSender(session.session_id, () =>
+        setError("Some audio could not be sent.")
+      );
+      pending.forEach((chunk) => current.send(chunk));
+      current.events = speechAPI.openSessionEvents(session.session_id, (segment) =>
+        setTranscription((text) => (text ? `${text} ${segment.text}` : segment.text))
+      );
+      current.timer = setTimeout(handleStop, duration * 1000);
     } catch (e) {
+      if (current.recorder) current.recorder.stop();
+      live.current = null;
       setError("API call failed.");
+      setRecording(false);
     }
-    setRecording(false);
   };
 
+  // Release the microphone and the session if the component goes away mid-recording
+  useEffect(() => () => {
+    const current = live.current;
+    if (!current) return;
+    clearTimeout(current.timer);
+    if (current.recorder) current.recorder.stop();
+    if (current.events) current.events.close();
+    if (current.sessionId) speechAPI.stopContinuousTranscription(current.sessionId).catch(() => {});
+  }, []);
+
   return (
     <div className="option-box glass"  style={{ position: "relative" }}>
-        <DownloadButton transcription={transcription} disabled={!transcription} />
-    
+        <DownloadButton transcription={transcription} disabled={!transcription || recording} />
+
       <h2>Continuous Real-Time (auto transcription)</h2>
       <div className="duration-select-row">
         <label htmlFor="duration-select-continuous">Recording Time:</label>
@@ -60,6 +112,7 @@ function ContinuousRealtime() {
           id="duration-select-continuous"
           value={duration}
           onChange={(e) => setDuration(Number(e.target.value))}
+          disabled={recording}
         >
           {durations.map((d) => (
             <option key={d.value} value={d.value}>
@@ -68,9 +121,13 @@ function ContinuousRealtime() {
           ))}
         </select>
       </div>
-      <button onClick={handleRecord} disabled={recording}>
-        {recording ? "Recording..." : `Start Recording (${duration}s)`}
-      </button>
+      {recording ? (
+        <button onClick={handleStop} disabled={stopping}>
+          {stopping ? "Finishing..." : "Stop Recording"}
+        </button>
+      ) : (
+        <button onClick={handleRecord}>{`Start Recording (${duration}s)`}</button>
+      )}
       {recording && <WaveformVisualizer />}
       {error && (
         <div className="transcription-box" style={{ color: "#ff6b6b" }}>
@@ -84,4 +141,4 @@ function ContinuousRealtime() {
   );
 }
 
-export default ContinuousRealtime;
\ No newline at end of file
+export default ContinuousRealtime;
@@ -1,37 +1,43 @@
 "use client"
 
-import { useState } from "react"
+import { useState, useEffect } from "react"
 import { Download, FileText, File, CheckCircle, Copy } from "lucide-react"
+import { speechAPI } from "../services/api"
+
+const formatDuration = (seconds) => {
+  if (seconds === null || seconds === undefined) return "--:--"
+  const total = Math.round(seconds)
+  return `${String(Math.floor(total / 60)).padStart(2, "0")}:${String(total % 60).padStart(2, "0")}`
+}
+
+// Listings only carry a preview, so fetch the full text before saving or copying
+const loadFullText = async (transcription) => {
+  const transcript = await speechAPI.getTranscript(transcription.id)
+  return transcript.success ? transcript.text : transcription.content
+}
 
 export default function DownloadService() {
-  const [transcriptions, setTranscriptions] = useState([
-    {
-      id: 1,
-      title: "Meeting Notes - Project Discussion",
-      content:
-        "This is a sample transcription from a project meeting. The team discussed the upcoming features and timeline for the speech-to-text application development.",
-      date: "2024-01-15",
-      duration: "15:30",
-      type: "meeting",
-    },
-    {
-      id: 2,
-      title: "Interview Recording - User Feedback",
-      content:
-        "User interview transcription discussing the usability and features of the current speech-to-text system. Valuable insights for product improvement.",
-      date: "2024-01-14",
-      duration: "08:45",
-      type: "interview",
-    },
-    {
-      id: 3,
-      title: "Hindi Audio Sample",
-      content: "यह एक हिंदी भाषा का नमूना प्रतिलेखन है। इसमें विभिन्न विषयों पर चर्चा की गई है।",
-      date: "2024-01-13",
-      duration: "12:20",
-      type: "hindi",
-    },
-  ])
+  const [transcriptions, setTranscriptions] = useState([])
+
+  // Transcripts saved by the backend's transcript store
+  useEffect(() => {
+    speechAPI
+      .listTranscripts({ limit: 50 })
+      .then((page) => {
+        if (!page.success) return
+        setTranscriptions(
+          page.transcripts.map((t) => ({
+            id: t.transcript_id,
+            title: t.filename || `Session ${t.source_id}`,
+            content: t.preview,
+            date: new Date(t.created_at * 1000).toISOString().slice(0, 10),
+            duration: formatDuration(t.duration_seconds),
+            type: t.source,
+          })),
+        )
+      })
+      .catch((err) => console.log("[v0] Failed to load transcriptions:", err))
+  }, [])
 
   const [selectedTranscriptions, setSelectedTranscriptions] = useState([])
   const [downloadFormat, setDownloadFormat] = useState("txt")
@@ -49,28 +55,29 @@ export default function DownloadService() {
     }
   }
 
-  const downloadTranscription = (transcription, format) => {
+  const downloadTranscription = async (transcription, format) => {
     console.log(`[v0] Downloading transcription "${transcription.title}" as ${format.toUpperCase()}`)
 
+    const fullText = await loadFullText(transcription)
     let content = ""
     let filename = ""
     let mimeType = ""
 
     switch (format) {
       case "txt":
-        content = `${transcription.title}\nDate: ${transcription.date}\nDuration: ${transcription.duration}\n\n${transcription.content}`
+        content = `${transcription.title}\nDate: ${transcription.date}\nDuration: ${transcription.duration}\n\n${fullText}`
         filename = `${transcription.title.replace(/[^a-z0-9]/gi, "_").toLowerCase()}.txt`
         mimeType = "text/plain"
         break
       case "docx":
         // Simulate DOCX content (in real app, would use a library like docx)
-        content = transcription.content
+        content = fullText
         filename = `${transcription.title.replace(/[^a-z0-9]/gi, "_").toLowerCase()}.docx`
         mimeType = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         break
       case "pdf":
         // Simulate PDF content (in real app, would use a library like jsPDF)
-        content = transcription.content
+        content = fullText
         filename = `${transcription.title.replace(/[^a-z0-9]/gi, "_").toLowerCase()}.pdf`
         mimeType = "application/pdf"
         break
@@ -99,7 +106,7 @@ export default function DownloadService() {
       const transcription = transcriptions.find((t) => t.id === selectedTranscriptions[i])
       if (transcription) {
         await new Promise((resolve) => setTimeout(resolve, 500)) // Simulate processing time
-        downloadTranscription(transcription, downloadFormat)
+        await downloadTranscription(transcription, downloadFormat)
       }
     }
 
@@ -107,7 +114,8 @@ export default function DownloadService() {
     setTimeout(() => setDownloadStatus("idle"), 2000)
   }
 
-  const copyToClipboard = (content) => {
+  const copyToClipboard = async (transcription) => {
+    const content = await loadFullText(transcription)
     navigator.clipboard
       .writeText(content)
       .then(() => {
@@ -203,9 +211,9 @@ export default function DownloadService() {
                   <div className="flex items-center gap-1 text-xs text-muted-foreground flex-shrink-0">
                     <span
                       className={`px-2 py-1 rounded-full ${
-                        transcription.type === "meeting"
+                        transcription.type === "session"
                           ? "bg-blue-500/20 text-blue-400"
-                          : transcription.type === "interview"
+                          : transcription.type === "job"
                             ? "bg-green-500/20 text-green-400"
                             : "bg-orange-500/20 text-orange-400"
                       }`}
@@ -245,7 +253,7 @@ export default function DownloadService() {
                     PDF
                   </button>
                   <button
-                    onClick={() => copyToClipboard(transcription.content)}
+                    onClick={() => copyToClipboard(transcription)}
                     className="flex items-center gap-1 text-xs text-muted-foreground hover:text-foreground underline"
                   >
                     <Copy className="w-3 h-3" />
@@ -49,6 +49,75 @@ export const speechAPI = {
     }
   },
 
+  // Start a continuous session fed with audio captured in the browser (see streamAudio)
+  startStreamingTranscription: async (language = "en-US", audioFormat = {}, sessionId = null) => {
+    try {
+      const body = { language, source: "stream", audio_format: audioFormat }
+      if (sessionId) body.session_id = sessionId
+
+      const response = await fetch(`${API_URL}/api/continuous/start`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify(body),
+      })
+      return await response.json()
+    } catch (error) {
+      throw new Error("Streaming transcription failed")
+    }
+  },
+
+  // Push a chunk of raw PCM (ArrayBuffer or Blob) into a streamed session. seq numbers the
+  // session's chunks 0, 1, 2, ... in recording order; the server writes them in that order.
+  sendSessionAudio: async (sessionId, chunk, seq) => {
+    try {
+      const params = new URLSearchParams({ seq })
+      const response = await fetch(`${API_URL}/api/continuous/${encodeURIComponent(sessionId)}/audio?${params}`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/octet-stream",
+        },
+        body: chunk,
+      })
+      return await response.json()
+    } catch (error) {
+      throw new Error("Failed to send session audio")
+    }
+  },
+
+  // Sender for one streamed session: numbers the chunks it is given and posts them one at a
+  // time, so they reach the recognizer in recording order. flush() resolves once all are sent.
+  createSessionAudioSender: (sessionId, onError = null) => {
+    let seq = 0
+    let queue = Promise.resolve()
+    const send = (chunk) => {
+      const chunkSeq = seq++
+      queue = queue
+        .then(() => speechAPI.sendSessionAudio(sessionId, chunk, chunkSeq))
+        .then((res) => {
+          if (!res.success && onError) onError(res.error)
+        })
+        .catch((error) => {
+          if (onError) onError(error)
+        })
+      return queue
+    }
+    send.flush = () => queue
+    return send
+  },
+
+  // Server-Sent Events of recognized segments; call .close() on the result to stop listening
+  openSessionEvents: (sessionId, onSegment, onEnd = null) => {
+    const source = new EventSource(`${API_URL}/api/continuous/${encodeURIComponent(sessionId)}/events`)
+    source.addEventListener("segment", (e) => onSegment(JSON.parse(e.data)))
+    source.addEventListener("end", (e) => {
+      source.close()
+      if (onEnd) onEnd(JSON.parse(e.data))
+    })
+    return source
+  },
+
   // Stop continuous transcription
   stopContinuousTranscription: async (sessionId) => {
     try {
@@ -141,6 +210,43 @@ export const speechAPI = {
       throw new Error("Failed to fetch active sessions")
     }
   },
+
+  // Saved transcripts, newest first; pass the previous page's next_cursor to continue
+  listTranscripts: async ({ limit = 20, cursor = null, language = null, source = null } = {}) => {
+    try {
+      const params = new URLSearchParams({ limit })
+      if (cursor !== null) params.append("cursor", cursor)
+      if (language) params.append("language", language)
+      if (source) params.append("source", source)
+
+      const response = await fetch(`${API_URL}/api/transcripts?${params}`)
+      return await response.json()
+    } catch (error) {
+      throw new Error("Failed to fetch transcripts")
+    }
+  },
+
+  // Full-text search; each result has a snippet with the matches wrapped in <mark>
+  searchTranscripts: async (query, { limit = 20, offset = 0, order = "relevance" } = {}) => {
+    try {
+      const params = new URLSearchParams({ q: query, limit, offset, order })
+      const response = await fetch(`${API_URL}/api/transcripts/search?${params}`)
+      return await response.json()
+    } catch (error) {
+      throw new Error("Transcript search failed")
+    }
+  },
+
+  getTranscript: async (transcriptId, includeSegments = false) => {
+    try {
+      const response = await fetch(
+        `${API_URL}/api/transcripts/${encodeURIComponent(transcriptId)}?segments=${includeSegments}`,
+      )
+      return await response.json()
+    } catch (error) {
+      throw new Error("Failed to fetch transcript")
+    }
+  },
 }
 
 export async function simpleRealtimeTranscribe(duration, language = "en-US") {
@@ -76,3 +76,60 @@ export async function recordAudio(durationSeconds = 15) {
     };
   });
 }
+
+// Capture the microphone continuously and hand raw 32-bit float PCM chunks to
+// onChunk(buffer, seq), for streamed continuous sessions; seq counts chunks from 0 in
+// recording order. Resolves to { audioFormat, stop }: pass audioFormat to the session
+// start request and call stop() to release the microphone.
+export async function streamAudio(onChunk, chunkMs = 250) {
+  if (!navigator.mediaDevices || !window.AudioContext) {
+    throw new Error('Microphone not supported');
+  }
+  const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+  const audioContext = new window.AudioContext();
+  const source = audioContext.createMediaStreamSource(stream);
+  const processor = audioContext.createScriptProcessor(4096, 1, 1);
+  const chunkSamples = Math.round(audioContext.sampleRate * chunkMs / 1000);
+  let pending = [];
+  let pendingSamples = 0;
+  let seq = 0;
+
+  const flush = () => {
+    if (pendingSamples === 0) return;
+    const samples = new Float32Array(pendingSamples);
+    let offset = 0;
+    for (let arr of pending) {
+      samples.set(arr, offset);
+      offset += arr.length;
+    }
+    pending = [];
+    pendingSamples = 0;
+    onChunk(samples.buffer, seq++);
+  };
+
+  processor.onaudioprocess = (e) => {
+    const data = new Float32Array(e.inputBuffer.getChannelData(0));
+    pending.push(data);
+    pendingSamples += data.length;
+    if (pendingSamples >= chunkSamples) flush();
+  };
+
+  source.connect(processor);
+  processor.connect(audioContext.destination);
+
+  return {
+    audioFormat: {
+      sample_rate: audioContext.sampleRate,
+      channels: 1,
+      encoding: 'float',
+      bits_per_sample: 32,
+    },
+    stop: () => {
+      processor.disconnect();
+      source.disconnect();
+      stream.getTracks().forEach((track) => track.stop());
+      flush();
+      audioContext.close();
+    },
+  };
+}